@@ -0,0 +1,267 @@
+"""
+LLM 답변 캐시
+(모델, 프롬프트 템플릿 버전, 질문, 검색된 청크 id+버전 순서) 해시로 답변을 재사용
+
+같은 질문에 같은 문서가 검색되면 PROMPT_TEMPLATE로 만든 프롬프트도 동일하므로 LLM을 다시 호출하지 않는다.
+백엔드:
+- memory: 프로세스 로컬 LRU + TTL
+- redis: 여러 워커가 공유 (redis-py, REDIS_URL)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from langchain.schema import Document
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import cache_entries, cache_hits, cache_misses
+
+
+logger = setup_logger()
+
+NAMESPACE = "llm_answer"
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_PREFIX = "rag"
+
+
+def chunk_version(doc: Document) -> str:
+    """
+    청크 버전 식별자
+
+    metadata.version이 있으면 사용하고, 없으면 page_content 해시를 사용한다.
+    청크를 다시 임베딩하면서 내용이 바뀌면 키도 바뀌므로 이전 답변은 자연히 미스가 된다.
+    """
+    version = doc.metadata.get("version")
+    if version is not None:
+        return str(version)
+    return hashlib.sha1((doc.page_content or "").encode("utf-8")).hexdigest()[:12]
+
+
+def _document_ids(docs: Sequence[Document]) -> List[str]:
+    ids = []
+    for doc in docs:
+        doc_id = doc.metadata.get("document_id")
+        if doc_id and doc_id not in ids:
+            ids.append(str(doc_id))
+    return ids
+
+
+class MemoryAnswerBackend:
+    """프로세스 로컬 LRU + TTL 백엔드"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._by_document: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, answer, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return answer
+
+    def set(self, key: str, answer: str, document_ids: Sequence[str], ttl_seconds: float) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl_seconds, answer, tuple(document_ids))
+            for doc_id in document_ids:
+                self._by_document.setdefault(doc_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            cache_entries.labels(namespace=NAMESPACE).set(len(self._entries))
+
+    def invalidate(self, document_ids: Iterable[str]) -> int:
+        with self._lock:
+            keys: Set[str] = set()
+            for doc_id in document_ids:
+                keys |= self._by_document.pop(doc_id, set())
+            removed = 0
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    removed += 1
+            cache_entries.labels(namespace=NAMESPACE).set(len(self._entries))
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_document.clear()
+            cache_entries.labels(namespace=NAMESPACE).set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, document_ids = self._entries.pop(key)
+        for doc_id in document_ids:
+            keys = self._by_document.get(doc_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_document[doc_id]
+
+
+class RedisAnswerBackend:
+    """
+    Redis 백엔드
+
+    - 답변: {prefix}:answer:{hash} (TTL)
+    - 무효화 인덱스: {prefix}:answer_doc:{document_id} → 답변 키 SET (TTL 동일)
+    """
+
+    def __init__(self, client: Any, prefix: str = DEFAULT_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    def _answer_key(self, key: str) -> str:
+        return f"{self.prefix}:answer:{key}"
+
+    def _doc_key(self, doc_id: str) -> str:
+        return f"{self.prefix}:answer_doc:{doc_id}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self._answer_key(key))
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, answer: str, document_ids: Sequence[str], ttl_seconds: float) -> None:
+        ttl = max(1, int(ttl_seconds))
+        answer_key = self._answer_key(key)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(answer_key, answer, ex=ttl)
+        for doc_id in document_ids:
+            pipe.sadd(self._doc_key(doc_id), answer_key)
+            pipe.expire(self._doc_key(doc_id), ttl)
+        pipe.execute()
+
+    def invalidate(self, document_ids: Iterable[str]) -> int:
+        doc_keys = [self._doc_key(doc_id) for doc_id in document_ids]
+        if not doc_keys:
+            return 0
+        answer_keys: Set[Any] = set()
+        for doc_key in doc_keys:
+            answer_keys |= set(self.client.smembers(doc_key))
+        removed = int(self.client.delete(*answer_keys)) if answer_keys else 0
+        self.client.delete(*doc_keys)
+        return removed
+
+    def clear(self) -> None:
+        for pattern in (f"{self.prefix}:answer:*", f"{self.prefix}:answer_doc:*"):
+            keys = list(self.client.scan_iter(match=pattern))
+            if keys:
+                self.client.delete(*keys)
+
+
+class AnswerCache:
+    """
+    LLM 답변 캐시
+
+    키 = sha256(model, template_version, question, [(document_id, chunk_version), ...])
+    검색 결과 순서가 바뀌면 프롬프트도 바뀌므로 순서를 그대로 키에 포함한다.
+    백엔드 오류는 캐시 미스로 처리하여 질의 자체는 실패하지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        template_version: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.template_version = template_version
+        self.ttl_seconds = ttl_seconds
+
+    def make_key(self, model: str, question: str, docs: Sequence[Document]) -> str:
+        payload = {
+            "model": model,
+            "template": self.template_version,
+            "question": question.strip(),
+            "chunks": [
+                [doc.metadata.get("document_id"), chunk_version(doc)] for doc in docs
+            ],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            answer = self.backend.get(key)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"답변 캐시 조회 실패: {exc}")
+            answer = None
+        if answer is None:
+            cache_misses.labels(namespace=NAMESPACE).inc()
+            return None
+        cache_hits.labels(namespace=NAMESPACE).inc()
+        return answer
+
+    def put(self, key: str, answer: str, docs: Sequence[Document]) -> None:
+        try:
+            self.backend.set(key, answer, _document_ids(docs), self.ttl_seconds)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"답변 캐시 저장 실패: {exc}")
+
+    def invalidate_documents(self, document_ids: Iterable[str]) -> int:
+        """청크 재임베딩 시 해당 문서를 참조한 답변 삭제 (삭제된 엔트리 수 반환)"""
+        removed = self.backend.invalidate([str(doc_id) for doc_id in document_ids])
+        logger.info(f"답변 캐시 무효화: {removed}건")
+        return removed
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def init_answer_cache_from_env(template_version: str) -> Optional[AnswerCache]:
+    """
+    환경 변수 기반 답변 캐시 생성
+
+    - ANSWER_CACHE_ENABLED: true/false (기본 false)
+    - ANSWER_CACHE_BACKEND: memory / redis (기본 memory)
+    - ANSWER_CACHE_TTL: TTL 초 (기본 3600)
+    - ANSWER_CACHE_MAX_ENTRIES: memory 백엔드 최대 엔트리 수 (기본 1024)
+    - REDIS_URL / CACHE_PREFIX: redis 백엔드 접속 URL, 키 네임스페이스 (기본 rag)
+    """
+    enabled = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+    if not enabled:
+        return None
+
+    backend_name = os.getenv("ANSWER_CACHE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("ANSWER_CACHE_TTL", DEFAULT_TTL_SECONDS))
+    if backend_name == "redis":
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            raise ValueError("ANSWER_CACHE_BACKEND=redis에는 REDIS_URL이 필요합니다.")
+        import redis  # 옵셔널 의존성: redis 백엔드 사용 시에만 필요
+
+        backend: Any = RedisAnswerBackend(
+            redis.Redis.from_url(redis_url),
+            prefix=os.getenv("CACHE_PREFIX", DEFAULT_PREFIX),
+        )
+    elif backend_name == "memory":
+        backend = MemoryAnswerBackend(
+            max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        )
+    else:
+        raise ValueError(f"지원하지 않는 ANSWER_CACHE_BACKEND: {backend_name} (가능: memory, redis)")
+
+    logger.info(f"답변 캐시 초기화: backend={backend_name}, ttl={ttl_seconds}s")
+    return AnswerCache(backend, template_version=template_version, ttl_seconds=ttl_seconds)
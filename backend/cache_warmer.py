@@ -0,0 +1,321 @@
+"""
+Cache Warmer
+최근 쿼리 로그(JSONL)에서 인기 쿼리+필터 조합을 집계하여
+TTL 만료 전에 임베딩/검색 결과를 Semantic Cache에 미리 채운다.
+채울 대상이 Semantic Cache의 search 엔트리뿐이므로 SEMANTIC_CACHE_ENABLED=true일 때만 동작한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import Counter as TallyCounter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from backend.utils.logger import setup_logger, log_exception
+from backend.utils.metrics import Counter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from backend.retriever import Retriever
+
+
+logger = setup_logger()
+
+DEFAULT_TOP_N = 50
+DEFAULT_CONCURRENCY = 2
+DEFAULT_LOOKBACK_SECONDS = 24 * 3600.0
+# TTL 대비 갱신 주기 비율 (만료 전에 다시 채우기 위해 1보다 작게)
+REFRESH_RATIO = 0.8
+# 쿼리 로그 회전 크기 (현재 파일 + 회전 파일 1개만 유지 → 읽기량 상한 2배)
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+cache_warm_queries = Counter('cache_warm_queries_total', 'Cache warmer 사전 검색 수', ['status'])
+
+# 로그 레코드에서 쿼리 텍스트로 인정하는 키 (우선순위 순)
+_QUERY_FIELDS = ("query", "question", "text", "title")
+
+
+@dataclass(frozen=True)
+class WarmTarget:
+    """사전 검색 대상 (쿼리 + 필터 조합)"""
+    query: str
+    top_k: int = 5
+    domain: Optional[str] = None
+    area: Optional[str] = None
+
+
+class QueryLogWriter:
+    """
+    검색 쿼리 JSONL 로그 기록기
+
+    한 줄에 {"ts", "endpoint", "query", "top_k", "domain", "area"} 하나를 추가한다.
+    파일이 max_bytes를 넘으면 `<path>.1`로 회전한다 (이전 회전 파일은 덮어씀).
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_LOG_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        endpoint: str,
+        query: str,
+        top_k: int,
+        domain: Optional[str] = None,
+        area: Optional[str] = None,
+    ) -> None:
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "endpoint": endpoint,
+            "query": query,
+            "top_k": top_k,
+            "domain": domain,
+            "area": area,
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        try:
+            with self._lock:
+                with self.path.open("a", encoding="utf-8") as fp:
+                    fp.write(line + "\n")
+                if self.max_bytes > 0 and self.path.stat().st_size >= self.max_bytes:
+                    os.replace(self.path, rotated_path(self.path))
+        except OSError as exc:
+            # 로그 기록 실패가 요청 처리에 영향을 주지 않도록 경고만 남김
+            logger.warning(f"쿼리 로그 기록 실패: {exc}")
+
+
+def rotated_path(path: Path) -> Path:
+    """회전된 쿼리 로그 경로 (<path>.1)"""
+    return path.with_name(path.name + ".1")
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def load_query_log(path: str, lookback_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    JSONL 쿼리 로그 읽기
+
+    - 회전 파일(<path>.1) → 현재 파일 순서로 읽음 (QueryLogWriter가 크기를 제한하므로 읽기량도 상한)
+    - 쿼리 텍스트가 없는 줄, JSON 파싱 실패 줄은 건너뜀
+    - lookback_seconds가 주어지면 ts가 그보다 오래된 레코드는 제외 (ts 없는 레코드는 포함)
+    """
+    log_path = Path(path)
+    cutoff = time.time() - lookback_seconds if lookback_seconds else None
+    records: List[Dict[str, Any]] = []
+    for file_path in (rotated_path(log_path), log_path):
+        if file_path.exists():
+            records.extend(_read_log_file(file_path, cutoff))
+    return records
+
+
+def _read_log_file(log_path: Path, cutoff: Optional[float]) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with log_path.open(encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if cutoff is not None:
+                ts = _parse_ts(record.get("ts"))
+                if ts is not None and ts < cutoff:
+                    continue
+            records.append(record)
+    return records
+
+
+def rank_queries(records: Iterable[Dict[str, Any]], top_n: int = DEFAULT_TOP_N) -> List[WarmTarget]:
+    """
+    쿼리+필터 조합별 빈도 집계 후 상위 top_n 반환
+
+    공백만 다른 쿼리는 같은 조합으로 취급한다.
+    """
+    tally: TallyCounter = TallyCounter()
+    for record in records:
+        query = next((record[f] for f in _QUERY_FIELDS if isinstance(record.get(f), str)), None)
+        if not query:
+            continue
+        query = " ".join(query.split())
+        if len(query) < 2:
+            continue
+        top_k = record.get("top_k") or 5
+        if not isinstance(top_k, int) or not 1 <= top_k <= 10:
+            continue
+        tally[WarmTarget(
+            query=query,
+            top_k=top_k,
+            domain=record.get("domain") or None,
+            area=record.get("area") or None,
+        )] += 1
+    return [target for target, _ in tally.most_common(top_n)]
+
+
+class CacheWarmer:
+    """
+    인기 쿼리 사전 검색기
+
+    - 쿼리 로그에서 상위 top_n 조합을 골라 Retriever.search(refresh_cache=True) 실행
+    - 동시 실행 수를 concurrency로 제한하여 실시간 트래픽의 풀/CPU를 잠식하지 않음
+    - interval_seconds마다 반복 (기본: 캐시 TTL × 0.8, 만료 전에 갱신)
+    """
+
+    def __init__(
+        self,
+        retriever: "Retriever",
+        log_path: str,
+        top_n: int = DEFAULT_TOP_N,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        interval_seconds: float = 240.0,
+        lookback_seconds: Optional[float] = DEFAULT_LOOKBACK_SECONDS,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency는 1 이상이어야 합니다.")
+        self.retriever = retriever
+        self.log_path = log_path
+        self.top_n = top_n
+        self.concurrency = concurrency
+        self.interval_seconds = interval_seconds
+        self.lookback_seconds = lookback_seconds
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def targets(self) -> List[WarmTarget]:
+        """현재 로그 기준 사전 검색 대상"""
+        return rank_queries(load_query_log(self.log_path, self.lookback_seconds), self.top_n)
+
+    async def warm_once(self) -> Dict[str, Any]:
+        """상위 쿼리를 한 번 사전 검색하고 결과 요약 반환"""
+        start = time.perf_counter()
+        targets = await asyncio.to_thread(self.targets)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(target: WarmTarget) -> bool:
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(
+                        self.retriever.search,
+                        query=target.query,
+                        top_k=target.top_k,
+                        domain=target.domain,
+                        area=target.area,
+                        refresh_cache=True,
+                    )
+                    cache_warm_queries.labels(status="ok").inc()
+                    return True
+                except Exception as exc:  # pylint: disable=broad-except
+                    cache_warm_queries.labels(status="error").inc()
+                    logger.warning(f"Cache warm 실패: query='{target.query[:50]}': {exc}")
+                    return False
+
+        results = await asyncio.gather(*(warm(t) for t in targets))
+        summary = {
+            "targets": len(targets),
+            "warmed": sum(1 for ok in results if ok),
+            "failed": sum(1 for ok in results if not ok),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        self.last_run = summary
+        logger.info(f"Cache warm 완료: {summary}")
+        return summary
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.warm_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-except
+                log_exception(exc, {"phase": "cache_warmer", "log_path": self.log_path}, logger)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> asyncio.Task:
+        """백그라운드 반복 실행 시작 (시작 직후 1회 실행 → cold start 제거)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        """백그라운드 실행 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def init_query_log_from_env() -> Optional[QueryLogWriter]:
+    """
+    QUERY_LOG_PATH가 설정되면 쿼리 로그 기록기 생성
+
+    - QUERY_LOG_MAX_BYTES: 회전 크기 (기본 10MB, 0이면 회전 안 함)
+    """
+    path = os.getenv("QUERY_LOG_PATH")
+    if not path:
+        return None
+    max_bytes = int(os.getenv("QUERY_LOG_MAX_BYTES", DEFAULT_LOG_MAX_BYTES))
+    logger.info(f"쿼리 로그 기록 활성화: {path} (max_bytes={max_bytes})")
+    return QueryLogWriter(path, max_bytes=max_bytes)
+
+
+def init_cache_warmer_from_env(retriever: "Retriever", cache_ttl: Optional[float]) -> Optional[CacheWarmer]:
+    """
+    환경 변수 기반 Cache Warmer 생성
+
+    cache_ttl은 Semantic Cache TTL이며, None(Semantic Cache 비활성화)이면 채울 캐시가 없으므로 경고 후 None.
+
+    - CACHE_WARMER_ENABLED: true/false (기본 false, SEMANTIC_CACHE_ENABLED=true 필요)
+    - CACHE_WARMER_LOG_PATH: 집계할 쿼리 로그 (기본 QUERY_LOG_PATH)
+    - CACHE_WARMER_TOP_N: 사전 검색할 상위 조합 수 (기본 50)
+    - CACHE_WARMER_CONCURRENCY: 동시 검색 수 (기본 2)
+    - CACHE_WARMER_INTERVAL: 반복 주기 초 (기본 캐시 TTL × 0.8)
+    - CACHE_WARMER_LOOKBACK: 집계 대상 기간 초 (기본 86400)
+    """
+    enabled = os.getenv("CACHE_WARMER_ENABLED", "false").lower() in ("1", "true", "yes")
+    log_path = os.getenv("CACHE_WARMER_LOG_PATH") or os.getenv("QUERY_LOG_PATH")
+    if not enabled:
+        return None
+    if cache_ttl is None:
+        logger.warning("Cache warmer 비활성화: SEMANTIC_CACHE_ENABLED=false (warmer는 Semantic Cache만 채움)")
+        return None
+    if not log_path:
+        logger.warning("Cache warmer 비활성화: CACHE_WARMER_LOG_PATH/QUERY_LOG_PATH 미설정")
+        return None
+
+    warmer = CacheWarmer(
+        retriever=retriever,
+        log_path=log_path,
+        top_n=int(os.getenv("CACHE_WARMER_TOP_N", DEFAULT_TOP_N)),
+        concurrency=int(os.getenv("CACHE_WARMER_CONCURRENCY", DEFAULT_CONCURRENCY)),
+        interval_seconds=float(os.getenv("CACHE_WARMER_INTERVAL", cache_ttl * REFRESH_RATIO)),
+        lookback_seconds=float(os.getenv("CACHE_WARMER_LOOKBACK", DEFAULT_LOOKBACK_SECONDS)),
+    )
+    logger.info(
+        f"Cache warmer 초기화: log={log_path}, top_n={warmer.top_n}, "
+        f"concurrency={warmer.concurrency}, interval={warmer.interval_seconds}s"
+    )
+    return warmer
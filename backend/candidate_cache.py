@@ -0,0 +1,147 @@
+"""
+일정 추천 후보 풀 캐시
+(정규화 지역, 도메인, 도메인별 후보 수, expansion) 조합별 후보 문서를 재사용
+
+일정 추천 쿼리는 f"{region} {domain}"으로 만들어지므로 조합 수가 작다 (지역 × 6 도메인 × 일수 구간).
+- 프로세스 로컬 LRU + TTL, 문서 ID 역색인으로 재임베딩 시 해당 문서를 포함한 풀만 삭제
+- 지역은 공백만 정리하고 대소문자는 유지 (검색 area 필터가 대소문자 구분 LIKE이므로 검색에 넘기는 문자열 그대로 키로 사용)
+- 시작 시 상위 지역을 미리 채울 수 있음 (ItineraryPlanner.warm_candidate_pools)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from langchain.schema import Document
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import cache_entries, cache_hits, cache_misses
+
+
+logger = setup_logger()
+
+NAMESPACE = "itinerary_candidates"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 1800.0
+
+CandidateKey = Tuple[str, str, int, bool]
+
+
+def normalize_region(region: str) -> str:
+    """지역 표기 정규화 (앞뒤/연속 공백 정리, 검색에도 같은 문자열 사용)"""
+    return " ".join((region or "").split())
+
+
+class CandidatePoolCache:
+    """도메인별 후보 문서 풀 캐시 (LRU + TTL + 문서 ID 무효화)"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CandidateKey, Tuple[float, List[Document]]]" = OrderedDict()
+        self._by_document: Dict[str, Set[CandidateKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(region: str, domain: str, per_domain: int, expansion: bool) -> CandidateKey:
+        return (normalize_region(region), domain, per_domain, bool(expansion))
+
+    def get(self, key: CandidateKey) -> Optional[List[Document]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                cache_misses.labels(namespace=NAMESPACE).inc()
+                return None
+            self._entries.move_to_end(key)
+        cache_hits.labels(namespace=NAMESPACE).inc()
+        return list(entry[1])
+
+    def put(self, key: CandidateKey, docs: List[Document]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, list(docs))
+            for doc in docs:
+                doc_id = doc.metadata.get("document_id")
+                if doc_id:
+                    self._by_document.setdefault(str(doc_id), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            cache_entries.labels(namespace=NAMESPACE).set(len(self._entries))
+
+    def invalidate_documents(self, document_ids: Iterable[str]) -> int:
+        """재임베딩된 문서를 포함한 후보 풀 삭제 (삭제된 엔트리 수 반환)"""
+        with self._lock:
+            keys: Set[CandidateKey] = set()
+            for doc_id in document_ids:
+                keys |= self._by_document.get(str(doc_id), set())
+            for key in keys:
+                self._remove(key)
+            cache_entries.labels(namespace=NAMESPACE).set(len(self._entries))
+        if keys:
+            logger.info(f"후보 풀 캐시 무효화: {len(keys)}건")
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_document.clear()
+            cache_entries.labels(namespace=NAMESPACE).set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: CandidateKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for doc in entry[1]:
+            doc_id = str(doc.metadata.get("document_id"))
+            keys = self._by_document.get(doc_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_document[doc_id]
+
+
+def init_candidate_cache_from_env() -> Optional[CandidatePoolCache]:
+    """
+    환경 변수 기반 후보 풀 캐시 생성
+
+    - ITINERARY_CANDIDATE_CACHE_ENABLED: true/false (기본 true)
+    - ITINERARY_CANDIDATE_CACHE_TTL: TTL 초 (기본 1800)
+    - ITINERARY_CANDIDATE_CACHE_MAX_ENTRIES: 최대 엔트리 수 (기본 512)
+    """
+    enabled = os.getenv("ITINERARY_CANDIDATE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    if not enabled:
+        return None
+    cache = CandidatePoolCache(
+        max_entries=int(os.getenv("ITINERARY_CANDIDATE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        ttl_seconds=float(os.getenv("ITINERARY_CANDIDATE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+    )
+    logger.info(f"후보 풀 캐시 초기화: ttl={cache.ttl_seconds}s, max_entries={cache.max_entries}")
+    return cache
+
+
+def warm_targets_from_env() -> Tuple[List[str], List[int]]:
+    """
+    시작 시 미리 채울 (지역 목록, 일수 목록)
+
+    - ITINERARY_CACHE_WARM_REGIONS: 쉼표 구분 지역 (기본 없음 → warm 안 함)
+    - ITINERARY_CACHE_WARM_DAYS: 쉼표 구분 일수 (기본 1,2,3)
+    """
+    regions = [r.strip() for r in os.getenv("ITINERARY_CACHE_WARM_REGIONS", "").split(",") if r.strip()]
+    days = [int(d) for d in os.getenv("ITINERARY_CACHE_WARM_DAYS", "1,2,3").split(",") if d.strip()]
+    return regions, days
@@ -0,0 +1,209 @@
+"""
+토큰 예산 기반 컨텍스트 패커
+stuff 체인에 넣을 컨텍스트를 토큰 수 기준으로 구성
+
+- _rows_to_documents가 청크마다 붙이는 parent summary 블록을 문서(document_id)당 한 번만 포함
+- similarity 내림차순으로 예산(RAG_CONTEXT_TOKEN_BUDGET)이 허용하는 청크만 포함
+- 토큰 수는 tiktoken으로 계산하고, 미설치 또는 인코딩 로드 실패 시 문자 수 기반 근사치 사용
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain.schema import Document
+
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+DEFAULT_TOKEN_BUDGET = 2000
+SUMMARY_MARKER = "親ドキュメント要約:"
+QUESTION_MARKER = "質問:"
+SEPARATOR = "\n\n"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> Optional[Any]:
+    """모델별 tiktoken 인코딩 (실패 결과도 캐시하여 매 요청 재시도하지 않음)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # pylint: disable=broad-except
+        # 오프라인 환경 등에서 BPE 파일을 받지 못하면 근사치로 대체
+        logger.warning(f"tiktoken 인코딩 로드 실패, 근사 토큰 수 사용: model={model}: {exc}")
+        return None
+
+
+def _approx_tokens(text: str) -> int:
+    """근사 토큰 수: ASCII 4자당 1토큰, 그 외(일본어/한국어) 문자는 1자당 1토큰"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+class TokenCounter:
+    """모델 토크나이저 기반 토큰 계산기"""
+
+    def __init__(self, model: str = "gpt-4o"):
+        self.model = model
+        self.encoding = _get_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is None:
+            return _approx_tokens(text)
+        return len(self.encoding.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞에서부터 max_tokens 이내로 자른 텍스트"""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        # 근사치: 이분 탐색으로 예산 이내 최장 접두사
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if _approx_tokens(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low]
+
+
+def split_parent_summary(page_content: str) -> Tuple[str, str]:
+    """page_content → (parent summary 블록, 質問/回答 본문)"""
+    page = (page_content or "").strip()
+    if page.startswith(SUMMARY_MARKER) and QUESTION_MARKER in page:
+        summary, body = page.split(QUESTION_MARKER, 1)
+        return summary.strip(), f"{QUESTION_MARKER}{body}".strip()
+    return "", page
+
+
+@dataclass
+class PackedContext:
+    """패킹 결과"""
+    text: str
+    context_tokens: int
+    budget: int
+    documents: List[Document] = field(default_factory=list)
+    dropped: int = 0
+    summaries_deduped: int = 0
+    truncated: bool = False
+    exact: bool = True
+
+    def stats(self) -> Dict[str, Any]:
+        """응답 metadata용 요약"""
+        return {
+            "context_tokens": self.context_tokens,
+            "context_budget": self.budget,
+            "context_chunks": len(self.documents),
+            "context_dropped": self.dropped,
+            "summaries_deduped": self.summaries_deduped,
+            "token_count_exact": self.exact,
+        }
+
+
+class ContextPacker:
+    """
+    토큰 예산 내에서 관련도 순으로 청크를 채우는 컨텍스트 빌더
+
+    출력은 문서별로 묶어 parent summary 1회 + 청크 본문들 순서로 구성하며,
+    문서 순서는 가장 관련도 높은 청크 기준이다.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, model: str = "gpt-4o"):
+        if token_budget < 1:
+            raise ValueError("token_budget은 1 이상이어야 합니다.")
+        self.token_budget = token_budget
+        self.counter = TokenCounter(model)
+
+    def pack(self, docs: Sequence[Document]) -> PackedContext:
+        ranked = sorted(
+            enumerate(docs),
+            key=lambda item: (-float(item[1].metadata.get("similarity", 0.0)), item[0]),
+        )
+        separator_tokens = self.counter.count(SEPARATOR)
+
+        groups: Dict[Any, Dict[str, Any]] = {}
+        order: List[Any] = []
+        used = 0
+        dropped = 0
+        deduped = 0
+        truncated = False
+        included: List[Document] = []
+
+        for _, doc in ranked:
+            summary, body = split_parent_summary(doc.page_content)
+            group_key = doc.metadata.get("document_id") or summary or id(doc)
+            group = groups.get(group_key)
+            need_summary = bool(summary) and (group is None or not group["summary"])
+            if summary and not need_summary:
+                deduped += 1
+
+            body_cost = self.counter.count(body) + (separator_tokens if used else 0)
+            summary_cost = self.counter.count(summary) + separator_tokens if need_summary else 0
+
+            if used + body_cost + summary_cost > self.token_budget:
+                if used + body_cost <= self.token_budget and group is None:
+                    # 요약까지는 못 넣어도 청크 본문은 포함
+                    need_summary = False
+                elif not included:
+                    # 최상위 청크 하나도 예산을 넘으면 잘라서라도 포함
+                    body = self.counter.truncate(body, self.token_budget)
+                    body_cost = self.counter.count(body)
+                    need_summary = False
+                    truncated = True
+                else:
+                    dropped += 1
+                    continue
+
+            if group is None:
+                group = groups[group_key] = {"summary": "", "bodies": []}
+                order.append(group_key)
+            if need_summary:
+                group["summary"] = summary
+                used += summary_cost
+            group["bodies"].append(body)
+            used += body_cost
+            included.append(doc)
+
+        blocks: List[str] = []
+        for group_key in order:
+            group = groups[group_key]
+            if group["summary"]:
+                blocks.append(group["summary"])
+            blocks.extend(group["bodies"])
+        text = SEPARATOR.join(blocks)
+
+        return PackedContext(
+            text=text,
+            context_tokens=self.counter.count(text),
+            budget=self.token_budget,
+            documents=included,
+            dropped=dropped,
+            summaries_deduped=deduped,
+            truncated=truncated,
+            exact=self.counter.exact,
+        )
+
+
+def context_token_budget_from_env() -> int:
+    """RAG_CONTEXT_TOKEN_BUDGET: 컨텍스트 토큰 예산 (기본 2000)"""
+    return int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
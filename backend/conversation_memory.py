@@ -0,0 +1,591 @@
+"""
+대화 메모리 (MariaDB 저장)
+/chat session_id별 최근 턴 sliding window + 누적 요약으로 토큰 예산 안에서 multi-turn 컨텍스트 구성
+
+- 프로세스 내 세션 캐시(LRU + TTL)에서 최근 CHAT_MEMORY_WINDOW_TURNS 턴과 요약을 읽어 프롬프트에 추가
+- window를 넘친 오래된 턴은 추출 요약(턴별 첫 문장, CHAT_MEMORY_SUMMARY_TOKENS 이내)으로 압축하고,
+  예산을 넘으면 오래된 줄을 지역/테마 키워드 줄("以前の話題")로 접어 넣어 화제를 유지
+- MariaDB 기록은 요청 경로에서 하지 않고 버퍼에 쌓아 백그라운드에서 배치 INSERT (write-behind)
+- 캐시 미스(재시작, 다른 worker) 시 MariaDB에서 요약 + 최근 턴 + 전체 턴 수를 다시 로드
+- 여러 worker가 같은 세션을 처리하므로 MariaDB 사용 시 세션 캐시 TTL을 짧게(기본 10초) 두고,
+  요약 upsert는 turn_count가 더 큰(최신) 기록만 반영해 오래된 캐시의 요약이 덮어쓰지 않게 한다
+- aiomysql 미설치 또는 MariaDB 연결 실패 시 프로세스 내 메모리로만 동작
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from backend.context_packer import TokenCounter
+from backend.intent_router import find_areas, find_domains
+from backend.utils.logger import setup_logger, log_exception
+from backend.utils.metrics import Counter, Gauge, cache_hits, cache_misses
+
+try:
+    import aiomysql
+except ImportError:  # pragma: no cover - 선택 의존성
+    aiomysql = None
+
+
+logger = setup_logger()
+
+DEFAULT_WINDOW_TURNS = 6
+DEFAULT_TOKEN_BUDGET = 1500
+DEFAULT_SUMMARY_TOKENS = 300
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_PENDING = 10000
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_CACHE_TTL = 600.0
+# MariaDB 사용 시 기본 세션 캐시 TTL (다른 worker가 기록한 턴을 빨리 반영)
+DEFAULT_DB_CACHE_TTL = 10.0
+# 요약에 남길 턴별 최대 글자 수
+SUMMARY_LINE_CHARS = 80
+SUMMARY_HEADER = "これまでの会話の要約:"
+# 예산 초과로 접힌 오래된 턴의 키워드 줄 (지역/테마)
+SUMMARY_TOPICS_PREFIX = "- 以前の話題: "
+MAX_SUMMARY_TOPICS = 12
+SCHEMA_PATH = Path(__file__).resolve().parent / "db" / "init_chat_memory.sql"
+
+chat_memory_pending = Gauge('chat_memory_pending_writes', 'MariaDB 기록 대기 중인 대화 메시지 수')
+chat_memory_flushes = Counter(
+    'chat_memory_flushes_total',
+    '대화 메모리 배치 기록 횟수',
+    ['status'],
+)
+chat_memory_dropped = Counter(
+    'chat_memory_dropped_writes_total',
+    '버퍼 상한 초과로 기록하지 못한 대화 메시지 수',
+)
+
+_ROLE_LABELS = {"user": "ユーザー", "assistant": "アシスタント"}
+_DOMAIN_LABELS = {
+    "food": "グルメ",
+    "stay": "宿泊",
+    "nat": "自然",
+    "his": "歴史",
+    "shop": "ショッピング",
+    "lei": "レジャー",
+}
+_SENTENCE_END = re.compile(r"[。！？!?]|\.(?:\s|$)")
+
+
+@dataclass
+class ConversationTurn:
+    """대화 메시지 1건"""
+    role: str
+    content: str
+
+
+@dataclass
+class ConversationContext:
+    """세션의 요약 + 최근 턴 (오래된 순)"""
+    summary: str = ""
+    turns: List[ConversationTurn] = field(default_factory=list)
+    # 요약된 턴을 포함한 전체 메시지 수 (저장소 기준)
+    turn_count: int = 0
+
+    def to_messages(self, counter: TokenCounter, token_budget: int) -> List[Dict[str, str]]:
+        """
+        OpenAI messages 형식으로 변환 (요약 system 메시지 + 최근 턴)
+
+        예산 안에서 최신 턴부터 채우고, 남은 예산이 없으면 오래된 턴부터 제외한다.
+        """
+        messages: List[Dict[str, str]] = []
+        remaining = token_budget
+        if self.summary:
+            summary_text = f"{SUMMARY_HEADER}\n{self.summary}"
+            remaining -= counter.count(summary_text)
+            if remaining >= 0:
+                messages.append({"role": "system", "content": summary_text})
+            else:
+                remaining = token_budget
+
+        recent: List[Dict[str, str]] = []
+        for turn in reversed(self.turns):
+            tokens = counter.count(turn.content)
+            if tokens > remaining:
+                break
+            remaining -= tokens
+            recent.append({"role": turn.role, "content": turn.content})
+        return messages + list(reversed(recent))
+
+
+def _first_sentence(text: str) -> str:
+    """턴 내용의 첫 문장 (최대 SUMMARY_LINE_CHARS자)"""
+    text = " ".join(text.split())
+    match = _SENTENCE_END.search(text)
+    if match:
+        text = text[:match.end()].strip()
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS] + "…"
+    return text
+
+
+def _line_topics(line: str) -> List[str]:
+    """요약 줄에서 지역/테마 키워드 추출 (intent_router 사전)"""
+    return find_areas(line) + [_DOMAIN_LABELS.get(d.value, d.value) for d in find_domains(line)]
+
+
+def compress_summary(
+    summary: str,
+    evicted: Sequence[ConversationTurn],
+    counter: TokenCounter,
+    max_tokens: int,
+) -> str:
+    """
+    window에서 밀려난 턴을 요약에 누적 (추출 요약)
+
+    - 턴마다 첫 문장만 "- 역할: 문장" 한 줄로 남김
+    - 예산을 넘으면 가장 오래된 줄부터 지역/테마 키워드만 "以前の話題" 줄에 접어 넣음 (최근 키워드 우선)
+    - 키워드 줄만 남아도 예산을 넘으면 오래된 키워드부터 제거
+    """
+    topics: List[str] = []
+    lines: List[str] = []
+    for line in summary.splitlines():
+        if line.startswith(SUMMARY_TOPICS_PREFIX):
+            topics = [t for t in line[len(SUMMARY_TOPICS_PREFIX):].split("、") if t]
+        elif line:
+            lines.append(line)
+    for turn in evicted:
+        lines.append(f"- {_ROLE_LABELS.get(turn.role, turn.role)}: {_first_sentence(turn.content)}")
+
+    def render() -> str:
+        head = [SUMMARY_TOPICS_PREFIX + "、".join(topics)] if topics else []
+        return "\n".join(head + lines)
+
+    text = render()
+    while (lines or topics) and counter.count(text) > max_tokens:
+        if lines:
+            for topic in _line_topics(lines.pop(0)):
+                if topic in topics:
+                    topics.remove(topic)
+                topics.append(topic)
+            del topics[:-MAX_SUMMARY_TOPICS]
+        else:
+            topics.pop(0)
+        text = render()
+    return text
+
+
+class ConversationBackend(Protocol):
+    """대화 영구 저장소 인터페이스"""
+
+    async def connect(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def load(self, session_id: str, limit: int) -> ConversationContext: ...
+
+    async def write_batch(
+        self,
+        messages: Sequence[Tuple[str, str, str]],
+        summaries: Dict[str, Tuple[str, int]],
+    ) -> None: ...
+
+
+class MariaDBConversationBackend:
+    """
+    aiomysql 커넥션 풀 기반 MariaDB 저장소
+
+    - chat_messages: session_id별 메시지 (id 순서 = 대화 순서)
+    - chat_summaries: session_id별 누적 요약과 요약 시점의 턴 수
+      (upsert는 turn_count가 기존보다 클 때만 요약을 교체 → 오래된 worker 캐시의 요약이 덮어쓰지 않음)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        minsize: int = 1,
+        maxsize: int = 5,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.pool: Any = None
+
+    async def connect(self) -> None:
+        if aiomysql is None:
+            raise RuntimeError("aiomysql가 설치되지 않았습니다.")
+        self.pool = await aiomysql.create_pool(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            db=self.database,
+            minsize=self.minsize,
+            maxsize=self.maxsize,
+            charset="utf8mb4",
+            autocommit=False,
+        )
+        await self._ensure_schema()
+
+    async def _ensure_schema(self) -> None:
+        statements = [s.strip() for s in SCHEMA_PATH.read_text(encoding="utf-8").split(";") if s.strip()]
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                for statement in statements:
+                    await cur.execute(statement)
+            await conn.commit()
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def load(self, session_id: str, limit: int) -> ConversationContext:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT summary FROM chat_summaries WHERE session_id = %s",
+                    (session_id,),
+                )
+                row = await cur.fetchone()
+                await cur.execute(
+                    "SELECT role, content FROM chat_messages WHERE session_id = %s "
+                    "ORDER BY id DESC LIMIT %s",
+                    (session_id, limit),
+                )
+                rows = await cur.fetchall()
+                await cur.execute(
+                    "SELECT COUNT(*) FROM chat_messages WHERE session_id = %s",
+                    (session_id,),
+                )
+                count_row = await cur.fetchone()
+        return ConversationContext(
+            summary=row[0] if row else "",
+            turns=[ConversationTurn(role=role, content=content) for role, content in reversed(rows)],
+            turn_count=int(count_row[0]) if count_row else len(rows),
+        )
+
+    async def write_batch(
+        self,
+        messages: Sequence[Tuple[str, str, str]],
+        summaries: Dict[str, Tuple[str, int]],
+    ) -> None:
+        async with self.pool.acquire() as conn:
+            try:
+                async with conn.cursor() as cur:
+                    if messages:
+                        await cur.executemany(
+                            "INSERT INTO chat_messages (session_id, role, content) VALUES (%s, %s, %s)",
+                            list(messages),
+                        )
+                    if summaries:
+                        await cur.executemany(
+                            SUMMARY_UPSERT_SQL,
+                            [(sid, summary, count) for sid, (summary, count) in summaries.items()],
+                        )
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+
+# 요약은 더 많은 턴을 반영한 기록만 교체 (summary를 먼저 평가해야 기존 turn_count와 비교됨)
+SUMMARY_UPSERT_SQL = (
+    "INSERT INTO chat_summaries (session_id, summary, turn_count) VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE "
+    "summary = IF(VALUES(turn_count) > turn_count, VALUES(summary), summary), "
+    "turn_count = GREATEST(turn_count, VALUES(turn_count))"
+)
+
+
+@dataclass
+class _SessionState:
+    summary: str
+    turns: Deque[ConversationTurn]
+    turn_count: int
+    expires_at: float
+
+
+class ConversationMemory:
+    """
+    세션별 bounded 대화 메모리
+
+    load()/append()는 프로세스 내 캐시만 사용하고, 영구 저장은 백그라운드 flush가 배치로 수행한다.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ConversationBackend] = None,
+        window_turns: int = DEFAULT_WINDOW_TURNS,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        model: str = "gpt-4o",
+    ):
+        """
+        Args:
+            backend: 영구 저장소 (None이면 프로세스 내 메모리만 사용)
+            window_turns: 프롬프트에 원문 그대로 넣을 최근 턴 수 (user + assistant = 2턴)
+            token_budget: 요약 + 최근 턴 토큰 예산
+            summary_tokens: 누적 요약 최대 토큰
+            flush_interval: 배치 기록 주기 초
+            batch_size: 1회 기록 최대 메시지 수 (도달 시 주기 전에 기록)
+            max_pending: 기록 대기 버퍼 상한 (초과 시 오래된 메시지부터 버림)
+            max_sessions: 캐시할 세션 수 (LRU)
+            cache_ttl: 세션 캐시 TTL 초 (다른 worker의 기록 반영 주기)
+        """
+        self.backend = backend
+        self.window_turns = window_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_sessions = max_sessions
+        self.cache_ttl = cache_ttl
+        self.counter = TokenCounter(model)
+        self._sessions: "OrderedDict[str, _SessionState]" = OrderedDict()
+        # session_id별 기록 대기 메시지 (role, content), 먼저 기록 대기한 세션 순
+        self._pending: "OrderedDict[str, Deque[Tuple[str, str]]]" = OrderedDict()
+        self._pending_count = 0
+        self._dirty_summaries: Dict[str, Tuple[str, int]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """저장소 연결 및 백그라운드 flush 시작 (연결 실패 시 메모리 전용으로 동작)"""
+        if self.backend is not None:
+            try:
+                await self.backend.connect()
+            except Exception as exc:  # pylint: disable=broad-except
+                log_exception(exc, {"phase": "conversation_memory_connect"}, logger)
+                logger.warning("대화 메모리 저장소 연결 실패, 프로세스 내 메모리로만 동작")
+                self.backend = None
+        if self.backend is not None and (self._task is None or self._task.done()):
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """flush 중지 후 남은 버퍼 기록, 저장소 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.backend is not None:
+            await self.flush()
+            await self.backend.close()
+
+    async def load(self, session_id: str) -> ConversationContext:
+        """세션 컨텍스트 (캐시 미스 시 저장소에서 로드)"""
+        state = self._get_state(session_id)
+        if state is None:
+            cache_misses.labels(namespace="chat_memory").inc()
+            context = ConversationContext()
+            if self.backend is not None:
+                try:
+                    context = await self.backend.load(session_id, self.window_turns)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.warning(f"대화 메모리 로드 실패, 빈 컨텍스트 사용: {exc}")
+            # 로드 중 같은 세션에 기록된 턴이 있으면 그 상태를 우선
+            # turn_count는 저장소의 전체 메시지 수 (window 크기로 줄이면 다음 upsert가 요약 갱신에서 밀림)
+            state = self._get_state(session_id) or self._put_state(
+                session_id, context.summary, context.turns, max(context.turn_count, len(context.turns))
+            )
+        else:
+            cache_hits.labels(namespace="chat_memory").inc()
+        return ConversationContext(summary=state.summary, turns=list(state.turns), turn_count=state.turn_count)
+
+    def history_messages(self, context: ConversationContext) -> List[Dict[str, str]]:
+        """토큰 예산 안의 히스토리 messages"""
+        return context.to_messages(self.counter, self.token_budget)
+
+    def append(self, session_id: str, user_text: str, assistant_text: str) -> None:
+        """
+        턴 기록 (요청 경로에서 호출, I/O 없음)
+
+        window를 넘친 턴은 요약에 누적하고, 메시지/요약은 다음 flush에서 기록한다.
+        """
+        new_turns = [ConversationTurn("user", user_text)]
+        if assistant_text:
+            new_turns.append(ConversationTurn("assistant", assistant_text))
+
+        state = self._get_state(session_id) or self._put_state(session_id, "", [], 0)
+        state.turns.extend(new_turns)
+        state.turn_count += len(new_turns)
+        evicted = []
+        while len(state.turns) > self.window_turns:
+            evicted.append(state.turns.popleft())
+        if evicted:
+            state.summary = compress_summary(state.summary, evicted, self.counter, self.summary_tokens)
+        state.expires_at = time.monotonic() + self.cache_ttl
+
+        if self.backend is None:
+            return
+        queue = self._pending.setdefault(session_id, deque())
+        queue.extend((turn.role, turn.content) for turn in new_turns)
+        self._pending_count += len(new_turns)
+        if evicted:
+            self._dirty_summaries[session_id] = (state.summary, state.turn_count)
+        overflow = self._pending_count - self.max_pending
+        if overflow > 0:
+            self._take_pending(overflow)
+            chat_memory_dropped.inc(overflow)
+            logger.warning(f"대화 메모리 기록 버퍼 초과: {overflow}건 제외")
+        chat_memory_pending.set(self._pending_count)
+        if self._pending_count >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """버퍼를 batch_size 단위로 기록 (실패 시 버퍼에 되돌림), 기록한 메시지 수 반환"""
+        if self.backend is None:
+            return 0
+        written = 0
+        while self._pending or self._dirty_summaries:
+            batch = self._take_pending(self.batch_size)
+            summaries, self._dirty_summaries = self._dirty_summaries, {}
+            try:
+                await self.backend.write_batch(batch, summaries)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._restore_pending(batch)
+                for session_id, value in summaries.items():
+                    self._dirty_summaries.setdefault(session_id, value)
+                chat_memory_flushes.labels(status="error").inc()
+                logger.warning(f"대화 메모리 기록 실패, 다음 주기에 재시도: {exc}")
+                break
+            chat_memory_flushes.labels(status="ok").inc()
+            written += len(batch)
+        chat_memory_pending.set(self._pending_count)
+        return written
+
+    def _take_pending(self, limit: int) -> List[Tuple[str, str, str]]:
+        """오래된 세션부터 최대 limit건을 (session_id, role, content)로 꺼냄 (세션 안 순서 유지)"""
+        taken: List[Tuple[str, str, str]] = []
+        while self._pending and len(taken) < limit:
+            session_id, queue = next(iter(self._pending.items()))
+            while queue and len(taken) < limit:
+                role, content = queue.popleft()
+                taken.append((session_id, role, content))
+            if not queue:
+                del self._pending[session_id]
+        self._pending_count -= len(taken)
+        return taken
+
+    def _restore_pending(self, batch: Sequence[Tuple[str, str, str]]) -> None:
+        """기록 실패한 배치를 원래 순서대로 버퍼 앞에 되돌림"""
+        for session_id, role, content in reversed(batch):
+            queue = self._pending.get(session_id)
+            if queue is None:
+                queue = self._pending[session_id] = deque()
+            self._pending.move_to_end(session_id, last=False)
+            queue.appendleft((role, content))
+        self._pending_count += len(batch)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-except
+                log_exception(exc, {"phase": "conversation_memory_flush"}, logger)
+
+    def _get_state(self, session_id: str) -> Optional[_SessionState]:
+        state = self._sessions.get(session_id)
+        if state is None:
+            return None
+        if state.expires_at <= time.monotonic():
+            # 기록 대기 중인 턴이 있으면 저장소보다 최신이므로 유지
+            if self.backend is not None and session_id not in self._pending:
+                del self._sessions[session_id]
+                return None
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def _put_state(
+        self,
+        session_id: str,
+        summary: str,
+        turns: Sequence[ConversationTurn],
+        turn_count: int,
+    ) -> _SessionState:
+        state = _SessionState(
+            summary=summary,
+            turns=deque(turns),
+            turn_count=turn_count,
+            expires_at=time.monotonic() + self.cache_ttl,
+        )
+        self._sessions[session_id] = state
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return state
+
+
+def init_conversation_memory_from_env() -> Optional[ConversationMemory]:
+    """
+    환경 변수 기반 대화 메모리 생성
+
+    - CHAT_MEMORY_ENABLED: true/false (기본 true, session_id가 있는 /chat 요청에만 적용)
+    - MARIADB_HOST/PORT/USER/PASSWORD/DATABASE: 저장소 (MARIADB_HOST 미설정 시 프로세스 내 메모리만 사용)
+    - MARIADB_POOL_MIN/MAX: aiomysql 풀 크기 (기본 1/5)
+    - CHAT_MEMORY_WINDOW_TURNS: 원문 유지 최근 턴 수 (기본 6)
+    - CHAT_MEMORY_TOKEN_BUDGET: 요약 + 최근 턴 토큰 예산 (기본 1500)
+    - CHAT_MEMORY_SUMMARY_TOKENS: 누적 요약 최대 토큰 (기본 300)
+    - CHAT_MEMORY_FLUSH_INTERVAL: 배치 기록 주기 초 (기본 1.0)
+    - CHAT_MEMORY_BATCH_SIZE: 1회 기록 최대 메시지 수 (기본 200)
+    - CHAT_MEMORY_CACHE_TTL: 세션 캐시 TTL 초 (기본: MariaDB 사용 시 10, 메모리 전용 600)
+    """
+    if os.getenv("CHAT_MEMORY_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+
+    backend: Optional[ConversationBackend] = None
+    host = os.getenv("MARIADB_HOST")
+    if host and aiomysql is None:
+        logger.warning("aiomysql 미설치: 대화 메모리를 프로세스 내 메모리로만 사용")
+    elif host:
+        backend = MariaDBConversationBackend(
+            host=host,
+            port=int(os.getenv("MARIADB_PORT", "3306")),
+            user=os.getenv("MARIADB_USER", "tourism_user"),
+            password=os.getenv("MARIADB_PASSWORD", ""),
+            database=os.getenv("MARIADB_DATABASE", "tourism_db"),
+            minsize=int(os.getenv("MARIADB_POOL_MIN", "1")),
+            maxsize=int(os.getenv("MARIADB_POOL_MAX", "5")),
+        )
+
+    memory = ConversationMemory(
+        backend=backend,
+        window_turns=int(os.getenv("CHAT_MEMORY_WINDOW_TURNS", DEFAULT_WINDOW_TURNS)),
+        token_budget=int(os.getenv("CHAT_MEMORY_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)),
+        summary_tokens=int(os.getenv("CHAT_MEMORY_SUMMARY_TOKENS", DEFAULT_SUMMARY_TOKENS)),
+        flush_interval=float(os.getenv("CHAT_MEMORY_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)),
+        batch_size=int(os.getenv("CHAT_MEMORY_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        cache_ttl=float(
+            os.getenv("CHAT_MEMORY_CACHE_TTL", DEFAULT_DB_CACHE_TTL if backend is not None else DEFAULT_CACHE_TTL)
+        ),
+    )
+    logger.info(
+        f"대화 메모리 초기화: backend={'mariadb' if backend else 'memory'}, "
+        f"window={memory.window_turns}, budget={memory.token_budget}"
+    )
+    return memory
@@ -15,6 +15,7 @@ except ImportError:
     ConnectionPool = None
     psycopg = None
 
+from backend.db.pool import PoolLease, get_pool_registry
 from backend.utils.logger import setup_logger, log_exception
 
 
@@ -24,13 +25,13 @@ logger = setup_logger()
 class DatabaseConnection:
     """
     PostgreSQL 연결 관리 클래스
+    프로세스 전역 공유 풀(PoolRegistry)을 workload 단위로 사용한다.
     """
     
     def __init__(
         self,
         db_url: Optional[str] = None,
-        min_size: int = 5,
-        max_size: int = 20,
+        workload: str = "admin",
         max_retries: int = 5,
         retry_delay: int = 2,
     ):
@@ -39,8 +40,7 @@ class DatabaseConnection:
         
         Args:
             db_url: 데이터베이스 연결 URL
-            min_size: 최소 커넥션 수
-            max_size: 최대 커넥션 수
+            workload: 공유 풀 워크로드 이름 (동시 사용 상한: DB_POOL_ADMIN_LIMIT 등)
             max_retries: 최대 재시도 횟수
             retry_delay: 재시도 대기 시간 (초)
         """
@@ -48,18 +48,18 @@ class DatabaseConnection:
         if not self.db_url:
             raise ValueError("DATABASE_URL이 설정되지 않았습니다.")
         
-        self.min_size = min_size
-        self.max_size = max_size
+        self.workload = workload
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.pool: Optional[ConnectionPool] = None
+        self._lease: Optional[PoolLease] = None
         
         # 연결 초기화
         self._initialize_connection()
     
     def _initialize_connection(self) -> None:
         """
-        커넥션 풀 초기화 (재시도 로직 포함)
+        공유 커넥션 풀 연결 (재시도 로직 포함)
         """
         if ConnectionPool is None:
             logger.warning("psycopg_pool이 설치되지 않았습니다. 연결을 건너뜁니다.")
@@ -69,18 +69,14 @@ class DatabaseConnection:
             try:
                 logger.info(
                     f"DB 연결 시도 {attempt}/{self.max_retries}... "
-                    f"(min_size={self.min_size}, max_size={self.max_size})"
+                    f"(workload={self.workload})"
                 )
                 
-                self.pool = ConnectionPool(
-                    conninfo=self.db_url,
-                    min_size=self.min_size,
-                    max_size=self.max_size,
-                    timeout=10,
-                )
+                self._lease = get_pool_registry().acquire(self.db_url, workload=self.workload)
+                self.pool = self._lease.pool
                 
                 # 연결 테스트
-                with self.pool.connection() as conn:
+                with self._lease.connection(timeout=10) as conn:
                     with conn.cursor() as cur:
                         cur.execute("SELECT 1")
                         result = cur.fetchone()
@@ -98,6 +94,10 @@ class DatabaseConnection:
                     },
                     logger=logger,
                 )
+                if self._lease is not None:
+                    self._lease.release()
+                    self._lease = None
+                    self.pool = None
                 
                 if attempt == self.max_retries:
                     error_msg = f"DB 연결 실패 ({self.max_retries}회 시도)"
@@ -110,15 +110,15 @@ class DatabaseConnection:
     @contextmanager
     def get_connection(self):
         """
-        컨텍스트 매니저로 연결 제공
+        컨텍스트 매니저로 연결 제공 (워크로드 상한 적용)
         
         Yields:
             psycopg.Connection
         """
-        if self.pool is None:
+        if self._lease is None:
             raise RuntimeError("커넥션 풀이 초기화되지 않았습니다.")
         
-        with self.pool.connection() as conn:
+        with self._lease.connection() as conn:
             try:
                 yield conn
             except Exception as e:
@@ -184,10 +184,12 @@ class DatabaseConnection:
             return False
     
     def close(self) -> None:
-        """커넥션 풀 종료"""
-        if self.pool:
-            self.pool.close()
-            logger.info("DB 커넥션 풀 종료")
+        """공유 커넥션 풀 참조 해제 (마지막 참조면 풀 종료)"""
+        if self._lease is not None:
+            self._lease.release()
+            self._lease = None
+            self.pool = None
+            logger.info("DB 커넥션 풀 참조 해제")
 
 
 # 전역 DB 연결 인스턴스 (싱글톤)
@@ -0,0 +1,118 @@
+"""
+필터 검색 실행 계획
+IVFFlat + WHERE 필터 조합에서 결과가 top_k보다 적게 나오는 recall 손실 보정
+
+- 필터 선택도(planner 통계 기반 예상 행 수)가 작으면 인덱스 대신 exact scan
+- 인덱스 검색 결과가 부족하면 ivfflat.probes를 늘려 재시도 (횟수 제한 → 지연 예측 가능)
+- pgvector 0.8+ 에서는 iterative index scan 옵션 사용 가능
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter
+
+
+logger = setup_logger()
+
+DEFAULT_EXACT_SCAN_MAX_ROWS = 2000
+DEFAULT_RETRY_PROBES = (20, 80)
+DEFAULT_SELECTIVITY_TTL = 600.0
+SELECTIVITY_CACHE_SIZE = 512
+
+filtered_search_total = Counter(
+    'rag_filtered_search_total',
+    '필터 검색 실행 전략별 수 (strategy: index/exact, outcome: full/retried/short)',
+    ['strategy', 'outcome'],
+)
+
+
+@dataclass
+class FilteredSearchPolicy:
+    """
+    필터 검색 정책 (환경 변수 기반)
+
+    - exact_scan_max_rows: 예상 행 수가 이 값 이하이면 exact scan (0이면 사용 안 함)
+    - retry_probes: 결과 부족 시 순서대로 시도할 ivfflat.probes 값
+    - iterative_scan: ivfflat.iterative_scan 값 (relaxed_order / strict_order, 빈 값이면 사용 안 함)
+    """
+    exact_scan_max_rows: int = DEFAULT_EXACT_SCAN_MAX_ROWS
+    retry_probes: Tuple[int, ...] = DEFAULT_RETRY_PROBES
+    iterative_scan: Optional[str] = None
+    selectivity_ttl: float = DEFAULT_SELECTIVITY_TTL
+
+    @classmethod
+    def from_env(cls) -> "FilteredSearchPolicy":
+        raw_probes = os.getenv("PGVECTOR_RETRY_PROBES")
+        if raw_probes is None:
+            retry_probes = DEFAULT_RETRY_PROBES
+        else:
+            retry_probes = tuple(int(p) for p in raw_probes.split(",") if p.strip())
+        iterative_scan = os.getenv("PGVECTOR_ITERATIVE_SCAN", "").strip() or None
+        if iterative_scan not in (None, "off", "relaxed_order", "strict_order"):
+            raise ValueError(
+                "PGVECTOR_ITERATIVE_SCAN은 off / relaxed_order / strict_order 중 하나여야 합니다."
+            )
+        return cls(
+            exact_scan_max_rows=int(os.getenv("PGVECTOR_EXACT_SCAN_MAX_ROWS", DEFAULT_EXACT_SCAN_MAX_ROWS)),
+            retry_probes=retry_probes,
+            iterative_scan=None if iterative_scan == "off" else iterative_scan,
+            selectivity_ttl=float(os.getenv("PGVECTOR_SELECTIVITY_TTL", DEFAULT_SELECTIVITY_TTL)),
+        )
+
+    def index_settings(self) -> Dict[str, Any]:
+        """인덱스 검색 1차 시도용 트랜잭션 로컬 설정"""
+        if self.iterative_scan:
+            return {"ivfflat.iterative_scan": self.iterative_scan}
+        return {}
+
+    def retry_settings(self) -> List[Dict[str, Any]]:
+        """결과 부족 시 재시도용 설정 목록 (probes 증가 순)"""
+        base = self.index_settings()
+        return [{**base, "ivfflat.probes": probes} for probes in self.retry_probes]
+
+    @staticmethod
+    def exact_settings() -> Dict[str, Any]:
+        """벡터 인덱스를 쓰지 않는 exact scan 설정 (필터 인덱스는 bitmap scan으로 사용)"""
+        return {"enable_indexscan": "off"}
+
+
+@dataclass
+class SelectivityCache:
+    """필터 조합별 예상 행 수 캐시 (TTL + LRU)"""
+    ttl_seconds: float = DEFAULT_SELECTIVITY_TTL
+    max_entries: int = SELECTIVITY_CACHE_SIZE
+    _entries: "OrderedDict[Tuple, Tuple[float, int]]" = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, key: Tuple) -> Optional[int]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, rows = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return rows
+
+    def put(self, key: Tuple, rows: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def plan_rows_from_explain(explain_result: Any) -> Optional[int]:
+    """EXPLAIN (FORMAT JSON) 결과에서 최상위 노드의 예상 행 수 추출"""
+    try:
+        plan = explain_result[0]["Plan"]
+        return int(plan["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
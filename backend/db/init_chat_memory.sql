@@ -0,0 +1,20 @@
+-- 대화 메모리 스키마 (MariaDB 10.11)
+-- backend/conversation_memory.py가 시작 시 IF NOT EXISTS로 실행
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    session_id VARCHAR(64) NOT NULL,
+    role VARCHAR(16) NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    PRIMARY KEY (id),
+    KEY idx_chat_messages_session (session_id, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS chat_summaries (
+    session_id VARCHAR(64) NOT NULL,
+    summary TEXT NOT NULL,
+    turn_count INT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3),
+    PRIMARY KEY (session_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,336 @@
+"""
+Connection Pool 설정 및 관측 헬퍼
+환경 변수 기반 풀 크기 설정, 커넥션 configure 콜백, Prometheus 게이지 내보내기,
+프로세스 전역 공유 Pool 레지스트리 (워크로드별 동시 사용 상한)
+"""
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    from psycopg_pool import ConnectionPool, PoolTimeout
+except ImportError:
+    # 패키지 미설치 시 임시 처리
+    ConnectionPool = None
+    PoolTimeout = TimeoutError  # type: ignore[misc,assignment]
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter, Gauge
+
+
+logger = setup_logger()
+
+
+# Pool 상태 게이지 (label: pool 이름)
+pool_size_gauge = Gauge('db_pool_size', '현재 풀이 보유한 커넥션 수', ['pool'])
+pool_in_use_gauge = Gauge('db_pool_connections_in_use', '사용 중인 커넥션 수', ['pool'])
+pool_waiting_gauge = Gauge('db_pool_requests_waiting', '커넥션을 기다리는 클라이언트 수', ['pool'])
+pool_wait_ms_gauge = Gauge('db_pool_requests_wait_ms', '커넥션 대기 누적 시간 (ms)', ['pool'])
+pool_errors_gauge = Gauge('db_pool_requests_errors', '커넥션 획득 실패 누적 수', ['pool'])
+workload_in_use_gauge = Gauge('db_pool_workload_in_use', '워크로드별 사용 중인 커넥션 수', ['workload'])
+workload_rejections = Counter('db_pool_workload_rejections_total', '워크로드 상한 대기 타임아웃 수', ['workload'])
+
+# 공유 풀 기본값 (DB_POOL_* 환경 변수로 조정)
+DEFAULT_POOL_MIN_SIZE = 2
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_TIMEOUT = 30.0
+
+
+def _env_number(name: str, default: float, cast: Callable[[str], Any] = float) -> Any:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"잘못된 환경 변수 값: {name}={value!r}, 기본값 {default} 사용")
+        return default
+
+
+def pool_settings_from_env(
+    prefix: str,
+    min_size: int,
+    max_size: int,
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    ConnectionPool 생성 인자를 환경 변수에서 읽는다.
+
+    - {prefix}_MIN_SIZE / {prefix}_MAX_SIZE: 풀 크기
+    - {prefix}_TIMEOUT: 커넥션 대기 타임아웃 (초)
+    - {prefix}_MAX_WAITING: 대기 큐 최대 길이 (0 = 무제한, 초과 시 즉시 실패)
+    - {prefix}_MAX_IDLE / {prefix}_MAX_LIFETIME: 유휴/최대 수명 (초)
+
+    Args:
+        prefix: 환경 변수 접두사 (예: DB_POOL)
+        min_size, max_size, timeout: 환경 변수 미설정 시 기본값
+    """
+    settings = {
+        "min_size": _env_number(f"{prefix}_MIN_SIZE", min_size, int),
+        "max_size": _env_number(f"{prefix}_MAX_SIZE", max_size, int),
+        "timeout": _env_number(f"{prefix}_TIMEOUT", timeout),
+        "max_waiting": _env_number(f"{prefix}_MAX_WAITING", 0, int),
+        "max_idle": _env_number(f"{prefix}_MAX_IDLE", 600.0),
+        "max_lifetime": _env_number(f"{prefix}_MAX_LIFETIME", 3600.0),
+    }
+    if settings["max_size"] < settings["min_size"]:
+        raise ValueError(
+            f"{prefix}_MAX_SIZE({settings['max_size']})는 "
+            f"{prefix}_MIN_SIZE({settings['min_size']}) 이상이어야 합니다."
+        )
+    return settings
+
+
+def session_settings_from_env() -> Dict[str, int]:
+    """
+    커넥션 생성 시 1회 적용할 세션 설정
+
+    - PGVECTOR_IVFFLAT_PROBES → ivfflat.probes
+    - PGVECTOR_HNSW_EF_SEARCH → hnsw.ef_search
+    - DB_STATEMENT_TIMEOUT_MS → statement_timeout
+    """
+    mapping = {
+        "ivfflat.probes": "PGVECTOR_IVFFLAT_PROBES",
+        "hnsw.ef_search": "PGVECTOR_HNSW_EF_SEARCH",
+        "statement_timeout": "DB_STATEMENT_TIMEOUT_MS",
+    }
+    settings: Dict[str, int] = {}
+    for setting, env_name in mapping.items():
+        value = _env_number(env_name, None, int)
+        if value is not None:
+            settings[setting] = value
+    return settings
+
+
+def make_configure_callback(session_settings: Optional[Dict[str, int]] = None) -> Callable[[Any], None]:
+    """
+    ConnectionPool `configure` 콜백 생성
+
+    새 커넥션마다 1회: pgvector 타입 등록 + 세션 설정(SET) 적용.
+    쿼리마다 SET을 반복하지 않도록 풀 레벨에서 처리한다.
+    """
+    settings = dict(session_settings or {})
+
+    def configure(conn) -> None:
+        try:
+            from pgvector.psycopg import register_vector
+
+            register_vector(conn)
+        except Exception as exc:  # pylint: disable=broad-except
+            # vector 확장이 없는 DB(관리용 등)에서도 커넥션은 사용 가능해야 함
+            logger.warning(f"pgvector 타입 등록 생략: {exc}")
+            conn.rollback()
+
+        if settings:
+            with conn.cursor() as cur:
+                for name, value in settings.items():
+                    cur.execute(f"SET {name} = {int(value)}")
+        # configure 종료 시 커넥션은 idle 상태여야 한다
+        conn.commit()
+
+    return configure
+
+
+def export_pool_stats(pool: Any, name: str) -> Dict[str, int]:
+    """
+    pool.get_stats()를 Prometheus 게이지로 내보내고 반환
+
+    Args:
+        pool: psycopg_pool.ConnectionPool
+        name: 게이지 라벨 (예: retriever)
+    """
+    get_stats = getattr(pool, "get_stats", None)
+    if get_stats is None:
+        return {}
+    try:
+        stats = dict(get_stats())
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning(f"Pool 통계 조회 실패: {exc}")
+        return {}
+
+    size = int(stats.get("pool_size", 0))
+    available = int(stats.get("pool_available", 0))
+    pool_size_gauge.labels(pool=name).set(size)
+    pool_in_use_gauge.labels(pool=name).set(max(0, size - available))
+    pool_waiting_gauge.labels(pool=name).set(int(stats.get("requests_waiting", 0)))
+    pool_wait_ms_gauge.labels(pool=name).set(int(stats.get("requests_wait_ms", 0)))
+    pool_errors_gauge.labels(pool=name).set(int(stats.get("requests_errors", 0)))
+    return stats
+
+
+def workload_limits_from_env(max_size: int) -> Dict[str, int]:
+    """
+    워크로드별 동시 커넥션 상한
+
+    - DB_POOL_SEARCH_LIMIT: 검색 트래픽 (기본 max_size)
+    - DB_POOL_ADMIN_LIMIT: 관리/스크립트 (기본 max_size // 4, 최소 1)
+    """
+    limits = {
+        "search": _env_number("DB_POOL_SEARCH_LIMIT", max_size, int),
+        "admin": _env_number("DB_POOL_ADMIN_LIMIT", max(1, max_size // 4), int),
+    }
+    return {name: max(1, min(limit, max_size)) for name, limit in limits.items()}
+
+
+@dataclass
+class _SharedPool:
+    pool: Any
+    name: str
+    timeout: float
+    limits: Dict[str, threading.BoundedSemaphore]
+    refs: Dict[str, int] = field(default_factory=dict)
+    in_use: Dict[str, int] = field(default_factory=dict)
+
+
+class PoolLease:
+    """
+    공유 풀에 대한 워크로드 단위 참조
+    connection()은 워크로드 상한(세마포어)을 적용한 뒤 풀에서 커넥션을 대여한다.
+    """
+
+    def __init__(self, registry: "PoolRegistry", key: Tuple[str, Any], shared: _SharedPool, workload: str):
+        self._registry = registry
+        self._key = key
+        self._shared = shared
+        self.workload = workload
+        self.released = False
+
+    @property
+    def pool(self) -> Any:
+        return self._shared.pool
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        워크로드 상한을 적용해 커넥션 대여
+
+        Raises:
+            PoolTimeout: 워크로드 상한 또는 풀 대기 타임아웃
+        """
+        shared = self._shared
+        wait = shared.timeout if timeout is None else timeout
+        semaphore = shared.limits.get(self.workload)
+        if semaphore is not None and not semaphore.acquire(timeout=wait):
+            workload_rejections.labels(workload=self.workload).inc()
+            raise PoolTimeout(f"워크로드 '{self.workload}' 커넥션 상한 대기 타임아웃 ({wait}s)")
+
+        self._registry._track(shared, self.workload, 1)
+        try:
+            with shared.pool.connection(timeout=wait) as conn:
+                yield conn
+        finally:
+            self._registry._track(shared, self.workload, -1)
+            if semaphore is not None:
+                semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 통계 + 워크로드별 사용량 (Prometheus 게이지 갱신)"""
+        stats = export_pool_stats(self._shared.pool, self._shared.name)
+        stats["workloads_in_use"] = dict(self._shared.in_use)
+        return stats
+
+    def release(self) -> None:
+        """참조 해제 (중복 호출 안전, 마지막 참조면 풀 종료)"""
+        if self.released:
+            return
+        self.released = True
+        self._registry._release(self._key, self.workload)
+
+
+class PoolRegistry:
+    """
+    프로세스 전역 Connection Pool 레지스트리
+
+    같은 DSN을 쓰는 Retriever / DatabaseConnection이 ConnectionPool 하나를 공유하고,
+    워크로드(search/admin)별 세마포어로 동시 사용 커넥션 수를 제한한다.
+    """
+
+    def __init__(self) -> None:
+        self._pools: Dict[Tuple[str, Any], _SharedPool] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        db_url: str,
+        workload: str,
+        name: str = "primary",
+        pool_factory: Optional[Callable[..., Any]] = None,
+    ) -> PoolLease:
+        """
+        DSN에 해당하는 공유 풀 참조를 반환 (없으면 DB_POOL_* 설정으로 생성)
+
+        Args:
+            db_url: PostgreSQL 연결 URL
+            workload: 워크로드 이름 (search / admin)
+            name: 풀 메트릭 라벨
+            pool_factory: ConnectionPool 생성자 (테스트 시 mock 주입용)
+        """
+        factory = pool_factory or ConnectionPool
+        if factory is None:
+            raise RuntimeError("psycopg_pool이 설치되지 않았습니다.")
+        key = (db_url, factory)
+
+        with self._lock:
+            shared = self._pools.get(key)
+            if shared is None:
+                settings = pool_settings_from_env(
+                    "DB_POOL",
+                    min_size=DEFAULT_POOL_MIN_SIZE,
+                    max_size=DEFAULT_POOL_MAX_SIZE,
+                    timeout=DEFAULT_POOL_TIMEOUT,
+                )
+                pool = factory(
+                    conninfo=db_url,
+                    configure=make_configure_callback(session_settings_from_env()),
+                    name=name,
+                    **settings,
+                )
+                limits = workload_limits_from_env(settings["max_size"])
+                shared = _SharedPool(
+                    pool=pool,
+                    name=name,
+                    timeout=settings["timeout"],
+                    limits={w: threading.BoundedSemaphore(n) for w, n in limits.items()},
+                )
+                self._pools[key] = shared
+                logger.info(
+                    f"공유 Connection Pool 생성: name={name}, min={settings['min_size']}, "
+                    f"max={settings['max_size']}, limits={limits}"
+                )
+            shared.refs[workload] = shared.refs.get(workload, 0) + 1
+            return PoolLease(self, key, shared, workload)
+
+    def close_all(self) -> None:
+        """모든 공유 풀 종료 (프로세스 종료 시)"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for shared in pools:
+            shared.pool.close()
+
+    def _release(self, key: Tuple[str, Any], workload: str) -> None:
+        with self._lock:
+            shared = self._pools.get(key)
+            if shared is None:
+                return
+            shared.refs[workload] = max(0, shared.refs.get(workload, 0) - 1)
+            if any(shared.refs.values()):
+                return
+            del self._pools[key]
+        shared.pool.close()
+        logger.info(f"공유 Connection Pool 종료: name={shared.name}")
+
+    def _track(self, shared: _SharedPool, workload: str, delta: int) -> None:
+        with self._lock:
+            shared.in_use[workload] = shared.in_use.get(workload, 0) + delta
+            workload_in_use_gauge.labels(workload=workload).set(shared.in_use[workload])
+
+
+_registry = PoolRegistry()
+
+
+def get_pool_registry() -> PoolRegistry:
+    """프로세스 전역 PoolRegistry 반환"""
+    return _registry
@@ -0,0 +1,223 @@
+"""
+Read Replica 라우팅
+least-outstanding-requests 기반 부하 분산, 오류/지연 시 replica 제외, primary fallback
+"""
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import psycopg
+except ImportError:
+    # 패키지 미설치 시 임시 처리
+    psycopg = None
+
+from backend.db.pool import PoolLease, PoolTimeout
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter, Gauge
+
+
+logger = setup_logger()
+
+T = TypeVar("T")
+
+DEFAULT_EJECT_SECONDS = 30.0
+DEFAULT_MAX_LAG_SECONDS = 10.0
+DEFAULT_HEALTH_INTERVAL_SECONDS = 10.0
+
+# replica 제외 대상 오류 (연결/운영 오류). SQL 오류 등 호출자 원인 오류는 그대로 전파
+EJECT_ERRORS = (PoolTimeout,) + ((psycopg.OperationalError,) if psycopg is not None else ())
+
+replica_requests = Counter('db_replica_requests_total', 'Replica 라우팅 요청 수', ['target', 'status'])
+replica_healthy_gauge = Gauge('db_replica_healthy', 'Replica 정상 여부 (1=정상, 0=제외)', ['target'])
+
+# 수신한 WAL을 모두 재생했으면 지연 0 (primary에 쓰기가 없으면 replay timestamp가 계속 과거로 남음)
+# 재생이 밀려 있을 때만 마지막 재생 트랜잭션 시각과의 차이를 지연으로 사용 (primary는 NULL → 0)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() IS NULL
+          OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0)
+    END
+"""
+
+
+def replica_urls_from_env() -> List[str]:
+    """READ_REPLICA_URLS (쉼표 구분) 파싱"""
+    raw = os.getenv("READ_REPLICA_URLS", "")
+    return [url.strip() for url in raw.split(",") if url.strip()]
+
+
+@dataclass
+class _Target:
+    name: str
+    lease: PoolLease
+    is_primary: bool = False
+    outstanding: int = 0
+    ejected_until: float = 0.0
+    status: str = "ok"
+
+    def healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class ReplicaRouter:
+    """
+    검색(읽기) 쿼리를 replica로 라우팅
+
+    - 정상 replica 중 진행 중 요청 수가 가장 적은 곳 선택 (동률은 무작위)
+    - replica 연결/운영 오류 또는 복제 지연(max_lag_seconds 초과) 시 eject_seconds 동안 제외
+    - 복제 지연은 start_health_checks()의 백그라운드 스레드가 주기적으로 확인
+    - 사용 가능한 replica가 없거나 replica 실행이 실패하면 primary로 fallback
+    - 쓰기(ingestion)는 이 라우터를 거치지 않고 primary(DatabaseConnection)를 사용한다
+    """
+
+    def __init__(
+        self,
+        primary: PoolLease,
+        replicas: Optional[Dict[str, PoolLease]] = None,
+        eject_seconds: float = DEFAULT_EJECT_SECONDS,
+        max_lag_seconds: float = DEFAULT_MAX_LAG_SECONDS,
+    ):
+        self.primary = _Target(name="primary", lease=primary, is_primary=True)
+        self.replicas = [
+            _Target(name=name, lease=lease) for name, lease in (replicas or {}).items()
+        ]
+        self.eject_seconds = eject_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._lock = threading.Lock()
+        self._health_stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        for target in self.replicas:
+            replica_healthy_gauge.labels(target=target.name).set(1)
+
+    def _choose(self) -> _Target:
+        now = time.monotonic()
+        with self._lock:
+            healthy = [t for t in self.replicas if t.healthy(now)]
+            if not healthy:
+                target = self.primary
+            else:
+                least = min(t.outstanding for t in healthy)
+                target = random.choice([t for t in healthy if t.outstanding == least])
+            target.outstanding += 1
+            return target
+
+    def _done(self, target: _Target) -> None:
+        with self._lock:
+            target.outstanding -= 1
+
+    def eject(self, target_name: str, reason: str) -> None:
+        """replica를 eject_seconds 동안 라우팅 대상에서 제외"""
+        with self._lock:
+            for target in self.replicas:
+                if target.name == target_name:
+                    target.ejected_until = time.monotonic() + self.eject_seconds
+                    target.status = reason
+                    replica_healthy_gauge.labels(target=target.name).set(0)
+                    logger.warning(f"Replica 제외: {target.name} ({reason}), {self.eject_seconds}s")
+
+    def run(self, fn: Callable[[Any], T]) -> T:
+        """
+        선택된 대상의 커넥션으로 fn(conn) 실행
+
+        replica 연결/운영 오류(EJECT_ERRORS)면 해당 replica를 제외하고 primary에서 1회 재시도한다.
+        그 외 오류(SQL 오류 등)는 replica 상태를 바꾸지 않고 그대로 전파한다.
+        """
+        target = self._choose()
+        try:
+            with target.lease.connection() as conn:
+                result = fn(conn)
+            replica_requests.labels(target=target.name, status="ok").inc()
+            return result
+        except EJECT_ERRORS as exc:
+            replica_requests.labels(target=target.name, status="error").inc()
+            if target.is_primary:
+                raise
+            self.eject(target.name, "error")
+            logger.warning(f"Replica 검색 실패, primary로 재시도: {target.name}: {exc}")
+        except Exception:
+            replica_requests.labels(target=target.name, status="error").inc()
+            raise
+        finally:
+            self._done(target)
+
+        target = self.primary
+        with self._lock:
+            target.outstanding += 1
+        try:
+            with target.lease.connection() as conn:
+                result = fn(conn)
+            replica_requests.labels(target=target.name, status="fallback").inc()
+            return result
+        finally:
+            self._done(target)
+
+    def check_health(self) -> Dict[str, str]:
+        """
+        replica별 상태 확인 (연결 + 복제 지연)
+
+        Returns:
+            {replica 이름: ok / lagging / error / ejected}
+        """
+        result: Dict[str, str] = {}
+        now = time.monotonic()
+        for target in self.replicas:
+            try:
+                with target.lease.connection(timeout=5) as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(REPLICA_LAG_SQL)
+                        lag = float(cur.fetchone()[0] or 0.0)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning(f"Replica health check 실패: {target.name}: {exc}")
+                self.eject(target.name, "error")
+                result[target.name] = "error"
+                continue
+
+            if lag > self.max_lag_seconds:
+                self.eject(target.name, "lagging")
+                result[target.name] = "lagging"
+            elif not target.healthy(now):
+                # 지연이 해소되었으면 즉시 복귀
+                with self._lock:
+                    target.ejected_until = 0.0
+                    target.status = "ok"
+                replica_healthy_gauge.labels(target=target.name).set(1)
+                result[target.name] = "ok"
+            else:
+                result[target.name] = "ok"
+        return result
+
+    def start_health_checks(self, interval_seconds: float = DEFAULT_HEALTH_INTERVAL_SECONDS) -> None:
+        """check_health를 interval_seconds마다 실행하는 백그라운드 스레드 시작 (replica 없으면 생략)"""
+        if not self.replicas or interval_seconds <= 0:
+            return
+        if self._health_thread is not None and self._health_thread.is_alive():
+            return
+        self._health_stop.clear()
+
+        def loop() -> None:
+            while not self._health_stop.wait(interval_seconds):
+                try:
+                    self.check_health()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.warning(f"Replica health check 루프 오류: {exc}")
+
+        self._health_thread = threading.Thread(target=loop, name="replica-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        """백그라운드 health check 중지"""
+        self._health_stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=5)
+            self._health_thread = None
+
+    def release(self) -> None:
+        """replica 풀 참조 해제 (primary는 소유자가 해제)"""
+        self.stop_health_checks()
+        for target in self.replicas:
+            target.lease.release()
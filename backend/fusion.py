@@ -0,0 +1,154 @@
+"""
+검색 결과 Fusion
+Query Expansion 변형별 순위 리스트를 하나의 top_k 리스트로 병합
+
+전략:
+- max_sim: 문서별 최대 similarity (기존 동작, 목록이 작아 NumPy 없이 dict 병합 + 정렬이 가장 빠름)
+- rrf: Reciprocal Rank Fusion, Σ w_i / (rrf_k + rank_i)
+- weighted_sum: Σ w_i × similarity_i (여러 변형에서 함께 검색된 문서 우대)
+"""
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+
+FUSION_STRATEGIES = ("max_sim", "rrf", "weighted_sum")
+DEFAULT_STRATEGY = "max_sim"
+DEFAULT_RRF_K = 60
+
+
+def document_key(doc: Document) -> Any:
+    """Document에서 고유 ID 추출 (중복 제거용)"""
+    doc_id = doc.metadata.get("document_id") or doc.metadata.get("documentId")
+    if not doc_id:
+        doc_id = hash(doc.page_content)
+    return doc_id
+
+
+def normalize_fusion_config(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """config/query_expansion.json의 fusion 항목 정규화"""
+    data = data or {}
+    strategy = data.get("strategy", DEFAULT_STRATEGY)
+    if strategy not in FUSION_STRATEGIES:
+        raise ValueError(f"지원하지 않는 fusion 전략: {strategy} (가능: {', '.join(FUSION_STRATEGIES)})")
+    weights = data.get("weights", [])
+    # 잘못된 값을 버리면 뒤쪽 가중치가 다른 변형에 적용되므로 로드 시점에 거부
+    if not isinstance(weights, list) or any(
+        isinstance(w, bool) or not isinstance(w, (int, float)) or w < 0 for w in weights
+    ):
+        raise ValueError(f"fusion weights는 0 이상의 숫자 목록이어야 합니다: {weights!r}")
+    weights = [float(w) for w in weights]
+    return {
+        "strategy": strategy,
+        "rrf_k": max(1, int(data.get("rrf_k", DEFAULT_RRF_K))),
+        "weights": weights,
+    }
+
+
+def _fuse_max_sim(ranked_lists: Sequence[Sequence[Document]], top_k: int) -> List[Document]:
+    """문서별 최대 similarity 인스턴스를 dict로 병합 후 정렬 (안정 정렬이라 동률이면 먼저 등장한 문서 우선)"""
+    merged: Dict[Any, Tuple[float, Document]] = {}
+    for results in ranked_lists:
+        for doc in results:
+            key = document_key(doc)
+            sim = float(doc.metadata.get("similarity", 0.0))
+            prev = merged.get(key)
+            if prev is None or sim > prev[0]:
+                merged[key] = (sim, doc)
+    ordered = sorted(merged.values(), key=itemgetter(0), reverse=True)
+    return [doc for _, doc in ordered[:top_k]]
+
+
+def fuse_results(
+    ranked_lists: Sequence[Sequence[Document]],
+    top_k: int,
+    strategy: str = DEFAULT_STRATEGY,
+    rrf_k: int = DEFAULT_RRF_K,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Document]:
+    """
+    변형별 순위 리스트 병합
+
+    Args:
+        ranked_lists: 변형 순서대로의 검색 결과 (각 리스트는 유사도 내림차순)
+        top_k: 반환할 문서 개수
+        strategy: max_sim / rrf / weighted_sum
+        rrf_k: RRF 상수
+        weights: 변형별 가중치 (부족한 뒤쪽 변형은 1.0)
+
+    Returns:
+        fusion 점수 내림차순 Document 리스트. 문서마다 similarity가 가장 높은 인스턴스를 대표로 사용하고,
+        max_sim 외 전략은 metadata.fusion_score를 추가한 복사본을 반환한다.
+    """
+    if strategy not in FUSION_STRATEGIES:
+        raise ValueError(f"지원하지 않는 fusion 전략: {strategy}")
+    if top_k < 1:
+        return []
+    if strategy == "max_sim":
+        return _fuse_max_sim(ranked_lists, top_k)
+
+    # 1) 평탄화: (문서 인덱스, 변형 인덱스, 순위, similarity)
+    #    + 문서별 대표 인스턴스(similarity 최대, 동률이면 먼저 나온 인스턴스)
+    index_of: Dict[Any, int] = {}
+    best_doc: List[Document] = []
+    best_sim: List[float] = []
+    entry_doc: List[int] = []
+    entry_list: List[int] = []
+    entry_rank: List[int] = []
+    entry_sim: List[float] = []
+    for list_idx, results in enumerate(ranked_lists):
+        for rank, doc in enumerate(results):
+            key = document_key(doc)
+            sim = float(doc.metadata.get("similarity", 0.0))
+            doc_idx = index_of.get(key)
+            if doc_idx is None:
+                doc_idx = index_of[key] = len(best_doc)
+                best_doc.append(doc)
+                best_sim.append(sim)
+            elif sim > best_sim[doc_idx]:
+                best_doc[doc_idx] = doc
+                best_sim[doc_idx] = sim
+            entry_doc.append(doc_idx)
+            entry_list.append(list_idx)
+            entry_rank.append(rank)
+            entry_sim.append(sim)
+
+    if not best_doc:
+        return []
+
+    # 2) 전략별 점수 (NumPy 배열)
+    doc_idx_arr = np.asarray(entry_doc, dtype=np.int64)
+    sims = np.asarray(entry_sim, dtype=np.float64)
+    weight_arr = np.ones(len(ranked_lists), dtype=np.float64)
+    if weights:
+        n = min(len(weights), len(ranked_lists))
+        weight_arr[:n] = np.asarray(weights[:n], dtype=np.float64)
+    entry_weight = weight_arr[np.asarray(entry_list, dtype=np.int64)]
+    if strategy == "rrf":
+        contrib = entry_weight / (rrf_k + np.asarray(entry_rank, dtype=np.float64) + 1.0)
+    else:
+        contrib = entry_weight * sims
+    scores = np.zeros(len(best_doc), dtype=np.float64)
+    np.add.at(scores, doc_idx_arr, contrib)
+
+    # 3) heap 기반 top-k 선택 (동률이면 먼저 등장한 문서 우선)
+    score_list = scores.tolist()
+    top = heapq.nlargest(
+        min(top_k, len(best_doc)),
+        range(len(best_doc)),
+        key=lambda i: (score_list[i], -i),
+    )
+
+    fused: List[Document] = []
+    for i in top:
+        representative = best_doc[i]
+        # 캐시와 공유되는 원본은 변경하지 않고 검증 없는 얕은 복사본에 점수 추가
+        fused.append(representative.copy(
+            update={"metadata": {**representative.metadata, "fusion_score": round(score_list[i], 6)}}
+        ))
+    return fused
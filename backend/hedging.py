@@ -0,0 +1,297 @@
+"""
+Hedged LLM 호출
+느린 응답 하나가 p99를 망치지 않도록 중복 요청(hedge)과 전체 deadline 적용
+
+- 최근 응답 지연의 백분위(LLM_HEDGE_PERCENTILE) 안에 완료(스트림은 첫 토큰)되지 않으면
+  같은 모델 또는 LLM_HEDGE_FALLBACK_MODEL로 중복 요청을 보내고 먼저 끝난 쪽을 사용, 나머지는 취소
+- 최근 hedge 비율이 LLM_HEDGE_MAX_RATE 이상이면 hedge하지 않아 평균 비용 증가를 제한
+- LLM_DEADLINE_SECONDS를 넘으면 asyncio.TimeoutError (호출 측 fallback 처리)
+- Python 3.9/3.10 이미지에서도 동작하도록 asyncio.timeout() 대신 asyncio.wait_for 사용
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter
+
+
+logger = setup_logger()
+
+T = TypeVar("T")
+
+llm_hedge_requests = Counter(
+    'llm_hedge_requests_total',
+    'LLM 호출 수 (hedged: 중복 요청 발생 여부)',
+    ['call', 'hedged'],
+)
+llm_hedge_wins = Counter(
+    'llm_hedge_wins_total',
+    'Hedge된 LLM 호출에서 먼저 완료된 쪽 (winner: primary/hedge)',
+    ['call', 'winner'],
+)
+llm_deadline_exceeded = Counter(
+    'llm_deadline_exceeded_total',
+    'LLM_DEADLINE_SECONDS 초과로 중단된 LLM 호출 수',
+    ['call'],
+)
+
+
+class LatencyTracker:
+    """최근 N개 지연 시간(초) 기반 백분위 계산"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+def _consume_result(task: "asyncio.Future[Any]") -> None:
+    """취소/패배한 task의 예외를 회수하여 'never retrieved' 경고 방지"""
+    if not task.cancelled():
+        task.exception()
+
+
+async def _aclose(iterator: AsyncIterator[Any]) -> None:
+    """스트림 iterator 종료 (HTTP 응답/풀 커넥션 반환, 종료 중 오류는 무시)"""
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Hedging + deadline 정책
+
+    호출 종류(call)별로 지연 분포와 hedge 비율을 따로 관리한다.
+    """
+
+    enabled: bool = True
+    percentile: float = 95.0
+    initial_delay: float = 2.0
+    min_delay: float = 0.3
+    min_samples: int = 20
+    max_hedge_rate: float = 0.1
+    deadline_seconds: Optional[float] = 20.0
+    fallback_model: Optional[str] = None
+    window: int = 200
+    _latency: Dict[str, LatencyTracker] = field(default_factory=dict, init=False, repr=False)
+    _decisions: Dict[str, Deque[bool]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.percentile < 100.0:
+            raise ValueError("percentile은 0과 100 사이여야 합니다.")
+        if not 0.0 <= self.max_hedge_rate <= 1.0:
+            raise ValueError("max_hedge_rate는 0~1 사이여야 합니다.")
+
+    def tracker(self, call: str) -> LatencyTracker:
+        tracker = self._latency.get(call)
+        if tracker is None:
+            tracker = self._latency[call] = LatencyTracker(self.window)
+        return tracker
+
+    def hedge_rate(self, call: str) -> float:
+        decisions = self._decisions.get(call)
+        return sum(decisions) / len(decisions) if decisions else 0.0
+
+    def hedge_delay(self, call: str) -> Optional[float]:
+        """hedge 대기 시간(초), hedge하지 않을 경우 None"""
+        if not self.enabled or self.max_hedge_rate <= 0:
+            return None
+        if self._decisions.get(call) and self.hedge_rate(call) >= self.max_hedge_rate:
+            return None
+        tracker = self.tracker(call)
+        if len(tracker) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, tracker.percentile(self.percentile) or self.initial_delay)
+
+    def _record(self, call: str, hedged: bool) -> None:
+        decisions = self._decisions.get(call)
+        if decisions is None:
+            decisions = self._decisions[call] = deque(maxlen=self.window)
+        decisions.append(hedged)
+        llm_hedge_requests.labels(call=call, hedged=str(hedged).lower()).inc()
+
+    async def run(self, factory: Callable[[bool], Awaitable[T]], call: str = "llm") -> T:
+        """
+        완료 기준 hedged 호출
+
+        Args:
+            factory: factory(hedge) → 코루틴. hedge=True면 중복 요청용 (fallback 모델 선택은 호출 측 책임)
+            call: 메트릭/지연 분포 구분용 호출 이름
+        """
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._race(factory, call), self.deadline_seconds)
+        except asyncio.TimeoutError:
+            llm_deadline_exceeded.labels(call=call).inc()
+            logger.warning(f"LLM deadline 초과: call={call}, deadline={self.deadline_seconds}s")
+            raise
+        self.tracker(call).observe(time.perf_counter() - start)
+        return result
+
+    async def _race(self, factory: Callable[[bool], Awaitable[T]], call: str) -> T:
+        tasks: Dict["asyncio.Future[T]", str] = {}
+        primary = asyncio.ensure_future(factory(False))
+        primary.add_done_callback(_consume_result)
+        tasks[primary] = "primary"
+        hedged = False
+        try:
+            delay = self.hedge_delay(call)
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            hedged = True
+            logger.info(f"LLM hedge 요청: call={call}, delay={delay:.2f}s")
+            hedge = asyncio.ensure_future(factory(True))
+            hedge.add_done_callback(_consume_result)
+            tasks[hedge] = "hedge"
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        llm_hedge_wins.labels(call=call, winner=tasks[task]).inc()
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            self._record(call, hedged)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def stream(
+        self,
+        factory: Callable[[bool], AsyncIterator[T]],
+        call: str = "llm_stream",
+    ) -> AsyncIterator[T]:
+        """
+        첫 토큰 기준 hedged 스트림
+
+        첫 청크가 hedge 지연 안에 오지 않으면 중복 스트림을 시작하고, 첫 청크가 먼저 온 스트림만 끝까지 사용한다.
+        deadline은 첫 토큰까지의 대기에 적용한다.
+        """
+        start = time.perf_counter()
+        streams: Dict["asyncio.Future[T]", AsyncIterator[T]] = {}
+        names: Dict["asyncio.Future[T]", str] = {}
+
+        def launch(hedge: bool) -> "asyncio.Future[T]":
+            iterator = factory(hedge).__aiter__()
+            task = asyncio.ensure_future(iterator.__anext__())
+            task.add_done_callback(_consume_result)
+            streams[task] = iterator
+            names[task] = "hedge" if hedge else "primary"
+            return task
+
+        hedged = False
+        winner: Optional["asyncio.Future[T]"] = None
+
+        async def first_chunk() -> None:
+            nonlocal hedged, winner
+            pending = {launch(False)}
+            delay = self.hedge_delay(call)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    hedged = True
+                    logger.info(f"LLM 스트림 hedge 요청: call={call}, delay={delay:.2f}s")
+                    pending.add(launch(True))
+
+            error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    # StopAsyncIteration: 빈 스트림도 정상 완료로 취급
+                    if exc is None or isinstance(exc, StopAsyncIteration):
+                        winner = task
+                        break
+                    error = exc
+            if winner is None:
+                assert error is not None
+                raise error
+
+        try:
+            try:
+                await asyncio.wait_for(first_chunk(), self.deadline_seconds)
+            except asyncio.TimeoutError:
+                llm_deadline_exceeded.labels(call=call).inc()
+                logger.warning(f"LLM 첫 토큰 deadline 초과: call={call}, deadline={self.deadline_seconds}s")
+                raise
+        finally:
+            self._record(call, hedged)
+            # 패배/실패한 스트림은 취소 후 iterator까지 닫아야 응답과 풀 커넥션이 GC 전에 반환됨
+            for task, iterator in streams.items():
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                    await asyncio.wait({task})
+                await _aclose(iterator)
+
+        winner_iter = streams[winner]
+        try:
+            if isinstance(winner.exception(), StopAsyncIteration):
+                return
+            if winner.exception() is not None:
+                raise winner.exception()
+            self.tracker(call).observe(time.perf_counter() - start)
+            if hedged:
+                llm_hedge_wins.labels(call=call, winner=names[winner]).inc()
+            yield winner.result()
+            async for chunk in winner_iter:
+                yield chunk
+        finally:
+            await _aclose(winner_iter)
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """
+        환경 변수 기반 정책
+
+        - LLM_HEDGE_ENABLED: true/false (기본 true)
+        - LLM_HEDGE_PERCENTILE: hedge 기준 백분위 (기본 95)
+        - LLM_HEDGE_INITIAL_DELAY: 표본이 부족할 때 hedge 대기 초 (기본 2.0)
+        - LLM_HEDGE_MIN_DELAY: hedge 대기 하한 초 (기본 0.3)
+        - LLM_HEDGE_MAX_RATE: 최근 hedge 비율 상한 (기본 0.1)
+        - LLM_HEDGE_FALLBACK_MODEL: hedge 요청 모델 (미설정 시 같은 모델)
+        - LLM_DEADLINE_SECONDS: 호출 전체 deadline 초 (기본 20, 0이면 없음)
+        """
+        deadline = float(os.getenv("LLM_DEADLINE_SECONDS", "20"))
+        return cls(
+            enabled=os.getenv("LLM_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes"),
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+            initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "2.0")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.3")),
+            max_hedge_rate=float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1")),
+            deadline_seconds=deadline if deadline > 0 else None,
+            fallback_model=os.getenv("LLM_HEDGE_FALLBACK_MODEL") or None,
+        )
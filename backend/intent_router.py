@@ -0,0 +1,288 @@
+"""
+규칙 기반 /chat 의도 라우터 (fast path)
+명확한 장소 검색 메시지("弘大 カフェ")는 Function Calling 왕복 없이 바로 search_places로 보낸다
+
+- 지역 사전: 도시명(한국어/일본어/영어)과 주요 동네명(明洞, 弘大, 海雲台 등) → area
+- 도메인 사전: 키워드 → DomainEnum (food/stay/nat/his/shop/lei)
+- 영어 키워드는 단어 경계로 비교 ("park"가 "parking"에 걸리지 않음), 한국어/일본어는 부분 문자열
+- 도메인 키워드는 지역명을 지운 뒤 비교 ("仁寺洞"의 "寺"가 역사 도메인으로 잡히지 않음)
+- 일정/비교/교통/방법 질문처럼 LLM 판단이 필요한 표현이 있거나 지역·도메인이 여러 개(복합 의도)면 라우팅하지 않음
+- 점수(지역 0.45 + 도메인 0.35 + 검색 표현 0.1 + 짧은 메시지 0.1)가 CHAT_FAST_PATH_MIN_CONFIDENCE 이상일 때만 fast path
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from backend.schemas import DomainEnum
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter
+
+
+logger = setup_logger()
+
+chat_intent_routes = Counter(
+    'chat_intent_routes_total',
+    '/chat 의도 라우팅 결과 (route: fast_path/llm)',
+    ['route'],
+)
+
+# area 값 → 별칭 (도시명 + 주요 동네명)
+AREA_LEXICON: Dict[str, Tuple[str, ...]] = {
+    "서울": (
+        "서울", "ソウル", "seoul",
+        "명동", "明洞", "myeongdong",
+        "홍대", "弘大", "hongdae",
+        "강남", "江南", "gangnam",
+        "이태원", "梨泰院", "itaewon",
+        "인사동", "仁寺洞", "insadong",
+        "동대문", "東大門", "dongdaemun",
+        "남대문", "南大門",
+        "성수", "聖水", "seongsu",
+        "잠실", "蚕室", "jamsil",
+        "북촌", "北村", "bukchon",
+        "신촌", "新村", "sinchon",
+        "압구정", "狎鴎亭",
+        "가로수길", "カロスキル",
+        "익선동", "益善洞",
+        "여의도", "汝矣島",
+    ),
+    "부산": (
+        "부산", "釜山", "プサン", "busan",
+        "해운대", "海雲台", "haeundae",
+        "광안리", "広安里", "gwangalli",
+        "서면", "西面", "seomyeon",
+        "남포동", "南浦洞", "nampo",
+        "감천", "甘川", "gamcheon",
+        "기장", "機張",
+    ),
+    "제주": (
+        "제주", "済州", "濟州", "チェジュ", "jeju",
+        "서귀포", "西帰浦", "seogwipo",
+        "성산", "城山", "seongsan",
+        "애월", "涯月", "aewol",
+        "한라산", "漢拏山", "hallasan",
+    ),
+    "대전": ("대전", "大田", "テジョン", "daejeon"),
+    "대구": ("대구", "大邱", "daegu"),
+    "광주": ("광주", "光州", "クァンジュ", "gwangju"),
+    "인천": ("인천", "仁川", "インチョン", "incheon", "송도", "松島"),
+}
+
+DOMAIN_KEYWORDS: Dict[DomainEnum, Tuple[str, ...]] = {
+    DomainEnum.FOOD: (
+        "グルメ", "レストラン", "ご飯", "ごはん", "食事", "ランチ", "ディナー", "朝食",
+        "カフェ", "スイーツ", "焼肉", "サムギョプサル", "冷麺", "チキン", "海鮮", "屋台", "食べ",
+        "맛집", "음식", "식당", "카페", "디저트", "먹",
+        "restaurant", "food", "cafe",
+    ),
+    DomainEnum.STAY: (
+        "ホテル", "宿", "宿泊", "ゲストハウス", "民泊", "リゾート", "韓屋ステイ",
+        "호텔", "숙소", "숙박", "게스트하우스", "펜션",
+        "hotel", "hostel", "stay",
+    ),
+    DomainEnum.NAT: (
+        "自然", "公園", "海岸", "ビーチ", "海辺", "登山", "山登り", "滝", "紅葉", "桜", "ハイキング",
+        "자연", "공원", "해변", "해수욕장", "등산", "폭포",
+        "beach", "park", "nature",
+    ),
+    DomainEnum.HIS: (
+        "歴史", "宮殿", "王宮", "寺", "お寺", "博物館", "史跡", "遺跡", "城郭", "韓屋村",
+        "역사", "고궁", "궁궐", "사찰", "박물관", "유적",
+        "palace", "temple", "museum",
+    ),
+    DomainEnum.SHOP: (
+        "ショッピング", "買い物", "お土産", "市場", "デパート", "免税店", "コスメ", "雑貨",
+        "쇼핑", "시장", "백화점", "면세점", "기념품",
+        "shopping", "market",
+    ),
+    DomainEnum.LEI: (
+        "遊び", "体験", "テーマパーク", "遊園地", "チムジルバン", "スパ", "展望台", "夜景", "アクティビティ",
+        "놀거리", "체험", "테마파크", "놀이공원", "찜질방", "전망대", "야경",
+        "activity", "theme park",
+    ),
+}
+
+# 검색 의도를 강화하는 표현
+SEARCH_CUES: Tuple[str, ...] = (
+    "おすすめ", "オススメ", "教えて", "探して", "どこ", "知りたい", "人気", "有名", "行きたい",
+    "추천", "알려", "찾아", "어디", "유명",
+    "recommend", "where", "best",
+)
+
+# LLM 판단이 필요한 표현 (일정, 비교, 교통, 예산, 방법 질문 등) → fast path 제외
+LLM_REQUIRED_CUES: Tuple[str, ...] = (
+    "日程", "旅程", "プラン", "スケジュール", "コース", "日間", "日帰り",
+    "比較", "違い", "行き方", "アクセス", "予算", "天気", "両替", "なぜ",
+    "方法", "どうやって", "どうすれば", "やり方", "仕方",
+    "일정", "코스", "계획", "비교", "가는 법", "예산", "날씨", "방법", "어떻게",
+    "itinerary", "plan", "schedule", "compare", "how",
+)
+
+# 숙박 일수 표현 ("2泊3日", "何泊") → 일정 질문 ("宿泊"은 숙소 검색이므로 제외)
+NIGHTS_PATTERN: Pattern[str] = re.compile(r"[0-9０-９一二三四五六七八九十何]泊")
+
+DEFAULT_AREA_WEIGHT = 0.45
+DEFAULT_DOMAIN_WEIGHT = 0.35
+DEFAULT_CUE_WEIGHT = 0.1
+DEFAULT_SHORT_WEIGHT = 0.1
+
+
+_AREA_ALIASES_BY_LENGTH: Tuple[str, ...] = tuple(
+    sorted({alias for aliases in AREA_LEXICON.values() for alias in aliases}, key=len, reverse=True)
+)
+
+
+@lru_cache(maxsize=None)
+def _word_pattern(keyword: str) -> Pattern[str]:
+    # \b는 가나/한자도 단어 문자로 보므로("seoulのカフェ") 영숫자 경계만 확인, 복수형(hotels)은 허용
+    return re.compile(rf"(?<![a-z0-9]){re.escape(keyword)}(?:e?s)?(?![a-z0-9])")
+
+
+def _contains(text: str, text_lower: str, keyword: str) -> bool:
+    # 영어 키워드는 단어 단위로만 일치 ("park" ≠ "parking")
+    if keyword.isascii():
+        return _word_pattern(keyword).search(text_lower) is not None
+    return keyword in text or keyword in text_lower
+
+
+def _matches(text: str, text_lower: str, keywords: Sequence[str]) -> List[str]:
+    return [kw for kw in keywords if _contains(text, text_lower, kw)]
+
+
+def requires_llm(text: str) -> bool:
+    """일정/비교/방법 질문 등 LLM 판단이 필요한 메시지인지"""
+    text_lower = text.lower()
+    return bool(_matches(text, text_lower, LLM_REQUIRED_CUES) or NIGHTS_PATTERN.search(text))
+
+
+def find_areas(text: str) -> List[str]:
+    """텍스트에 등장하는 area 목록 (사전 순서, 중복 없음)"""
+    if not text:
+        return []
+    text_lower = text.lower()
+    return [area for area, aliases in AREA_LEXICON.items() if _matches(text, text_lower, aliases)]
+
+
+def _mask_area_names(text: str) -> Tuple[str, str]:
+    """지역명 위치를 공백으로 지운 (원문, 소문자) 텍스트 (긴 별칭부터)"""
+    for alias in _AREA_ALIASES_BY_LENGTH:
+        if not alias.isascii():
+            text = text.replace(alias, " ")
+    text_lower = text.lower()
+    for alias in _AREA_ALIASES_BY_LENGTH:
+        if alias.isascii():
+            text_lower = _word_pattern(alias).sub(" ", text_lower)
+    return text, text_lower
+
+
+def find_domains(text: str) -> List[DomainEnum]:
+    """텍스트에 등장하는 도메인 목록 (지역명 제외 후 비교, 사전 순서, 중복 없음)"""
+    if not text:
+        return []
+    text, text_lower = _mask_area_names(text)
+    return [domain for domain, keywords in DOMAIN_KEYWORDS.items() if _matches(text, text_lower, keywords)]
+
+
+@dataclass
+class RoutedIntent:
+    """fast path로 처리할 의도 (search_places 인자 포함)"""
+    tool: str
+    confidence: float
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+class IntentRouter:
+    """
+    키워드/지역 사전 기반 의도 라우터
+
+    명확한 단일 장소 검색만 RoutedIntent로 반환하고, 나머지는 None(LLM Function Calling)으로 넘긴다.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.8,
+        max_length: int = 60,
+        short_length: int = 30,
+        top_k: int = 3,
+    ):
+        """
+        Args:
+            min_confidence: fast path 최소 점수
+            max_length: 이보다 긴 메시지는 라우팅하지 않음 (문맥 이해가 필요할 가능성)
+            short_length: 이 길이 이하면 짧은 메시지 가산점
+            top_k: search_places top_k (Function Calling 지침과 동일하게 3)
+        """
+        self.min_confidence = min_confidence
+        self.max_length = max_length
+        self.short_length = short_length
+        self.top_k = top_k
+
+    def score(self, text: str) -> Tuple[float, Optional[str], Optional[DomainEnum]]:
+        """
+        검색 의도 점수
+
+        Returns:
+            (점수, area, domain) - 라우팅 불가(복합 의도, LLM 필요 표현)면 점수 0
+        """
+        text = (text or "").strip()
+        if not text or len(text) > self.max_length:
+            return 0.0, None, None
+        if requires_llm(text):
+            return 0.0, None, None
+        text_lower = text.lower()
+
+        areas = find_areas(text)
+        domains = find_domains(text)
+        if len(areas) > 1 or len(domains) > 1:
+            return 0.0, None, None
+
+        score = 0.0
+        if areas:
+            score += DEFAULT_AREA_WEIGHT
+        if domains:
+            score += DEFAULT_DOMAIN_WEIGHT
+        if _matches(text, text_lower, SEARCH_CUES):
+            score += DEFAULT_CUE_WEIGHT
+        if len(text) <= self.short_length:
+            score += DEFAULT_SHORT_WEIGHT
+        return round(score, 2), (areas[0] if areas else None), (domains[0] if domains else None)
+
+    def route(self, text: str) -> Optional[RoutedIntent]:
+        """fast path 대상이면 RoutedIntent, 아니면 None"""
+        score, area, domain = self.score(text)
+        # 지역과 도메인이 모두 있어야 검색 조건이 충분함 (지역 없으면 LLM이 되묻기)
+        if area is None or domain is None or score < self.min_confidence:
+            chat_intent_routes.labels(route="llm").inc()
+            return None
+        chat_intent_routes.labels(route="fast_path").inc()
+        return RoutedIntent(
+            tool="search_places",
+            confidence=score,
+            arguments={
+                "query": text.strip(),
+                "area": area,
+                "domain": domain.value,
+                "top_k": self.top_k,
+                "user_text": text,
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["IntentRouter"]:
+        """
+        환경 변수 기반 라우터 (비활성화면 None)
+
+        - CHAT_FAST_PATH_ENABLED: true/false (기본 true)
+        - CHAT_FAST_PATH_MIN_CONFIDENCE: fast path 최소 점수 (기본 0.8)
+        - CHAT_FAST_PATH_MAX_LENGTH: 라우팅 대상 최대 글자 수 (기본 60)
+        """
+        if os.getenv("CHAT_FAST_PATH_ENABLED", "true").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            min_confidence=float(os.getenv("CHAT_FAST_PATH_MIN_CONFIDENCE", "0.8")),
+            max_length=int(os.getenv("CHAT_FAST_PATH_MAX_LENGTH", "60")),
+        )
@@ -3,17 +3,26 @@ Itinerary recommendation helper
 """
 from __future__ import annotations
 
+import contextvars
 import json
 import os
+import threading
+import time
 from collections import OrderedDict
-from typing import Any, Dict, List, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
 
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import Document
 from langchain_openai import ChatOpenAI
 
-from backend.retriever import Retriever
+from backend.candidate_cache import CandidatePoolCache, normalize_region
+from backend.itinerary_optimizer import ItineraryOptimizer
+from backend.llm_usage import LLMUsageCallback
+from backend.retriever import Retriever, collect_expansion_metrics
 from backend.schemas import (
+    DomainEnum,
+    GeneratorEnum,
     ItineraryPlan,
     ItineraryRecommendationRequest,
     ItinerarySegment,
@@ -21,6 +30,9 @@ from backend.schemas import (
 )
 from backend.utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from backend.llm_clients import LLMClients
+
 
 logger = setup_logger()
 
@@ -28,9 +40,22 @@ logger = setup_logger()
 class ItineraryPlanner:
     """Query Expansion + LLM 기반 추천 일정 생성기"""
 
-    def __init__(self, retriever: Retriever, llm_model: str = "gpt-4o"):
+    def __init__(
+        self,
+        retriever: Retriever,
+        llm_model: str = "gpt-4o",
+        llm_clients: Optional[LLMClients] = None,
+        candidate_cache: Optional[CandidatePoolCache] = None,
+        optimizer: Optional[ItineraryOptimizer] = None,
+    ):
         self.retriever = retriever
         self.llm_model = llm_model
+        # 앱 단위 공유 클라이언트 (없으면 호출마다 ChatOpenAI 생성)
+        self.llm_clients = llm_clients
+        # (지역, 도메인, 후보 수, expansion)별 후보 풀 캐시 (없으면 매 요청 검색)
+        self.candidate_cache = candidate_cache
+        # generator="optimizer" 요청용 결정적 최적화기
+        self.optimizer = optimizer or ItineraryOptimizer.from_env()
 
     def recommend(
         self,
@@ -39,11 +64,22 @@ class ItineraryPlanner:
         """
         요청 정보를 바탕으로 추천 일정 생성
         """
-        candidates = self._gather_candidates(request)
+        candidate_stats: Dict[str, int] = {}
+        with collect_expansion_metrics() as expansion_metrics:
+            candidates = self._gather_candidates(request, candidate_stats)
         itineraries: List[ItineraryPlan] = []
         generator = "rule"
-
-        if candidates:
+        optimizer_ms: Optional[float] = None
+
+        if request.generator == GeneratorEnum.OPTIMIZER:
+            started = time.perf_counter()
+            itineraries = self.optimizer.plan(request, candidates)
+            optimizer_ms = round((time.perf_counter() - started) * 1000, 2)
+            if itineraries:
+                generator = "optimizer"
+                if request.llm_descriptions:
+                    self._describe_with_llm(request, itineraries, candidates)
+        elif candidates:
             try:
                 itineraries = self._generate_with_llm(request, candidates)
                 if itineraries:
@@ -65,10 +101,13 @@ class ItineraryPlanner:
             "expansion": request.expansion,
             "generator": generator,
         }
+        if optimizer_ms is not None:
+            metadata["optimizer_ms"] = optimizer_ms
+        if candidate_stats:
+            metadata["candidate_cache"] = candidate_stats
         if request.expansion:
-            metadata["expansion_metrics"] = getattr(
-                self.retriever, "last_expansion_metrics", None
-            )
+            # 모든 도메인이 캐시 히트면 이번 요청에서 검색하지 않았으므로 빈 dict → None
+            metadata["expansion_metrics"] = expansion_metrics or None
 
         return {
             "itineraries": itineraries,
@@ -78,9 +117,19 @@ class ItineraryPlanner:
     def _gather_candidates(
         self,
         request: ItineraryRecommendationRequest,
+        stats: Optional[Dict[str, int]] = None,
     ) -> List[Document]:
-        """도메인별 후보 문서를 수집"""
-        per_domain = max(3, request.duration_days * 3)
+        """
+        도메인별 후보 문서를 수집
+
+        candidate_cache에 있는 도메인은 재사용하고, 나머지만 검색한다.
+        Retriever.search_domains가 있으면 모든 도메인(및 expansion 변형)을 임베딩 1회 + SQL 1회로 조회하고,
+        없으면 도메인별 검색을 스레드에서 동시에 실행한다.
+
+        Args:
+            stats: 전달되면 캐시 hits/misses 수를 기록
+        """
+        per_domain = self._per_domain(request.duration_days)
         docs_by_id: "OrderedDict[str, Document]" = OrderedDict()
 
         def add_docs(documents):
@@ -91,22 +140,121 @@ class ItineraryPlanner:
                 if doc_id not in docs_by_id:
                     docs_by_id[doc_id] = doc
 
-        for domain in request.domains:
-            query = f"{request.region} {domain.value}"
-            search_kwargs = {
-                "query": query,
-                "top_k": per_domain,
-                "domain": domain.value,
-                "area": request.region,
-            }
-            if request.expansion:
-                docs = self.retriever.search_with_expansion(**search_kwargs)
-            else:
-                docs = self.retriever.search(**search_kwargs)
+        docs_per_domain = self._candidate_pools(
+            request.region,
+            [domain.value for domain in request.domains],
+            per_domain,
+            request.expansion,
+            stats,
+        )
+
+        # 도메인 요청 순서대로 병합 (rule 일정의 배치 순서 유지)
+        for docs in docs_per_domain:
             add_docs(docs)
 
         return list(docs_by_id.values())
 
+    @staticmethod
+    def _per_domain(duration_days: int) -> int:
+        """도메인별 후보 수 (일수 × 3, 최소 3)"""
+        return max(3, duration_days * 3)
+
+    def _candidate_pools(
+        self,
+        region: str,
+        domains: List[str],
+        per_domain: int,
+        expansion: bool,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> List[List[Document]]:
+        """도메인 순서대로 후보 풀 반환 (캐시 미스 도메인만 검색 후 저장)"""
+        # 캐시 키와 검색(query/area 필터)에 같은 지역 문자열 사용
+        region = normalize_region(region)
+        cache = self.candidate_cache
+        pools: Dict[str, List[Document]] = {}
+        if cache is not None:
+            for domain in domains:
+                cached = cache.get(cache.make_key(region, domain, per_domain, expansion))
+                if cached is not None:
+                    pools[domain] = cached
+
+        missing = [domain for domain in domains if domain not in pools]
+        if missing:
+            queries = {domain: f"{region} {domain}" for domain in missing}
+            search_domains = getattr(self.retriever, "search_domains", None)
+            if callable(search_domains):
+                results = search_domains(
+                    queries,
+                    top_k=per_domain,
+                    area=region,
+                    expansion=expansion,
+                )
+                fetched = [results.get(domain, []) for domain in missing]
+            else:
+                fetched = self._search_domains_concurrently(region, queries, per_domain, expansion)
+            for domain, docs in zip(missing, fetched):
+                pools[domain] = docs
+                if cache is not None:
+                    cache.put(cache.make_key(region, domain, per_domain, expansion), docs)
+
+        if stats is not None and cache is not None:
+            stats["hits"] = len(domains) - len(missing)
+            stats["misses"] = len(missing)
+        return [pools[domain] for domain in domains]
+
+    def warm_candidate_pools(
+        self,
+        regions: Sequence[str],
+        duration_days: Sequence[int] = (1, 2, 3),
+        expansion: bool = True,
+        stop_event: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        지역 × 전체 도메인 × 일수 구간의 후보 풀을 미리 채움 (시작 시 상위 지역용)
+
+        expansion 기본값은 요청 스키마 기본값(True)과 같게 두어 기본 요청이 히트하도록 한다.
+        stop_event가 설정되면 다음 조합부터 중단한다 (종료 시 스레드가 남지 않도록, 진행 중인 검색은 완료).
+
+        Returns:
+            채운 지역×일수 조합 수 (실패한 조합은 경고 후 건너뜀)
+        """
+        if self.candidate_cache is None:
+            return 0
+        domains = [domain.value for domain in DomainEnum]
+        warmed = 0
+        for region in regions:
+            for per_domain in sorted({self._per_domain(days) for days in duration_days}):
+                if stop_event is not None and stop_event.is_set():
+                    logger.info(f"후보 풀 warm 중단: {warmed}건 완료")
+                    return warmed
+                try:
+                    self._candidate_pools(region, domains, per_domain, expansion)
+                    warmed += 1
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.warning(f"후보 풀 warm 실패: region={region}, per_domain={per_domain}: {exc}")
+        logger.info(f"후보 풀 warm 완료: {warmed}건, 캐시 엔트리 {len(self.candidate_cache)}개")
+        return warmed
+
+    def _search_domains_concurrently(
+        self,
+        region: str,
+        queries: Dict[str, str],
+        per_domain: int,
+        expansion: bool,
+    ) -> List[List[Document]]:
+        """도메인별 검색을 스레드 풀에서 동시에 실행 (요청 컨텍스트/메트릭 라벨 전달)"""
+        search = self.retriever.search_with_expansion if expansion else self.retriever.search
+
+        def run(domain: str, query: str) -> List[Document]:
+            return search(query=query, top_k=per_domain, domain=domain, area=region)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(queries))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, domain, query)
+                for domain, query in queries.items()
+            ]
+            return [future.result() for future in futures]
+
     def _build_rule_based_itineraries(
         self,
         request: ItineraryRecommendationRequest,
@@ -230,13 +378,19 @@ class ItineraryPlanner:
             ]
         )
 
-        llm = ChatOpenAI(
-            model=self.llm_model,
-            temperature=0.4,
-            max_tokens=2000,
-        )
+        if self.llm_clients is not None:
+            llm = self.llm_clients.chat(self.llm_model, temperature=0.4, max_tokens=2000)
+        else:
+            llm = ChatOpenAI(
+                model=self.llm_model,
+                temperature=0.4,
+                max_tokens=2000,
+            )
 
-        response = llm.invoke(prompt.format_messages())  # type: ignore[arg-type]
+        response = llm.invoke(
+            prompt.format_messages(),  # type: ignore[arg-type]
+            config={"callbacks": [LLMUsageCallback(self.llm_model)]},
+        )
         content = response.content if hasattr(response, "content") else str(response)
         payload = self._parse_json_response(content)
         itineraries_data = payload.get("itineraries", [])
@@ -247,6 +401,70 @@ class ItineraryPlanner:
 
         return itineraries
 
+    def _describe_with_llm(
+        self,
+        request: ItineraryRecommendationRequest,
+        itineraries: List[ItineraryPlan],
+        docs: Sequence[Document],
+    ) -> None:
+        """
+        optimizer 일정의 장소 설명만 LLM으로 작성 (일정 구성은 바꾸지 않음)
+
+        실패하면 경고만 남기고 문서 발췌 설명을 유지한다.
+        """
+        segments = [
+            segment
+            for itinerary in itineraries
+            for day in itinerary.days
+            for segment in day.segments
+            if segment.document_id
+        ]
+        if not segments or not os.getenv("OPENAI_API_KEY"):
+            return
+
+        ids = {segment.document_id for segment in segments}
+        candidates = self._format_candidates(
+            [doc for doc in docs if (doc.metadata or {}).get("document_id") in ids]
+        )
+        # 후보 요약에 중괄호가 있을 수 있어 템플릿 대신 메시지를 그대로 전달
+        messages = [
+            (
+                "system",
+                "あなたは日本人旅行者のための韓国旅行ガイドです。"
+                "各スポットの紹介文を1〜2文で書き、JSON形式のみで出力してください。",
+            ),
+            (
+                "user",
+                f"""地域: {request.region}
+テーマ: {', '.join(request.themes) if request.themes else 'なし'}
+
+スポット:
+{candidates}
+
+JSON形式: {{"descriptions": {{"document_id": "紹介文"}}}}""",
+            ),
+        ]
+
+        try:
+            if self.llm_clients is not None:
+                llm = self.llm_clients.chat(self.llm_model, temperature=0.4, max_tokens=1000)
+            else:
+                llm = ChatOpenAI(model=self.llm_model, temperature=0.4, max_tokens=1000)
+            response = llm.invoke(
+                messages,
+                config={"callbacks": [LLMUsageCallback(self.llm_model)]},
+            )
+            content = response.content if hasattr(response, "content") else str(response)
+            descriptions = self._parse_json_response(content).get("descriptions", {})
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("LLM description generation failed: %s", exc)
+            return
+
+        for segment in segments:
+            text = descriptions.get(segment.document_id)
+            if isinstance(text, str) and text.strip():
+                segment.description = text.strip()
+
     def _format_candidates(self, docs: Sequence[Document]) -> str:
         lines = []
         for doc in docs:
@@ -0,0 +1,319 @@
+"""
+결정적 일정 최적화기 (generator="optimizer")
+LLM 없이 후보 문서로 일정을 구성해 수십 ms 안에 반환한다.
+
+- 같은 장소의 여러 청크를 장소 단위로 묶음 (대표 문서 = similarity 최고)
+- avoid_places 제외, preferred_places는 모든 일정안에 우선 포함
+- 나머지는 요청 도메인 순서로 round-robin 선택 (도메인 균형)
+- 방문 순서: greedy 초기해 + 2-opt 개선
+  비용 = 같은 날 area 전환 + 날짜 경계 area 전환(가중치 낮음) + 하루 안 도메인 중복
+- 일정안마다 앞선 안에서 쓰지 않은 장소를 사용 (최대 3안)
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set
+
+from langchain.schema import Document
+
+from backend.schemas import (
+    DayPlan,
+    ItineraryPlan,
+    ItineraryRecommendationRequest,
+    ItinerarySegment,
+)
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+# 하루 방문 순서별 시간대 라벨 (LLM 일정과 같은 표기)
+TIME_SLOTS = ("午前", "午後", "夕方", "夜")
+
+DEFAULT_STOPS_PER_DAY = 3
+DEFAULT_AREA_SWITCH_COST = 1.0
+DEFAULT_OVERNIGHT_SWITCH_COST = 0.2
+DEFAULT_DOMAIN_REPEAT_COST = 0.6
+
+
+@dataclass
+class Stop:
+    """장소 단위 후보 (같은 장소의 청크/문서를 묶음)"""
+    key: str
+    place_name: str
+    area: str
+    domain: str
+    score: float
+    doc: Document
+    document_ids: Set[str] = field(default_factory=set)
+    preferred: bool = False
+
+
+def _place_key(meta: Dict) -> str:
+    name = " ".join(str(meta.get("place_name") or meta.get("title") or "").split()).casefold()
+    return name or str(meta.get("document_id") or "")
+
+
+def group_places(
+    docs: Sequence[Document],
+    preferred: Sequence[str] = (),
+    avoid: Sequence[str] = (),
+) -> List[Stop]:
+    """
+    후보 문서를 장소 단위로 묶음 (입력 순서 유지)
+
+    preferred/avoid는 document_id 또는 장소명으로 비교한다.
+    similarity가 없는 문서는 입력 순위로 점수를 매긴다.
+    """
+    preferred_set = set(preferred)
+    avoid_set = set(avoid)
+    stops: Dict[str, Stop] = {}
+    for rank, doc in enumerate(docs):
+        meta = doc.metadata or {}
+        key = _place_key(meta) or f"#{rank}"
+        doc_id = meta.get("document_id")
+        score = meta.get("similarity")
+        score = float(score) if score is not None else 1.0 / (1 + rank)
+        stop = stops.get(key)
+        if stop is None:
+            stop = Stop(
+                key=key,
+                place_name=meta.get("place_name") or meta.get("title") or "추천 장소",
+                area=meta.get("area") or "",
+                domain=meta.get("domain") or "",
+                score=score,
+                doc=doc,
+            )
+            stops[key] = stop
+        elif score > stop.score:
+            stop.score = score
+            stop.doc = doc
+        if doc_id:
+            stop.document_ids.add(str(doc_id))
+
+    result = []
+    for stop in stops.values():
+        names = {stop.place_name}
+        if (stop.document_ids | names) & avoid_set:
+            continue
+        stop.preferred = bool((stop.document_ids | names) & preferred_set)
+        result.append(stop)
+    return result
+
+
+def day_sizes(count: int, days: int) -> List[int]:
+    """count개 장소를 days일에 고르게 나눈 일자별 장소 수"""
+    base, extra = divmod(count, days)
+    return [base + (1 if day < extra else 0) for day in range(days)]
+
+
+class ItineraryOptimizer:
+    """도메인 균형 + area 전환 최소화 일정 최적화기 (greedy + 2-opt)"""
+
+    def __init__(
+        self,
+        stops_per_day: int = DEFAULT_STOPS_PER_DAY,
+        area_switch_cost: float = DEFAULT_AREA_SWITCH_COST,
+        overnight_switch_cost: float = DEFAULT_OVERNIGHT_SWITCH_COST,
+        domain_repeat_cost: float = DEFAULT_DOMAIN_REPEAT_COST,
+        max_options: int = 3,
+        max_passes: int = 20,
+    ):
+        """
+        Args:
+            stops_per_day: 하루 최대 방문 장소 수
+            area_switch_cost: 같은 날 다른 area로 이동하는 비용
+            overnight_switch_cost: 날짜가 바뀌며 area가 바뀌는 비용 (숙박 이동이라 낮게)
+            domain_repeat_cost: 하루 안에서 같은 도메인이 반복될 때 비용
+            max_options: 최대 일정안 수
+            max_passes: 2-opt 최대 반복 횟수
+        """
+        if stops_per_day < 1:
+            raise ValueError("stops_per_day는 1 이상이어야 합니다.")
+        self.stops_per_day = stops_per_day
+        self.area_switch_cost = area_switch_cost
+        self.overnight_switch_cost = overnight_switch_cost
+        self.domain_repeat_cost = domain_repeat_cost
+        self.max_options = max_options
+        self.max_passes = max_passes
+
+    def plan(
+        self,
+        request: ItineraryRecommendationRequest,
+        docs: Sequence[Document],
+    ) -> List[ItineraryPlan]:
+        """후보 문서로 일정안 생성 (후보가 없으면 빈 목록)"""
+        stops = group_places(docs, request.preferred_places, request.avoid_places)
+        if not stops:
+            return []
+
+        days = request.duration_days
+        capacity = days * self.stops_per_day
+        domain_order = [d.value for d in request.domains]
+        used: Set[str] = set()
+        itineraries: List[ItineraryPlan] = []
+
+        for option in range(self.max_options):
+            available = [s for s in stops if s.preferred or s.key not in used]
+            fresh = [s for s in available if not s.preferred]
+            # 두 번째 안부터는 새 장소로 하루 1곳 이상 채울 수 있을 때만 생성
+            if option > 0 and len(fresh) < days:
+                break
+            selected = self.select(available, capacity, domain_order)
+            if not selected:
+                break
+            route = self.order(selected, days)
+            used.update(s.key for s in selected)
+            itineraries.append(self._build_plan(request, route, option))
+
+        return itineraries
+
+    def select(self, stops: Sequence[Stop], count: int, domain_order: Sequence[str]) -> List[Stop]:
+        """preferred 우선, 나머지는 도메인 round-robin (도메인 안에서는 점수 순)"""
+        selected = [s for s in stops if s.preferred][:count]
+        by_domain: Dict[str, List[Stop]] = {}
+        for stop in stops:
+            if not stop.preferred:
+                by_domain.setdefault(stop.domain, []).append(stop)
+        for queue in by_domain.values():
+            queue.sort(key=lambda s: -s.score)
+        order = list(domain_order) + [d for d in by_domain if d not in domain_order]
+        queues = [by_domain[d] for d in order if by_domain.get(d)]
+
+        while len(selected) < count and any(queues):
+            for queue in queues:
+                if queue and len(selected) < count:
+                    selected.append(queue.pop(0))
+        return selected
+
+    def order(self, stops: Sequence[Stop], days: int) -> List[Stop]:
+        """greedy 초기해를 2-opt로 개선한 방문 순서"""
+        if len(stops) <= 2:
+            return list(stops)
+        sizes = day_sizes(len(stops), days)
+        route = self._greedy(stops, sizes)
+        return self._two_opt(route, sizes)
+
+    def cost(self, route: Sequence[Stop], sizes: Sequence[int]) -> float:
+        """경로 비용 (area 전환 + 하루 안 도메인 중복)"""
+        total = 0.0
+        start = 0
+        for size in sizes:
+            day = route[start:start + size]
+            for prev, cur in zip(day, day[1:]):
+                if prev.area != cur.area:
+                    total += self.area_switch_cost
+            total += (len(day) - len({s.domain for s in day})) * self.domain_repeat_cost
+            end = start + size
+            if day and end < len(route) and route[end - 1].area != route[end].area:
+                total += self.overnight_switch_cost
+            start = end
+        return total
+
+    def _greedy(self, stops: Sequence[Stop], sizes: Sequence[int]) -> List[Stop]:
+        """preferred/고득점 장소에서 시작해 증분 비용이 가장 작은 장소를 차례로 붙임"""
+        remaining = sorted(stops, key=lambda s: (not s.preferred, -s.score))
+        route = [remaining.pop(0)]
+        boundaries = set()
+        acc = 0
+        for size in sizes:
+            acc += size
+            boundaries.add(acc)
+
+        while remaining:
+            position = len(route)
+            new_day = position in boundaries
+            day_start = max((b for b in boundaries | {0} if b <= position), default=0)
+            day_domains = {s.domain for s in route[day_start:]}
+            prev = route[-1]
+
+            def step_cost(stop: Stop) -> float:
+                if prev.area == stop.area:
+                    move = 0.0
+                else:
+                    move = self.overnight_switch_cost if new_day else self.area_switch_cost
+                repeat = 0.0 if new_day or stop.domain not in day_domains else self.domain_repeat_cost
+                return move + repeat
+
+            best = min(range(len(remaining)), key=lambda i: (step_cost(remaining[i]), -remaining[i].score))
+            route.append(remaining.pop(best))
+        return route
+
+    def _two_opt(self, route: List[Stop], sizes: Sequence[int]) -> List[Stop]:
+        """구간 뒤집기로 비용이 줄어드는 동안 반복 (first improvement)"""
+        best_cost = self.cost(route, sizes)
+        n = len(route)
+        for _ in range(self.max_passes):
+            improved = False
+            for i in range(n - 1):
+                for j in range(i + 1, n):
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    candidate_cost = self.cost(candidate, sizes)
+                    if candidate_cost < best_cost - 1e-9:
+                        route, best_cost = candidate, candidate_cost
+                        improved = True
+            if not improved:
+                break
+        return route
+
+    def _build_plan(
+        self,
+        request: ItineraryRecommendationRequest,
+        route: Sequence[Stop],
+        option: int,
+    ) -> ItineraryPlan:
+        days = request.duration_days
+        sizes = day_sizes(len(route), days)
+        day_plans: List[DayPlan] = []
+        start = 0
+        for day, size in enumerate(sizes, start=1):
+            stops = route[start:start + size]
+            start += size
+            if not stops:
+                continue
+            segments = []
+            for slot, stop in enumerate(stops):
+                meta = stop.doc.metadata or {}
+                segments.append(
+                    ItinerarySegment(
+                        time=TIME_SLOTS[slot] if slot < len(TIME_SLOTS) else None,
+                        place_name=stop.place_name,
+                        description=stop.doc.page_content[:180],
+                        document_id=meta.get("document_id"),
+                        source_url=meta.get("source_url"),
+                        area=stop.area or None,
+                        notes=f"domain={stop.domain}",
+                    )
+                )
+            day_plans.append(DayPlan(day=day, segments=segments))
+
+        areas = list(dict.fromkeys(s.area for s in route if s.area))
+        domains = sorted({s.domain for s in route if s.domain})
+        area_text = " → ".join(areas) if areas else request.region
+        return ItineraryPlan(
+            title=f"{request.region} {days}일 추천 #{option + 1}",
+            summary=(
+                f"{request.region}에서 {area_text} 순으로 이동하며 "
+                f"{', '.join(domains) if domains else 'mixed'}을(를) 즐기는 {days}일 일정"
+            ),
+            days=day_plans,
+            highlights=[s.place_name for s in route[:5]],
+            estimated_budget=request.budget_level or "standard",
+            metadata={
+                "domains": [d.value for d in request.domains],
+                "region": request.region,
+                "route_cost": round(self.cost(route, sizes), 2),
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> "ItineraryOptimizer":
+        """
+        환경 변수 기반 최적화기
+
+        - ITINERARY_OPTIMIZER_STOPS_PER_DAY: 하루 최대 방문 장소 수 (기본 3)
+        """
+        return cls(
+            stops_per_day=int(os.getenv("ITINERARY_OPTIMIZER_STOPS_PER_DAY", DEFAULT_STOPS_PER_DAY)),
+        )
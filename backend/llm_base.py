@@ -4,10 +4,15 @@ OpenAI API 래퍼
 """
 import os
 import asyncio
+import time
 from typing import List, Dict, Any, Optional, Type, TypeVar
+
+import httpx
 from openai import OpenAI, AsyncOpenAI
 from pydantic import BaseModel
 
+from backend.hedging import HedgePolicy
+from backend.llm_usage import record_usage, usage_from_openai
 from backend.utils.logger import setup_logger, log_exception
 
 
@@ -28,6 +33,9 @@ class LLMClient:
         model_name: Optional[str] = None,
         api_key: Optional[str] = None,
         timeout: int = 30,  # 15초 → 30초 (Structured Outputs 지원)
+        http_client: Optional[httpx.Client] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
     ):
         """
         초기화
@@ -36,16 +44,20 @@ class LLMClient:
             model_name: 사용할 OpenAI 모델명 (None이면 환경변수에서 로드)
             api_key: OpenAI API 키 (None이면 환경변수에서 로드)
             timeout: API 호출 타임아웃 (초)
+            http_client: 공유 동기 HTTP 클라이언트 (keep-alive 커넥션 재사용)
+            http_async_client: 공유 비동기 HTTP 클라이언트
+            hedge_policy: 비동기 호출 hedging/deadline 정책 (없으면 timeout만 적용)
         """
         self.model = model_name or os.getenv("OPENAI_MODEL", "gpt-4o")
         self.timeout = timeout
+        self.hedge_policy = hedge_policy
         
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
         
-        self.client = OpenAI(api_key=api_key)
-        self.async_client = AsyncOpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=http_client)
+        self.async_client = AsyncOpenAI(api_key=api_key, http_client=http_async_client)
         
         logger.info(f"LLM 클라이언트 초기화: model={self.model}, timeout={timeout}s")
     
@@ -69,6 +81,7 @@ class LLMClient:
         try:
             logger.info(f"LLM 생성 요청: {len(messages)} 메시지, model={self.model}")
             
+            started = time.perf_counter()
             completion = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -76,6 +89,7 @@ class LLMClient:
                 max_tokens=max_tokens,
                 timeout=self.timeout,
             )
+            self.record_usage(completion, started)
             
             response = completion.choices[0].message.content.strip()
             logger.info(f"LLM 응답 생성 완료: {len(response)} 문자")
@@ -93,6 +107,44 @@ class LLMClient:
             )
             return f"[오류] 응답 생성 실패: {str(e)}"
     
+    async def acomplete(self, call: str = "chat", **create_kwargs: Any) -> Any:
+        """
+        비동기 chat.completions.create (hedge_policy가 있으면 hedged + deadline)
+
+        hedge 요청은 LLM_HEDGE_FALLBACK_MODEL(미설정 시 같은 모델)로 보낸다.
+
+        Args:
+            call: 메트릭/지연 분포 구분용 호출 이름
+            **create_kwargs: chat.completions.create 인자 (model 생략 시 self.model)
+        """
+        model = create_kwargs.pop("model", self.model)
+        policy = self.hedge_policy
+        started = time.perf_counter()
+        if policy is None or not policy.enabled:
+            completion = await asyncio.wait_for(
+                self.async_client.chat.completions.create(model=model, **create_kwargs),
+                self.timeout,
+            )
+        else:
+            fallback_model = policy.fallback_model or model
+            completion = await policy.run(
+                lambda hedge: self.async_client.chat.completions.create(
+                    model=fallback_model if hedge else model,
+                    **create_kwargs,
+                ),
+                call=call,
+            )
+        self.record_usage(completion, started, model=model)
+        return completion
+
+    def record_usage(self, completion: Any, started: float, model: Optional[str] = None) -> None:
+        """completion usage(토큰/비용/시간)를 메트릭과 요청 누적 usage에 기록"""
+        try:
+            record_usage(usage_from_openai(completion, model or self.model, time.perf_counter() - started))
+        except Exception as exc:  # pylint: disable=broad-except
+            # 집계 실패가 응답을 막지 않도록 경고만 남김
+            logger.warning(f"LLM usage 기록 실패: {exc}")
+
     async def agenerate(
         self,
         messages: List[Dict[str, str]],
@@ -113,13 +165,11 @@ class LLMClient:
         try:
             logger.info(f"LLM 비동기 생성 요청: {len(messages)} 메시지")
             
-            async with asyncio.timeout(self.timeout):
-                completion = await self.async_client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+            completion = await self.acomplete(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
             
             response = completion.choices[0].message.content.strip()
             logger.info(f"LLM 비동기 응답 생성 완료: {len(response)} 문자")
@@ -127,7 +177,8 @@ class LLMClient:
             return response
         
         except asyncio.TimeoutError:
-            error_msg = f"LLM 요청 타임아웃 ({self.timeout}초 초과)"
+            deadline = self.hedge_policy.deadline_seconds if self.hedge_policy else self.timeout
+            error_msg = f"LLM 요청 타임아웃 ({deadline}초 초과)"
             logger.error(error_msg)
             return f"[오류] {error_msg}"
         
@@ -171,6 +222,7 @@ class LLMClient:
             
             logger.info(f"Structured Outputs 요청: model={response_format.__name__}")
             
+            started = time.perf_counter()
             completion = self.client.beta.chat.completions.parse(
                 model=self.model,
                 messages=messages,
@@ -178,6 +230,7 @@ class LLMClient:
                 temperature=temperature,
                 timeout=self.timeout,
             )
+            self.record_usage(completion, started)
             
             result = completion.choices[0].message.parsed
             logger.info(f"Structured Outputs 생성 완료: {type(result).__name__}")
@@ -0,0 +1,194 @@
+"""
+앱 단위 LLM 클라이언트
+lifespan에서 한 번 생성하여 요청 간 HTTP keep-alive 커넥션 풀을 재사용
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from backend.hedging import HedgePolicy
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_TIMEOUT = 30.0
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    HedgePolicy를 적용한 ChatModel 래퍼
+
+    - ainvoke: 완료 기준 hedge (느리면 fallback 모델로 중복 요청, 먼저 끝난 쪽 사용)
+    - astream: 첫 토큰 기준 hedge
+    - invoke(동기): hedge 없이 primary 호출
+    """
+
+    primary: Any
+    fallback: Any
+    policy: Any
+    call: str = "rag_chain"
+
+    @property
+    def _llm_type(self) -> str:
+        return f"hedged-{self.primary._llm_type}"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "primary": getattr(self.primary, "model_name", None),
+            "fallback": getattr(self.fallback, "model_name", None),
+        }
+
+    def _model(self, hedge: bool) -> BaseChatModel:
+        return self.fallback if hedge else self.primary
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.primary._generate(messages, stop=stop, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await self.policy.run(
+            lambda hedge: self._model(hedge)._agenerate(messages, stop=stop, **kwargs),
+            call=self.call,
+        )
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self.policy.stream(
+            lambda hedge: self._model(hedge)._astream(messages, stop=stop, **kwargs),
+            call=f"{self.call}_stream",
+        ):
+            yield chunk
+
+
+class LLMClients:
+    """
+    공유 HTTP 클라이언트 + 모델별 ChatOpenAI 캐시
+
+    - httpx.Client / httpx.AsyncClient 하나씩을 모든 LLM 호출이 공유 (TLS 핸드셰이크 재사용)
+    - ChatOpenAI는 (model, temperature, max_tokens, streaming) 조합별로 한 번만 생성
+    - hedge_policy가 있으면 HedgedChatModel로 감싸 반환 (fallback 모델 클라이언트도 같은 풀 사용)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.hedge_policy = hedge_policy
+        self.http_client = httpx.Client(limits=limits, timeout=timeout)
+        self.http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self._models: Dict[Tuple, Union[ChatOpenAI, HedgedChatModel]] = {}
+        self._lock = threading.Lock()
+        logger.info(
+            f"LLM HTTP 클라이언트 초기화: max_connections={max_connections}, "
+            f"keepalive={max_keepalive_connections}, expiry={keepalive_expiry}s"
+        )
+
+    def chat(
+        self,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        streaming: bool = False,
+        request_timeout: Optional[float] = None,
+        hedge: bool = True,
+    ) -> Union[ChatOpenAI, HedgedChatModel]:
+        """공유 HTTP 클라이언트를 사용하는 ChatOpenAI (조합별 캐시, hedge=False면 래핑하지 않음)"""
+        policy = self.hedge_policy if hedge else None
+        key = (model, temperature, max_tokens, streaming, request_timeout, policy is not None)
+        with self._lock:
+            llm = self._models.get(key)
+            if llm is None:
+                llm = self._create(model, temperature, max_tokens, streaming, request_timeout)
+                if policy is not None and policy.enabled:
+                    fallback_model = policy.fallback_model or model
+                    fallback = llm if fallback_model == model else self._create(
+                        fallback_model, temperature, max_tokens, streaming, request_timeout
+                    )
+                    llm = HedgedChatModel(primary=llm, fallback=fallback, policy=policy)
+                self._models[key] = llm
+            return llm
+
+    def _create(
+        self,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        streaming: bool,
+        request_timeout: Optional[float],
+    ) -> ChatOpenAI:
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            streaming=streaming,
+            # 스트리밍에서도 마지막 청크로 usage를 받아 토큰/비용 집계
+            stream_usage=streaming,
+            request_timeout=request_timeout or self.timeout,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+        )
+
+    async def aclose(self) -> None:
+        """HTTP 커넥션 풀 종료"""
+        self._models.clear()
+        self.http_client.close()
+        await self.http_async_client.aclose()
+        logger.info("LLM HTTP 클라이언트 종료")
+
+
+def init_llm_clients_from_env() -> LLMClients:
+    """
+    환경 변수 기반 LLM 클라이언트 생성
+
+    - LLM_HTTP_MAX_CONNECTIONS: 최대 동시 커넥션 (기본 100)
+    - LLM_HTTP_MAX_KEEPALIVE: 유지할 keep-alive 커넥션 (기본 20)
+    - LLM_HTTP_KEEPALIVE_EXPIRY: keep-alive 유지 시간 초 (기본 60)
+    - LLM_HTTP_TIMEOUT: 요청 타임아웃 초 (기본 30)
+    - LLM_HEDGE_* / LLM_DEADLINE_SECONDS: HedgePolicy.from_env() 참고
+    """
+    return LLMClients(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+        timeout=float(os.getenv("LLM_HTTP_TIMEOUT", DEFAULT_TIMEOUT)),
+        hedge_policy=HedgePolicy.from_env(),
+    )
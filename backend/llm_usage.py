@@ -0,0 +1,278 @@
+"""
+LLM 토큰/비용 집계
+모든 completion의 usage(prompt, completion, cached 토큰)와 첫 토큰/전체 시간을 기록
+
+- Prometheus: endpoint, model 라벨의 토큰/비용 Counter와 시간 Histogram
+- 요청 단위: collect_llm_usage()로 바인딩한 dict에 누적하여 응답 metadata(llm_usage)로 반환
+- 비용은 모델별 단가표(USD / 1M 토큰)로 추정하며 LLM_PRICING_JSON으로 덮어쓸 수 있음
+
+SDK 호출(LLMClient)은 record_usage()를 직접 호출하고, LangChain 호출은 LLMUsageCallback을 config callbacks로 전달한다.
+hedge로 취소된 요청의 토큰은 usage를 받지 못하므로 집계되지 않는다.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter, Histogram, current_endpoint
+
+
+logger = setup_logger()
+
+LLM_LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0]
+
+llm_tokens = Counter(
+    'llm_tokens_total',
+    'LLM 토큰 사용량 (kind: prompt/completion/cached)',
+    ['endpoint', 'model', 'kind'],
+)
+llm_cost = Counter(
+    'llm_cost_usd_total',
+    'LLM 추정 비용 (USD, 단가표 기준)',
+    ['endpoint', 'model'],
+)
+llm_calls = Counter(
+    'llm_calls_total',
+    'usage가 기록된 LLM 호출 수',
+    ['endpoint', 'model'],
+)
+llm_call_duration = Histogram(
+    'llm_call_duration_seconds',
+    'LLM 호출 전체 시간 (초)',
+    ['endpoint', 'model'],
+    buckets=LLM_LATENCY_BUCKETS,
+)
+llm_time_to_first_token = Histogram(
+    'llm_time_to_first_token_seconds',
+    'LLM 스트리밍 첫 토큰까지 시간 (초)',
+    ['endpoint', 'model'],
+    buckets=LLM_LATENCY_BUCKETS,
+)
+
+# USD / 1M 토큰: (prompt, cached prompt, completion)
+DEFAULT_PRICING: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+}
+
+_usage_var: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "llm_usage", default=None
+)
+
+
+@lru_cache(maxsize=1)
+def load_pricing() -> Dict[str, Tuple[float, float, float]]:
+    """
+    LLM_PRICING_JSON: {"model": [prompt, cached, completion]} (USD / 1M 토큰, 기본 단가표에 병합)
+    """
+    pricing = dict(DEFAULT_PRICING)
+    raw = os.getenv("LLM_PRICING_JSON")
+    if raw:
+        try:
+            for model, prices in json.loads(raw).items():
+                prompt, cached, completion = (float(v) for v in prices)
+                pricing[model] = (prompt, cached, completion)
+        except (ValueError, TypeError) as exc:
+            logger.warning(f"LLM_PRICING_JSON 파싱 실패, 기본 단가표 사용: {exc}")
+    return pricing
+
+
+def price_for(model: str) -> Optional[Tuple[float, float, float]]:
+    """모델 단가 (gpt-4o-2024-08-06 → gpt-4o처럼 가장 긴 접두사 일치), 없으면 None"""
+    pricing = load_pricing()
+    if model in pricing:
+        return pricing[model]
+    matches = [name for name in pricing if model.startswith(name)]
+    return pricing[max(matches, key=len)] if matches else None
+
+
+@dataclass
+class LLMUsage:
+    """completion 1회의 usage"""
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    duration: Optional[float] = None
+    ttft: Optional[float] = None
+
+    @property
+    def cost_usd(self) -> float:
+        prices = price_for(self.model)
+        if prices is None:
+            return 0.0
+        prompt, cached, completion = prices
+        uncached = max(0, self.prompt_tokens - self.cached_tokens)
+        return (uncached * prompt + self.cached_tokens * cached + self.completion_tokens * completion) / 1_000_000
+
+
+def _get(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _tokens(value: Any) -> Optional[int]:
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def usage_from_openai(completion: Any, model: str, duration: Optional[float] = None) -> Optional[LLMUsage]:
+    """OpenAI SDK ChatCompletion(또는 dict) → LLMUsage (usage 없으면 None)"""
+    usage = _get(completion, "usage")
+    prompt_tokens = _tokens(_get(usage, "prompt_tokens"))
+    completion_tokens = _tokens(_get(usage, "completion_tokens"))
+    if prompt_tokens is None and completion_tokens is None:
+        return None
+    response_model = _get(completion, "model")
+    return LLMUsage(
+        model=response_model if isinstance(response_model, str) and response_model else model,
+        prompt_tokens=prompt_tokens or 0,
+        completion_tokens=completion_tokens or 0,
+        cached_tokens=_tokens(_get(_get(usage, "prompt_tokens_details"), "cached_tokens")) or 0,
+        duration=duration,
+    )
+
+
+def usage_from_llm_result(response: LLMResult, model: str) -> Optional[LLMUsage]:
+    """LangChain LLMResult → LLMUsage (token_usage 또는 message.usage_metadata)"""
+    llm_output = response.llm_output or {}
+    token_usage = llm_output.get("token_usage")
+    if token_usage:
+        return usage_from_openai(
+            {"usage": token_usage, "model": llm_output.get("model_name")}, model
+        )
+
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            metadata = getattr(message, "usage_metadata", None)
+            if metadata:
+                response_metadata = getattr(message, "response_metadata", None) or {}
+                return LLMUsage(
+                    model=response_metadata.get("model_name") or model,
+                    prompt_tokens=_tokens(metadata.get("input_tokens")) or 0,
+                    completion_tokens=_tokens(metadata.get("output_tokens")) or 0,
+                )
+    return None
+
+
+@contextmanager
+def collect_llm_usage() -> Iterator[Dict[str, Any]]:
+    """현재 요청의 LLM usage를 누적할 dict 바인딩 (응답 metadata["llm_usage"]용)"""
+    usage: Dict[str, Any] = {}
+    token = _usage_var.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_var.reset(token)
+
+
+def _accumulate(summary: Dict[str, Any], usage: LLMUsage) -> None:
+    cost = usage.cost_usd
+    for target in (summary, summary.setdefault("by_model", {}).setdefault(usage.model, {})):
+        target["calls"] = target.get("calls", 0) + 1
+        target["prompt_tokens"] = target.get("prompt_tokens", 0) + usage.prompt_tokens
+        target["completion_tokens"] = target.get("completion_tokens", 0) + usage.completion_tokens
+        target["cached_tokens"] = target.get("cached_tokens", 0) + usage.cached_tokens
+        target["cost_usd"] = round(target.get("cost_usd", 0.0) + cost, 6)
+        if usage.duration is not None:
+            target["llm_ms"] = round(target.get("llm_ms", 0.0) + usage.duration * 1000, 2)
+        if usage.ttft is not None and "ttft_ms" not in target:
+            target["ttft_ms"] = round(usage.ttft * 1000, 2)
+
+
+def record_usage(
+    usage: Optional[LLMUsage],
+    endpoint: Optional[str] = None,
+    summary: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    usage를 Prometheus와 요청 누적 dict에 기록
+
+    Args:
+        endpoint: 메트릭 라벨 (없으면 bind_request로 바인딩된 endpoint)
+        summary: 누적 dict (없으면 collect_llm_usage()로 바인딩된 dict)
+    """
+    if usage is None:
+        return
+    endpoint = endpoint or current_endpoint()
+    labels = {"endpoint": endpoint, "model": usage.model}
+    llm_calls.labels(**labels).inc()
+    llm_tokens.labels(kind="prompt", **labels).inc(usage.prompt_tokens)
+    llm_tokens.labels(kind="completion", **labels).inc(usage.completion_tokens)
+    llm_tokens.labels(kind="cached", **labels).inc(usage.cached_tokens)
+    llm_cost.labels(**labels).inc(usage.cost_usd)
+    if usage.duration is not None:
+        llm_call_duration.labels(**labels).observe(usage.duration)
+    if usage.ttft is not None:
+        llm_time_to_first_token.labels(**labels).observe(usage.ttft)
+
+    summary = summary if summary is not None else _usage_var.get()
+    if summary is not None:
+        _accumulate(summary, usage)
+
+
+class LLMUsageCallback(BaseCallbackHandler):
+    """
+    LangChain 호출 usage 기록 콜백
+
+    config={"callbacks": [LLMUsageCallback()]}로 전달한다.
+    스트리밍 구간처럼 contextvar를 쓸 수 없는 곳에서는 endpoint/summary를 직접 지정한다.
+    """
+
+    # 이벤트 루프 스레드에서 바로 실행 (executor로 넘기지 않아 순서/컨텍스트 유지)
+    run_inline = True
+
+    def __init__(
+        self,
+        model: str = "",
+        endpoint: Optional[str] = None,
+        summary: Optional[Dict[str, Any]] = None,
+    ):
+        self.model = model
+        self.endpoint = endpoint
+        self.summary = summary
+        self._started: Dict[UUID, float] = {}
+        self._first_token: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._first_token.setdefault(run_id, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        first_token = self._first_token.pop(run_id, None)
+        usage = usage_from_llm_result(response, self.model)
+        if usage is None:
+            return
+        if started is not None:
+            usage.duration = time.perf_counter() - started
+            if first_token is not None:
+                usage.ttft = first_token - started
+        record_usage(usage, endpoint=self.endpoint, summary=self.summary)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        self._first_token.pop(run_id, None)
@@ -2,50 +2,35 @@
 FastAPI 메인 애플리케이션
 엔트리포인트 및 라우터 정의
 """
+import asyncio
+import json
 import os
+import threading
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
-try:
-    from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-    from prometheus_fastapi_instrumentator import Instrumentator
-except ImportError:  # pragma: no cover - 옵셔널 의존성 미설치 시 대체
-    class _NoOpMetric:
-        def __init__(self, *_, **__):
-            pass
-
-        def labels(self, *_, **__):
-            return self
-
-        def observe(self, *_, **__):
-            return None
-
-        def inc(self, *_, **__):
-            return None
-
-        def dec(self, *_, **__):
-            return None
-
-    class _NoOpInstrumentator:
-        def instrument(self, app):
-            return self
-
-        def expose(self, app, endpoint="/metrics"):
-            return self
-
-    Counter = Histogram = Gauge = _NoOpMetric
-    generate_latest = lambda *_, **__: b""  # type: ignore[var-annotated]
-    CONTENT_TYPE_LATEST = "text/plain"
-    Instrumentator = _NoOpInstrumentator  # type: ignore[assignment]
-
+from backend.utils.metrics import (
+    Counter,
+    Histogram,
+    Gauge,
+    generate_latest,
+    CONTENT_TYPE_LATEST,
+    Instrumentator,
+    bind_request,
+    filter_shape,
+    record_stage,
+    track_stage,
+)
 from fastapi.responses import Response
 
 from backend.schemas import (
+    AnswerCacheInvalidateRequest,
+    AnswerCacheInvalidateResponse,
     RAGQueryRequest,
     RAGQueryResponse,
     HealthCheckResponse,
@@ -53,17 +38,41 @@ from backend.schemas import (
     ItineraryRecommendationRequest,
     ItineraryRecommendationResponse,
     ChatRequest,
+    RAGSearchBatchRequest,
+    RAGSearchBatchResponse,
+    RAGSearchBatchResult,
+    RAGSearchRequest,
+    RAGSearchResponse,
+    SearchHit,
 )
-from backend.retriever import Retriever
+from backend.retriever import Retriever, collect_expansion_metrics
+from backend.db.replicas import replica_urls_from_env
+from backend.semantic_cache import SemanticCache, init_semantic_cache_from_env
+from backend.answer_cache import AnswerCache, MemoryAnswerBackend, init_answer_cache_from_env
+from backend.context_packer import context_token_budget_from_env
+from backend.single_flight import SingleFlight, init_single_flight_from_env, request_fingerprint
+from backend.cache_warmer import QueryLogWriter, init_cache_warmer_from_env, init_query_log_from_env
+from backend.llm_base import LLMClient
+from backend.llm_clients import LLMClients, init_llm_clients_from_env
+from backend.llm_usage import LLMUsageCallback, collect_llm_usage
 from backend.rag_chain import (
+    PROMPT_TEMPLATE_VERSION,
+    RAG_REQUEST_TIMEOUT,
     RetrieverAdapter,
+    ainvoke_rag_chain,
+    bind_retrieval_params,
+    collect_context_stats,
     create_rag_chain,
     execute_retriever_query,
+    pack_rag_prompt,
     process_rag_response,
     remove_parent_summary,
+    stream_rag_answer,
 )
 from backend.itinerary import ItineraryPlanner
+from backend.candidate_cache import CandidatePoolCache, init_candidate_cache_from_env, warm_targets_from_env
 from backend.unified_chat import UnifiedChatHandler
+from backend.conversation_memory import init_conversation_memory_from_env
 from backend.utils.logger import setup_logger, log_exception
 
 # 환경 변수 로드
@@ -73,9 +82,15 @@ load_dotenv()
 logger = setup_logger(level=os.getenv("LOG_LEVEL", "INFO"))
 
 
-def init_cache_from_env():
-    """캐시 초기화 플레이스홀더 (테스트 호환용)"""
-    return None
+def init_cache_from_env() -> Optional[SemanticCache]:
+    """Semantic Cache 초기화 (테스트에서는 None으로 대체 가능)"""
+    return init_semantic_cache_from_env()
+
+
+def init_answer_cache() -> Optional[AnswerCache]:
+    """LLM 답변 캐시 초기화 (ANSWER_CACHE_ENABLED=true일 때만 생성)"""
+    # 컨텍스트 토큰 예산이 바뀌면 프롬프트도 바뀌므로 템플릿 버전에 포함
+    return init_answer_cache_from_env(f"{PROMPT_TEMPLATE_VERSION}:ctx{context_token_budget_from_env()}")
 
 # Prometheus 메트릭 정의
 rag_query_duration = Histogram(
@@ -92,6 +107,20 @@ query_expansion_duration = Histogram(
 
 rag_errors = Counter('rag_errors_total', 'RAG 쿼리 에러 수', ['error_type'])
 
+# /rag/search (검색 전용) SLO 메트릭
+RAG_SEARCH_SLO_MS = float(os.getenv("RAG_SEARCH_SLO_MS", "300"))
+rag_search_duration = Histogram(
+    'rag_search_duration_seconds',
+    '검색 전용 엔드포인트 응답 시간 (초)',
+    ['filter_shape', 'expansion'],
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0]
+)
+rag_search_slo_violations = Counter(
+    'rag_search_slo_violations_total',
+    '검색 전용 엔드포인트 SLO(RAG_SEARCH_SLO_MS) 초과 수',
+    ['filter_shape', 'expansion'],
+)
+
 active_requests = Gauge('active_requests', '현재 처리 중인 요청 수')
 
 
@@ -123,18 +152,63 @@ async def lifespan(app: FastAPI):
     db_url = os.getenv("DATABASE_URL")
 
     try:
-        app.state.retriever = Retriever(db_url=db_url)
+        app.state.semantic_cache = init_cache_from_env()
+        app.state.retriever = Retriever(
+            db_url=db_url,
+            semantic_cache=app.state.semantic_cache,
+            replica_urls=replica_urls_from_env(),
+        )
         logger.info("Retriever 인스턴스 생성 및 앱 상태에 등록됨")
+
+        # 쿼리 로그 + 인기 쿼리 사전 검색 (Semantic Cache 비활성화면 warmer는 경고 후 미사용)
+        app.state.query_log = init_query_log_from_env()
+        app.state.cache_warmer = init_cache_warmer_from_env(
+            app.state.retriever,
+            cache_ttl=app.state.semantic_cache.ttl_seconds if app.state.semantic_cache is not None else None,
+        )
+        if app.state.cache_warmer is not None:
+            app.state.cache_warmer.start()
         app.state.llm_model = os.getenv("OPENAI_MODEL", "gpt-4o")
+        # LLM HTTP 커넥션 풀 + (model, temperature)별 RAG 체인 캐시
+        app.state.llm_clients = init_llm_clients_from_env()
+        app.state.rag_chains = {}
+        app.state.answer_cache = init_answer_cache()
+        # 동일 요청 동시 유입 시 계산 1회로 병합 (SINGLE_FLIGHT_ENABLED)
+        app.state.rag_query_flight = init_single_flight_from_env("/rag/query")
+        app.state.chat_flight = init_single_flight_from_env("/chat")
+        # 일정 추천 후보 풀 캐시 (지역, 도메인, 후보 수별)
+        app.state.candidate_cache = init_candidate_cache_from_env()
         app.state.itinerary_planner = ItineraryPlanner(
             app.state.retriever,
             llm_model=app.state.llm_model,
+            llm_clients=app.state.llm_clients,
+            candidate_cache=app.state.candidate_cache,
         )
+        # 상위 지역 후보 풀 사전 적재 (시작을 막지 않도록 백그라운드 스레드)
+        app.state.candidate_warm_task = None
+        app.state.candidate_warm_stop = threading.Event()
+        warm_regions, warm_days = warm_targets_from_env()
+        if app.state.candidate_cache is not None and warm_regions:
+            app.state.candidate_warm_task = asyncio.create_task(
+                asyncio.to_thread(
+                    app.state.itinerary_planner.warm_candidate_pools,
+                    warm_regions,
+                    warm_days,
+                    stop_event=app.state.candidate_warm_stop,
+                )
+            )
         
         # UnifiedChatHandler 초기화
         app.state.unified_chat_handler = UnifiedChatHandler(
+            llm_client=LLMClient(
+                http_client=app.state.llm_clients.http_client,
+                http_async_client=app.state.llm_clients.http_async_client,
+                hedge_policy=app.state.llm_clients.hedge_policy,
+            ),
             retriever=app.state.retriever,
-            itinerary_recommender=app.state.itinerary_planner
+            itinerary_recommender=app.state.itinerary_planner,
+            # session_id별 대화 메모리 (MariaDB write-behind)
+            memory=init_conversation_memory_from_env(),
         )
         await app.state.unified_chat_handler.initialize()
         logger.info("UnifiedChatHandler 초기화 완료")
@@ -148,10 +222,23 @@ async def lifespan(app: FastAPI):
     # 종료 시
     logger.info("FastAPI 애플리케이션 종료")
     
+    if getattr(app.state, "cache_warmer", None) is not None:
+        await app.state.cache_warmer.stop()
+
+    # to_thread 작업은 cancel로 스레드가 멈추지 않으므로 stop event로 다음 조합부터 중단
+    if getattr(app.state, "candidate_warm_stop", None) is not None:
+        app.state.candidate_warm_stop.set()
+    if getattr(app.state, "candidate_warm_task", None) is not None:
+        app.state.candidate_warm_task.cancel()
+
     # UnifiedChatHandler 정리
     if hasattr(app.state, 'unified_chat_handler'):
         await app.state.unified_chat_handler.close()
         logger.info("UnifiedChatHandler 정리 완료")
+
+    # LLM HTTP 커넥션 풀 정리
+    if getattr(app.state, "llm_clients", None) is not None:
+        await app.state.llm_clients.aclose()
     
     # Connection Pool 정리
     if hasattr(app.state, 'retriever'):
@@ -220,21 +307,33 @@ async def health_check():
     if retriever is None:
         db_status = "missing"
     else:
-        try:
+        # DB 확인/풀 통계/replica 확인은 블로킹 호출이므로 이벤트 루프 밖(스레드)에서 실행
+        def ping() -> None:
             # 연결을 실제로 열고 간단한 쿼리로 확인한 뒤 풀에 반환
             with retriever.pool.connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute("SELECT 1")
+
+        try:
+            await asyncio.to_thread(ping)
         except Exception as exc:
             logger.warning("DB health check failed: %s", exc)
             db_status = "error"
+        pool_stats = getattr(retriever, "pool_stats", None)
+        if callable(pool_stats):
+            await asyncio.to_thread(pool_stats)
+        replica_health = getattr(retriever, "replica_health", None)
+        if callable(replica_health):
+            # replica 장애는 primary fallback으로 흡수되므로 overall status에는 반영하지 않음
+            for name, replica_status in (await asyncio.to_thread(replica_health)).items():
+                checks[f"db_{name}"] = replica_status
     checks["db"] = db_status
 
     llm_status = "ok" if os.getenv("OPENAI_API_KEY") else "missing"
     checks["llm"] = llm_status
 
-    # 캐시 상태는 현재 비활성화 (placeholder)
-    checks["cache"] = "missing"
+    semantic_cache: Optional[SemanticCache] = getattr(app.state, "semantic_cache", None)
+    checks["cache"] = "ok" if semantic_cache is not None else "missing"
 
     overall_status = "healthy" if db_status == "ok" and llm_status == "ok" else "degraded"
     
@@ -256,23 +355,40 @@ async def rag_query(request: RAGQueryRequest):
     Returns:
         RAG 응답 (답변, 출처, 지연시간)
     """
+    with bind_request("/rag/query", collect_timings=request.debug) as timings:
+        flight = getattr(app.state, "rag_query_flight", None)
+        # debug 요청은 요청별 timings가 필요하므로 병합하지 않음
+        if not isinstance(flight, SingleFlight) or request.debug:
+            return await _execute_rag_query(request, timings)
+
+        key = request_fingerprint("/rag/query", request.model_dump(mode="json"))
+        response, shared = await flight.run(key, lambda: _execute_rag_query(request, None))
+        if shared:
+            response = response.model_copy(update={"metadata": {**response.metadata, "coalesced": True}})
+        return response
+
+
+async def _execute_rag_query(
+    request: RAGQueryRequest,
+    timings: Optional[dict[str, float]],
+) -> RAGQueryResponse:
+    """/rag/query 본문 (timings: debug 시 단계별 누적 시간 dict)"""
     start_time = time.time()
     
     try:
         logger.info(f"RAG 질의 수신: {request.question[:50]}...")
+        _log_query(
+            "/rag/query",
+            request.question,
+            request.top_k,
+            request.domain.value if request.domain else None,
+            request.area,
+        )
 
         retriever: Retriever = app.state.retriever
         llm_model = getattr(app.state, "llm_model", os.getenv("OPENAI_MODEL", "gpt-4-turbo"))
 
-        adapter = RetrieverAdapter(
-            retriever=retriever,
-            top_k=request.top_k,
-            domain=(request.domain.value if request.domain else None),
-            area=request.area,
-            expansion=request.expansion,
-            variations=request.expansion_variations or [],
-            include_parent_summary=request.parent_context,
-        )
+        domain = request.domain.value if request.domain else None
 
         metadata: dict[str, Any] = {
             "model": llm_model,
@@ -281,24 +397,87 @@ async def rag_query(request: RAGQueryRequest):
             "parent_context": request.parent_context,
         }
 
-        try:
-            chain = create_rag_chain(
-                llm_model=llm_model,
-                retriever=adapter,
+        # Semantic Cache: 근사 중복 질문이면 LLM 호출 없이 캐시된 답변 반환
+        semantic_cache: Optional[SemanticCache] = getattr(app.state, "semantic_cache", None)
+        answer_key = None
+        question_embedding = None
+        if semantic_cache is not None:
+            answer_key = SemanticCache.make_key(
+                "answer",
+                model=llm_model,
+                top_k=request.top_k,
+                domain=domain,
+                area=request.area,
+                expansion=request.expansion,
+                variations=request.expansion_variations or [],
+                parent_context=request.parent_context,
             )
-            chain_result = chain.invoke({"query": request.question})
+            question_embedding = await asyncio.to_thread(retriever.embed_query, request.question)
+            cached = semantic_cache.get(question_embedding, answer_key)
+            if cached is not None:
+                latency = round(time.time() - start_time, 2)
+                rag_query_duration.observe(latency)
+                cached_metadata = {**cached["metadata"], "cache_hit": True}
+                if timings is not None:
+                    cached_metadata["timings_ms"] = dict(timings)
+                return RAGQueryResponse(
+                    answer=cached["answer"],
+                    sources=cached["sources"],
+                    latency=latency,
+                    metadata=cached_metadata,
+                )
+
+        try:
+            chain = _get_rag_chain(retriever, llm_model)
+            # chain 단계는 RetrieverAdapter 검색 + LLM 호출을 모두 포함
+            # ainvoke: 비동기 LLM 클라이언트 + 비동기 검색으로 이벤트 루프를 막지 않음
+            # 체인은 공유되므로 요청별 검색 파라미터는 contextvar로 전달
+            with bind_retrieval_params(
+                top_k=request.top_k,
+                domain=domain,
+                area=request.area,
+                expansion=request.expansion,
+                variations=request.expansion_variations or [],
+                include_parent_summary=request.parent_context,
+            ), collect_context_stats() as context_stats, collect_llm_usage() as llm_usage, \
+                    collect_expansion_metrics() as expansion_metrics, \
+                    track_stage("chain", filter_shape(domain, request.area)):
+                # 답변 캐시 사용 시: 검색 후 (model, 템플릿, 질문, 청크 id+버전) 키로 LLM 호출 생략
+                chain_result = await ainvoke_rag_chain(
+                    chain,
+                    request.question,
+                    answer_cache=getattr(app.state, "answer_cache", None),
+                    llm_model=llm_model,
+                    callbacks=[LLMUsageCallback(llm_model)],
+                )
             rag_result = process_rag_response(chain_result)
+            if "cache_hit" in chain_result:
+                metadata["cache_hit"] = chain_result["cache_hit"]
+            # 패킹된 컨텍스트/프롬프트 토큰 수 (답변 캐시 히트 시에는 LLM 미호출로 없음)
+            metadata.update(context_stats)
 
+            docs = chain_result.get("source_documents", [])
             answer = rag_result["answer"] or "該当する情報が見つかりませんでした。"
             sources = rag_result["sources"]
             metadata.update(rag_result.get("metadata") or {})
             if request.expansion:
-                expansion_metrics = getattr(retriever, "last_expansion_metrics", None)
+                # 이번 요청의 검색 지표 (공유 Retriever 속성이 아니라 요청 컨텍스트에서 수집)
+                expansion_metrics = expansion_metrics or None
                 metadata["expansion_metrics"] = expansion_metrics
                 
                 # Query Expansion 메트릭 기록
                 if expansion_metrics and expansion_metrics.get("duration_ms"):
                     query_expansion_duration.observe(expansion_metrics["duration_ms"] / 1000.0)
+
+            if answer_key is not None and rag_result["answer"]:
+                semantic_cache.put(
+                    question_embedding,
+                    answer_key,
+                    {"answer": answer, "sources": sources, "metadata": dict(metadata)},
+                )
+            # 토큰/비용은 이번 요청의 LLM 호출분만 (캐시에는 저장하지 않음)
+            if llm_usage:
+                metadata["llm_usage"] = llm_usage
         except Exception as e:
             rag_errors.labels(error_type="rag_chain").inc()
             log_exception(
@@ -309,15 +488,17 @@ async def rag_query(request: RAGQueryRequest):
                 },
                 logger,
             )
-            docs = execute_retriever_query(
-                retriever=retriever,
-                query=request.question,
-                top_k=request.top_k,
-                domain=(request.domain.value if request.domain else None),
-                area=request.area,
-                expansion=request.expansion,
-                variations=request.expansion_variations or [],
-            )
+            with collect_expansion_metrics() as expansion_metrics:
+                docs = await asyncio.to_thread(
+                    execute_retriever_query,
+                    retriever=retriever,
+                    query=request.question,
+                    top_k=request.top_k,
+                    domain=(request.domain.value if request.domain else None),
+                    area=request.area,
+                    expansion=request.expansion,
+                    variations=request.expansion_variations or [],
+                )
             if not request.parent_context:
                 docs = remove_parent_summary(docs)
             sources = [
@@ -329,7 +510,7 @@ async def rag_query(request: RAGQueryRequest):
             metadata["fallback"] = True
             metadata["retrieved_count"] = len(docs)
             if request.expansion:
-                expansion_metrics = getattr(retriever, "last_expansion_metrics", None)
+                expansion_metrics = expansion_metrics or None
                 metadata["expansion_metrics"] = expansion_metrics
                 if expansion_metrics and expansion_metrics.get("duration_ms"):
                     query_expansion_duration.observe(expansion_metrics["duration_ms"] / 1000.0)
@@ -347,6 +528,9 @@ async def rag_query(request: RAGQueryRequest):
         similarities = [d.metadata.get("similarity", 0.0) for d in docs]
         avg_similarity = sum(similarities) / len(similarities) if similarities else 0.0
         max_similarity = max(similarities) if similarities else 0.0
+
+        if timings is not None:
+            metadata["timings_ms"] = dict(timings)
         
         return RAGQueryResponse(
             answer=answer,
@@ -371,6 +555,368 @@ async def rag_query(request: RAGQueryRequest):
         )
 
 
+def _log_query(endpoint: str, query: str, top_k: int, domain: Optional[str], area: Optional[str]) -> None:
+    """QUERY_LOG_PATH 설정 시 Cache Warmer 집계용 쿼리 로그 기록"""
+    query_log: Optional[QueryLogWriter] = getattr(app.state, "query_log", None)
+    if query_log is not None:
+        query_log.write(endpoint, query, top_k, domain, area)
+
+
+def _get_rag_chain(retriever: Retriever, llm_model: str, temperature: float = 0.7):
+    """
+    (model, temperature)별 RAG 체인을 한 번만 생성하여 재사용
+
+    요청별 검색 파라미터는 bind_retrieval_params()로 전달하므로 체인 자체는 요청 간 공유 가능하다.
+    """
+    chains: Optional[dict] = getattr(app.state, "rag_chains", None)
+    key = (llm_model, temperature)
+    if chains is not None and key in chains:
+        return chains[key]
+
+    llm_clients: Optional[LLMClients] = getattr(app.state, "llm_clients", None)
+    chain = create_rag_chain(
+        llm_model=llm_model,
+        retriever=RetrieverAdapter(retriever=retriever),
+        temperature=temperature,
+        llm=(
+            llm_clients.chat(llm_model, temperature=temperature, request_timeout=RAG_REQUEST_TIMEOUT)
+            if llm_clients is not None
+            else None
+        ),
+    )
+    if chains is not None:
+        chains[key] = chain
+    return chain
+
+
+def _to_search_hit(doc: Any, include_summary: bool) -> SearchHit:
+    """Document → compact 검색 결과"""
+    metadata = doc.metadata or {}
+    return SearchHit(
+        document_id=metadata.get("document_id"),
+        title=metadata.get("title") or "",
+        place_name=metadata.get("place_name") or "",
+        area=metadata.get("area") or "",
+        domain=metadata.get("domain"),
+        similarity=round(float(metadata.get("similarity", 0.0)), 4),
+        source_url=metadata.get("source_url") or "",
+        summary=(metadata.get("parent_summary") or None) if include_summary else None,
+    )
+
+
+def _collapse_by_document(docs: list) -> list:
+    """같은 document_id의 chunk는 가장 높은 유사도 하나만 유지 (순서는 유사도 내림차순)"""
+    best: dict[Any, Any] = {}
+    for doc in docs:
+        doc_id = (doc.metadata or {}).get("document_id") or id(doc)
+        prev = best.get(doc_id)
+        if prev is None or doc.metadata.get("similarity", 0.0) > prev.metadata.get("similarity", 0.0):
+            best[doc_id] = doc
+    return sorted(best.values(), key=lambda d: d.metadata.get("similarity", 0.0), reverse=True)
+
+
+@app.post(
+    "/rag/search",
+    response_model=RAGSearchResponse,
+    response_model_exclude_none=True,
+)
+async def rag_search(request: RAGSearchRequest):
+    """
+    검색 전용 엔드포인트 (LLM 미사용)
+    
+    Retriever 경로만 실행하여 순위가 매겨진 장소 목록을 compact JSON으로 반환한다.
+    """
+    start_time = time.perf_counter()
+    domain = request.domain.value if request.domain else None
+    shape = filter_shape(domain, request.area)
+    try:
+        retriever: Retriever = app.state.retriever
+        # collapse 시 같은 문서의 chunk가 빠져도 top_k를 채우도록 여유 있게 조회
+        fetch_k = min(request.top_k * 2, 10) if request.collapse else request.top_k
+        # warmer가 실제 검색과 같은 캐시 키를 채우도록 조회 크기(fetch_k)를 기록
+        _log_query("/rag/search", request.query, fetch_k, domain, request.area)
+
+        with bind_request("/rag/search"), collect_expansion_metrics() as expansion_metrics:
+            if request.expansion:
+                docs = await retriever.search_with_expansion_async(
+                    query=request.query,
+                    top_k=fetch_k,
+                    domain=domain,
+                    area=request.area,
+                    variations=request.expansion_variations or [],
+                )
+            else:
+                docs = await asyncio.to_thread(
+                    retriever.search,
+                    query=request.query,
+                    top_k=fetch_k,
+                    domain=domain,
+                    area=request.area,
+                )
+
+        if request.collapse:
+            docs = _collapse_by_document(docs)
+        docs = docs[:request.top_k]
+
+        metadata: dict[str, Any] = {"retrieved_count": len(docs)}
+        if request.expansion:
+            metadata["expansion_metrics"] = expansion_metrics or None
+
+        elapsed = time.perf_counter() - start_time
+        expansion_label = "true" if request.expansion else "false"
+        rag_search_duration.labels(filter_shape=shape, expansion=expansion_label).observe(elapsed)
+        if elapsed * 1000 > RAG_SEARCH_SLO_MS:
+            rag_search_slo_violations.labels(filter_shape=shape, expansion=expansion_label).inc()
+            logger.warning(f"/rag/search SLO 초과: {elapsed * 1000:.1f}ms > {RAG_SEARCH_SLO_MS}ms")
+
+        return RAGSearchResponse(
+            results=[_to_search_hit(d, request.parent_context) for d in docs],
+            latency=round(elapsed, 3),
+            metadata=metadata,
+        )
+    except ValueError as e:
+        rag_errors.labels(error_type="validation").inc()
+        log_exception(e, {"request": request.model_dump()}, logger)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        rag_errors.labels(error_type="internal").inc()
+        log_exception(e, {"request": request.model_dump()}, logger)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="검색 중 오류 발생",
+        )
+
+
+@app.post(
+    "/rag/search/batch",
+    response_model=RAGSearchBatchResponse,
+    response_model_exclude_none=True,
+)
+async def rag_search_batch(request: RAGSearchBatchRequest):
+    """
+    일괄 검색 엔드포인트 (LLM 미사용)
+    
+    모든 쿼리를 한 번에 임베딩하고 SQL은 pipeline 모드로 한 커넥션에서 실행한다.
+    """
+    start_time = time.time()
+    try:
+        retriever: Retriever = app.state.retriever
+        batch = [
+            {
+                "query": item.query,
+                "top_k": item.top_k,
+                "domain": (item.domain.value if item.domain else None),
+                "area": item.area,
+            }
+            for item in request.queries
+        ]
+        for req in batch:
+            _log_query("/rag/search/batch", req["query"], req["top_k"], req["domain"], req["area"])
+        with bind_request("/rag/search/batch"):
+            # to_thread는 contextvars를 복사하므로 단계 메트릭 라벨이 유지됨
+            docs_per_query = await asyncio.to_thread(retriever.search_batch, batch)
+
+        results = [
+            RAGSearchBatchResult(
+                query=item.query,
+                results=[_to_search_hit(d, request.parent_context) for d in docs],
+            )
+            for item, docs in zip(request.queries, docs_per_query)
+        ]
+        return RAGSearchBatchResponse(
+            results=results,
+            latency=round(time.time() - start_time, 3),
+        )
+    except ValueError as e:
+        rag_errors.labels(error_type="validation").inc()
+        log_exception(e, {"batch_size": len(request.queries)}, logger)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        rag_errors.labels(error_type="internal").inc()
+        log_exception(e, {"batch_size": len(request.queries)}, logger)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="일괄 검색 중 오류 발생",
+        )
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Server-Sent Events 한 건 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/rag/query/stream")
+async def rag_query_stream(request: RAGQueryRequest):
+    """
+    RAG 질의응답 스트리밍 엔드포인트 (Server-Sent Events)
+    
+    이벤트 순서:
+        sources  → 검색 직후 출처/문서 요약 (TTFB = 검색 지연)
+        token    → LLM 토큰 (도착하는 대로)
+        metadata → latency, expansion_metrics 등
+        error    → 처리 중 오류 (발생 시)
+    """
+    return StreamingResponse(
+        _stream_rag_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_rag_events(request: RAGQueryRequest):
+    """
+    /rag/query/stream 이벤트 생성기
+
+    contextvars는 yield 사이에 유지된다는 보장이 없으므로 bind_request는 yield를 포함하지 않는 구간에만 사용한다.
+    """
+    start_time = time.time()
+    domain = request.domain.value if request.domain else None
+    shape = filter_shape(domain, request.area)
+    try:
+        retriever: Retriever = app.state.retriever
+        llm_model = getattr(app.state, "llm_model", os.getenv("OPENAI_MODEL", "gpt-4-turbo"))
+        _log_query("/rag/query/stream", request.question, request.top_k, domain, request.area)
+
+        with bind_request("/rag/query/stream"), collect_expansion_metrics() as expansion_metrics:
+            with track_stage("retrieve", shape):
+                docs = await asyncio.to_thread(
+                    execute_retriever_query,
+                    retriever=retriever,
+                    query=request.question,
+                    top_k=request.top_k,
+                    domain=domain,
+                    area=request.area,
+                    expansion=request.expansion,
+                    variations=request.expansion_variations or [],
+                )
+        if not request.parent_context:
+            docs = remove_parent_summary(docs)
+
+        sources = []
+        for d in docs:
+            doc_id = d.metadata.get("document_id")
+            if doc_id and doc_id not in sources:
+                sources.append(doc_id)
+        yield _sse_event("sources", {
+            "sources": sources,
+            "documents": [
+                _to_search_hit(d, include_summary=False).model_dump(exclude_none=True) for d in docs
+            ],
+        })
+
+        first_token_at: Optional[float] = None
+        context_stats: dict[str, Any] = {}
+        llm_usage: dict[str, Any] = {}
+        if docs:
+            llm_start = time.perf_counter()
+            llm_clients: Optional[LLMClients] = getattr(app.state, "llm_clients", None)
+            llm = (
+                llm_clients.chat(llm_model, streaming=True, request_timeout=RAG_REQUEST_TIMEOUT)
+                if llm_clients is not None
+                else None
+            )
+            prompt, context_stats = pack_rag_prompt(request.question, docs, llm_model)
+            # yield 사이에는 contextvar를 쓸 수 없으므로 endpoint/누적 dict를 콜백에 직접 지정
+            usage_callback = LLMUsageCallback(llm_model, endpoint="/rag/query/stream", summary=llm_usage)
+            async for text in stream_rag_answer(
+                request.question, docs, llm_model=llm_model, llm=llm, prompt=prompt,
+                callbacks=[usage_callback],
+            ):
+                if first_token_at is None:
+                    first_token_at = time.time()
+                yield _sse_event("token", {"text": text})
+            with bind_request("/rag/query/stream"):
+                record_stage("llm_stream", time.perf_counter() - llm_start, shape)
+        else:
+            yield _sse_event("token", {"text": "該当する情報が見つかりませんでした。"})
+
+        latency = round(time.time() - start_time, 2)
+        rag_query_duration.observe(latency)
+        metadata: dict[str, Any] = {
+            "model": llm_model,
+            "top_k": request.top_k,
+            "expansion": request.expansion,
+            "parent_context": request.parent_context,
+            "retrieved_count": len(docs),
+            "latency": latency,
+            **context_stats,
+        }
+        if first_token_at is not None:
+            metadata["first_token_latency"] = round(first_token_at - start_time, 2)
+        if llm_usage:
+            metadata["llm_usage"] = llm_usage
+        if request.expansion:
+            expansion_metrics = expansion_metrics or None
+            metadata["expansion_metrics"] = expansion_metrics
+            if expansion_metrics and expansion_metrics.get("duration_ms"):
+                query_expansion_duration.observe(expansion_metrics["duration_ms"] / 1000.0)
+        yield _sse_event("metadata", metadata)
+
+    except Exception as e:
+        # 스트림이 이미 시작되어 HTTP 상태 코드를 바꿀 수 없으므로 error 이벤트로 전달
+        error_type = "validation" if isinstance(e, ValueError) else "rag_stream"
+        rag_errors.labels(error_type=error_type).inc()
+        log_exception(e, {"request": request.model_dump()}, logger)
+        yield _sse_event("error", {
+            "error": str(e) if isinstance(e, ValueError) else "RAG 스트리밍 처리 중 오류 발생",
+        })
+
+
+@app.post("/rag/cache/invalidate", response_model=AnswerCacheInvalidateResponse)
+async def invalidate_answer_cache(request: AnswerCacheInvalidateRequest):
+    """
+    청크 재임베딩 후 해당 문서를 참조한 캐시 삭제
+
+    LLM 답변 캐시, Semantic Cache(search/answer), 일정 후보 풀이 대상이다.
+    프로세스 로컬 캐시(Semantic Cache, 후보 풀, memory 답변 캐시)는 이 요청을 처리한 워커에서만 삭제되므로
+    응답 scope=worker로 알리고, 다른 워커는 TTL 만료로 갱신된다.
+    """
+    local_caches = []
+    candidate_cache = getattr(app.state, "candidate_cache", None)
+    if isinstance(candidate_cache, CandidatePoolCache):
+        candidate_cache.invalidate_documents(request.document_ids)
+        local_caches.append("itinerary_candidates")
+
+    semantic_removed = 0
+    semantic_cache: Optional[SemanticCache] = getattr(app.state, "semantic_cache", None)
+    if semantic_cache is not None:
+        semantic_removed = semantic_cache.invalidate_documents(request.document_ids)
+        local_caches.append("semantic")
+
+    removed = 0
+    answer_cache: Optional[AnswerCache] = getattr(app.state, "answer_cache", None)
+    if answer_cache is not None:
+        try:
+            removed = await asyncio.to_thread(answer_cache.invalidate_documents, request.document_ids)
+        except Exception as e:
+            log_exception(e, {"document_ids": request.document_ids[:20]}, logger)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="답변 캐시 무효화 실패",
+            )
+        if isinstance(answer_cache.backend, MemoryAnswerBackend):
+            local_caches.append("llm_answer")
+
+    note = None
+    if local_caches:
+        note = (
+            f"프로세스 로컬 캐시({', '.join(local_caches)})는 이 워커에서만 삭제되었습니다. "
+            "다른 워커는 TTL 만료 후 반영됩니다 (답변 캐시는 ANSWER_CACHE_BACKEND=redis로 공유 가능)."
+        )
+    return AnswerCacheInvalidateResponse(
+        invalidated=removed,
+        semantic_invalidated=semantic_removed,
+        scope="worker" if local_caches else "cluster",
+        note=note,
+    )
+
+
 @app.post("/recommend/itinerary", response_model=ItineraryRecommendationResponse)
 async def recommend_itinerary(request: ItineraryRecommendationRequest):
     """여행 추천 일정 생성"""
@@ -379,8 +925,13 @@ async def recommend_itinerary(request: ItineraryRecommendationRequest):
         planner: ItineraryPlanner = getattr(app.state, "itinerary_planner", None)
         if planner is None:
             planner = ItineraryPlanner(app.state.retriever)
-        result = planner.recommend(request)
+        with bind_request("/recommend/itinerary"), collect_llm_usage() as llm_usage:
+            # 동기 LLM/검색 호출이 이벤트 루프를 막지 않도록 스레드에서 실행
+            # (to_thread는 contextvar를 복사하므로 스레드의 usage도 llm_usage에 누적)
+            result = await asyncio.to_thread(planner.recommend, request)
         result["metadata"]["latency"] = round(time.time() - start_time, 2)
+        if llm_usage:
+            result["metadata"]["llm_usage"] = llm_usage
         return ItineraryRecommendationResponse(**result)
     except ValueError as e:
         log_exception(e, {"request": request.model_dump()}, logger)
@@ -405,6 +956,15 @@ async def recommend_itinerary_alias(request: ItineraryRecommendationRequest):
     return await recommend_itinerary(request)
 
 
+async def _handle_chat_with_usage(handler: UnifiedChatHandler, request: ChatRequest) -> dict:
+    """handle_chat + 이번 요청의 LLM 토큰/비용을 metadata.llm_usage로 첨부"""
+    with collect_llm_usage() as llm_usage:
+        response = await handler.handle_chat(request)
+    if llm_usage and isinstance(response, dict):
+        response = {**response, "metadata": {**response.get("metadata", {}), "llm_usage": llm_usage}}
+    return response
+
+
 @app.post("/chat")
 async def unified_chat(request: ChatRequest):
     """
@@ -419,7 +979,13 @@ async def unified_chat(request: ChatRequest):
     """
     try:
         handler: UnifiedChatHandler = app.state.unified_chat_handler
-        response = await handler.handle_chat(request)
+        flight = getattr(app.state, "chat_flight", None)
+        with bind_request("/chat"):
+            if not isinstance(flight, SingleFlight):
+                response = await _handle_chat_with_usage(handler, request)
+            else:
+                key = request_fingerprint("/chat", request.model_dump(mode="json"))
+                response, _ = await flight.run(key, lambda: _handle_chat_with_usage(handler, request))
         return JSONResponse(content=response)
     
     except ValueError as e:
@@ -9,6 +9,8 @@ from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Sequence
 
+from backend.fusion import normalize_fusion_config
+
 DEFAULT_PUNCTUATION = "、。！？「」『』（）［］【】〈〉《》,.!?;:'\"()[]{}…"
 DEFAULT_SUFFIXES = ["おすすめ", "観光", "人気スポット"]
 DEFAULT_MAX_VARIATIONS = 6
@@ -29,6 +31,7 @@ def _normalize_config(data: dict) -> dict:
         "punctuation_chars": data.get("punctuation_chars", DEFAULT_PUNCTUATION),
         "suffixes": [s for s in data.get("suffixes", DEFAULT_SUFFIXES) if isinstance(s, str)],
         "max_variations": max(1, int(data.get("max_variations", DEFAULT_MAX_VARIATIONS))),
+        "fusion": normalize_fusion_config(data.get("fusion")),
     }
 
 
@@ -5,18 +5,29 @@ LangChain 기반 RetrievalQA
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import hashlib
+from contextlib import contextmanager
 from copy import copy
-from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
-from langchain.chains import RetrievalQA
+from langchain.chains import LLMChain, RetrievalQA
+from langchain.chains.combine_documents.stuff import StuffDocumentsChain
 from langchain.prompts import PromptTemplate
 from langchain.schema import BaseRetriever, Document
 from langchain_openai import ChatOpenAI
-from pydantic import ConfigDict, Field
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.pydantic_v1 import Field
+from langchain_core.runnables import RunnableConfig
+from pydantic import ConfigDict
 
+from backend.context_packer import ContextPacker, context_token_budget_from_env
 from backend.utils.logger import setup_logger
 
 if TYPE_CHECKING:  # pragma: no cover
+    from backend.answer_cache import AnswerCache
     from backend.retriever import Retriever
 
 
@@ -35,11 +46,100 @@ PROMPT_TEMPLATE = """あなたは日本人観光客のための韓国観光ガ
 
 回答（日本語）:"""
 
+# 템플릿이 바뀌면 답변 캐시 키도 바뀌도록 내용 해시를 버전으로 사용
+PROMPT_TEMPLATE_VERSION = hashlib.sha1(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+
+# RAG 답변 LLM 호출 타임아웃 초 (공유 LLMClients 사용 시에도 같은 값 전달)
+RAG_REQUEST_TIMEOUT = 15.0
+
+
+def create_llm(
+    llm_model: str = "gpt-4-turbo",
+    temperature: float = 0.7,
+    streaming: bool = False,
+) -> ChatOpenAI:
+    """RAG용 ChatOpenAI 클라이언트 생성"""
+    return ChatOpenAI(
+        model=llm_model,
+        temperature=temperature,
+        request_timeout=RAG_REQUEST_TIMEOUT,
+        streaming=streaming,
+        stream_usage=streaming,
+    )
+
+
+@lru_cache(maxsize=16)
+def get_context_packer(llm_model: str, token_budget: Optional[int] = None) -> ContextPacker:
+    """모델별 ContextPacker (토크나이저 로드 비용을 한 번만 지불)"""
+    budget = token_budget if token_budget is not None else context_token_budget_from_env()
+    return ContextPacker(token_budget=budget, model=llm_model)
+
+
+_context_stats: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "rag_context_stats", default=None
+)
+
+
+@contextmanager
+def collect_context_stats() -> Iterator[Dict[str, Any]]:
+    """현재 요청에서 체인이 구성한 컨텍스트/프롬프트 토큰 수를 수집할 dict 바인딩"""
+    stats: Dict[str, Any] = {}
+    token = _context_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _context_stats.reset(token)
+
+
+class PackedStuffDocumentsChain(StuffDocumentsChain):
+    """
+    토큰 예산 패커로 컨텍스트를 구성하는 stuff 체인
+
+    기본 stuff 체인은 문서 page_content를 그대로 이어 붙여 청크마다 반복되는 parent summary까지 프롬프트에 들어간다.
+    """
+
+    context_packer: Any = None
+
+    def _get_inputs(self, docs: List[Document], **kwargs: Any) -> dict:
+        inputs = {
+            k: v
+            for k, v in kwargs.items()
+            if k in self.llm_chain.prompt.input_variables
+        }
+        packed = self.context_packer.pack(docs)
+        inputs[self.document_variable_name] = packed.text
+        stats = _context_stats.get()
+        if stats is not None:
+            stats.update(packed.stats())
+            stats["prompt_tokens"] = self.context_packer.counter.count(
+                self.llm_chain.prompt.format(**inputs)
+            )
+        return inputs
+
+
+def pack_rag_prompt(
+    question: str,
+    docs: Sequence[Document],
+    llm_model: str = "gpt-4-turbo",
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    토큰 예산 내로 컨텍스트를 구성한 프롬프트와 토큰 통계 반환
+
+    Returns:
+        (프롬프트 문자열, {context_tokens, prompt_tokens, ...})
+    """
+    packer = get_context_packer(llm_model)
+    packed = packer.pack(docs)
+    prompt = PROMPT_TEMPLATE.format(context=packed.text, question=question)
+    return prompt, {**packed.stats(), "prompt_tokens": packer.counter.count(prompt)}
+
 
 def create_rag_chain(
     llm_model: str = "gpt-4-turbo",
     retriever: BaseRetriever = None,
     temperature: float = 0.7,
+    llm: Optional[ChatOpenAI] = None,
+    context_packer: Optional[ContextPacker] = None,
 ) -> RetrievalQA:
     """
     RAG 체인 생성
@@ -48,6 +148,8 @@ def create_rag_chain(
         llm_model: 사용할 LLM 모델명
         retriever: 문서 검색기 (PGVector retriever)
         temperature: LLM 생성 온도
+        llm: 공유 LLM 클라이언트 (없으면 새로 생성)
+        context_packer: 컨텍스트 토큰 예산 패커 (없으면 RAG_CONTEXT_TOKEN_BUDGET 기준으로 생성)
     
     Returns:
         RetrievalQA 체인
@@ -57,12 +159,9 @@ def create_rag_chain(
     
     logger.info(f"RAG 체인 생성 중... (model={llm_model})")
     
-    # LLM 초기화
-    llm = ChatOpenAI(
-        model=llm_model,
-        temperature=temperature,
-        request_timeout=15,
-    )
+    # LLM 초기화 (앱 단위 공유 클라이언트 우선)
+    if llm is None:
+        llm = create_llm(llm_model=llm_model, temperature=temperature)
     
     # 프롬프트 템플릿 생성
     prompt = PromptTemplate(
@@ -70,13 +169,16 @@ def create_rag_chain(
         input_variables=["context", "question"],
     )
     
-    # RetrievalQA 체인 구성
-    chain = RetrievalQA.from_chain_type(
-        llm=llm,
-        chain_type="stuff",
+    # RetrievalQA 체인 구성 (stuff 체인 + 토큰 예산 컨텍스트 패킹)
+    combine_chain = PackedStuffDocumentsChain(
+        llm_chain=LLMChain(llm=llm, prompt=prompt),
+        document_variable_name="context",
+        context_packer=context_packer or get_context_packer(llm_model),
+    )
+    chain = RetrievalQA(
+        combine_documents_chain=combine_chain,
         retriever=retriever,
         return_source_documents=True,
-        chain_type_kwargs={"prompt": prompt},
     )
     
     logger.info("RAG 체인 생성 완료")
@@ -84,6 +186,80 @@ def create_rag_chain(
     return chain
 
 
+async def ainvoke_rag_chain(
+    chain: RetrievalQA,
+    question: str,
+    answer_cache: Optional["AnswerCache"] = None,
+    llm_model: str = "",
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+) -> Dict[str, Any]:
+    """
+    RAG 체인 비동기 실행
+
+    answer_cache가 있으면 검색 → 답변 캐시 조회 → (미스 시) LLM 순서로 나누어 실행하여
+    같은 질문에 같은 문서가 검색된 경우 LLM 호출을 생략한다.
+
+    Args:
+        callbacks: LLM 호출에 전달할 콜백 (LLMUsageCallback 등)
+
+    Returns:
+        RetrievalQA 결과와 같은 형식 (result, source_documents) + cache_hit
+    """
+    config: RunnableConfig = {"callbacks": callbacks} if callbacks else {}
+    if answer_cache is None:
+        return await chain.ainvoke({"query": question}, config=config)
+
+    docs = await chain.retriever.ainvoke(question)
+    key = answer_cache.make_key(llm_model, question, docs)
+    cached = await asyncio.to_thread(answer_cache.get, key)
+    if cached is not None:
+        return {"result": cached, "source_documents": docs, "cache_hit": True}
+
+    output = await chain.combine_documents_chain.ainvoke(
+        {"input_documents": docs, "question": question},
+        config=config,
+    )
+    answer = output.get("output_text", "")
+    if answer.strip():
+        await asyncio.to_thread(answer_cache.put, key, answer, docs)
+    return {"result": answer, "source_documents": docs, "cache_hit": False}
+
+
+async def stream_rag_answer(
+    question: str,
+    docs: Sequence[Document],
+    llm_model: str = "gpt-4-turbo",
+    temperature: float = 0.7,
+    llm: Optional[ChatOpenAI] = None,
+    prompt: Optional[str] = None,
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+) -> AsyncIterator[str]:
+    """
+    검색된 문서로 프롬프트를 구성하고 LLM 토큰을 도착하는 대로 반환
+
+    Args:
+        question: 사용자 질문
+        docs: 컨텍스트로 사용할 문서 (이미 검색 완료)
+        llm_model: 사용할 LLM 모델명
+        temperature: LLM 생성 온도
+        llm: 공유 streaming LLM 클라이언트 (없으면 새로 생성)
+        prompt: pack_rag_prompt()로 미리 구성한 프롬프트 (없으면 여기서 구성)
+        callbacks: LLM 호출에 전달할 콜백 (LLMUsageCallback 등)
+
+    Yields:
+        답변 텍스트 조각
+    """
+    if prompt is None:
+        prompt, _ = pack_rag_prompt(question, docs, llm_model)
+    if llm is None:
+        llm = create_llm(llm_model=llm_model, temperature=temperature, streaming=True)
+    config: RunnableConfig = {"callbacks": callbacks} if callbacks else {}
+    async for chunk in llm.astream(prompt, config=config):
+        text = getattr(chunk, "content", chunk)
+        if text:
+            yield text
+
+
 def process_rag_response(result: Dict[str, Any]) -> Dict[str, Any]:
     """
     RAG 체인 결과 후처리
@@ -146,51 +322,119 @@ def remove_parent_summary(docs: List[Document]) -> List[Document]:
     return stripped
 
 
+@dataclass(frozen=True)
+class RetrievalParams:
+    """요청별 검색 파라미터 (공유 체인의 RetrieverAdapter에 contextvar로 전달)"""
+    top_k: int = 5
+    domain: Optional[str] = None
+    area: Optional[str] = None
+    expansion: bool = False
+    variations: Tuple[str, ...] = ()
+    include_parent_summary: bool = True
+
+
+_retrieval_params: contextvars.ContextVar[Optional[RetrievalParams]] = contextvars.ContextVar(
+    "rag_retrieval_params", default=None
+)
+
+
+@contextmanager
+def bind_retrieval_params(
+    top_k: int = 5,
+    domain: Optional[str] = None,
+    area: Optional[str] = None,
+    expansion: bool = False,
+    variations: Optional[Sequence[str]] = None,
+    include_parent_summary: bool = True,
+) -> Iterator[RetrievalParams]:
+    """
+    현재 요청의 검색 파라미터 바인딩
+
+    캐시된 체인을 여러 요청이 동시에 사용해도 각 요청은 자신의 파라미터로 검색한다.
+    """
+    params = RetrievalParams(
+        top_k=top_k,
+        domain=domain,
+        area=area,
+        expansion=expansion,
+        variations=tuple(variations or ()),
+        include_parent_summary=include_parent_summary,
+    )
+    token = _retrieval_params.set(params)
+    try:
+        yield params
+    finally:
+        _retrieval_params.reset(token)
+
+
 class RetrieverAdapter(BaseRetriever):
     """
     LangChain BaseRetriever 인터페이스에 맞춰 custom Retriever를 감싸는 어댑터.
-    요청별 필터(domain/area/expansion 등)를 안전하게 주입하기 위해
-    인스턴스를 매 요청마다 생성한다.
+
+    요청별 필터(domain/area/expansion 등)는 bind_retrieval_params()로 바인딩된 값을 우선 사용하므로
+    체인을 (model, temperature)별로 한 번만 만들어 재사용할 수 있다.
+    바인딩이 없으면 인스턴스 필드 값을 사용한다.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
     retriever: Any
-    top_k: int
+    top_k: int = 5
     domain: Optional[str] = None
     area: Optional[str] = None
     expansion: bool = False
+    # BaseRetriever는 pydantic v1 모델이므로 v1 Field 사용 (v2 Field는 기본값으로 FieldInfo가 들어감)
     variations: List[str] = Field(default_factory=list)
     include_parent_summary: bool = True
 
-    def _query(self, query: str) -> List[Document]:
-        return execute_retriever_query(
-            retriever=self.retriever,
-            query=query,
+    def _params(self) -> RetrievalParams:
+        bound = _retrieval_params.get()
+        if bound is not None:
+            return bound
+        return RetrievalParams(
             top_k=self.top_k,
             domain=self.domain,
             area=self.area,
             expansion=self.expansion,
-            variations=self.variations,
+            variations=tuple(self.variations or ()),
+            include_parent_summary=self.include_parent_summary,
         )
 
-    def _maybe_strip_parent_summary(self, docs: List[Document]) -> List[Document]:
-        if self.include_parent_summary:
+    @staticmethod
+    def _maybe_strip_parent_summary(params: RetrievalParams, docs: List[Document]) -> List[Document]:
+        if params.include_parent_summary:
             return docs
         return remove_parent_summary(docs)
 
-    def get_relevant_documents(
+    def _get_relevant_documents(
         self, query: str, *, run_manager: Optional[Any] = None
     ) -> List[Document]:
-        docs = self._query(query)
-        return self._maybe_strip_parent_summary(docs)
+        params = self._params()
+        docs = execute_retriever_query(
+            retriever=self.retriever,
+            query=query,
+            top_k=params.top_k,
+            domain=params.domain,
+            area=params.area,
+            expansion=params.expansion,
+            variations=params.variations,
+        )
+        return self._maybe_strip_parent_summary(params, docs)
 
-    async def aget_relevant_documents(
+    async def _aget_relevant_documents(
         self, query: str, *, run_manager: Optional[Any] = None
     ) -> List[Document]:
-        loop = asyncio.get_running_loop()
-        docs = await loop.run_in_executor(None, self._query, query)
-        return self._maybe_strip_parent_summary(docs)
-
+        # chain.ainvoke 경로: 이벤트 루프를 막지 않도록 비동기 검색 사용
+        params = self._params()
+        docs = await execute_retriever_query_async(
+            retriever=self.retriever,
+            query=query,
+            top_k=params.top_k,
+            domain=params.domain,
+            area=params.area,
+            expansion=params.expansion,
+            variations=params.variations,
+        )
+        return self._maybe_strip_parent_summary(params, docs)
 
 
 def execute_retriever_query(
@@ -222,3 +466,34 @@ def execute_retriever_query(
         domain=domain_value,
         area=area,
     )
+
+
+async def execute_retriever_query_async(
+    retriever: "Retriever",
+    query: str,
+    *,
+    top_k: int,
+    domain: Optional[str],
+    area: Optional[str],
+    expansion: bool,
+    variations: Optional[Sequence[str]],
+) -> List[Document]:
+    """
+    비동기 공통 검색 실행 헬퍼.
+    expansion이면 변형별 병렬 검색(search_with_expansion_async),
+    아니면 동기 search를 executor에서 실행한다 (요청 컨텍스트/메트릭 라벨 전달).
+    """
+    if expansion:
+        return await retriever.search_with_expansion_async(
+            query=query,
+            top_k=top_k,
+            domain=domain,
+            area=area,
+            variations=list(variations or []),
+        )
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        None,
+        lambda: ctx.run(retriever.search, query=query, top_k=top_k, domain=domain, area=area),
+    )
@@ -3,20 +3,70 @@
 tourism_child 테이블 직접 검색
 """
 import asyncio
+import contextvars
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 import psycopg
 from psycopg_pool import ConnectionPool
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.schema import Document
 
 from backend.utils.logger import setup_logger, log_exception
-from backend.query_expansion import generate_variations
+from backend.query_expansion import generate_variations, load_query_expansion_config
+from backend.fusion import fuse_results
+from backend.semantic_cache import SemanticCache
+from backend.db.pool import get_pool_registry
+from backend.db.replicas import (
+    DEFAULT_EJECT_SECONDS,
+    DEFAULT_HEALTH_INTERVAL_SECONDS,
+    DEFAULT_MAX_LAG_SECONDS,
+    ReplicaRouter,
+)
+from backend.db.filtered_search import (
+    FilteredSearchPolicy,
+    SelectivityCache,
+    filtered_search_total,
+    plan_rows_from_explain,
+)
+from backend.utils.metrics import filter_shape, record_stage, track_stage
 
 
 logger = setup_logger()
 
+# 동일 쿼리 텍스트의 임베딩 재계산 방지용 LRU 크기
+EMBEDDING_MEMO_SIZE = 256
+
+# 요청별 Query Expansion 지표 (Retriever는 요청 간 공유되므로 인스턴스 속성에 두지 않음)
+_expansion_metrics_var: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "expansion_metrics", default=None
+)
+
+
+@contextmanager
+def collect_expansion_metrics() -> Iterator[Dict[str, Any]]:
+    """
+    현재 요청의 Query Expansion 지표를 받을 dict 바인딩 (응답 metadata["expansion_metrics"]용)
+
+    to_thread/copy_context로 넘어간 검색도 같은 dict에 기록한다. 변형 검색이 없었으면 빈 dict로 남는다.
+    """
+    metrics: Dict[str, Any] = {}
+    token = _expansion_metrics_var.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _expansion_metrics_var.reset(token)
+
+
+def record_expansion_metrics(metrics: Dict[str, Any]) -> None:
+    target = _expansion_metrics_var.get()
+    if target is not None:
+        target.clear()
+        target.update(metrics)
+
 
 class Retriever:
     """
@@ -28,29 +78,63 @@ class Retriever:
         db_url: str,
         embedding_model: str = "intfloat/multilingual-e5-small",
         embeddings_client = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        replica_urls: Optional[List[str]] = None,
     ):
         """
         초기화
         
         Args:
-            db_url: PostgreSQL 연결 URL
+            db_url: PostgreSQL 연결 URL (primary)
             embedding_model: HuggingFace 임베딩 모델명
             embeddings_client: Optional embeddings client (테스트 시 mock 주입용)
+            semantic_cache: Optional Semantic Cache (근사 중복 쿼리 결과 재사용)
+            replica_urls: Optional 읽기 전용 replica URL 목록 (검색 쿼리 분산)
         """
         try:
             logger.info(f"Retriever 초기화 중... (모델: {embedding_model})")
             
             self.db_url = db_url
-            self.last_expansion_metrics: Optional[Dict[str, Any]] = None
+            self.semantic_cache = semantic_cache
+            self._embedding_memo: "OrderedDict[str, List[float]]" = OrderedDict()
+            self._embedding_memo_lock = threading.Lock()
+
+            # 필터 검색 recall 보정 정책 (exact scan 기준, probes 재시도)
+            self.filter_policy = FilteredSearchPolicy.from_env()
+            self._selectivity = SelectivityCache(ttl_seconds=self.filter_policy.selectivity_ttl)
             
-            # Connection Pool 초기화 (min 2, max 10 connections)
-            self.pool = ConnectionPool(
-                conninfo=db_url,
-                min_size=2,
-                max_size=10,
-                timeout=30.0,
+            # 프로세스 전역 공유 풀 사용 (DB_POOL_* 환경 변수, workload=search)
+            # configure 콜백에서 pgvector 타입 등록 + 세션 설정을 커넥션당 1회 적용
+            self._pool_lease = get_pool_registry().acquire(
+                db_url,
+                workload="search",
+                pool_factory=ConnectionPool,
+            )
+            self.pool = self._pool_lease.pool
+            logger.info("공유 DB Connection Pool 연결 완료 (workload=search)")
+
+            # 검색 쿼리 라우팅 (replica 미설정 시 primary만 사용)
+            replicas = {
+                f"replica_{i}": get_pool_registry().acquire(
+                    url,
+                    workload="search",
+                    name=f"replica_{i}",
+                    pool_factory=ConnectionPool,
+                )
+                for i, url in enumerate(replica_urls or [], start=1)
+            }
+            self.router = ReplicaRouter(
+                primary=self._pool_lease,
+                replicas=replicas,
+                eject_seconds=float(os.getenv("REPLICA_EJECT_SECONDS", DEFAULT_EJECT_SECONDS)),
+                max_lag_seconds=float(os.getenv("REPLICA_MAX_LAG_SECONDS", DEFAULT_MAX_LAG_SECONDS)),
             )
-            logger.info("DB Connection Pool 생성 완료 (min=2, max=10)")
+            if replicas:
+                # 복제 지연은 /health 호출과 무관하게 주기적으로 확인
+                self.router.start_health_checks(
+                    float(os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", DEFAULT_HEALTH_INTERVAL_SECONDS))
+                )
+                logger.info(f"Read replica 라우팅 활성화: {len(replicas)}개")
             
             # Embeddings client 설정 (주입 또는 기본값 생성)
             if embeddings_client is not None:
@@ -80,11 +164,21 @@ class Retriever:
             )
             raise
     
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection Pool 통계 조회 및 Prometheus 게이지 갱신"""
+        return self._pool_lease.stats()
+
+    def replica_health(self) -> Dict[str, str]:
+        """Read replica별 상태 (ok / lagging / error)"""
+        return self.router.check_health()
+
     def close(self):
-        """Connection Pool 정리"""
-        if hasattr(self, 'pool'):
-            self.pool.close()
-            logger.info("DB Connection Pool 종료 완료")
+        """공유 Connection Pool 참조 해제 (마지막 참조면 풀 종료)"""
+        if hasattr(self, 'router'):
+            self.router.release()
+        if hasattr(self, '_pool_lease') and not self._pool_lease.released:
+            self._pool_lease.release()
+            logger.info("DB Connection Pool 참조 해제 완료")
     
     def __enter__(self):
         """Context manager 지원"""
@@ -95,8 +189,25 @@ class Retriever:
         self.close()
     
     def _embed_query(self, query: str) -> List[float]:
-        """쿼리를 벡터로 임베딩"""
-        return self.embeddings.embed_query(query.strip())
+        """쿼리를 벡터로 임베딩 (동일 텍스트는 LRU memo 재사용)"""
+        text = query.strip()
+        with self._embedding_memo_lock:
+            cached = self._embedding_memo.get(text)
+            if cached is not None:
+                self._embedding_memo.move_to_end(text)
+                return cached
+
+        embedding = self.embeddings.embed_query(text)
+
+        with self._embedding_memo_lock:
+            self._embedding_memo[text] = embedding
+            while len(self._embedding_memo) > EMBEDDING_MEMO_SIZE:
+                self._embedding_memo.popitem(last=False)
+        return embedding
+
+    def embed_query(self, query: str) -> List[float]:
+        """외부 모듈용 쿼리 임베딩 (Semantic Cache 조회 등)"""
+        return self._embed_query(query)
     
     def _build_sql_and_params(
         self,
@@ -106,6 +217,7 @@ class Retriever:
         area: Optional[str] = None,
     ) -> tuple[str, list]:
         """SQL 쿼리와 파라미터 생성"""
+        filter_sql, filter_params = self._build_filter_clause(domain, area)
         sql = """
             SELECT 
                 c.chunk_text,
@@ -128,30 +240,190 @@ class Retriever:
         # Distance와 similarity 모두 계산하기 위해 쿼리 임베딩을 두 번 전달
         params = [str(query_embedding), str(query_embedding)]
         
-        # 도메인 필터 추가
+        # 도메인/지역 필터 추가
+        sql += filter_sql
+        params.extend(filter_params)
+        
+        # ORDER BY에서는 이미 계산된 distance 사용
+        sql += " ORDER BY distance LIMIT %s"
+        params.append(top_k)
+        
+        return sql, params
+    
+    @staticmethod
+    def _build_filter_clause(
+        domain: Optional[str] = None,
+        area: Optional[str] = None,
+    ) -> tuple[str, list]:
+        """도메인/지역 필터 WHERE 절과 파라미터 생성"""
+        sql = ""
+        params: list = []
+
+        # 도메인 필터
         if domain:
             sql += " AND c.domain = %s"
             params.append(domain)
-        
-        # 지역 필터 추가 (부분 일치)
+
+        # 지역 필터 (부분 일치)
         if area:
             sql += " AND (c.area LIKE %s OR c.place_name LIKE %s OR c.title LIKE %s)"
             area_pattern = f"%{area}%"
             params.extend([area_pattern, area_pattern, area_pattern])
-        
-        # ORDER BY에서는 이미 계산된 distance 사용
-        sql += " ORDER BY distance LIMIT %s"
-        params.append(top_k)
-        
+
         return sql, params
+
+    def _execute_search(
+        self,
+        sql: str,
+        params: list,
+        shape: str = "none",
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> list:
+        """
+        SQL 쿼리 실행하여 결과 반환 (Connection Pool 사용)
+
+        settings가 주어지면 트랜잭션 로컬(set_config(..., true))로 적용한 뒤 실행한다.
+        """
+        # 대기 중인 클라이언트 수가 큐잉 시점에 보이도록 획득 전에 갱신
+        self.pool_stats()
+        wait_start = time.perf_counter()
+
+        def run(conn) -> list:
+            record_stage("pool_wait", time.perf_counter() - wait_start, shape)
+            with track_stage("sql", shape):
+                if not settings:
+                    with conn.cursor() as cur:
+                        cur.execute(sql, params)
+                        return cur.fetchall()
+                with conn.transaction():
+                    with conn.cursor() as cur:
+                        for name, value in settings.items():
+                            cur.execute("SELECT set_config(%s, %s, true)", (name, str(value)))
+                        cur.execute(sql, params)
+                        return cur.fetchall()
+
+        # replica 우선 (least outstanding), 실패 시 primary fallback
+        return self.router.run(run)
     
-    def _execute_search(self, sql: str, params: list) -> list:
-        """SQL 쿼리 실행하여 결과 반환 (Connection Pool 사용)"""
-        with self.pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                return cur.fetchall()
-    
+    def _execute_search_batch(self, statements: List[tuple[str, list]], shape: str = "none") -> List[list]:
+        """
+        여러 SQL을 하나의 커넥션에서 pipeline 모드로 실행
+
+        왕복(round trip)을 쿼리마다 기다리지 않고 한 번에 전송한 뒤 순서대로 결과를 수집한다.
+        """
+        self.pool_stats()
+        wait_start = time.perf_counter()
+
+        def run(conn) -> List[list]:
+            record_stage("pool_wait", time.perf_counter() - wait_start, shape)
+            with track_stage("sql", shape):
+                with conn.pipeline():
+                    cursors = []
+                    for sql, params in statements:
+                        cur = conn.cursor()
+                        cur.execute(sql, params)
+                        cursors.append(cur)
+                    results = []
+                    for cur in cursors:
+                        results.append(cur.fetchall())
+                        cur.close()
+                    return results
+
+        return self.router.run(run)
+
+    def _estimate_filtered_rows(
+        self,
+        domain: Optional[str],
+        area: Optional[str],
+        shape: str = "none",
+    ) -> Optional[int]:
+        """
+        필터 조합의 예상 행 수 (planner 통계 기반 EXPLAIN, 필터 조합별 캐시)
+
+        추정 실패 시 None (인덱스 검색으로 진행)
+        """
+        key = (domain, area)
+        cached = self._selectivity.get(key)
+        if cached is not None:
+            return cached
+
+        filter_sql, filter_params = self._build_filter_clause(domain, area)
+        explain_sql = "EXPLAIN (FORMAT JSON) SELECT 1 FROM tourism_child c WHERE 1=1" + filter_sql
+        try:
+            rows = self._execute_search(explain_sql, filter_params, shape=shape)
+            estimate = plan_rows_from_explain(rows[0][0]) if rows else None
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"필터 선택도 추정 실패: domain={domain}, area={area}: {exc}")
+            return None
+
+        if estimate is not None:
+            self._selectivity.put(key, estimate)
+        return estimate
+
+    def _search_rows(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        domain: Optional[str] = None,
+        area: Optional[str] = None,
+        shape: str = "none",
+    ) -> list:
+        """
+        필터 선택도에 따라 실행 전략을 골라 검색 row 반환
+
+        - 필터 없음: 인덱스 검색 1회
+        - 예상 행 수 ≤ exact_scan_max_rows: exact scan (정확한 top_k, 작은 집합이라 빠름)
+        - 그 외: 인덱스 검색 → 결과 부족 시 probes를 늘려 재시도 → 그래도 부족하면 exact scan
+        """
+        sql, params = self._build_sql_and_params(query_embedding, top_k, domain, area)
+        policy = self.filter_policy
+
+        if shape == "none":
+            return self._execute_search(sql, params, shape=shape, settings=policy.index_settings())
+
+        if policy.exact_scan_max_rows > 0:
+            estimate = self._estimate_filtered_rows(domain, area, shape)
+            if estimate is not None and estimate <= policy.exact_scan_max_rows:
+                rows = self._execute_search(sql, params, shape=shape, settings=policy.exact_settings())
+                filtered_search_total.labels(strategy="exact", outcome="full").inc()
+                return rows
+
+        rows = self._execute_search(sql, params, shape=shape, settings=policy.index_settings())
+        return self._complete_filtered_rows(sql, params, rows, top_k, shape)
+
+    def _complete_filtered_rows(
+        self,
+        sql: str,
+        params: list,
+        rows: list,
+        top_k: int,
+        shape: str,
+    ) -> list:
+        """
+        첫 인덱스 검색 결과(rows)가 부족하면 probes를 늘려 재시도 → 그래도 부족하면 exact scan
+
+        일괄 검색은 pipeline으로 받은 결과를 그대로 넘겨 첫 검색/EXPLAIN을 다시 실행하지 않는다.
+        """
+        if len(rows) >= top_k:
+            filtered_search_total.labels(strategy="index", outcome="full").inc()
+            return rows
+
+        policy = self.filter_policy
+        for settings in policy.retry_settings():
+            logger.info(f"필터 검색 결과 부족({len(rows)}/{top_k}), 재시도: {settings}")
+            rows = self._execute_search(sql, params, shape=shape, settings=settings)
+            if len(rows) >= top_k:
+                filtered_search_total.labels(strategy="index", outcome="retried").inc()
+                return rows
+
+        # probes를 늘려도 부족하면 필터를 통과하는 행 자체가 적은 경우 → exact scan으로 확정
+        rows = self._execute_search(sql, params, shape=shape, settings=policy.exact_settings())
+        filtered_search_total.labels(
+            strategy="exact",
+            outcome="full" if len(rows) >= top_k else "short",
+        ).inc()
+        return rows
+
     def _rows_to_documents(self, rows: list) -> List[Document]:
         """DB row를 Document 객체 리스트로 변환"""
         documents = []
@@ -197,6 +469,7 @@ class Retriever:
         top_k: int = 5,
         domain: Optional[str] = None,
         area: Optional[str] = None,
+        refresh_cache: bool = False,
     ) -> List[Document]:
         """
         유사도 기반 문서 검색 (Metadata Filtering 강화)
@@ -206,6 +479,7 @@ class Retriever:
             top_k: 반환할 문서 개수
             domain: 도메인 필터 (food, stay, nat, his, shop, lei)
             area: 지역 필터 (예: 서울, 부산)
+            refresh_cache: True면 캐시 조회 없이 DB 검색 후 캐시 엔트리를 갱신 (Cache Warmer용)
         
         Returns:
             검색된 Document 리스트
@@ -218,20 +492,32 @@ class Retriever:
             raise ValueError("top_k는 1~10 사이의 정수여야 합니다.")
         
         try:
-            self.last_expansion_metrics = None
             logger.info(f"문서 검색 시작: query='{query[:50]}...', top_k={top_k}, domain={domain}, area={area}")
 
+            shape = filter_shape(domain, area)
+
             # 쿼리 임베딩 생성
-            query_embedding = self._embed_query(query)
-            
-            # SQL 쿼리 구성
-            sql, params = self._build_sql_and_params(query_embedding, top_k, domain, area)
+            with track_stage("embed", shape):
+                query_embedding = self._embed_query(query)
+
+            # Semantic Cache 조회 (동일 필터 + 근사 중복 쿼리)
+            cache_key = None
+            if self.semantic_cache is not None:
+                cache_key = SemanticCache.make_key("search", top_k=top_k, domain=domain, area=area)
+                cached = None if refresh_cache else self.semantic_cache.get(query_embedding, cache_key)
+                if cached is not None:
+                    logger.info(f"검색 캐시 히트: {len(cached)}개 문서 반환")
+                    return list(cached)
             
-            # 검색 실행
-            rows = self._execute_search(sql, params)
+            # 검색 실행 (필터 선택도 기반 전략 선택 + 결과 부족 시 재시도)
+            rows = self._search_rows(query_embedding, top_k, domain, area, shape=shape)
             
             # Document 객체로 변환
-            documents = self._rows_to_documents(rows)
+            with track_stage("materialize", shape):
+                documents = self._rows_to_documents(rows)
+
+            if cache_key is not None:
+                self.semantic_cache.put(query_embedding, cache_key, list(documents))
             
             logger.info(f"검색 완료: {len(documents)}개 문서 반환")
             
@@ -250,41 +536,294 @@ class Retriever:
             )
             raise
 
-    def _get_document_id(self, doc: Document) -> Any:
-        """Document에서 고유 ID 추출 (중복 제거용)"""
-        doc_id = doc.metadata.get("document_id") or doc.metadata.get("documentId")
-        if not doc_id:
-            doc_id = hash(doc.page_content)
-        return doc_id
-    
-    def _merge_documents_by_similarity(self, all_results: List[List[Document]]) -> Dict[Any, Document]:
+    def _embed_batch(self, queries: List[str]) -> List[List[float]]:
+        """여러 쿼리를 한 번의 forward pass로 임베딩 (memo에 없는 텍스트만 계산)"""
+        texts = [q.strip() for q in queries]
+        unique = list(dict.fromkeys(texts))
+        # memo 히트는 로컬로 복사 (이번 배치의 새 임베딩이 memo 크기를 넘기면 히트 항목이 밀려날 수 있음)
+        vectors: Dict[str, List[float]] = {}
+        with self._embedding_memo_lock:
+            for text in unique:
+                cached = self._embedding_memo.get(text)
+                if cached is not None:
+                    self._embedding_memo.move_to_end(text)
+                    vectors[text] = cached
+
+        missing = [t for t in unique if t not in vectors]
+        if missing:
+            computed = self.embeddings.embed_documents(missing)
+            vectors.update(zip(missing, computed))
+            with self._embedding_memo_lock:
+                for text, embedding in zip(missing, computed):
+                    self._embedding_memo[text] = embedding
+                while len(self._embedding_memo) > EMBEDDING_MEMO_SIZE:
+                    self._embedding_memo.popitem(last=False)
+
+        return [vectors[t] for t in texts]
+
+    def search_batch(self, requests: List[Dict[str, Any]]) -> List[List[Document]]:
         """
-        여러 검색 결과를 document_id 기준으로 병합하고 가장 높은 유사도만 유지
-        
+        여러 쿼리 일괄 검색
+
+        - 임베딩: embed_documents 한 번으로 일괄 계산
+        - SQL: 캐시 미스 쿼리만 pipeline 모드로 한 커넥션에서 실행
+
         Args:
-            all_results: 검색 결과 리스트의 리스트
-        
+            requests: {"query", "top_k", "domain", "area"} dict 리스트
+
         Returns:
-            document_id를 키로 하는 Document 딕셔너리
+            요청 순서와 같은 순서의 Document 리스트의 리스트
         """
-        merged = {}
-        for results in all_results:
-            for doc in results:
-                doc_id = self._get_document_id(doc)
-                prev = merged.get(doc_id)
-                sim = float(doc.metadata.get("similarity", 0.0))
-                if not prev or sim > prev.metadata.get("similarity", 0.0):
-                    merged[doc_id] = doc
-        return merged
-    
-    def _sort_and_limit_by_similarity(self, documents: Dict[Any, Document], top_k: int) -> List[Document]:
-        """유사도 기준 정렬 및 top_k 제한"""
-        docs = sorted(
-            documents.values(),
-            key=lambda d: d.metadata.get("similarity", 0.0),
-            reverse=True
+        for req in requests:
+            query = req.get("query")
+            top_k = req.get("top_k", 5)
+            if not query or len(query.strip()) < 2:
+                raise ValueError("쿼리는 최소 2자 이상이어야 합니다.")
+            if not isinstance(top_k, int) or top_k < 1 or top_k > 10:
+                raise ValueError("top_k는 1~10 사이의 정수여야 합니다.")
+
+        if not requests:
+            return []
+
+        try:
+            logger.info(f"일괄 검색 시작: {len(requests)}개 쿼리")
+            shape = "batch"
+
+            with track_stage("embed", shape):
+                embeddings = self._embed_batch([req["query"] for req in requests])
+
+            results: List[Optional[List[Document]]] = [None] * len(requests)
+            pending: List[tuple[int, Any]] = []
+            statements: List[tuple[str, list]] = []
+            for i, (req, embedding) in enumerate(zip(requests, embeddings)):
+                top_k = req.get("top_k", 5)
+                domain = req.get("domain")
+                area = req.get("area")
+                cache_key = None
+                if self.semantic_cache is not None:
+                    cache_key = SemanticCache.make_key("search", top_k=top_k, domain=domain, area=area)
+                    cached = self.semantic_cache.get(embedding, cache_key)
+                    if cached is not None:
+                        results[i] = list(cached)
+                        continue
+                pending.append((i, cache_key))
+                statements.append(self._build_sql_and_params(embedding, top_k, domain, area))
+
+            if statements:
+                rows_per_query = self._execute_search_batch(statements, shape=shape)
+                with track_stage("materialize", shape):
+                    for (i, cache_key), (sql, params), rows in zip(pending, statements, rows_per_query):
+                        req = requests[i]
+                        top_k = req.get("top_k", 5)
+                        if len(rows) < top_k and (req.get("domain") or req.get("area")):
+                            # 필터 검색 결과 부족 → pipeline 결과를 첫 검색으로 보고 재시도/exact scan만 실행
+                            rows = self._complete_filtered_rows(
+                                sql,
+                                params,
+                                rows,
+                                top_k,
+                                shape=filter_shape(req.get("domain"), req.get("area")),
+                            )
+                        documents = self._rows_to_documents(rows)
+                        results[i] = documents
+                        if cache_key is not None:
+                            self.semantic_cache.put(embeddings[i], cache_key, list(documents))
+
+            logger.info(
+                f"일괄 검색 완료: {len(requests)}개 쿼리 (DB 실행 {len(statements)}개, 캐시 {len(requests) - len(statements)}개)"
+            )
+            return [docs or [] for docs in results]
+
+        except Exception as e:
+            log_exception(
+                e,
+                context={"batch_size": len(requests)},
+                logger=logger,
+            )
+            raise
+
+    def _build_multi_domain_sql_and_params(
+        self,
+        domains: List[str],
+        embeddings: List[List[float]],
+        top_k: int,
+        area: Optional[str] = None,
+    ) -> tuple[str, list]:
+        """
+        (도메인, 쿼리 임베딩) 슬롯별 top_k를 한 번에 조회하는 SQL
+
+        슬롯 배열을 unnest하고 LATERAL 서브쿼리(ORDER BY distance LIMIT)로 슬롯마다 할당량만큼 가져온다.
+        슬롯별 ORDER BY ... LIMIT이라 ivfflat 인덱스를 그대로 사용한다.
+        """
+        area_sql, area_params = self._build_filter_clause(None, area)
+        sql = f"""
+            SELECT
+                q.slot,
+                r.*
+            FROM unnest(%s::int[], %s::text[], %s::vector[]) AS q(slot, domain, embedding)
+            CROSS JOIN LATERAL (
+                SELECT
+                    c.chunk_text,
+                    c.question,
+                    c.answer,
+                    c.domain,
+                    c.title,
+                    c.place_name,
+                    c.area,
+                    p.source_url,
+                    p.document_id,
+                    p.summary_text,
+                    (c.embedding <=> q.embedding) AS distance,
+                    (1 - (c.embedding <=> q.embedding)) AS similarity
+                FROM tourism_child c
+                JOIN tourism_parent p ON c.parent_id = p.id
+                WHERE c.domain = q.domain::domain_type{area_sql}
+                ORDER BY distance
+                LIMIT %s
+            ) r
+            ORDER BY q.slot, r.distance
+        """
+        params = [
+            list(range(len(domains))),
+            list(domains),
+            [str(embedding) for embedding in embeddings],
+            *area_params,
+            top_k,
+        ]
+        return sql, params
+
+    def search_domains(
+        self,
+        queries: Dict[str, str],
+        top_k: int = 5,
+        area: Optional[str] = None,
+        expansion: bool = False,
+    ) -> Dict[str, List[Document]]:
+        """
+        여러 도메인 동시 검색 (도메인별 top_k 할당)
+
+        - 도메인별 쿼리(expansion이면 변형 포함)를 한 번에 임베딩하고, 같은 텍스트는 한 번만 계산
+        - 캐시 미스 슬롯을 SQL 한 번(unnest + LATERAL)으로 조회, 결과 부족 슬롯만 단건 경로로 재시도
+          (재시도 실패 시 경고 후 첫 조회 결과 사용)
+        - expansion metrics는 슬롯별 실제 결과로 집계 (문서 있음 = success, 빈 결과/재시도 실패 = failure)
+        - expansion이면 도메인별 변형 결과를 fusion 전략으로 병합
+
+        Args:
+            queries: {도메인: 쿼리}
+            top_k: 도메인별 반환 문서 수
+            area: 지역 필터
+            expansion: Query Expansion 변형 검색 여부
+
+        Returns:
+            {도메인: Document 리스트} (queries 순서)
+        """
+        if not isinstance(top_k, int) or top_k < 1 or top_k > 50:
+            raise ValueError("top_k는 1~50 사이의 정수여야 합니다.")
+        for query in queries.values():
+            if not query or len(query.strip()) < 2:
+                raise ValueError("쿼리는 최소 2자 이상이어야 합니다.")
+        if not queries:
+            return {}
+
+        try:
+            start_time = time.perf_counter()
+            shape = "multi_domain"
+            slots: List[tuple[str, str]] = []
+            for domain, query in queries.items():
+                variants = generate_variations(query) if expansion else [query.strip()]
+                slots.extend((domain, variant) for variant in variants)
+            logger.info(f"다중 도메인 검색 시작: domains={list(queries)}, slots={len(slots)}, area={area}")
+
+            with track_stage("embed", shape):
+                embeddings = self._embed_batch([variant for _, variant in slots])
+
+            slot_docs: List[Optional[List[Document]]] = [None] * len(slots)
+            cache_keys: List[Optional[tuple]] = [None] * len(slots)
+            pending: List[int] = []
+            for i, ((domain, _), embedding) in enumerate(zip(slots, embeddings)):
+                if self.semantic_cache is not None:
+                    cache_keys[i] = SemanticCache.make_key("search", top_k=top_k, domain=domain, area=area)
+                    cached = self.semantic_cache.get(embedding, cache_keys[i])
+                    if cached is not None:
+                        slot_docs[i] = list(cached)
+                        continue
+                pending.append(i)
+
+            if pending:
+                sql, params = self._build_multi_domain_sql_and_params(
+                    [slots[i][0] for i in pending],
+                    [embeddings[i] for i in pending],
+                    top_k,
+                    area,
+                )
+                rows = self._execute_search(sql, params, shape=shape, settings=self.filter_policy.index_settings())
+                rows_by_slot: Dict[int, list] = {n: [] for n in range(len(pending))}
+                for row in rows:
+                    rows_by_slot[row[0]].append(tuple(row[1:]))
+
+                with track_stage("materialize", shape):
+                    for n, i in enumerate(pending):
+                        slot_rows = rows_by_slot[n]
+                        failed = False
+                        if len(slot_rows) < top_k:
+                            # 필터 통과 행 부족 → 단건 경로의 재시도/exact scan 적용
+                            try:
+                                slot_rows = self._search_rows(
+                                    embeddings[i],
+                                    top_k,
+                                    slots[i][0],
+                                    area,
+                                    shape=filter_shape(slots[i][0], area),
+                                )
+                            except Exception as exc:  # pylint: disable=broad-except
+                                # 한 슬롯의 재시도가 실패해도 나머지 도메인 결과는 반환
+                                failed = True
+                                logger.warning(f"슬롯 재시도 실패: domain={slots[i][0]}, query={slots[i][1]}: {exc}")
+                        slot_docs[i] = self._rows_to_documents(slot_rows)
+                        if cache_keys[i] is not None and not failed:
+                            self.semantic_cache.put(embeddings[i], cache_keys[i], list(slot_docs[i]))
+
+            results: Dict[str, List[Document]] = {}
+            for domain in queries:
+                per_variant = [slot_docs[i] or [] for i, (d, _) in enumerate(slots) if d == domain]
+                results[domain] = (
+                    self._fuse_variant_results(per_variant, top_k) if len(per_variant) > 1 else per_variant[0]
+                )
+
+            if expansion:
+                success_count = sum(1 for docs in slot_docs if docs)
+                record_expansion_metrics({
+                    "variants": [variant for _, variant in slots],
+                    "success_count": success_count,
+                    "failure_count": len(slots) - success_count,
+                    "retrieved": sum(len(docs) for docs in results.values()),
+                    "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                })
+            logger.info(
+                f"다중 도메인 검색 완료: slots={len(slots)} (DB {len(pending)}, 캐시 {len(slots) - len(pending)})"
+            )
+            return results
+
+        except Exception as e:
+            log_exception(
+                e,
+                context={"domains": list(queries), "top_k": top_k, "area": area},
+                logger=logger,
+            )
+            raise
+
+    def _fuse_variant_results(self, all_results: List[List[Document]], top_k: int) -> List[Document]:
+        """
+        변형별 검색 결과를 fusion 전략(config/query_expansion.json의 fusion)으로 병합하여 top_k 반환
+        """
+        fusion_config = load_query_expansion_config()["fusion"]
+        return fuse_results(
+            all_results,
+            top_k,
+            strategy=fusion_config["strategy"],
+            rrf_k=fusion_config["rrf_k"],
+            weights=fusion_config["weights"],
         )
-        return docs[:top_k]
 
     async def search_async(
         self,
@@ -305,11 +844,12 @@ class Retriever:
         Returns:
             검색된 Document 리스트
         """
-        # 동기 search를 asyncio에서 실행
+        # 동기 search를 asyncio에서 실행 (요청 컨텍스트/메트릭 라벨 전달)
         loop = asyncio.get_event_loop()
+        ctx = contextvars.copy_context()
         return await loop.run_in_executor(
             None,
-            lambda: self.search(query, top_k, domain, area)
+            lambda: ctx.run(self.search, query, top_k, domain, area)
         )
 
     def search_with_expansion(
@@ -321,15 +861,13 @@ class Retriever:
         variations: Optional[List[str]] = None,
     ) -> List[Document]:
         """
-        간단한 Query Expansion을 적용한 검색
+        간단한 Query Expansion을 적용한 검색 (순차 실행)
 
-        전략(간단 버전):
-        - 기본 쿼리
-        - 구두점 제거 버전
-        - 추천어 추가(예: 'おすすめ')
-        - 사용자 제공 variations 병합
+        전략:
+        - generate_variations로 변형 생성 (기본 쿼리, 구두점 제거, 접미어, 사용자 제공 variations)
+        - 변형별 검색 결과를 fusion 전략(max_sim / rrf / weighted_sum)으로 병합
 
-        반환: 중복 Document는 document_id 기준으로 제거하고 similarity가 높은 순으로 정렬하여 top_k 반환
+        반환: 중복 Document는 document_id 기준으로 제거하고 fusion 점수가 높은 순으로 top_k 반환
         """
         if not query or len(query.strip()) < 2:
             raise ValueError("쿼리는 최소 2자 이상이어야 합니다.")
@@ -341,35 +879,11 @@ class Retriever:
             "failure_count": 0,
         }
 
-        # 결과 수집: key by document_id (metadata.document_id)
         all_results = []
         start_time = time.perf_counter()
-        # 기본 변형 리스트 생성
-        vars_to_try = [query.strip()]
-
-        # 일본어 및 일반 구두점 제거 (안전한 방식)
-        # 일본어 구두점: 、。！？「」『』（）［］【】〈〉《》
-        # 일반 구두점: ,.!?;:'"()[]{}
-        punctuation_chars = "、。！？「」『』（）［］【】〈〉《》,.!?;:'\"()[]{}…"
-        punct_removed = "".join(ch for ch in query if ch not in punctuation_chars)
-        if punct_removed and punct_removed.strip() and punct_removed not in vars_to_try:
-            vars_to_try.append(punct_removed.strip())
-
-        # 추천어 추가 (간단한 힌트)
-        if "おすすめ" not in query:
-            vars_to_try.append(query + " おすすめ")
-
-        # 사용자 지정 변형이 있다면 포함
-        if variations:
-            for v in variations:
-                if v and v not in vars_to_try:
-                    vars_to_try.append(v)
 
         logger.info(f"Query Expansion: variants={vars_to_try}")
 
-        # 결과 수집: key by document_id (metadata.document_id)
-        merged = {}
-
         for qv in vars_to_try:
             try:
                 results = self.search(query=qv, top_k=top_k, domain=domain, area=area)
@@ -380,17 +894,14 @@ class Retriever:
                 metrics["failure_count"] = int(metrics["failure_count"] or 0) + 1
                 continue
 
-        # 중복 제거 및 병합
-        merged = self._merge_documents_by_similarity(all_results)
-        
-        # 정렬 및 top_k 선택
+        # 중복 제거 + fusion 점수 기준 top_k 선택
+        docs = self._fuse_variant_results(all_results, top_k)
         duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
-        docs = self._sort_and_limit_by_similarity(merged, top_k)
         
         metrics["retrieved"] = len(docs)
         metrics["duration_ms"] = duration_ms
         logger.info(f"Query Expansion metrics: {metrics}")
-        self.last_expansion_metrics = metrics
+        record_expansion_metrics(metrics)
         return docs
 
     async def search_with_expansion_async(
@@ -453,35 +964,13 @@ class Retriever:
                 metrics["success_count"] = int(metrics["success_count"] or 0) + 1
                 all_results.append(result)
 
-        # 중복 제거 및 병합
-        merged = self._merge_documents_by_similarity(all_results)
-
-        # 정렬 및 top_k 선택
+        # 중복 제거 + fusion 점수 기준 top_k 선택
+        docs = self._fuse_variant_results(all_results, top_k)
         duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
-        docs = self._sort_and_limit_by_similarity(merged, top_k)
         
         metrics["retrieved"] = len(docs)
         metrics["duration_ms"] = duration_ms
         logger.info(f"Query Expansion async metrics: {metrics}")
         
-        self.last_expansion_metrics = metrics
+        record_expansion_metrics(metrics)
         return docs
-            except Exception:
-                # 한 변형이 실패해도 계속 진행
-                continue
-
-            for doc in results:
-                doc_id = doc.metadata.get("document_id") or doc.metadata.get("documentId")
-                # fallback: use page_content hash if no id
-                if not doc_id:
-                    doc_id = hash(doc.page_content)
-
-                # keep the highest similarity per document
-                prev = merged.get(doc_id)
-                sim = float(doc.metadata.get("similarity", 0.0))
-                if not prev or sim > prev.metadata.get("similarity", 0.0):
-                    merged[doc_id] = doc
-
-        # 정렬 및 top_k 선택
-        docs = sorted(merged.values(), key=lambda d: d.metadata.get("similarity", 0.0), reverse=True)
-        return docs[:top_k]
@@ -17,6 +17,12 @@ class DomainEnum(str, Enum):
     LEI = "lei"
 
 
+class GeneratorEnum(str, Enum):
+    """일정 생성 방식"""
+    LLM = "llm"
+    OPTIMIZER = "optimizer"
+
+
 class RAGQueryRequest(BaseModel):
     """RAG 질의 요청 모델"""
     question: str = Field(
@@ -51,6 +57,10 @@ class RAGQueryRequest(BaseModel):
         default=True,
         description="검색 결과에 parent summary(문서 요약)를 포함할지 여부"
     )
+    debug: bool = Field(
+        default=False,
+        description="True면 단계별 소요 시간(ms)을 metadata.timings_ms에 포함",
+    )
     
     @field_validator("question")
     @classmethod
@@ -93,6 +103,114 @@ class RAGQueryResponse(BaseModel):
         }
 
 
+class SearchHit(BaseModel):
+    """검색 결과 한 건 (LLM 없이 반환하는 compact 포맷)"""
+    document_id: Optional[str] = None
+    title: str = ""
+    place_name: str = ""
+    area: str = ""
+    domain: Optional[str] = None
+    similarity: float = 0.0
+    source_url: str = ""
+    summary: Optional[str] = Field(default=None, description="parent summary (parent_context=True일 때)")
+
+
+class RAGSearchRequest(BaseModel):
+    """검색 전용 요청 (LLM 미사용)"""
+    query: str = Field(..., min_length=2, max_length=500, description="검색 쿼리")
+    top_k: int = Field(default=5, ge=1, le=10, description="반환할 결과 개수")
+    domain: Optional[DomainEnum] = Field(default=None, description="도메인 필터")
+    area: Optional[str] = Field(default=None, description="지역 필터")
+    expansion: bool = Field(default=False, description="쿼리 확장 사용 여부")
+    expansion_variations: Optional[List[str]] = Field(
+        default=None,
+        description="사용자 정의 쿼리 변형 리스트 (선택)",
+    )
+    collapse: bool = Field(
+        default=True,
+        description="True면 같은 document_id의 chunk를 하나로 합침 (가장 높은 유사도 유지)",
+    )
+    parent_context: bool = Field(
+        default=False,
+        description="True면 각 결과에 parent summary 포함",
+    )
+
+    @field_validator("query")
+    @classmethod
+    def validate_query(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("query는 비어있을 수 없습니다.")
+        return v.strip()
+
+
+class RAGSearchResponse(BaseModel):
+    """검색 전용 응답"""
+    results: List[SearchHit] = Field(default_factory=list)
+    latency: float = Field(..., ge=0, description="처리 시간 (초)")
+    metadata: Optional[Dict[str, Any]] = Field(default=None, description="추가 메타데이터")
+
+
+class RAGSearchBatchItem(BaseModel):
+    """일괄 검색 요청의 개별 쿼리"""
+    query: str = Field(..., min_length=2, max_length=500, description="검색 쿼리")
+    top_k: int = Field(default=5, ge=1, le=10, description="검색할 문서 개수")
+    domain: Optional[DomainEnum] = Field(default=None, description="도메인 필터")
+    area: Optional[str] = Field(default=None, description="지역 필터")
+
+    @field_validator("query")
+    @classmethod
+    def validate_query(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("query는 비어있을 수 없습니다.")
+        return v.strip()
+
+
+class RAGSearchBatchRequest(BaseModel):
+    """일괄 검색 요청 (카테고리 페이지 사전 로딩 등)"""
+    queries: List[RAGSearchBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="검색 쿼리 목록 (최대 50개)",
+    )
+    parent_context: bool = Field(
+        default=False,
+        description="True면 각 결과에 parent summary 포함",
+    )
+
+
+class RAGSearchBatchResult(BaseModel):
+    """일괄 검색 결과 (요청 순서 유지)"""
+    query: str
+    results: List[SearchHit] = Field(default_factory=list)
+
+
+class RAGSearchBatchResponse(BaseModel):
+    """일괄 검색 응답"""
+    results: List[RAGSearchBatchResult] = Field(default_factory=list)
+    latency: float = Field(..., ge=0, description="처리 시간 (초)")
+
+
+class AnswerCacheInvalidateRequest(BaseModel):
+    """답변 캐시 무효화 요청 (청크 재임베딩 후 호출)"""
+    document_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        description="재임베딩된 문서 ID 목록",
+    )
+
+
+class AnswerCacheInvalidateResponse(BaseModel):
+    """답변 캐시 무효화 결과"""
+    invalidated: int = Field(..., ge=0, description="삭제된 답변 캐시 엔트리 수")
+    semantic_invalidated: int = Field(default=0, ge=0, description="삭제된 Semantic Cache(search/answer) 엔트리 수")
+    scope: str = Field(
+        default="cluster",
+        description="무효화 범위 (cluster: 모든 워커, worker: 요청을 처리한 워커의 프로세스 로컬 캐시만)",
+    )
+    note: Optional[str] = Field(default=None, description="scope=worker일 때 다른 워커 캐시 처리 안내")
+
+
 class HealthCheckResponse(BaseModel):
     """헬스 체크 응답"""
     status: str = Field(default="healthy")
@@ -173,6 +291,14 @@ class ItineraryRecommendationRequest(BaseModel):
         default=True,
         description="Query Expansion 사용 여부",
     )
+    generator: GeneratorEnum = Field(
+        default=GeneratorEnum.LLM,
+        description="일정 생성 방식 (llm: LLM 생성, optimizer: LLM 없는 결정적 최적화)",
+    )
+    llm_descriptions: bool = Field(
+        default=False,
+        description="optimizer 모드에서 장소 설명만 LLM으로 작성할지 여부",
+    )
 
     @field_validator("region")
     @classmethod
@@ -213,6 +339,12 @@ class ItineraryStructuredResponse(BaseModel):
 class ChatRequest(BaseModel):
     """통합 채팅 요청"""
     text: str = Field(..., min_length=1, description="사용자 메시지")
+    session_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=64,
+        description="대화 세션 ID (있으면 이전 대화를 이어서 처리)",
+    )
     
     @field_validator("text")
     @classmethod
@@ -0,0 +1,276 @@
+"""
+Semantic Cache
+쿼리 임베딩 기준 근사 중복 질의 결과 캐시 (In-memory, TTL + LRU)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import cache_entries, cache_hits, cache_misses
+
+
+logger = setup_logger()
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+# 같은 쿼리로 다시 저장할 때 기존 엔트리를 교체하는 기준 (사실상 동일 벡터)
+_REPLACE_THRESHOLD = 0.999
+
+
+@dataclass
+class _CacheEntry:
+    key: int
+    bucket: Hashable
+    vector: np.ndarray
+    value: Any
+    expires_at: float
+
+
+class _Bucket:
+    """
+    동일 필터 조합의 엔트리를 모아 둔 Flat 인덱스.
+    정규화된 벡터 행렬과 내적 한 번으로 최근접 엔트리를 찾는다.
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[int] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def add(self, key: int, vector: np.ndarray) -> None:
+        row = vector.reshape(1, -1)
+        self.matrix = row if self.matrix is None else np.vstack([self.matrix, row])
+        self.keys.append(key)
+
+    def remove(self, key: int) -> None:
+        idx = self.keys.index(key)
+        del self.keys[idx]
+        self.matrix = None if not self.keys else np.delete(self.matrix, idx, axis=0)
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if self.matrix is None or vector.shape[0] != self.matrix.shape[1]:
+            return None, 0.0
+        sims = self.matrix @ vector
+        idx = int(np.argmax(sims))
+        return self.keys[idx], float(sims[idx])
+
+
+class SemanticCache:
+    """
+    쿼리 임베딩 기반 Semantic Cache
+
+    - 필터(namespace, domain, area, top_k 등)가 같은 엔트리끼리만 비교
+    - cosine similarity가 threshold 이상이면 캐시 히트
+    - TTL 만료 및 max_entries 초과 시 LRU 순으로 제거
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold는 0보다 크고 1 이하여야 합니다.")
+        if max_entries < 1:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._next_key = 0
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, **filters: Any) -> Tuple:
+        """필터 조합을 해시 가능한 버킷 키로 변환"""
+        items = []
+        for name in sorted(filters):
+            value = filters[name]
+            if isinstance(value, list):
+                value = tuple(value)
+            items.append((name, value))
+        return (namespace, tuple(items))
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        arr = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(arr))
+        if norm == 0.0:
+            return arr
+        return arr / norm
+
+    def get(self, vector: Sequence[float], key: Tuple) -> Optional[Any]:
+        """
+        근사 중복 쿼리 조회
+
+        Args:
+            vector: 쿼리 임베딩
+            key: make_key()로 만든 필터 키
+
+        Returns:
+            캐시된 값 (없으면 None)
+        """
+        namespace = key[0]
+        query = self._normalize(vector)
+        with self._lock:
+            self._evict_expired()
+            bucket = self._buckets.get(key)
+            entry_key, similarity = (None, 0.0) if bucket is None else bucket.nearest(query)
+            if entry_key is None or similarity < self.threshold:
+                self._misses[namespace] = self._misses.get(namespace, 0) + 1
+                cache_misses.labels(namespace=namespace).inc()
+                return None
+
+            self._entries.move_to_end(entry_key)
+            self._hits[namespace] = self._hits.get(namespace, 0) + 1
+            cache_hits.labels(namespace=namespace).inc()
+            logger.debug(f"Semantic cache hit: namespace={namespace}, similarity={similarity:.4f}")
+            return self._entries[entry_key].value
+
+    def put(self, vector: Sequence[float], key: Tuple, value: Any) -> None:
+        """쿼리 임베딩과 결과를 저장 (거의 동일한 벡터가 있으면 교체)"""
+        query = self._normalize(vector)
+        with self._lock:
+            bucket = self._buckets.setdefault(key, _Bucket())
+            existing_key, similarity = bucket.nearest(query)
+            if existing_key is not None and similarity >= _REPLACE_THRESHOLD:
+                self._remove(existing_key)
+                bucket = self._buckets.setdefault(key, _Bucket())
+
+            entry_key = self._next_key
+            self._next_key += 1
+            self._entries[entry_key] = _CacheEntry(
+                key=entry_key,
+                bucket=key,
+                vector=query,
+                value=value,
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            bucket.add(entry_key, query)
+            self._resize(key[0], 1)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_documents(self, document_ids: Iterable[str]) -> int:
+        """
+        재임베딩된 문서를 참조하는 엔트리 삭제 (삭제된 엔트리 수 반환)
+
+        search 값(Document 리스트)은 metadata.document_id, answer 값은 sources로 비교한다.
+        """
+        targets = {str(doc_id) for doc_id in document_ids}
+        if not targets:
+            return 0
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if _value_document_ids(entry.value) & targets
+            ]
+            for entry_key in stale:
+                self._remove(entry_key)
+        if stale:
+            logger.info(f"Semantic cache 무효화: {len(stale)}건")
+        return len(stale)
+
+    def clear(self) -> None:
+        """모든 엔트리 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            for namespace in self._sizes:
+                self._sizes[namespace] = 0
+                cache_entries.labels(namespace=namespace).set(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """namespace별 히트율 통계"""
+        with self._lock:
+            namespaces = sorted(set(self._hits) | set(self._misses))
+            result: Dict[str, Any] = {"entries": len(self._entries)}
+            for namespace in namespaces:
+                hits = self._hits.get(namespace, 0)
+                misses = self._misses.get(namespace, 0)
+                total = hits + misses
+                result[namespace] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / total, 4) if total else 0.0,
+                }
+            return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, entry_key: int) -> None:
+        entry = self._entries.pop(entry_key)
+        bucket = self._buckets[entry.bucket]
+        bucket.remove(entry_key)
+        if not bucket.keys:
+            del self._buckets[entry.bucket]
+        self._resize(entry.bucket[0], -1)
+
+    def _resize(self, namespace: str, delta: int) -> None:
+        self._sizes[namespace] = self._sizes.get(namespace, 0) + delta
+        cache_entries.labels(namespace=namespace).set(self._sizes[namespace])
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, entry in self._entries.items() if entry.expires_at <= now]
+        for entry_key in expired:
+            self._remove(entry_key)
+
+
+def _value_document_ids(value: Any) -> Set[str]:
+    """캐시 값이 참조하는 document_id 집합 (search: Document 리스트, answer: {"sources": [...]})"""
+    if isinstance(value, dict):
+        return {str(doc_id) for doc_id in value.get("sources") or []}
+    if isinstance(value, (list, tuple)):
+        ids = set()
+        for doc in value:
+            doc_id = (getattr(doc, "metadata", None) or {}).get("document_id")
+            if doc_id:
+                ids.add(str(doc_id))
+        return ids
+    return set()
+
+
+def init_semantic_cache_from_env() -> Optional[SemanticCache]:
+    """
+    환경 변수 기반 Semantic Cache 생성
+
+    - SEMANTIC_CACHE_ENABLED: true/false (기본 false, 0.95 임계값을 실제 쿼리로 검증한 뒤 활성화)
+    - SEMANTIC_CACHE_THRESHOLD: cosine similarity 임계값 (기본 0.95)
+    - SEMANTIC_CACHE_MAX_ENTRIES: 최대 엔트리 수 (기본 1024)
+    - SEMANTIC_CACHE_TTL: TTL 초 (기본 300)
+    """
+    enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+    if not enabled:
+        logger.info("Semantic cache 비활성화")
+        return None
+
+    cache = SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_THRESHOLD)),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+    )
+    logger.info(
+        f"Semantic cache 초기화: threshold={cache.threshold}, "
+        f"max_entries={cache.max_entries}, ttl={cache.ttl_seconds}s"
+    )
+    return cache
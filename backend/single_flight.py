@@ -0,0 +1,118 @@
+"""
+Single-flight 요청 병합
+동일한 요청이 동시에 들어오면 진행 중인 계산 하나를 함께 기다려 결과를 공유
+
+축제 등으로 같은 질문이 같은 순간에 몰릴 때 임베딩/검색/LLM 호출을 한 번만 수행한다.
+결과 캐시가 아니므로 계산이 끝나면 키는 즉시 제거된다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from backend.utils.logger import setup_logger
+from backend.utils.metrics import Counter
+
+
+logger = setup_logger()
+
+single_flight_requests = Counter(
+    'single_flight_requests_total',
+    'Single-flight 요청 수 (role: leader=직접 계산, coalesced=진행 중 계산 공유)',
+    ['endpoint', 'role'],
+)
+
+
+def _normalize_text(value: str) -> str:
+    """NFKC + 공백 정리 + casefold (전각/반각, 연속 공백 차이 무시)"""
+    return " ".join(unicodedata.normalize("NFKC", value).split()).casefold()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _normalize_text(value)
+    if isinstance(value, dict):
+        return {key: _normalize(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def request_fingerprint(endpoint: str, payload: Dict[str, Any]) -> str:
+    """엔드포인트 + 정규화된 요청 본문 해시"""
+    raw = json.dumps(
+        {"endpoint": endpoint, "payload": _normalize(payload)},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Call:
+    task: "asyncio.Future[Any]"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    키별 in-flight 계산 공유
+
+    - 첫 요청(leader)이 계산 task를 만들고, 같은 키의 후속 요청은 그 task를 함께 await
+    - 호출자가 취소되어도 다른 대기자가 남아 있으면 계산은 계속되고, 대기자가 모두 떠나면 계산도 취소
+    - 계산 예외는 모든 대기자에게 그대로 전달
+    """
+
+    def __init__(self, endpoint: str = "default"):
+        self.endpoint = endpoint
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Returns:
+            (결과, shared) — shared는 다른 요청의 계산 결과를 공유한 경우 True
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, k=key, c=call: self._forget(k, c))
+        single_flight_requests.labels(
+            endpoint=self.endpoint,
+            role="coalesced" if shared else "leader",
+        ).inc()
+
+        call.waiters += 1
+        try:
+            # shield: 이 호출자의 취소가 공유 계산을 바로 취소하지 않도록 보호
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                logger.info(f"Single-flight 대기자 없음, 계산 취소: endpoint={self.endpoint}")
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+def init_single_flight_from_env(endpoint: str) -> Optional[SingleFlight]:
+    """SINGLE_FLIGHT_ENABLED: true/false (기본 true)"""
+    enabled = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+    return SingleFlight(endpoint) if enabled else None
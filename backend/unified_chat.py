@@ -2,18 +2,24 @@
 UnifiedChatHandler - Function Calling 통합 처리
 일반 대화, RAG 검색, 여행 일정을 하나로 통합
 """
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+import os
+from typing import Awaitable, Dict, Any, List, Optional, TypeVar
 from backend.llm_base import LLMClient
 from backend.retriever import Retriever
 from backend.itinerary import ItineraryPlanner
+from backend.conversation_memory import ConversationMemory
 from backend.function_tools import ALL_TOOLS
+from backend.intent_router import IntentRouter, RoutedIntent, find_areas
 from backend.schemas import ChatRequest, ItineraryStructuredResponse
 from backend.utils.logger import setup_logger
 
 
 logger = setup_logger()
 
+T = TypeVar("T")
+
 
 class UnifiedChatHandler:
     """통합 채팅 핸들러 - Function Calling 사용"""
@@ -22,61 +28,58 @@ class UnifiedChatHandler:
         self,
         llm_client: Optional[LLMClient] = None,
         retriever: Optional[Retriever] = None,
-        itinerary_recommender: Optional[ItineraryPlanner] = None
+        itinerary_recommender: Optional[ItineraryPlanner] = None,
+        deadline_seconds: Optional[float] = None,
+        intent_router: Optional[IntentRouter] = None,
+        fast_path_phrasing: Optional[bool] = None,
+        memory: Optional[ConversationMemory] = None,
     ):
         """
         Args:
             llm_client: LLM 클라이언트
             retriever: RAG 검색기
             itinerary_recommender: 일정 추천기
+            deadline_seconds: 요청 전체 deadline 초 (None이면 CHAT_DEADLINE_SECONDS, 기본 25, 0이면 없음)
+            intent_router: 규칙 기반 의도 라우터 (None이면 IntentRouter.from_env())
+            fast_path_phrasing: fast path 결과 메시지를 LLM 한 줄 응답으로 다듬을지 (None이면 CHAT_FAST_PATH_PHRASING, 기본 false)
+            memory: session_id별 대화 메모리 (None이면 단일 턴)
         """
         self.llm = llm_client or LLMClient()
         self.retriever = retriever
         self.itinerary = itinerary_recommender
+        if deadline_seconds is None:
+            deadline_seconds = float(os.getenv("CHAT_DEADLINE_SECONDS", "25"))
+        self.deadline_seconds = deadline_seconds if deadline_seconds > 0 else None
+        self.intent_router = intent_router if intent_router is not None else IntentRouter.from_env()
+        if fast_path_phrasing is None:
+            fast_path_phrasing = os.getenv("CHAT_FAST_PATH_PHRASING", "false").lower() in ("1", "true", "yes")
+        self.fast_path_phrasing = fast_path_phrasing
+        self.memory = memory
         
         logger.info("UnifiedChatHandler 초기화 완료")
     
     async def initialize(self):
-        """비동기 초기화"""
-        # 필요시 여기서 DB 연결 등 초기화
-        pass
+        """비동기 초기화 (대화 메모리 저장소 연결)"""
+        if self.memory is not None:
+            await self.memory.start()
     
     async def close(self):
-        """리소스 정리"""
-        pass
+        """리소스 정리 (대화 메모리 남은 기록 flush)"""
+        if self.memory is not None:
+            await self.memory.close()
 
     def _infer_area_from_text(self, text: str) -> Optional[str]:
-        """간단한 지역 키워드 추론 (실험적)"""
-        if not text:
-            return None
-        text_lower = text.lower()
-        candidates = [
-            ("서울", "서울"),
-            ("ソウル", "서울"),
-            ("seoul", "서울"),
-            ("부산", "부산"),
-            ("釜山", "부산"),
-            ("busan", "부산"),
-            ("제주", "제주"),
-            ("濟州", "제주"),
-            ("jeju", "제주"),
-            ("대전", "대전"),
-            ("daejeon", "대전"),
-            ("대구", "대구"),
-            ("daegu", "대구"),
-            ("광주", "광주"),
-            ("gwangju", "광주"),
-            ("인천", "인천"),
-            ("incheon", "인천"),
-        ]
-        for key, area in candidates:
-            if key in text or key in text_lower:
-                return area
-        return None
+        """지역 키워드 추론 (intent_router 지역 사전, 여러 개면 첫 번째)"""
+        areas = find_areas(text)
+        return areas[0] if areas else None
     
     async def handle_chat(self, request: ChatRequest) -> Dict[str, Any]:
         """
         통합 채팅 처리 - Function Calling으로 의도 파악
+
+        LLM이 반환한 tool call을 모두 동시에 실행하여 복합 의도("明洞のカフェと釜山のホテル")도 한 번에 응답한다.
+        전체 처리는 요청 deadline(CHAT_DEADLINE_SECONDS) 안에서 수행한다.
+        session_id가 있으면 대화 메모리(요약 + 최근 턴)를 프롬프트에 넣고, 응답 후 턴을 기록한다.
         
         Args:
             request: 채팅 요청
@@ -84,61 +87,213 @@ class UnifiedChatHandler:
         Returns:
             응답 dict
         """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds if self.deadline_seconds else None
         try:
-            # 1. 컨텍스트 구성
-            messages = self._build_messages(request)
+            # 0. 명확한 장소 검색은 Function Calling 없이 바로 검색 (fast path)
+            routed = self.intent_router.route(request.text) if self.intent_router and self.retriever else None
+            if routed is not None:
+                response = await self._within_deadline(self._handle_fast_path(routed), deadline)
+                self._remember(request, response)
+                return response
+
+            # 1. 컨텍스트 구성 (대화 메모리 포함)
+            history: List[Dict[str, str]] = []
+            if self.memory is not None and request.session_id:
+                context = await self._within_deadline(self.memory.load(request.session_id), deadline)
+                history = self.memory.history_messages(context)
+            messages = self._build_messages(request, history)
             
-            # 2. Function Calling 요청
+            # 2. Function Calling 요청 (비동기 클라이언트, hedging 적용)
             logger.info("Function Calling 요청 수신")
             
-            completion = self.llm.client.chat.completions.create(
-                model=self.llm.model,
-                messages=messages,
-                tools=ALL_TOOLS,
-                tool_choice="auto",
-                temperature=0.7
+            completion = await self._within_deadline(
+                self.llm.acomplete(
+                    call="chat_tools",
+                    messages=messages,
+                    tools=ALL_TOOLS,
+                    tool_choice="auto",
+                    temperature=0.7,
+                ),
+                deadline,
             )
             
             response_message = completion.choices[0].message
             
-            # 3. Function Call이 있는지 확인
+            # 3. Function Call이 있으면 모두 동시 실행
             if response_message.tool_calls:
-                tool_call = response_message.tool_calls[0]
-                function_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
-                # 원문 텍스트를 전달해 쿼리/영역 fallback에 활용
-                arguments.setdefault("user_text", request.text)
-                
-                logger.info(f"Function Called: {function_name}, args={arguments}")
-                
-                # 4. Function 실행
-                if function_name == "search_places":
-                    response = await self._handle_search_places(arguments)
-                else:
-                    response = {
-                        "message": "旅行日程の作成は /recommend/itinerary を呼び出してください。",
-                    }
+                results = await self._run_tool_calls(response_message.tool_calls, request.text, deadline)
+                response = self._merge_tool_results(results)
             else:
                 # 일반 대화
                 response = self._handle_general_chat(response_message.content)
             
-            # 5. chat_completion_id 추가
+            # 4. chat_completion_id 추가
             response["chat_completion_id"] = completion.id
             
+            self._remember(request, response)
             return response
+
+        except asyncio.TimeoutError:
+            logger.warning(f"채팅 deadline 초과: {self.deadline_seconds}s")
+            return {
+                "message": "応答に時間がかかっています。しばらくしてからもう一度お試しください。",
+                "timeout": True,
+            }
         
         except Exception as e:
             logger.error(f"채팅 처리 실패: {e}")
             return {
                 "message": f"처리 중 오류가 발생했습니다: {str(e)}"
             }
+
+    @staticmethod
+    async def _within_deadline(awaitable: Awaitable[T], deadline: Optional[float]) -> T:
+        """
+        loop 시각 기준 deadline까지 남은 시간으로 대기 (초과 시 asyncio.TimeoutError)
+
+        asyncio.timeout_at()은 Python 3.11 이상에만 있으므로 wait_for로 구현한다.
+        """
+        if deadline is None:
+            return await awaitable
+        remaining = deadline - asyncio.get_running_loop().time()
+        return await asyncio.wait_for(awaitable, max(0.0, remaining))
+
+    def _remember(self, request: ChatRequest, response: Dict[str, Any]) -> None:
+        """턴 기록 (메모리 버퍼에만 추가, MariaDB 기록은 백그라운드 배치)"""
+        if self.memory is None or not request.session_id or response.get("timeout"):
+            return
+        self.memory.append(request.session_id, request.text, response.get("message") or "")
+
+    async def _run_tool_calls(
+        self,
+        tool_calls: List[Any],
+        user_text: str,
+        deadline: Optional[float],
+    ) -> List[Dict[str, Any]]:
+        """
+        tool call 병렬 실행
+
+        deadline까지 끝나지 않은 호출은 취소하고 시간 초과 결과로 대체한다.
+        """
+        tasks = [
+            asyncio.ensure_future(self._run_tool_call(tool_call, user_text))
+            for tool_call in tool_calls
+        ]
+        timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"tool call deadline 초과: {len(pending)}/{len(tasks)}건 취소")
+
+        results = []
+        for task in tasks:
+            if task in pending:
+                results.append({
+                    "message": "時間内に検索が完了しませんでした。",
+                    "places": [],
+                    "timeout": True,
+                })
+            else:
+                results.append(task.result())
+        return results
+
+    async def _run_tool_call(self, tool_call: Any, user_text: str) -> Dict[str, Any]:
+        """tool call 1건 실행 (인자 파싱 실패/알 수 없는 도구도 결과 dict로 반환)"""
+        function_name = tool_call.function.name
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+        except json.JSONDecodeError:
+            logger.warning(f"tool call 인자 파싱 실패: {function_name}")
+            arguments = {}
+        # 원문 텍스트를 전달해 쿼리/영역 fallback에 활용
+        arguments.setdefault("user_text", user_text)
+
+        logger.info(f"Function Called: {function_name}, args={arguments}")
+
+        if function_name == "search_places":
+            return await self._handle_search_places(arguments)
+        return {
+            "message": "旅行日程の作成は /recommend/itinerary を呼び出してください。",
+        }
+
+    async def _handle_fast_path(self, routed: RoutedIntent) -> Dict[str, Any]:
+        """
+        규칙 기반 라우팅 결과 실행 (LLM 왕복 생략)
+
+        fast_path_phrasing이면 검색 결과를 짧은 한 줄 응답으로 다듬는다 (실패 시 기본 메시지 유지).
+        """
+        logger.info(f"Fast path: {routed.tool}, confidence={routed.confidence}, args={routed.arguments}")
+        response = await self._handle_search_places(routed.arguments)
+        response["route"] = "fast_path"
+        # Function Calling completion이 없으므로 id 없음
+        response["chat_completion_id"] = None
+        if self.fast_path_phrasing and response.get("places"):
+            response["message"] = await self._phrase_places(routed.arguments["user_text"], response)
+        return response
+
+    async def _phrase_places(self, user_text: str, response: Dict[str, Any]) -> str:
+        """검색 결과 요약 한 줄 생성 (도구 없이 짧은 completion 1회)"""
+        names = "、".join(place["name"] for place in response["places"] if place.get("name"))
+        try:
+            completion = await self.llm.acomplete(
+                call="chat_phrase",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "あなたは韓国旅行の専門アシスタントです。検索結果を紹介する一文を日本語で丁寧に返してください。",
+                    },
+                    {"role": "user", "content": f"質問: {user_text}\n検索結果: {names}"},
+                ],
+                temperature=0.3,
+                max_tokens=80,
+            )
+            return completion.choices[0].message.content or response["message"]
+        except Exception as e:
+            logger.warning(f"fast path 응답 문장 생성 실패, 기본 메시지 사용: {e}")
+            return response["message"]
+
+    def _merge_tool_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        tool call 결과 병합
+
+        1건이면 그대로 반환하고, 여러 건이면 message를 이어 붙이고 places는 document_id 기준 중복 제거한다.
+        호출별 결과는 results에 그대로 담는다.
+        """
+        if len(results) == 1:
+            return results[0]
+
+        places: List[Dict[str, Any]] = []
+        seen = set()
+        for result in results:
+            for place in result.get("places") or []:
+                key = place.get("document_id") or id(place)
+                if key in seen:
+                    continue
+                seen.add(key)
+                places.append(place)
+
+        merged: Dict[str, Any] = {
+            "message": "\n".join(r["message"] for r in results if r.get("message")),
+            "places": places,
+            "results": results,
+        }
+        if any(r.get("timeout") for r in results):
+            merged["timeout"] = True
+        return merged
     
-    def _build_messages(self, request: ChatRequest) -> List[Dict[str, str]]:
+    def _build_messages(
+        self,
+        request: ChatRequest,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> List[Dict[str, str]]:
         """
         메시지 컨텍스트 구성
         
         Args:
             request: 채팅 요청
+            history: 대화 메모리 messages (요약 system 메시지 + 최근 턴)
         
         Returns:
             메시지 리스트
@@ -149,12 +304,16 @@ class UnifiedChatHandler:
                 "content": """あなたは韓国旅行の専門アシスタントです。常に日本語で丁寧に回答してください。ツールを呼ぶとき 아래 지침을 따르세요:
 1) 위치/지역 추출: 한국어·일본어·영어로 등장하는 도시/지역(서울, 釜山, 제주 등)을 모두 감지해 area/region에 설정합니다. 없으면 user_text에서 추론합니다.
 2) 검색 쿼리: query에는 원문 텍스트를 그대로 사용하고, top_k는 3으로 설정합니다.
+   여러 의도가 섞여 있으면(예: 明洞のカフェと釜山のホテル) 의도마다 search_places를 따로 호출하고, 각 query에는 해당 부분(明洞のカフェ / 釜山のホテル)만 사용합니다.
 3) 도메인: 요청에 음식/카페/쇼핑/자연/역사 등이 있으면 domain에 반영합니다(없으면 비워둠).
 4) 정보 부족: 지역이 전혀 언급되지 않았고 추론도 어렵다면, 먼저 짧게 어느 지역을 원하는지 물어봅니다.
 5) 응답 형식: /chat 응답에는 message와 places 배열(이름, 지역, document_id)만 포함되도록 도와주세요."""
             }
         ]
 
+        # 이전 대화 (요약 + 최근 턴)
+        messages.extend(history or [])
+
         # 현재 메시지
         messages.append({"role": "user", "content": request.text})
         
@@ -188,8 +347,9 @@ class UnifiedChatHandler:
                     "message": "検索クエリをもう少し具体的に入力してください。"
                 }
             
-            # RAG 검색
-            results = self.retriever.search(
+            # RAG 검색 (동기 검색을 스레드에서 실행하여 이벤트 루프를 막지 않음)
+            results = await asyncio.to_thread(
+                self.retriever.search,
                 query=query,
                 top_k=top_k,
                 domain=domain,
@@ -219,7 +379,8 @@ class UnifiedChatHandler:
                 
                 return {
                     "message": message,
-                    "places": places
+                    "places": places,
+                    "query": query,
                 }
             else:
                 return {
@@ -0,0 +1,132 @@
+"""
+Prometheus 메트릭 공용 모듈
+prometheus_client 미설치 환경에서도 import 가능하도록 No-Op 대체 구현을 제공
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_fastapi_instrumentator import Instrumentator
+except ImportError:  # pragma: no cover - 옵셔널 의존성 미설치 시 대체
+    class _NoOpMetric:
+        def __init__(self, *_, **__):
+            pass
+
+        def labels(self, *_, **__):
+            return self
+
+        def observe(self, *_, **__):
+            return None
+
+        def inc(self, *_, **__):
+            return None
+
+        def dec(self, *_, **__):
+            return None
+
+        def set(self, *_, **__):
+            return None
+
+    class _NoOpInstrumentator:
+        def instrument(self, app):
+            return self
+
+        def expose(self, app, endpoint="/metrics"):
+            return self
+
+    Counter = Histogram = Gauge = _NoOpMetric
+    generate_latest = lambda *_, **__: b""  # type: ignore[var-annotated]
+    CONTENT_TYPE_LATEST = "text/plain"
+    Instrumentator = _NoOpInstrumentator  # type: ignore[assignment]
+
+
+# 캐시 메트릭 (namespace: search / answer)
+cache_hits = Counter('cache_hits_total', '캐시 히트 수', ['namespace'])
+cache_misses = Counter('cache_misses_total', '캐시 미스 수', ['namespace'])
+cache_entries = Gauge('cache_entries', '캐시에 저장된 엔트리 수', ['namespace'])
+
+
+# RAG 단계별 메트릭 (embed, pool_wait, sql, materialize, chain)
+STAGE_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+rag_stage_duration = Histogram(
+    'rag_stage_duration_seconds',
+    'RAG 단계별 실행 시간 (초)',
+    ['stage', 'endpoint', 'filter_shape'],
+    buckets=STAGE_BUCKETS,
+)
+rag_stage_calls = Counter(
+    'rag_stage_calls_total',
+    'RAG 단계별 호출 수',
+    ['stage', 'endpoint', 'filter_shape', 'status'],
+)
+
+# 요청 단위 컨텍스트 (엔드포인트 라벨, debug 시 단계별 누적 시간)
+_endpoint_var: ContextVar[str] = ContextVar("rag_endpoint", default="internal")
+_timings_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("rag_stage_timings", default=None)
+
+
+def filter_shape(domain: Optional[str] = None, area: Optional[str] = None) -> str:
+    """필터 조합을 저카디널리티 라벨로 변환 (none/domain/area/domain+area)"""
+    if domain and area:
+        return "domain+area"
+    if domain:
+        return "domain"
+    if area:
+        return "area"
+    return "none"
+
+
+@contextmanager
+def bind_request(endpoint: str, collect_timings: bool = False) -> Iterator[Optional[Dict[str, float]]]:
+    """
+    요청 컨텍스트 바인딩
+
+    Args:
+        endpoint: 메트릭 endpoint 라벨
+        collect_timings: True면 단계별 누적 시간(ms)을 dict로 수집
+
+    Yields:
+        단계별 시간 dict (collect_timings=False면 None)
+    """
+    timings: Optional[Dict[str, float]] = {} if collect_timings else None
+    endpoint_token = _endpoint_var.set(endpoint)
+    timings_token = _timings_var.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings_var.reset(timings_token)
+        _endpoint_var.reset(endpoint_token)
+
+
+def current_endpoint() -> str:
+    """현재 요청 컨텍스트의 endpoint 라벨 (바인딩 없으면 internal)"""
+    return _endpoint_var.get()
+
+
+def record_stage(stage: str, seconds: float, shape: str = "none", status: str = "ok") -> None:
+    """단계 실행 시간을 Histogram/Counter 및 요청 컨텍스트에 기록"""
+    endpoint = _endpoint_var.get()
+    rag_stage_duration.labels(stage=stage, endpoint=endpoint, filter_shape=shape).observe(seconds)
+    rag_stage_calls.labels(stage=stage, endpoint=endpoint, filter_shape=shape, status=status).inc()
+    timings = _timings_var.get()
+    if timings is not None:
+        # 병렬 실행(Query Expansion 등)은 누적 시간으로 합산
+        timings[stage] = round(timings.get(stage, 0.0) + seconds * 1000, 2)
+
+
+@contextmanager
+def track_stage(stage: str, shape: str = "none") -> Iterator[None]:
+    """with 블록 실행 시간을 단계 메트릭으로 기록"""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        record_stage(stage, time.perf_counter() - start, shape, status)
@@ -0,0 +1,74 @@
+"""
+Fusion 마이크로 벤치마크
+
+Query Expansion 변형 6개 × top_k 결과를 병합하는 비용을 전략별로 측정한다.
+비교 기준(legacy)은 기존 dict 루프 병합 + 전체 정렬 방식.
+
+Usage:
+    python scripts/benchmark_fusion.py
+    python scripts/benchmark_fusion.py --variants 6 --top-k 10 --repeat 5000
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langchain.schema import Document
+
+from backend.fusion import FUSION_STRATEGIES, document_key, fuse_results
+
+
+def legacy_merge(all_results, top_k):
+    """기존 방식: document_id별 최대 similarity dict + 전체 정렬"""
+    merged = {}
+    for results in all_results:
+        for doc in results:
+            doc_id = document_key(doc)
+            prev = merged.get(doc_id)
+            sim = float(doc.metadata.get("similarity", 0.0))
+            if not prev or sim > prev.metadata.get("similarity", 0.0):
+                merged[doc_id] = doc
+    docs = sorted(merged.values(), key=lambda d: d.metadata.get("similarity", 0.0), reverse=True)
+    return docs[:top_k]
+
+
+def make_ranked_lists(variants, top_k, overlap, seed=42):
+    """변형별 결과 생성 (overlap 비율만큼 공통 문서 풀에서 선택)"""
+    rng = random.Random(seed)
+    pool_size = max(top_k, int(top_k * variants * (1 - overlap)) + top_k)
+    ranked = []
+    for _ in range(variants):
+        ids = rng.sample(range(pool_size), top_k)
+        sims = sorted((rng.uniform(0.6, 0.95) for _ in ids), reverse=True)
+        ranked.append([
+            Document(page_content=f"doc {i}", metadata={"document_id": f"J_DOC_{i}", "similarity": s})
+            for i, s in zip(ids, sims)
+        ])
+    return ranked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusion 전략별 병합 비용 측정")
+    parser.add_argument("--variants", type=int, default=6)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--overlap", type=float, default=0.5, help="변형 간 문서 중복 비율 (0~1)")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"variants={args.variants}, overlap={args.overlap}, repeat={args.repeat}")
+    print(f"{'top_k':>5} {'strategy':>13} {'µs/merge':>10}")
+    for top_k in args.top_k:
+        ranked = make_ranked_lists(args.variants, top_k, args.overlap)
+        cases = {"legacy": lambda: legacy_merge(ranked, top_k)}
+        for strategy in FUSION_STRATEGIES:
+            cases[strategy] = lambda s=strategy: fuse_results(ranked, top_k, strategy=s)
+        for name, fn in cases.items():
+            seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+            print(f"{top_k:>5} {name:>13} {seconds * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+OpenAI 호환 스텁 서버 (부하 테스트용)
+
+실제 OpenAI 비용 없이 /v1/chat/completions 지연 분포를 재현한다.
+
+- 첫 토큰 지연(TTFT): 로그정규 분포 (--ttft-ms 중앙값, --ttft-sigma)
+- 생성 속도: 정규 분포 토큰/초 (--tokens-per-sec, --tokens-per-sec-jitter)
+- tools가 있으면 --tool-call-rate 확률로 search_places tool call 반환
+- response_format=json_schema(Structured Outputs)면 스키마를 만족하는 JSON 생성
+- ItineraryPlanner 프롬프트("itineraries" JSON 형식)면 후보 스팟으로 일정 JSON 생성
+- stream=True면 SSE 청크를 토큰 속도에 맞춰 전송
+
+Usage:
+    python scripts/loadtest/fake_openai.py --port 8900 --ttft-ms 400 --tokens-per-sec 60
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=sk-fake uvicorn backend.main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+FILLER_TOKENS = [
+    "この", "エリア", "には", "地元", "で", "人気", "の", "お店", "が", "多く",
+    "、", "週末", "は", "混雑", "します", "。", "おすすめ", "は", "午前中", "の",
+    "訪問", "です", "。", "アクセス", "も", "便利", "で", "観光客", "に", "好評", "です", "。",
+]
+CANDIDATE_PATTERN = re.compile(r"^- id:(\S+) name:(.+?) domain:(\S*)", re.MULTILINE)
+DAYS_PATTERN = re.compile(r"dayの数は(\d+)日")
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """지연/응답 분포 설정"""
+    ttft_ms: float = 400.0
+    ttft_sigma: float = 0.5
+    tokens_per_sec: float = 60.0
+    tokens_per_sec_jitter: float = 15.0
+    min_tokens: int = 40
+    max_tokens: int = 160
+    tool_call_rate: float = 0.8
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+def approx_tokens(text: str) -> int:
+    """context_packer와 같은 근사 (ASCII 4자당 1토큰, 그 외 1자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def synthesize(schema: Dict[str, Any], defs: Dict[str, Any], depth: int = 0) -> Any:
+    """JSON schema를 만족하는 최소 예시 값 (Structured Outputs 응답용)"""
+    if "$ref" in schema:
+        return synthesize(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, depth)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [opt for opt in schema[key] if opt.get("type") != "null"] or schema[key]
+            return synthesize(options[0], defs, depth)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        return {
+            name: synthesize(prop, defs, depth + 1)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = max(int(schema.get("minItems", 0)), 2 if depth < 4 else 1)
+        return [synthesize(schema.get("items", {}), defs, depth + 1) for _ in range(count)]
+    if kind == "integer":
+        return int(schema.get("minimum", 1))
+    if kind == "number":
+        return float(schema.get("minimum", 1.0))
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return schema.get("title") or "サンプル"
+
+
+class FakeOpenAI:
+    """요청 본문 → 응답 내용 + 지연 샘플링"""
+
+    def __init__(self, config: FakeOpenAIConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.requests = 0
+
+    def ttft(self) -> float:
+        median = self.config.ttft_ms / 1000.0
+        return median * math.exp(self.rng.gauss(0.0, self.config.ttft_sigma))
+
+    def tokens_per_sec(self) -> float:
+        rate = self.rng.gauss(self.config.tokens_per_sec, self.config.tokens_per_sec_jitter)
+        return max(1.0, rate)
+
+    def text_tokens(self) -> List[str]:
+        count = self.rng.randint(self.config.min_tokens, self.config.max_tokens)
+        return [FILLER_TOKENS[i % len(FILLER_TOKENS)] for i in range(count)]
+
+    def build_message(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """assistant 메시지 (content 또는 tool_calls)"""
+        messages = body.get("messages") or []
+        prompt = "\n".join(str(m.get("content") or "") for m in messages if isinstance(m, dict))
+        last_user = next(
+            (str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"),
+            "",
+        )
+
+        tools = body.get("tools") or []
+        if tools and self.rng.random() < self.config.tool_call_rate:
+            function = tools[0].get("function", {})
+            arguments = {"query": last_user[:100] or "観光", "top_k": 3}
+            return {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {
+                        "name": function.get("name", "search_places"),
+                        "arguments": json.dumps(arguments, ensure_ascii=False),
+                    },
+                }],
+            }
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            content = json.dumps(synthesize(schema, schema.get("$defs", {})), ensure_ascii=False)
+            return {"role": "assistant", "content": content}
+
+        if '"itineraries"' in prompt:
+            return {"role": "assistant", "content": self.itinerary_json(prompt)}
+
+        return {"role": "assistant", "content": "".join(self.text_tokens())}
+
+    def itinerary_json(self, prompt: str) -> str:
+        """ItineraryPlanner 프롬프트의 후보 스팟으로 일정 JSON 구성"""
+        candidates = CANDIDATE_PATTERN.findall(prompt) or [("J_UNKNOWN", "スポット", "")]
+        match = DAYS_PATTERN.search(prompt)
+        days = int(match.group(1)) if match else 1
+        plan_days = []
+        for day in range(1, days + 1):
+            segments = []
+            for slot, time_label in enumerate(("午前", "午後")):
+                doc_id, name, _ = candidates[((day - 1) * 2 + slot) % len(candidates)]
+                segments.append({
+                    "time": time_label,
+                    "place_name": name.strip(),
+                    "description": f"{name.strip()}を訪問",
+                    "document_id": doc_id,
+                    "source_url": "",
+                    "area": "",
+                    "notes": "",
+                })
+            plan_days.append({"day": day, "segments": segments})
+        payload = {"itineraries": [{
+            "title": "おすすめプラン",
+            "summary": "候補スポットを巡るプランです。",
+            "days": plan_days,
+            "highlights": [c[1].strip() for c in candidates[:3]],
+            "estimated_budget": "standard",
+            "metadata": {},
+        }]}
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    """스텁 서버 FastAPI 앱"""
+    fake = FakeOpenAI(config or FakeOpenAIConfig())
+    app = FastAPI(title="Fake OpenAI")
+    app.state.fake = fake
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "fake"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": fake.requests, "config": asdict(fake.config)}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fake.requests += 1
+        if fake.rng.random() < fake.config.error_rate:
+            await asyncio.sleep(fake.ttft())
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"message": "fake overload", "type": "server_error"}},
+            )
+
+        model = body.get("model", "gpt-4o")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        message = fake.build_message(body)
+        prompt_tokens = sum(
+            approx_tokens(str(m.get("content") or "")) for m in body.get("messages") or []
+        )
+        content = message.get("content") or ""
+        completion_tokens = (
+            approx_tokens(content) if content
+            else approx_tokens(json.dumps(message.get("tool_calls"), ensure_ascii=False))
+        )
+        ttft = fake.ttft()
+        rate = fake.tokens_per_sec()
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + completion_tokens / rate)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                }],
+                "usage": _usage(prompt_tokens, completion_tokens),
+            }
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            if message.get("tool_calls"):
+                await asyncio.sleep(completion_tokens / rate)
+                tool_calls = [dict(call, index=i) for i, call in enumerate(message["tool_calls"])]
+                yield chunk({"tool_calls": tool_calls}, finish_reason="tool_calls")
+                pieces: List[str] = []
+            else:
+                # 대략 1토큰 크기 조각 (JSON은 4자, 일본어 본문은 2자)
+                step = 4 if content.startswith("{") else 2
+                pieces = [content[i:i + step] for i in range(0, len(content), step)]
+                for piece in pieces:
+                    await asyncio.sleep(1.0 / rate)
+                    yield chunk({"content": piece})
+                yield chunk({}, finish_reason="stop")
+            if include_usage:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": _usage(prompt_tokens, len(pieces) or completion_tokens),
+                }
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 스텁 서버")
+    defaults = FakeOpenAIConfig()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_ms, help="첫 토큰 지연 중앙값")
+    parser.add_argument("--ttft-sigma", type=float, default=defaults.ttft_sigma, help="로그정규 sigma")
+    parser.add_argument("--tokens-per-sec", type=float, default=defaults.tokens_per_sec)
+    parser.add_argument("--tokens-per-sec-jitter", type=float, default=defaults.tokens_per_sec_jitter)
+    parser.add_argument("--min-tokens", type=int, default=defaults.min_tokens)
+    parser.add_argument("--max-tokens", type=int, default=defaults.max_tokens)
+    parser.add_argument("--tool-call-rate", type=float, default=defaults.tool_call_rate)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="503 응답 비율")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main() -> None:
+    import uvicorn
+
+    args = build_parser().parse_args()
+    config = FakeOpenAIConfig(
+        ttft_ms=args.ttft_ms,
+        ttft_sigma=args.ttft_sigma,
+        tokens_per_sec=args.tokens_per_sec,
+        tokens_per_sec_jitter=args.tokens_per_sec_jitter,
+        min_tokens=args.min_tokens,
+        max_tokens=args.max_tokens,
+        tool_call_rate=args.tool_call_rate,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+오프라인 부하 테스트 드라이버
+
+/rag/query, /chat, /recommend/itinerary에 지정한 요청률(open-loop, 포아송 도착)로 요청을 보내고
+엔드포인트별 처리량과 p50/p95/p99 지연을 JSON으로 출력한다.
+
+- 지연은 예정 도착 시각부터 측정 (서버가 밀려도 coordinated omission 없이 대기 시간 포함)
+- --spawn: fake_openai 스텁 서버와 API(uvicorn)를 하위 프로세스로 띄워 OpenAI 비용 없이 실행
+- --baseline: 이전 결과 JSON과 비교하여 p95/p99/처리량 회귀가 허용치를 넘으면 종료 코드 1
+
+Usage:
+    python scripts/loadtest/seed_pgvector.py --reset
+    python scripts/loadtest/run_load.py --spawn --rate 20 --duration 60 --output bench.json
+    python scripts/loadtest/run_load.py --base-url http://localhost:8000 --baseline bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from seed_pgvector import AREA_LABELS, AREAS, DOMAIN_TOPICS, DOMAINS, QUESTION_TEMPLATES  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MIX = "rag_query=6,chat=3,itinerary=1"
+REGRESSION_METRICS = ("p95", "p99")
+
+
+# ========================================
+# 요청 생성
+# ========================================
+
+def _question(rng: random.Random) -> str:
+    domain = rng.choice(DOMAINS)
+    template = rng.choice(QUESTION_TEMPLATES)
+    return template.format(area=AREA_LABELS[rng.choice(AREAS)], topic=rng.choice(DOMAIN_TOPICS[domain]))
+
+
+def rag_query_payload(rng: random.Random) -> Dict[str, Any]:
+    return {"question": _question(rng), "top_k": 5}
+
+
+def chat_payload(rng: random.Random) -> Dict[str, Any]:
+    return {"text": _question(rng)}
+
+
+def itinerary_payload(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "region": rng.choice(AREAS),
+        "domains": rng.sample(DOMAINS, 2),
+        "duration_days": rng.randint(1, 3),
+    }
+
+
+ENDPOINTS: Dict[str, Tuple[str, Callable[[random.Random], Dict[str, Any]]]] = {
+    "rag_query": ("/rag/query", rag_query_payload),
+    "chat": ("/chat", chat_payload),
+    "itinerary": ("/recommend/itinerary", itinerary_payload),
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'rag_query=6,chat=3' → 가중치 dict"""
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"알 수 없는 엔드포인트: {name} (가능: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("mix 가중치 합이 0입니다.")
+    return mix
+
+
+class PayloadPool:
+    """
+    엔드포인트별 요청 본문 풀
+
+    pool_size개 본문을 미리 만들어 반복 사용한다 (작을수록 캐시/single-flight 적중 증가).
+    """
+
+    def __init__(self, mix: Dict[str, float], pool_size: int, seed: int):
+        self.rng = random.Random(seed)
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.names]
+        self.pools = {
+            name: [ENDPOINTS[name][1](self.rng) for _ in range(pool_size)]
+            for name in self.names
+        }
+
+    def next(self) -> Tuple[str, Dict[str, Any]]:
+        name = self.rng.choices(self.names, weights=self.weights)[0]
+        return name, self.rng.choice(self.pools[name])
+
+
+# ========================================
+# 집계
+# ========================================
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """선형 보간 백분위"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        ok = len(self.latencies_ms)
+        total = ok + self.errors
+
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+
+        return {
+            "requests": total,
+            "ok": ok,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "throughput_rps": round(ok / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "p50": rounded(percentile(self.latencies_ms, 50)),
+                "p95": rounded(percentile(self.latencies_ms, 95)),
+                "p99": rounded(percentile(self.latencies_ms, 99)),
+                "mean": rounded(sum(self.latencies_ms) / ok) if ok else None,
+                "max": rounded(max(self.latencies_ms)) if ok else None,
+            },
+            "status": dict(self.status),
+        }
+
+
+@dataclass
+class LoadConfig:
+    base_url: str
+    rate: float
+    duration: float
+    warmup: float = 5.0
+    mix: str = DEFAULT_MIX
+    pool_size: int = 200
+    max_in_flight: int = 256
+    timeout: float = 60.0
+    seed: int = 42
+
+
+async def run_load(config: LoadConfig) -> Dict[str, Any]:
+    """open-loop 부하 실행 → 결과 dict"""
+    started_at = datetime.now(timezone.utc).isoformat()
+    pool = PayloadPool(parse_mix(config.mix), config.pool_size, config.seed)
+    arrivals = random.Random(config.seed + 1)
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    dropped = 0
+    in_flight: set = set()
+    semaphore = asyncio.Semaphore(config.max_in_flight)
+
+    limits = httpx.Limits(max_connections=config.max_in_flight, max_keepalive_connections=config.max_in_flight)
+    async with httpx.AsyncClient(base_url=config.base_url, timeout=config.timeout, limits=limits) as client:
+
+        async def fire(name: str, payload: Dict[str, Any], scheduled: float, record: bool) -> None:
+            try:
+                response = await client.post(ENDPOINTS[name][0], json=payload)
+                status = str(response.status_code)
+                ok = response.is_success
+            except httpx.HTTPError as exc:
+                status, ok = type(exc).__name__, False
+            finally:
+                semaphore.release()
+            if not record:
+                return
+            entry = stats[name]
+            entry.status[status] += 1
+            if ok:
+                entry.latencies_ms.append((time.perf_counter() - scheduled) * 1000.0)
+            else:
+                entry.errors += 1
+
+        loop_start = time.perf_counter()
+        measure_start = loop_start + config.warmup
+        end = measure_start + config.duration
+        next_at = loop_start
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name, payload = pool.next()
+            record = next_at >= measure_start
+            if semaphore.locked():
+                # 동시 요청 상한 초과: 대기하지 않고 드롭으로 기록 (open-loop 유지)
+                dropped += record
+            else:
+                await semaphore.acquire()
+                task = asyncio.create_task(fire(name, payload, next_at, record))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            next_at += arrivals.expovariate(config.rate)
+
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=config.timeout)
+
+    # 처리량은 측정 구간에 도착 예정이던 요청 중 성공 수 / 측정 구간 길이
+    window = config.duration
+    endpoints = {name: stats[name].summary(window) for name in sorted(stats)}
+    total = EndpointStats()
+    for entry in stats.values():
+        total.latencies_ms.extend(entry.latencies_ms)
+        total.errors += entry.errors
+        for status, count in entry.status.items():
+            total.status[status] += count
+    return {
+        "started_at": started_at,
+        "config": asdict(config),
+        "dropped": dropped,
+        "endpoints": endpoints,
+        "total": total.summary(window),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """baseline 대비 회귀 목록 (지연 증가 또는 처리량 감소가 max_regression 비율 초과)"""
+    regressions = []
+    for name, current in result["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        for metric in REGRESSION_METRICS:
+            before = previous["latency_ms"].get(metric)
+            after = current["latency_ms"].get(metric)
+            if before and after and after > before * (1 + max_regression):
+                regressions.append(f"{name} {metric}: {before:.1f}ms → {after:.1f}ms")
+        before_rps = previous.get("throughput_rps") or 0
+        after_rps = current.get("throughput_rps") or 0
+        if before_rps and after_rps < before_rps * (1 - max_regression):
+            regressions.append(f"{name} throughput: {before_rps:.2f} → {after_rps:.2f} rps")
+        if current["error_rate"] > previous.get("error_rate", 0) + max_regression:
+            regressions.append(f"{name} error_rate: {previous.get('error_rate', 0):.2%} → {current['error_rate']:.2%}")
+    return regressions
+
+
+# ========================================
+# 스택 기동 (--spawn)
+# ========================================
+
+def _wait_ready(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"기동 대기 시간 초과: {url}")
+
+
+def spawn_stack(api_port: int, fake_port: int, fake_args: Sequence[str], ready_timeout: float) -> List[subprocess.Popen]:
+    """fake_openai + API 하위 프로세스 기동 (OPENAI_BASE_URL을 스텁으로 지정)"""
+    fake = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("fake_openai.py")), "--port", str(fake_port), *fake_args],
+        cwd=ROOT,
+    )
+    processes = [fake]
+    try:
+        _wait_ready(f"http://127.0.0.1:{fake_port}/v1/models", ready_timeout)
+        base = f"http://127.0.0.1:{fake_port}/v1"
+        env = dict(
+            os.environ,
+            OPENAI_BASE_URL=base,
+            OPENAI_API_BASE=base,
+            OPENAI_API_KEY=os.getenv("LOADTEST_OPENAI_API_KEY", "sk-fake"),
+        )
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(api_port), "--log-level", "warning"],
+            cwd=ROOT,
+            env=env,
+        )
+        processes.append(api)
+        _wait_ready(f"http://127.0.0.1:{api_port}/health", ready_timeout)
+    except Exception:
+        stop_stack(processes)
+        raise
+    return processes
+
+
+def stop_stack(processes: Sequence[subprocess.Popen]) -> None:
+    for process in reversed(processes):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="RAG API 오프라인 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=10.0, help="초당 요청 수 (포아송 도착)")
+    parser.add_argument("--duration", type=float, default=60.0, help="측정 구간 초")
+    parser.add_argument("--warmup", type=float, default=5.0, help="집계에서 제외할 워밍업 초")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="엔드포인트 가중치 (예: rag_query=6,chat=3,itinerary=1)")
+    parser.add_argument("--pool-size", type=int, default=200, help="엔드포인트별 요청 본문 종류 수")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 파일 (미지정 시 stdout)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="허용 회귀 비율 (기본 10%%)")
+    parser.add_argument("--spawn", action="store_true", help="fake_openai + API를 직접 기동")
+    parser.add_argument("--api-port", type=int, default=8010)
+    parser.add_argument("--fake-port", type=int, default=8900)
+    parser.add_argument("--fake-arg", action="append", default=[], help="fake_openai.py에 전달할 인자 (반복 가능)")
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    processes: List[subprocess.Popen] = []
+    base_url = args.base_url
+    if args.spawn:
+        fake_args = [token for arg in args.fake_arg for token in arg.split()]
+        processes = spawn_stack(args.api_port, args.fake_port, fake_args, args.ready_timeout)
+        base_url = f"http://127.0.0.1:{args.api_port}"
+
+    try:
+        config = LoadConfig(
+            base_url=base_url,
+            rate=args.rate,
+            duration=args.duration,
+            warmup=args.warmup,
+            mix=args.mix,
+            pool_size=args.pool_size,
+            max_in_flight=args.max_in_flight,
+            timeout=args.timeout,
+            seed=args.seed,
+        )
+        result = asyncio.run(run_load(config))
+    finally:
+        stop_stack(processes)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.max_regression)
+        for line in regressions:
+            print(f"회귀: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -74,6 +74,34 @@ async function queryRag(opts = {}) {
   return res.json();
 }
 
+/**
+ * 일괄 검색 엔드포인트 (LLM 미사용)
+ * 카테고리 페이지 사전 로딩 시 여러 쿼리를 한 번의 요청으로 검색합니다.
+ * queries: [{ query, top_k, domain, area }, ...] (최대 50개)
+ */
+async function searchBatch(opts = {}) {
+  const {
+    host = 'http://localhost:8000',
+    queries = [],
+    parent_context = false,
+  } = opts;
+
+  if (!queries.length) throw new Error('queries is required');
+
+  const res = await fetch(`${host}/rag/search/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ queries, parent_context }),
+  });
+
+  if (!res.ok) {
+    const txt = await res.text();
+    throw new Error(`Server error ${res.status}: ${txt}`);
+  }
+
+  return res.json();
+}
+
 /**
  * 여행 일정 추천 엔드포인트
  * POST /recommend (alias of /recommend/itinerary)
@@ -153,4 +181,4 @@ if (require.main === module) {
   })();
 }
 
-module.exports = { chat, queryRag, recommendItinerary };
+module.exports = { chat, queryRag, searchBatch, recommendItinerary };
@@ -0,0 +1,152 @@
+"""
+LLM 답변 캐시 테스트
+키 구성(모델/템플릿/질문/청크 순서·버전), LRU/TTL, 문서 단위 무효화, /rag/query cache_hit 검증
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.schema import Document
+
+from backend.answer_cache import AnswerCache, MemoryAnswerBackend, RedisAnswerBackend, init_answer_cache_from_env
+from backend.rag_chain import ainvoke_rag_chain
+
+
+def _doc(doc_id, content=None, **metadata):
+    return Document(page_content=content or f"{doc_id} 본문", metadata={"document_id": doc_id, **metadata})
+
+
+DOCS = [_doc("A"), _doc("B")]
+
+
+def test_key_depends_on_model_template_question_and_chunk_order():
+    cache = AnswerCache(MemoryAnswerBackend(), template_version="t1")
+    key = cache.make_key("gpt-4o", "서울 맛집", DOCS)
+
+    assert cache.make_key("gpt-4o", " 서울 맛집 ", DOCS) == key
+    assert cache.make_key("gpt-4o-mini", "서울 맛집", DOCS) != key
+    assert cache.make_key("gpt-4o", "부산 맛집", DOCS) != key
+    assert cache.make_key("gpt-4o", "서울 맛집", DOCS[::-1]) != key
+    assert AnswerCache(MemoryAnswerBackend(), template_version="t2").make_key("gpt-4o", "서울 맛집", DOCS) != key
+    # 재임베딩으로 청크 내용(버전)이 바뀌면 다른 키
+    assert cache.make_key("gpt-4o", "서울 맛집", [_doc("A", "수정된 본문"), DOCS[1]]) != key
+    assert cache.make_key("gpt-4o", "서울 맛집", [_doc("A", version=2), DOCS[1]]) != key
+
+
+def test_memory_backend_lru_ttl_and_invalidation():
+    backend = MemoryAnswerBackend(max_entries=2)
+    backend.set("k1", "답1", ["A"], ttl_seconds=60)
+    backend.set("k2", "답2", ["A", "B"], ttl_seconds=60)
+    assert backend.get("k1") == "답1"
+    backend.set("k3", "답3", ["C"], ttl_seconds=60)
+
+    # k2가 가장 오래 사용되지 않았으므로 제거
+    assert backend.get("k2") is None
+    assert backend.invalidate(["A"]) == 1
+    assert backend.get("k1") is None
+    assert backend.get("k3") == "답3"
+
+    backend.set("k4", "답4", ["D"], ttl_seconds=0)
+    assert backend.get("k4") is None
+
+
+def test_redis_backend_indexes_answers_by_document():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    backend = RedisAnswerBackend(client, prefix="test")
+
+    backend.set("abc", "답", ["A", "B"], ttl_seconds=120)
+    pipe.set.assert_called_once_with("test:answer:abc", "답", ex=120)
+    pipe.sadd.assert_any_call("test:answer_doc:A", "test:answer:abc")
+    pipe.execute.assert_called_once()
+
+    client.get.return_value = "답".encode("utf-8")
+    assert backend.get("abc") == "답"
+
+    client.smembers.side_effect = [{b"test:answer:abc"}, {b"test:answer:abc"}]
+    client.delete.return_value = 1
+    assert backend.invalidate(["A", "B"]) == 1
+    client.delete.assert_any_call("test:answer_doc:A", "test:answer_doc:B")
+
+
+def test_backend_errors_are_treated_as_miss():
+    backend = MagicMock()
+    backend.get.side_effect = ConnectionError("redis down")
+    backend.set.side_effect = ConnectionError("redis down")
+    cache = AnswerCache(backend, template_version="t1")
+
+    assert cache.get("key") is None
+    cache.put("key", "답", DOCS)
+
+
+def test_init_from_env(monkeypatch):
+    monkeypatch.delenv("ANSWER_CACHE_ENABLED", raising=False)
+    assert init_answer_cache_from_env("t1") is None
+
+    monkeypatch.setenv("ANSWER_CACHE_ENABLED", "true")
+    monkeypatch.setenv("ANSWER_CACHE_TTL", "60")
+    cache = init_answer_cache_from_env("t1")
+    assert isinstance(cache.backend, MemoryAnswerBackend)
+    assert cache.ttl_seconds == 60.0
+
+    monkeypatch.setenv("ANSWER_CACHE_BACKEND", "redis")
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    with pytest.raises(ValueError):
+        init_answer_cache_from_env("t1")
+
+
+def _fake_chain(answer="캐시 대상 답변"):
+    chain = MagicMock()
+    chain.retriever.ainvoke = AsyncMock(return_value=list(DOCS))
+    chain.combine_documents_chain.ainvoke = AsyncMock(return_value={"output_text": answer})
+    return chain
+
+
+def test_ainvoke_skips_llm_on_cache_hit():
+    chain = _fake_chain()
+    cache = AnswerCache(MemoryAnswerBackend(), template_version="t1")
+
+    first = asyncio.run(ainvoke_rag_chain(chain, "서울 맛집", answer_cache=cache, llm_model="gpt-4o"))
+    second = asyncio.run(ainvoke_rag_chain(chain, "서울 맛집", answer_cache=cache, llm_model="gpt-4o"))
+
+    assert (first["cache_hit"], second["cache_hit"]) == (False, True)
+    assert second["result"] == "캐시 대상 답변"
+    assert second["source_documents"] == DOCS
+    chain.combine_documents_chain.ainvoke.assert_awaited_once()
+
+
+def test_rag_query_reports_cache_hit_and_invalidation(monkeypatch):
+    import backend.main as main_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://answer-cache-test")
+    monkeypatch.setattr(main_module, "init_cache_from_env", lambda: None)
+    cache = AnswerCache(MemoryAnswerBackend(), template_version="t1")
+    monkeypatch.setattr(main_module, "init_answer_cache", lambda: cache)
+    monkeypatch.setattr(main_module, "Retriever", lambda **_: MagicMock())
+    monkeypatch.setattr(main_module, "ItineraryPlanner", lambda retriever, **_: MagicMock())
+    handler = MagicMock()
+    handler.initialize = AsyncMock()
+    handler.close = AsyncMock()
+    monkeypatch.setattr(main_module, "UnifiedChatHandler", lambda **_: handler)
+    chain = _fake_chain()
+    monkeypatch.setattr(main_module, "create_rag_chain", lambda **_: chain)
+
+    with TestClient(main_module.app) as client:
+        payload = {"question": "서울 맛집 추천", "top_k": 2}
+        first = client.post("/rag/query", json=payload).json()
+        second = client.post("/rag/query", json=payload).json()
+        invalidated = client.post("/rag/cache/invalidate", json={"document_ids": ["B"]}).json()
+        third = client.post("/rag/query", json=payload).json()
+
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert second["answer"] == first["answer"]
+    assert second["sources"] == ["A", "B"]
+    assert invalidated["invalidated"] == 1
+    # memory 백엔드는 이 워커에서만 삭제되므로 범위를 알려야 함
+    assert invalidated["scope"] == "worker"
+    assert "llm_answer" in invalidated["note"]
+    assert third["metadata"]["cache_hit"] is False
+    assert chain.combine_documents_chain.ainvoke.await_count == 2
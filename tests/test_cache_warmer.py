@@ -0,0 +1,173 @@
+"""
+Cache Warmer 테스트
+쿼리 로그 집계, 동시 실행 제한, 캐시 갱신(refresh_cache) 검증
+"""
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from langchain.schema import Document
+
+from backend.cache_warmer import (
+    CacheWarmer,
+    QueryLogWriter,
+    WarmTarget,
+    init_cache_warmer_from_env,
+    load_query_log,
+    rank_queries,
+)
+from backend.semantic_cache import SemanticCache
+
+
+def _write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n", encoding="utf-8")
+
+
+def test_rank_queries_counts_query_and_filter_combinations():
+    records = [
+        {"query": "明洞 グルメ", "domain": "food", "area": "서울"},
+        {"query": "明洞  グルメ", "domain": "food", "area": "서울"},
+        {"query": "明洞 グルメ", "domain": "food", "area": "서울"},
+        {"query": "釜山 海雲台", "area": "부산"},
+        {"query": "釜山 海雲台", "area": "부산"},
+        {"query": "明洞 グルメ"},
+        {"question": "済州 自然", "top_k": 3},
+        {"query": "x"},
+        {"note": "쿼리 없음"},
+    ]
+
+    targets = rank_queries(records, top_n=3)
+
+    assert targets[0] == WarmTarget("明洞 グルメ", 5, "food", "서울")
+    assert targets[1] == WarmTarget("釜山 海雲台", 5, None, "부산")
+    assert len(targets) == 3
+
+
+def test_query_log_round_trip_and_lookback(tmp_path):
+    log_path = tmp_path / "logs" / "queries.jsonl"
+    writer = QueryLogWriter(str(log_path))
+    writer.write("/rag/search", "明洞 グルメ", 5, "food", "서울")
+
+    with log_path.open("a", encoding="utf-8") as fp:
+        fp.write("not json\n")
+        fp.write(json.dumps({"ts": "2000-01-01T00:00:00+00:00", "query": "古い クエリ"}) + "\n")
+
+    records = load_query_log(str(log_path), lookback_seconds=3600)
+
+    assert [r["query"] for r in records] == ["明洞 グルメ"]
+    assert records[0]["domain"] == "food"
+    assert load_query_log(str(tmp_path / "missing.jsonl")) == []
+
+
+def test_query_log_rotates_and_reads_only_current_and_rotated_file(tmp_path):
+    log_path = tmp_path / "queries.jsonl"
+    writer = QueryLogWriter(str(log_path), max_bytes=300)
+    for i in range(10):
+        writer.write("/rag/search", f"クエリ {i}", 5)
+
+    rotated = tmp_path / "queries.jsonl.1"
+    assert rotated.exists()
+    assert log_path.stat().st_size < 300 and rotated.stat().st_size < 600
+    queries = [r["query"] for r in load_query_log(str(log_path))]
+    # 오래된 레코드는 회전으로 버려지고, 남은 레코드는 시간 순서
+    assert queries[-1] == "クエリ 9"
+    assert "クエリ 0" not in queries
+    assert queries == sorted(queries, key=lambda q: int(q.split()[1]))
+
+
+def test_warm_once_respects_concurrency_limit(tmp_path):
+    log_path = tmp_path / "queries.jsonl"
+    _write_jsonl(log_path, [{"query": f"クエリ {i}"} for i in range(6)])
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def slow_search(**kwargs):
+        assert kwargs["refresh_cache"] is True
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+        return []
+
+    retriever = Mock()
+    retriever.search = Mock(side_effect=slow_search)
+    warmer = CacheWarmer(retriever, str(log_path), top_n=10, concurrency=2)
+
+    summary = asyncio.run(warmer.warm_once())
+
+    assert summary["targets"] == 6
+    assert summary["warmed"] == 6
+    assert retriever.search.call_count == 6
+    assert state["peak"] <= 2
+
+
+def test_warm_once_counts_failures(tmp_path):
+    log_path = tmp_path / "queries.jsonl"
+    _write_jsonl(log_path, [{"query": "明洞 グルメ"}, {"query": "釜山 海雲台"}])
+
+    retriever = Mock()
+    retriever.search = Mock(side_effect=[[], RuntimeError("db down")])
+    warmer = CacheWarmer(retriever, str(log_path), concurrency=1)
+
+    summary = asyncio.run(warmer.warm_once())
+
+    assert summary["warmed"] == 1
+    assert summary["failed"] == 1
+
+
+def test_refresh_cache_bypasses_lookup_and_rewrites_entry():
+    """refresh_cache=True면 캐시를 읽지 않고 DB 결과로 엔트리를 갱신해야 한다."""
+    from backend.retriever import Retriever
+
+    mock_embeddings = Mock()
+    mock_embeddings.embed_query = Mock(return_value=[1.0, 0.0])
+    cache = SemanticCache(threshold=0.95)
+
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        mock_pool.return_value = MagicMock()
+        retriever = Retriever(
+            db_url="postgresql://warm-test",
+            embeddings_client=mock_embeddings,
+            semantic_cache=cache,
+        )
+
+    old = [Document(page_content="old", metadata={"document_id": "OLD"})]
+    new = [Document(page_content="new", metadata={"document_id": "NEW"})]
+    cache.put([1.0, 0.0], SemanticCache.make_key("search", top_k=5, domain=None, area=None), old)
+
+    with patch.object(retriever, "_execute_search", return_value=[]) as mock_execute, \
+            patch.object(retriever, "_rows_to_documents", return_value=new):
+        refreshed = retriever.search("明洞 グルメ", top_k=5, refresh_cache=True)
+        cached = retriever.search("明洞 グルメ", top_k=5)
+
+    assert mock_execute.call_count == 1
+    assert refreshed[0].metadata["document_id"] == "NEW"
+    assert cached[0].metadata["document_id"] == "NEW"
+    assert len(cache) == 1
+    retriever.close()
+
+
+def test_init_cache_warmer_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("CACHE_WARMER_INTERVAL", raising=False)
+    monkeypatch.setenv("CACHE_WARMER_ENABLED", "false")
+    assert init_cache_warmer_from_env(Mock(), cache_ttl=300) is None
+
+    monkeypatch.setenv("CACHE_WARMER_ENABLED", "true")
+    monkeypatch.delenv("CACHE_WARMER_LOG_PATH", raising=False)
+    monkeypatch.delenv("QUERY_LOG_PATH", raising=False)
+    assert init_cache_warmer_from_env(Mock(), cache_ttl=300) is None
+
+    monkeypatch.setenv("QUERY_LOG_PATH", str(tmp_path / "q.jsonl"))
+    # Semantic Cache 비활성화(cache_ttl=None)면 채울 캐시가 없으므로 생성하지 않음
+    assert init_cache_warmer_from_env(Mock(), cache_ttl=None) is None
+
+    warmer = init_cache_warmer_from_env(Mock(), cache_ttl=300)
+    assert warmer is not None
+    # TTL 만료 전에 갱신
+    assert warmer.interval_seconds == pytest.approx(240.0)
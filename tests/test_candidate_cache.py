@@ -0,0 +1,87 @@
+"""
+일정 후보 풀 캐시 테스트
+캐시 히트 시 검색 생략, 미스 도메인만 검색, 문서 ID 무효화, TTL, 시작 시 warm(중단 포함) 검증
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from langchain.schema import Document
+
+from backend.candidate_cache import CandidatePoolCache
+from backend.itinerary import ItineraryPlanner
+from backend.schemas import DomainEnum, ItineraryRecommendationRequest
+
+
+def _retriever():
+    retriever = MagicMock()
+    retriever.search_domains.side_effect = lambda queries, **_: {
+        domain: [Document(page_content=query, metadata={"document_id": f"{domain.upper()}_1", "domain": domain})]
+        for domain, query in queries.items()
+    }
+    return retriever
+
+
+def _request(domains, region="서울", days=2):
+    return ItineraryRecommendationRequest(region=region, domains=domains, duration_days=days)
+
+
+def test_second_request_reuses_pools_and_searches_only_missing_domains():
+    retriever = _retriever()
+    planner = ItineraryPlanner(retriever, candidate_cache=CandidatePoolCache())
+
+    stats = {}
+    planner._gather_candidates(_request([DomainEnum.FOOD]), stats)
+    assert stats == {"hits": 0, "misses": 1}
+
+    stats = {}
+    docs = planner._gather_candidates(_request([DomainEnum.FOOD, DomainEnum.SHOP], region=" 서울 "), stats)
+
+    assert stats == {"hits": 1, "misses": 1}
+    assert retriever.search_domains.call_args.args[0] == {"shop": "서울 shop"}
+    assert [d.metadata["document_id"] for d in docs] == ["FOOD_1", "SHOP_1"]
+
+
+def test_invalidation_and_ttl_drop_pools():
+    cache = CandidatePoolCache(ttl_seconds=0.05)
+    key = cache.make_key("Seoul", "food", 6, False)
+    cache.put(key, [Document(page_content="x", metadata={"document_id": "D1"})])
+
+    # 검색 area 필터가 대소문자를 구분하므로 키도 구분, 공백만 정리
+    assert cache.get(cache.make_key("  Seoul ", "food", 6, False)) is not None
+    assert cache.get(cache.make_key("seoul", "food", 6, False)) is None
+    assert cache.invalidate_documents(["D1"]) == 1
+    assert cache.get(key) is None
+
+    cache.put(key, [Document(page_content="x", metadata={"document_id": "D1"})])
+    time.sleep(0.06)
+    assert cache.get(key) is None
+
+
+def test_warm_fills_every_domain_and_duration_bucket():
+    retriever = _retriever()
+    cache = CandidatePoolCache()
+    planner = ItineraryPlanner(retriever, candidate_cache=cache)
+
+    assert planner.warm_candidate_pools(["서울", "부산"], duration_days=(1, 2, 3)) == 6
+    assert len(cache) == 2 * 3 * len(DomainEnum)
+
+    retriever.search_domains.reset_mock()
+    planner._gather_candidates(_request([DomainEnum.NAT, DomainEnum.HIS], region="부산", days=3))
+    retriever.search_domains.assert_not_called()
+
+
+def test_warm_stops_between_targets_when_stop_event_is_set():
+    retriever = _retriever()
+    cache = CandidatePoolCache()
+    planner = ItineraryPlanner(retriever, candidate_cache=cache)
+    stop_event = threading.Event()
+
+    def search_then_stop(queries, **_):
+        stop_event.set()
+        return {domain: [] for domain in queries}
+
+    retriever.search_domains.side_effect = search_then_stop
+
+    assert planner.warm_candidate_pools(["서울", "부산"], duration_days=(1, 2, 3), stop_event=stop_event) == 1
+    assert retriever.search_domains.call_count == 1
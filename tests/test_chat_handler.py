@@ -1,4 +1,5 @@
 """UnifiedChatHandler 동작 테스트"""
+import asyncio
 import json
 import pytest
 
@@ -40,6 +41,9 @@ class _FakeLLM:
         self.model = "fake-model"
         self.client = _FakeClient(message)
 
+    async def acomplete(self, call="chat", **kwargs):
+        return self.client.chat.completions.create(**kwargs)
+
 
 @pytest.mark.asyncio
 async def test_chat_handler_rejects_itinerary_tool():
@@ -165,3 +169,150 @@ async def test_handle_search_places_infers_area_from_user_text():
         "domain": "food",
         "area": "서울",
     }
+
+
+class _ArgsToolCall:
+    def __init__(self, name: str, arguments: dict):
+        self.function = type("Function", (), {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)})
+
+
+class _SlowRetriever:
+    """동기 search가 delay초 걸리는 검색기 (query별 document_id 반환)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def search(self, *, query, top_k, domain, area):
+        import time
+        from langchain.schema import Document
+
+        time.sleep(self.delay)
+        return [Document(page_content=query, metadata={"place_name": query, "area": area, "document_id": query})]
+
+
+def _multi_intent_message():
+    message = _FakeMessage(tool_name="search_places")
+    message.tool_calls = [
+        _ArgsToolCall("search_places", {"query": "明洞のカフェ", "area": "서울", "domain": "food"}),
+        _ArgsToolCall("search_places", {"query": "釜山のホテル", "area": "부산", "domain": "stay"}),
+    ]
+    return message
+
+
+@pytest.mark.asyncio
+async def test_multi_intent_tool_calls_run_concurrently_in_one_round():
+    """복합 의도의 tool call은 동시에 실행되고 places/results로 병합된다."""
+    import time
+
+    handler = UnifiedChatHandler(
+        llm_client=_FakeLLM(_multi_intent_message()),
+        retriever=_SlowRetriever(delay=0.3),
+        deadline_seconds=5,
+    )
+
+    start = time.perf_counter()
+    response = await handler.handle_chat(ChatRequest(text="明洞のカフェと釜山のホテル"))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.55
+    assert [p["document_id"] for p in response["places"]] == ["明洞のカフェ", "釜山のホテル"]
+    assert [r["query"] for r in response["results"]] == ["明洞のカフェ", "釜山のホテル"]
+    assert response["chat_completion_id"] == "dummy"
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_past_deadline_are_reported_as_timeout():
+    """deadline 안에 끝나지 않은 검색은 취소되고 timeout으로 표시된다."""
+    handler = UnifiedChatHandler(
+        llm_client=_FakeLLM(_multi_intent_message()),
+        retriever=_SlowRetriever(delay=0.5),
+        deadline_seconds=0.1,
+    )
+
+    response = await handler.handle_chat(ChatRequest(text="明洞のカフェと釜山のホテル"))
+
+    assert response["timeout"] is True
+    assert all(r.get("timeout") for r in response["results"])
+    assert response["places"] == []
+
+
+class _SlowLLM(_FakeLLM):
+    async def acomplete(self, call="chat", **kwargs):
+        await asyncio.sleep(0.5)
+        return await super().acomplete(call=call, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_slow_function_calling_past_deadline_returns_timeout():
+    """Function Calling 응답이 deadline을 넘으면 timeout 응답 (Python 3.10에서도 wait_for로 동작)"""
+    handler = UnifiedChatHandler(
+        llm_client=_SlowLLM(_multi_intent_message()),
+        retriever=_SlowRetriever(delay=0.0),
+        deadline_seconds=0.1,
+    )
+
+    response = await handler.handle_chat(ChatRequest(text="明洞のカフェと釜山のホテル"))
+
+    assert response["timeout"] is True
+    assert "places" not in response
+
+
+class _RecordingRetriever:
+    def __init__(self):
+        self.last_args = None
+
+    def search(self, *, query, top_k, domain, area):
+        from langchain.schema import Document
+
+        self.last_args = {"query": query, "top_k": top_k, "domain": domain, "area": area}
+        return [Document(page_content="説明", metadata={"place_name": "弘大カフェ", "area": area, "document_id": "DOC_FAST"})]
+
+
+class _FailingLLM:
+    """호출되면 실패하는 LLM (fast path가 LLM을 건너뛰는지 확인용)"""
+
+    async def acomplete(self, call="chat", **kwargs):
+        raise AssertionError(f"LLM should not be called: {call}")
+
+
+@pytest.mark.asyncio
+async def test_clear_search_intent_skips_function_calling():
+    """지역+도메인이 명확한 메시지는 LLM 없이 바로 검색한다."""
+    from backend.intent_router import IntentRouter
+
+    retriever = _RecordingRetriever()
+    handler = UnifiedChatHandler(
+        llm_client=_FailingLLM(),
+        retriever=retriever,
+        intent_router=IntentRouter(),
+        fast_path_phrasing=False,
+    )
+
+    response = await handler.handle_chat(ChatRequest(text="弘大 カフェ"))
+
+    assert response["route"] == "fast_path"
+    assert response["places"][0]["document_id"] == "DOC_FAST"
+    assert retriever.last_args == {"query": "弘大 カフェ", "top_k": 3, "domain": "food", "area": "서울"}
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_or_complex_messages_go_to_function_calling():
+    """복합 의도/일정/지역 없는 메시지는 라우팅하지 않는다."""
+    from backend.intent_router import IntentRouter
+
+    router = IntentRouter()
+
+    assert router.route("明洞のカフェと釜山のホテル") is None
+    assert router.route("ソウル 2泊3日のプラン") is None
+    assert router.route("おすすめのカフェ") is None
+    assert router.route("こんにちは") is None
+    assert router.route("海雲台でおすすめのホテル").arguments["area"] == "부산"
+
+    handler = UnifiedChatHandler(
+        llm_client=_FakeLLM(_multi_intent_message()),
+        retriever=_SlowRetriever(delay=0),
+        intent_router=router,
+    )
+    response = await handler.handle_chat(ChatRequest(text="明洞のカフェと釜山のホテル"))
+    assert "route" not in response
+    assert response["chat_completion_id"] == "dummy"
@@ -0,0 +1,120 @@
+"""
+컨텍스트 패커 테스트
+parent summary 중복 제거, 관련도 순 예산 채우기, 토큰 수 metadata 검증
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from langchain.schema import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from backend.context_packer import ContextPacker, TokenCounter, _approx_tokens, split_parent_summary
+from backend.rag_chain import RetrieverAdapter, collect_context_stats, create_rag_chain, pack_rag_prompt
+
+
+class CharEncoding:
+    """문자 1개 = 토큰 1개 (네트워크 없이 tiktoken 인코딩 대체)"""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def _chunk(doc_id, summary, question, similarity):
+    page = f"\n親ドキュメント要約:\n{summary}\n\n質問:\n{question}\n\n回答:\n{question}の回答\n"
+    return Document(page_content=page, metadata={"document_id": doc_id, "similarity": similarity})
+
+
+@pytest.fixture
+def packer_factory(monkeypatch):
+    def make(budget):
+        packer = ContextPacker(token_budget=budget, model="test-model")
+        packer.counter.encoding = CharEncoding()
+        return packer
+    return make
+
+
+DOCS = [
+    _chunk("A", "景福宮の要約", "開館時間", 0.80),
+    _chunk("B", "明洞の要約", "おすすめ料理", 0.90),
+    _chunk("A", "景福宮の要約", "入場料", 0.85),
+]
+
+
+def test_split_parent_summary():
+    summary, body = split_parent_summary(DOCS[0].page_content)
+    assert summary == "親ドキュメント要約:\n景福宮の要約"
+    assert body.startswith("質問:\n開館時間")
+    assert split_parent_summary("質問:\nQ")[0] == ""
+
+
+def test_parent_summary_included_once_per_document(packer_factory):
+    packed = packer_factory(10000).pack(DOCS)
+
+    assert packed.text.count("景福宮の要約") == 1
+    assert packed.summaries_deduped == 1
+    # 문서 순서는 최상위 청크 기준(B → A), A 내부는 관련도 순(입장료 → 개관 시간)
+    assert packed.text.index("明洞") < packed.text.index("景福宮")
+    assert packed.text.index("入場料") < packed.text.index("開館時間")
+    assert packed.context_tokens == len(packed.text)
+    assert [d.metadata["document_id"] for d in packed.documents] == ["B", "A", "A"]
+
+
+def test_budget_drops_least_relevant_chunks(packer_factory):
+    full = packer_factory(10000).pack(DOCS)
+    budget = full.context_tokens - 5
+    packed = packer_factory(budget).pack(DOCS)
+
+    assert packed.context_tokens <= budget
+    assert packed.dropped == 1
+    assert "開館時間" not in packed.text
+    assert packed.stats()["context_chunks"] == 2
+
+
+def test_oversized_top_chunk_is_truncated(packer_factory):
+    packed = packer_factory(8).pack(DOCS)
+
+    assert packed.truncated
+    assert packed.context_tokens == 8
+    assert len(packed.documents) == 1
+
+
+def test_approximate_count_without_tokenizer():
+    counter = TokenCounter("test-model")
+    counter.encoding = None
+
+    assert _approx_tokens("abcdefgh") == 2
+    assert counter.count("景福宮 abcd") == 3 + 2
+    assert counter.count(counter.truncate("景福宮景福宮", 4)) <= 4
+    assert not counter.exact
+
+
+def test_chain_reports_context_and_prompt_tokens(monkeypatch, packer_factory):
+    retriever = MagicMock()
+    retriever.search.return_value = DOCS
+    chain = create_rag_chain(
+        retriever=RetrieverAdapter(retriever=retriever, top_k=3),
+        llm=FakeListChatModel(responses=["回答です"]),
+        context_packer=packer_factory(10000),
+    )
+
+    with collect_context_stats() as stats:
+        result = asyncio.run(chain.ainvoke({"query": "景福宮について"}))
+
+    assert result["result"] == "回答です"
+    assert stats["context_chunks"] == 3
+    assert stats["summaries_deduped"] == 1
+    assert stats["prompt_tokens"] > stats["context_tokens"] > 0
+
+
+def test_pack_rag_prompt_uses_packed_context(monkeypatch, packer_factory):
+    import backend.rag_chain as rag_chain
+
+    monkeypatch.setattr(rag_chain, "get_context_packer", lambda *_: packer_factory(10000))
+    prompt, stats = pack_rag_prompt("景福宮について", DOCS, "test-model")
+
+    assert prompt.count("景福宮の要約") == 1
+    assert stats["prompt_tokens"] == len(prompt)
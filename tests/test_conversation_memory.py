@@ -0,0 +1,212 @@
+"""
+대화 메모리 테스트
+sliding window + 추출 요약(첫 문장, 예산 초과 시 키워드 줄로 접기), 토큰 예산, 배치 기록(write-behind), 캐시 미스 로드(turn_count 유지),
+worker 간 요약 덮어쓰기 방지, /chat 프롬프트 반영 검증
+"""
+import asyncio
+
+import pytest
+
+from backend import conversation_memory
+from backend.context_packer import TokenCounter
+from backend.conversation_memory import (
+    ConversationContext,
+    ConversationMemory,
+    ConversationTurn,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_DB_CACHE_TTL,
+    SUMMARY_TOPICS_PREFIX,
+    SUMMARY_UPSERT_SQL,
+    compress_summary,
+    init_conversation_memory_from_env,
+)
+from backend.schemas import ChatRequest
+from backend.unified_chat import UnifiedChatHandler
+
+
+class _FakeBackend:
+    """저장 호출을 기록하는 in-memory 저장소"""
+
+    def __init__(self, stored=None, fail_writes=0):
+        self.stored = stored or {}
+        self.batches = []
+        self.fail_writes = fail_writes
+        self.closed = False
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def load(self, session_id, limit):
+        return self.stored.get(session_id, ConversationContext())
+
+    async def write_batch(self, messages, summaries):
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise ConnectionError("mariadb down")
+        self.batches.append((list(messages), dict(summaries)))
+
+
+def test_window_overflow_is_folded_into_summary():
+    memory = ConversationMemory(window_turns=4, summary_tokens=200)
+
+    for n in range(4):
+        memory.append("s1", f"質問{n}", f"回答{n}")
+
+    context = asyncio.run(memory.load("s1"))
+    assert [t.content for t in context.turns] == ["質問2", "回答2", "質問3", "回答3"]
+    assert "質問0" in context.summary and "回答1" in context.summary
+
+
+def test_summary_and_history_stay_within_token_budget():
+    counter = TokenCounter("gpt-4o")
+    evicted = [ConversationTurn("user", "長い質問" * 50) for _ in range(20)]
+
+    summary = compress_summary("", evicted, counter, max_tokens=100)
+    assert counter.count(summary) <= 100
+
+    context = ConversationContext(
+        summary=summary,
+        turns=[ConversationTurn("user", "あ" * 300), ConversationTurn("assistant", "最新の回答")],
+    )
+    messages = context.to_messages(counter, token_budget=150)
+    assert messages[0]["role"] == "system"
+    # 예산을 넘는 오래된 턴은 제외, 최신 턴은 유지
+    assert [m["content"] for m in messages[1:]] == ["最新の回答"]
+
+
+def test_summary_keeps_first_sentence_and_folds_old_lines_into_topics():
+    counter = TokenCounter("gpt-4o")
+    first = [
+        ConversationTurn("user", "明洞でおすすめのカフェはどこですか？ 静かな店がいいです。"),
+        ConversationTurn("assistant", "明洞のカフェAがおすすめです。 営業時間は10時からです。"),
+    ]
+
+    summary = compress_summary("", first, counter, max_tokens=200)
+    assert summary.splitlines() == [
+        "- ユーザー: 明洞でおすすめのカフェはどこですか？",
+        "- アシスタント: 明洞のカフェAがおすすめです。",
+    ]
+
+    later = [ConversationTurn("user", f"釜山の海雲台ビーチについて質問{n}です。") for n in range(10)]
+    summary = compress_summary(summary, later, counter, max_tokens=80)
+
+    assert counter.count(summary) <= 80
+    # 밀려난 오래된 줄의 지역/테마는 키워드 줄에 남음
+    topics_line = summary.splitlines()[0]
+    assert topics_line.startswith(SUMMARY_TOPICS_PREFIX)
+    assert "서울" in topics_line and "グルメ" in topics_line
+    assert summary.splitlines()[-1] == "- ユーザー: 釜山の海雲台ビーチについて質問9です。"
+
+
+def test_pending_writes_keep_per_session_order_and_expired_state():
+    backend = _FakeBackend()
+    memory = ConversationMemory(backend=backend, window_turns=10, batch_size=3, cache_ttl=0.0)
+
+    async def run():
+        memory.append("s1", "q1", "a1")
+        memory.append("s2", "q1", "a1")
+        memory.append("s1", "q2", "a2")
+        # TTL이 지나도 기록 대기 중인 세션은 캐시 유지
+        assert memory._get_state("s1") is not None
+        await memory.flush()
+        assert memory._get_state("s1") is None
+
+    asyncio.run(run())
+    written = [message for messages, _ in backend.batches for message in messages]
+    assert [m for m in written if m[0] == "s1"] == [
+        ("s1", "user", "q1"), ("s1", "assistant", "a1"), ("s1", "user", "q2"), ("s1", "assistant", "a2"),
+    ]
+    assert len(written) == 6 and [len(messages) for messages, _ in backend.batches] == [3, 3]
+
+
+def test_writes_are_batched_off_the_request_path_and_retried():
+    backend = _FakeBackend(fail_writes=1)
+    memory = ConversationMemory(backend=backend, window_turns=2, batch_size=100)
+
+    async def run():
+        memory.append("s1", "q1", "a1")
+        memory.append("s1", "q2", "a2")
+        memory.append("s2", "q1", "a1")
+        assert backend.batches == []
+        assert await memory.flush() == 0
+        return await memory.flush()
+
+    assert asyncio.run(run()) == 6
+    assert len(backend.batches) == 1
+    messages, summaries = backend.batches[0]
+    assert messages[0] == ("s1", "user", "q1")
+    assert set(summaries) == {"s1"}
+
+
+def test_cache_miss_loads_from_backend():
+    stored = ConversationContext(summary="- ユーザー: 釜山", turns=[ConversationTurn("user", "海雲台")])
+    memory = ConversationMemory(backend=_FakeBackend(stored={"s1": stored}))
+
+    context = asyncio.run(memory.load("s1"))
+
+    assert context.summary == "- ユーザー: 釜山"
+    assert [t.content for t in context.turns] == ["海雲台"]
+
+
+def test_cache_miss_keeps_stored_turn_count():
+    turns = [ConversationTurn("user", "q"), ConversationTurn("assistant", "a")]
+    stored = ConversationContext(summary="- ユーザー: 釜山", turns=turns, turn_count=20)
+    backend = _FakeBackend(stored={"s1": stored})
+    memory = ConversationMemory(backend=backend, window_turns=2)
+
+    async def run():
+        await memory.load("s1")
+        memory.append("s1", "q2", "a2")
+        await memory.flush()
+
+    asyncio.run(run())
+
+    # window(2)로 줄어든 턴 수가 아니라 저장소의 전체 턴 수에서 이어감
+    _, summaries = backend.batches[0]
+    assert summaries["s1"][1] == 22
+
+
+def test_summary_upsert_keeps_newer_summary():
+    # 오래된 worker 캐시의 요약(작은 turn_count)은 기존 요약을 덮어쓰지 않음
+    assert "IF(VALUES(turn_count) > turn_count, VALUES(summary), summary)" in SUMMARY_UPSERT_SQL
+    assert "GREATEST(turn_count, VALUES(turn_count))" in SUMMARY_UPSERT_SQL
+    assert SUMMARY_UPSERT_SQL.index("summary = IF") < SUMMARY_UPSERT_SQL.index("turn_count = GREATEST")
+
+
+def test_cache_ttl_defaults_low_with_database(monkeypatch):
+    monkeypatch.delenv("CHAT_MEMORY_CACHE_TTL", raising=False)
+    monkeypatch.delenv("MARIADB_HOST", raising=False)
+    assert init_conversation_memory_from_env().cache_ttl == DEFAULT_CACHE_TTL
+
+    # 생성 시에는 연결하지 않으므로 aiomysql 미설치 환경에서도 backend 구성만 확인
+    monkeypatch.setattr(conversation_memory, "aiomysql", object())
+    monkeypatch.setenv("MARIADB_HOST", "localhost")
+    assert init_conversation_memory_from_env().cache_ttl == DEFAULT_DB_CACHE_TTL
+
+
+class _CapturingLLM:
+    def __init__(self):
+        self.messages = []
+
+    async def acomplete(self, call="chat", **kwargs):
+        self.messages.append(kwargs["messages"])
+        message = type("Message", (), {"tool_calls": None, "content": f"回答{len(self.messages)}"})
+        return type("Completion", (), {"choices": [type("Choice", (), {"message": message})], "id": "c"})
+
+
+@pytest.mark.asyncio
+async def test_chat_includes_previous_turns_for_same_session():
+    llm = _CapturingLLM()
+    handler = UnifiedChatHandler(llm_client=llm, memory=ConversationMemory())
+
+    await handler.handle_chat(ChatRequest(text="釜山に行きます", session_id="s1"))
+    await handler.handle_chat(ChatRequest(text="おすすめは?", session_id="s1"))
+    await handler.handle_chat(ChatRequest(text="おすすめは?"))
+
+    second = [m["content"] for m in llm.messages[1][1:]]
+    assert second == ["釜山に行きます", "回答1", "おすすめは?"]
+    # session_id 없는 요청은 단일 턴
+    assert len(llm.messages[2]) == 2
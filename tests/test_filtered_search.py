@@ -0,0 +1,130 @@
+"""
+필터 검색 recall 보정 테스트
+선택도 기반 exact scan, probes 증가 재시도, 트랜잭션 로컬 설정 적용 검증
+"""
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from backend.db.filtered_search import FilteredSearchPolicy, SelectivityCache, plan_rows_from_explain
+from backend.retriever import Retriever
+
+
+EXACT = {"enable_indexscan": "off"}
+
+
+def _make_retriever(policy=None):
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        mock_pool.return_value = MagicMock()
+        retriever = Retriever(db_url="postgresql://filtered-test", embeddings_client=Mock())
+    if policy is not None:
+        retriever.filter_policy = policy
+    return retriever
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("PGVECTOR_RETRY_PROBES", "10, 40,160")
+    monkeypatch.setenv("PGVECTOR_EXACT_SCAN_MAX_ROWS", "500")
+    monkeypatch.setenv("PGVECTOR_ITERATIVE_SCAN", "relaxed_order")
+
+    policy = FilteredSearchPolicy.from_env()
+
+    assert policy.retry_probes == (10, 40, 160)
+    assert policy.exact_scan_max_rows == 500
+    assert policy.index_settings() == {"ivfflat.iterative_scan": "relaxed_order"}
+    assert policy.retry_settings()[0] == {"ivfflat.iterative_scan": "relaxed_order", "ivfflat.probes": 10}
+
+    monkeypatch.setenv("PGVECTOR_ITERATIVE_SCAN", "fast")
+    with pytest.raises(ValueError):
+        FilteredSearchPolicy.from_env()
+
+
+def test_plan_rows_from_explain():
+    assert plan_rows_from_explain([{"Plan": {"Plan Rows": 321}}]) == 321
+    assert plan_rows_from_explain([]) is None
+
+
+def test_small_filtered_set_uses_exact_scan():
+    retriever = _make_retriever(FilteredSearchPolicy(exact_scan_max_rows=1000))
+
+    with patch.object(retriever, "_estimate_filtered_rows", return_value=120), \
+            patch.object(retriever, "_execute_search", return_value=[("row",)] * 3) as execute:
+        rows = retriever._search_rows([0.1, 0.2], 5, domain="his", area="경주", shape="domain+area")
+
+    assert len(rows) == 3
+    execute.assert_called_once()
+    assert execute.call_args.kwargs["settings"] == EXACT
+    retriever.close()
+
+
+def test_short_index_result_retries_with_more_probes():
+    retriever = _make_retriever(FilteredSearchPolicy(exact_scan_max_rows=1000, retry_probes=(20, 80)))
+    results = [[("row",)] * 2, [("row",)] * 4, [("row",)] * 5]
+
+    with patch.object(retriever, "_estimate_filtered_rows", return_value=50000), \
+            patch.object(retriever, "_execute_search", side_effect=results) as execute:
+        rows = retriever._search_rows([0.1, 0.2], 5, domain="food", shape="domain")
+
+    assert len(rows) == 5
+    settings = [call.kwargs["settings"] for call in execute.call_args_list]
+    assert settings == [{}, {"ivfflat.probes": 20}, {"ivfflat.probes": 80}]
+    retriever.close()
+
+
+def test_exhausted_retries_fall_back_to_exact_scan():
+    retriever = _make_retriever(FilteredSearchPolicy(exact_scan_max_rows=0, retry_probes=(20,)))
+
+    with patch.object(retriever, "_estimate_filtered_rows") as estimate, \
+            patch.object(retriever, "_execute_search", side_effect=[[], [("row",)], [("row",)] * 2]) as execute:
+        rows = retriever._search_rows([0.1, 0.2], 5, area="부산", shape="area")
+
+    estimate.assert_not_called()
+    assert len(rows) == 2
+    assert execute.call_args_list[-1].kwargs["settings"] == EXACT
+    retriever.close()
+
+
+def test_unfiltered_search_runs_once():
+    retriever = _make_retriever()
+
+    with patch.object(retriever, "_execute_search", return_value=[]) as execute:
+        retriever._search_rows([0.1, 0.2], 5, shape="none")
+
+    execute.assert_called_once()
+    retriever.close()
+
+
+def test_estimate_is_cached_per_filter_combination():
+    retriever = _make_retriever()
+    explain = [([{"Plan": {"Plan Rows": 42}}],)]
+
+    with patch.object(retriever, "_execute_search", return_value=explain) as execute:
+        assert retriever._estimate_filtered_rows("food", "서울") == 42
+        assert retriever._estimate_filtered_rows("food", "서울") == 42
+
+    execute.assert_called_once()
+    sql, params = execute.call_args.args[:2]
+    assert sql.startswith("EXPLAIN (FORMAT JSON)")
+    assert params == ["food", "%서울%", "%서울%", "%서울%"]
+    retriever.close()
+
+
+def test_execute_search_applies_settings_transaction_locally():
+    retriever = _make_retriever()
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("row",)]
+
+    with patch.object(retriever.router, "run", side_effect=lambda fn: fn(conn)):
+        rows = retriever._execute_search("SELECT 1", [], settings={"ivfflat.probes": 20})
+
+    assert rows == [("row",)]
+    conn.transaction.assert_called_once()
+    assert cursor.execute.call_args_list[0].args == ("SELECT set_config(%s, %s, true)", ("ivfflat.probes", "20"))
+    retriever.close()
+
+
+def test_selectivity_cache_expires():
+    cache = SelectivityCache(ttl_seconds=0)
+    cache.put(("food", None), 10)
+    assert cache.get(("food", None)) is None
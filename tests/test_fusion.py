@@ -0,0 +1,102 @@
+"""
+검색 결과 Fusion 테스트
+max_sim / rrf / weighted_sum 전략, 대표 문서 선택, 설정 로딩 검증
+"""
+import json
+
+import pytest
+from langchain.schema import Document
+
+import backend.query_expansion as qe
+from backend.fusion import fuse_results, normalize_fusion_config
+
+
+def _doc(doc_id, similarity, content=None):
+    return Document(
+        page_content=content or doc_id,
+        metadata={"document_id": doc_id, "similarity": similarity},
+    )
+
+
+RANKED = [
+    [_doc("A", 0.95), _doc("B", 0.90), _doc("C", 0.80)],
+    [_doc("B", 0.92), _doc("D", 0.91), _doc("A", 0.70)],
+    [_doc("B", 0.85), _doc("C", 0.84)],
+]
+
+
+def test_max_sim_keeps_highest_similarity_instance():
+    fused = fuse_results(RANKED, top_k=3, strategy="max_sim")
+
+    assert [d.metadata["document_id"] for d in fused] == ["A", "B", "D"]
+    assert fused[1].metadata["similarity"] == 0.92
+    # max_sim은 원본 Document를 그대로 반환 (metadata 변경 없음)
+    assert fused[0] is RANKED[0][0]
+    assert "fusion_score" not in fused[0].metadata
+
+
+def test_rrf_rewards_documents_found_by_many_variants():
+    fused = fuse_results(RANKED, top_k=4, strategy="rrf", rrf_k=60)
+
+    assert fused[0].metadata["document_id"] == "B"
+    assert fused[0].metadata["fusion_score"] == pytest.approx(1 / 62 + 1 / 61 + 1 / 61, abs=1e-6)
+    assert fused[0].metadata["similarity"] == 0.92
+    # 캐시 공유 Document를 변경하지 않아야 함
+    assert "fusion_score" not in RANKED[1][0].metadata
+
+
+def test_weighted_sum_uses_variant_weights():
+    fused = fuse_results(RANKED, top_k=2, strategy="weighted_sum", weights=[1.0, 0.0, 0.0])
+
+    assert [d.metadata["document_id"] for d in fused] == ["A", "B"]
+    assert fused[0].metadata["fusion_score"] == pytest.approx(0.95)
+
+
+def test_ties_keep_first_seen_order_and_empty_input():
+    ranked = [[_doc("X", 0.5), _doc("Y", 0.5)], [_doc("Z", 0.5)]]
+
+    assert [d.metadata["document_id"] for d in fuse_results(ranked, top_k=3)] == ["X", "Y", "Z"]
+    assert fuse_results([], top_k=3) == []
+    assert fuse_results([[]], top_k=3) == []
+
+
+def test_documents_without_id_are_keyed_by_content():
+    ranked = [[Document(page_content="same", metadata={"similarity": 0.5})],
+              [Document(page_content="same", metadata={"similarity": 0.7})]]
+
+    fused = fuse_results(ranked, top_k=5)
+
+    assert len(fused) == 1
+    assert fused[0].metadata["similarity"] == 0.7
+
+
+def test_invalid_strategy_rejected():
+    with pytest.raises(ValueError):
+        normalize_fusion_config({"strategy": "borda"})
+    with pytest.raises(ValueError):
+        fuse_results(RANKED, top_k=3, strategy="borda")
+
+
+@pytest.mark.parametrize("weights", [[1.0, "0.5"], [1.0, -1.0], [True], "1.0"])
+def test_invalid_weights_rejected_at_config_load(weights):
+    # 잘못된 값을 버리면 뒤쪽 가중치가 다른 변형에 밀려 적용되므로 거부
+    with pytest.raises(ValueError):
+        normalize_fusion_config({"strategy": "weighted_sum", "weights": weights})
+
+
+def test_fusion_config_loaded_from_query_expansion_json(monkeypatch, tmp_path):
+    config_path = tmp_path / "qe.json"
+    config_path.write_text(json.dumps({"fusion": {"strategy": "rrf", "rrf_k": 10, "weights": [1, 0.5]}}))
+    monkeypatch.setenv(qe.CONFIG_ENV_KEY, str(config_path))
+    qe.reset_query_expansion_config_cache()
+    try:
+        assert qe.load_query_expansion_config()["fusion"] == {
+            "strategy": "rrf",
+            "rrf_k": 10,
+            "weights": [1.0, 0.5],
+        }
+    finally:
+        monkeypatch.delenv(qe.CONFIG_ENV_KEY)
+        qe.reset_query_expansion_config_cache()
+
+    assert qe.load_query_expansion_config()["fusion"]["strategy"] == "max_sim"
@@ -0,0 +1,239 @@
+"""
+Hedged LLM 호출 테스트
+지연 기반 hedge, 먼저 끝난 쪽 채택 + 패자 취소, deadline, hedge 비율 상한, 스트림 첫 토큰 hedge(패자 스트림 종료) 검증
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from backend.hedging import HedgePolicy, LatencyTracker
+from backend.llm_base import LLMClient
+from backend.llm_clients import HedgedChatModel
+
+
+def _policy(**overrides):
+    params = dict(initial_delay=0.05, min_delay=0.01, max_hedge_rate=1.0, deadline_seconds=2.0)
+    params.update(overrides)
+    return HedgePolicy(**params)
+
+
+def _factory(delays, log):
+    async def call(hedge):
+        name = "hedge" if hedge else "primary"
+        log.append(name)
+        try:
+            await asyncio.sleep(delays[name])
+        except asyncio.CancelledError:
+            log.append(f"{name}:cancelled")
+            raise
+        return name
+    return call
+
+
+def test_fast_primary_is_not_hedged():
+    log = []
+    policy = _policy()
+    result = asyncio.run(policy.run(_factory({"primary": 0.0, "hedge": 0.0}, log)))
+
+    assert result == "primary"
+    assert log == ["primary"]
+    assert policy.hedge_rate("llm") == 0.0
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled():
+    log = []
+
+    async def scenario():
+        result = await _policy().run(_factory({"primary": 1.0, "hedge": 0.01}, log))
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == "hedge"
+    assert log == ["primary", "hedge", "primary:cancelled"]
+
+
+def test_primary_can_still_win_after_hedge():
+    log = []
+
+    async def scenario():
+        result = await _policy().run(_factory({"primary": 0.08, "hedge": 1.0}, log))
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == "primary"
+    assert "hedge:cancelled" in log
+
+
+def test_deadline_bounds_latency():
+    log = []
+
+    async def scenario():
+        # Python 3.10 이하에서는 asyncio.TimeoutError가 내장 TimeoutError와 다른 클래스
+        with pytest.raises(asyncio.TimeoutError):
+            await _policy(deadline_seconds=0.1).run(_factory({"primary": 1.0, "hedge": 1.0}, log))
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert {"primary:cancelled", "hedge:cancelled"} <= set(log)
+
+
+def test_hedge_rate_cap_limits_extra_requests():
+    policy = _policy(max_hedge_rate=0.5)
+
+    async def scenario():
+        for _ in range(2):
+            await policy.run(_factory({"primary": 0.1, "hedge": 0.0}, []))
+
+    asyncio.run(scenario())
+    # 첫 호출은 hedge, 비율 상한(0.5) 도달로 두 번째는 hedge하지 않음
+    assert list(policy._decisions["llm"]) == [True, False]
+
+
+def test_hedge_delay_follows_latency_percentile():
+    policy = _policy(min_samples=5, percentile=80)
+    assert policy.hedge_delay("llm") == 0.05
+    for seconds in (0.1, 0.2, 0.3, 0.4, 0.5):
+        policy.tracker("llm").observe(seconds)
+
+    assert policy.hedge_delay("llm") == 0.4
+    assert LatencyTracker().percentile(95) is None
+    assert HedgePolicy(enabled=False).hedge_delay("llm") is None
+
+
+def test_stream_hedges_on_slow_first_token():
+    def factory(hedge):
+        async def gen():
+            await asyncio.sleep(0.01 if hedge else 1.0)
+            for text in (["H1", "H2"] if hedge else ["P1"]):
+                yield text
+        return gen()
+
+    async def collect():
+        return [chunk async for chunk in _policy().stream(factory)]
+
+    assert asyncio.run(collect()) == ["H1", "H2"]
+
+
+class _ClosableStream:
+    """OpenAI AsyncStream처럼 취소만으로는 응답이 닫히지 않고 aclose()가 필요한 스트림"""
+
+    def __init__(self, name, delay, closed):
+        self.name, self.delay, self.closed = name, delay, closed
+        self.sent = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent:
+            raise StopAsyncIteration
+        await asyncio.sleep(self.delay)
+        self.sent = True
+        return self.name
+
+    async def aclose(self):
+        self.closed.append(self.name)
+
+
+def test_stream_closes_loser_and_winner_iterators():
+    closed = []
+
+    def factory(hedge):
+        return _ClosableStream("hedge", 0.01, closed) if hedge else _ClosableStream("primary", 1.0, closed)
+
+    async def collect():
+        chunks = []
+        async for chunk in _policy().stream(factory):
+            # 패자 스트림은 승자 스트림을 소비하기 전에 이미 닫혀 있어야 함
+            assert closed == ["primary"]
+            chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(collect()) == ["hedge"]
+    assert closed == ["primary", "hedge"]
+
+
+def test_stream_deadline_closes_streams():
+    closed = []
+
+    def factory(hedge):
+        return _ClosableStream("hedge" if hedge else "primary", 1.0, closed)
+
+    async def consume():
+        with pytest.raises(asyncio.TimeoutError):
+            async for _ in _policy(deadline_seconds=0.1).stream(factory):
+                pass
+
+    asyncio.run(consume())
+    assert sorted(closed) == ["hedge", "primary"]
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_HEDGE_PERCENTILE", "90")
+    monkeypatch.setenv("LLM_HEDGE_FALLBACK_MODEL", "gpt-4o-mini")
+    monkeypatch.setenv("LLM_DEADLINE_SECONDS", "0")
+
+    policy = HedgePolicy.from_env()
+    assert (policy.percentile, policy.fallback_model, policy.deadline_seconds) == (90.0, "gpt-4o-mini", None)
+
+
+class SlowChatModel(BaseChatModel):
+    """지연 후 고정 답변을 반환하는 테스트용 ChatModel"""
+
+    answer: str
+    delay: float = 0.0
+    model_name: str = "fake"
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.answer))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._generate(messages)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        for token in self.answer.split():
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def test_hedged_chat_model_uses_fallback_when_primary_is_slow():
+    model = HedgedChatModel(
+        primary=SlowChatModel(answer="primary answer", delay=1.0, model_name="gpt-4o"),
+        fallback=SlowChatModel(answer="fallback answer", delay=0.0, model_name="gpt-4o-mini"),
+        policy=_policy(),
+    )
+
+    assert asyncio.run(model.ainvoke("質問")).content == "fallback answer"
+
+    async def stream():
+        return [chunk.content async for chunk in model.astream("質問")]
+
+    assert asyncio.run(stream()) == ["fallback", "answer"]
+    # 동기 호출은 hedge 없이 primary
+    assert model.invoke("質問").content == "primary answer"
+
+
+def test_llm_client_acomplete_sends_hedge_to_fallback_model(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    client = LLMClient(model_name="gpt-4o", hedge_policy=_policy(fallback_model="gpt-4o-mini"))
+    models = []
+
+    async def create(model, **_):
+        models.append(model)
+        await asyncio.sleep(1.0 if model == "gpt-4o" else 0.0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f" {model} "))])
+
+    client.async_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    answer = asyncio.run(client.agenerate([{"role": "user", "content": "hi"}]))
+
+    assert answer == "gpt-4o-mini"
+    assert models == ["gpt-4o", "gpt-4o-mini"]
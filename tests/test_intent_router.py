@@ -0,0 +1,72 @@
+"""
+의도 라우터 테스트
+영어 키워드 단어 경계, 지역명 안의 도메인 키워드 무시, 방법/일정 질문의 LLM 위임, 숙박 키워드 라우팅 검증
+"""
+import pytest
+
+from backend.intent_router import IntentRouter, find_areas, find_domains, requires_llm
+from backend.schemas import DomainEnum
+
+
+@pytest.fixture
+def router():
+    return IntentRouter()
+
+
+@pytest.mark.parametrize(
+    "text, area, domain",
+    [
+        ("ソウル 宿泊", "서울", "stay"),
+        ("弘大 カフェ", "서울", "food"),
+        ("仁寺洞 カフェ", "서울", "food"),
+        ("海雲台でおすすめのホテル", "부산", "stay"),
+        ("best hotels in seoul", "서울", "stay"),
+        ("seoulのカフェ", "서울", "food"),
+        ("jeju beach", "제주", "nat"),
+    ],
+)
+def test_routes_clear_place_searches(router, text, area, domain):
+    routed = router.route(text)
+
+    assert routed is not None
+    assert routed.arguments["area"] == area
+    assert routed.arguments["domain"] == domain
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "parking near gangnam",
+        "明洞 ホテル 予約の方法は？",
+        "明洞 ホテル どうやって予約する？",
+        "how to book a hotel in seoul",
+        "ソウル 2泊3日のプラン",
+        "釜山 何泊がいい？",
+        "명동 호텔 예약 방법",
+        "明洞のカフェと釜山のホテル",
+        "おすすめのカフェ",
+    ],
+)
+def test_leaves_ambiguous_or_howto_messages_to_llm(router, text):
+    assert router.route(text) is None
+
+
+def test_english_keywords_match_whole_words_only():
+    assert find_domains("parking near gangnam") == []
+    assert find_domains("park near gangnam") == [DomainEnum.NAT]
+    assert find_domains("show me cafes") == [DomainEnum.FOOD]
+    assert not requires_llm("show me cafes in hongdae")
+    assert find_areas("busanese food") == []
+
+
+def test_area_names_do_not_count_as_domain_keywords():
+    # "仁寺洞"의 "寺"는 역사 도메인 키워드가 아님
+    assert find_domains("仁寺洞 カフェ") == [DomainEnum.FOOD]
+    assert find_domains("仁寺洞") == []
+    assert find_domains("仁寺洞のお寺") == [DomainEnum.HIS]
+
+
+def test_nights_cue_does_not_block_stay_keyword():
+    assert not requires_llm("ソウル 宿泊")
+    assert requires_llm("ソウル 2泊3日")
+    assert requires_llm("ソウル ２泊")
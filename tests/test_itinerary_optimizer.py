@@ -0,0 +1,111 @@
+"""
+결정적 일정 최적화기 테스트
+avoid/preferred 반영, 하루 단위 area 묶음 + 도메인 균형, LLM 미호출, 실행 시간, LLM 설명 옵션 검증
+"""
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from langchain.schema import Document
+
+from backend.itinerary import ItineraryPlanner
+from backend.itinerary_optimizer import ItineraryOptimizer
+from backend.schemas import DomainEnum, GeneratorEnum, ItineraryRecommendationRequest
+
+
+def _doc(doc_id, place, area, domain, similarity=0.8):
+    return Document(
+        page_content=f"{place}の紹介",
+        metadata={
+            "document_id": doc_id,
+            "place_name": place,
+            "area": area,
+            "domain": domain,
+            "similarity": similarity,
+        },
+    )
+
+
+def _request(**kwargs):
+    params = dict(
+        region="서울",
+        domains=[DomainEnum.FOOD, DomainEnum.SHOP, DomainEnum.HIS],
+        duration_days=2,
+        generator=GeneratorEnum.OPTIMIZER,
+    )
+    params.update(kwargs)
+    return ItineraryRecommendationRequest(**params)
+
+
+# 후보 순서를 area가 번갈아 나오도록 섞어 둠
+DOCS = [
+    _doc("F1", "明洞餃子", "중구", "food", 0.95),
+    _doc("F2", "江南焼肉", "강남구", "food", 0.9),
+    _doc("S1", "明洞商店街", "중구", "shop", 0.85),
+    _doc("S2", "COEXモール", "강남구", "shop", 0.8),
+    _doc("H1", "徳寿宮", "중구", "his", 0.75),
+    _doc("H2", "奉恩寺", "강남구", "his", 0.7),
+    _doc("F1b", "明洞餃子", "중구", "food", 0.6),
+    _doc("X1", "広蔵市場", "종로구", "food", 0.99),
+]
+
+
+def test_optimizer_groups_days_by_area_and_balances_domains():
+    request = _request(avoid_places=["X1"], preferred_places=["H2"])
+
+    plans = ItineraryOptimizer().plan(request, DOCS)
+
+    assert len(plans) == 1
+    days = plans[0].days
+    place_ids = [s.document_id for day in days for s in day.segments]
+    assert "X1" not in place_ids and "H2" in place_ids
+    # 같은 장소(明洞餃子)의 청크는 한 번만
+    assert len(place_ids) == len(set(place_ids)) == 6
+    for day in days:
+        assert len({s.area for s in day.segments}) == 1
+        assert {s.notes for s in day.segments} == {"domain=food", "domain=shop", "domain=his"}
+    assert plans[0].metadata["route_cost"] == 0.2
+
+
+def test_recommend_optimizer_skips_llm_and_is_fast():
+    areas = ["중구", "종로구", "강남구", "마포구"]
+    docs = [
+        _doc(f"{domain.value}_{i}", f"{domain.value}-{i}", areas[i % 4], domain.value, 0.9 - i * 0.01)
+        for domain in DomainEnum
+        for i in range(21)
+    ]
+    retriever = MagicMock()
+    retriever.search_domains.return_value = {}
+    llm_clients = MagicMock()
+    planner = ItineraryPlanner(retriever, llm_clients=llm_clients)
+    planner._gather_candidates = lambda request, stats=None: docs
+    request = _request(domains=list(DomainEnum), duration_days=7)
+
+    started = time.perf_counter()
+    result = planner.recommend(request)
+    elapsed = time.perf_counter() - started
+
+    assert result["metadata"]["generator"] == "optimizer"
+    assert len(result["itineraries"]) == 3
+    assert all(len(plan.days) == 7 for plan in result["itineraries"])
+    llm_clients.chat.assert_not_called()
+    assert elapsed < 0.5
+    assert result["metadata"]["optimizer_ms"] < 500
+
+
+def test_llm_descriptions_replace_text_only(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    llm = MagicMock()
+    llm.invoke.return_value = SimpleNamespace(content='{"descriptions": {"F1": "本場の餃子"}}')
+    llm_clients = MagicMock()
+    llm_clients.chat.return_value = llm
+    planner = ItineraryPlanner(MagicMock(), llm_clients=llm_clients)
+    planner._gather_candidates = lambda request, stats=None: DOCS[:6]
+
+    result = planner.recommend(_request(llm_descriptions=True))
+
+    segments = {s.document_id: s for day in result["itineraries"][0].days for s in day.segments}
+    assert segments["F1"].description == "本場の餃子"
+    assert segments["S1"].description == "明洞商店街の紹介"
+    assert result["metadata"]["generator"] == "optimizer"
+    llm_clients.chat.assert_called_once()
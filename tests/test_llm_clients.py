@@ -0,0 +1,97 @@
+"""
+LLM 클라이언트 재사용 테스트
+공유 HTTP 커넥션 풀, 모델별 ChatOpenAI 캐시, 공유 RAG 체인의 요청별 검색 파라미터 검증
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.schema import Document
+
+from backend.llm_clients import LLMClients, init_llm_clients_from_env
+from backend.rag_chain import RAG_REQUEST_TIMEOUT
+from backend.rag_chain import RetrieverAdapter, bind_retrieval_params
+
+
+def test_chat_models_cached_per_settings_and_share_http_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    clients = LLMClients(max_connections=5, max_keepalive_connections=2)
+
+    first = clients.chat("gpt-4o", temperature=0.7)
+    assert clients.chat("gpt-4o", temperature=0.7) is first
+    streaming = clients.chat("gpt-4o", temperature=0.7, streaming=True)
+    assert streaming is not first
+    assert first.http_client is clients.http_client
+    assert streaming.http_async_client is clients.http_async_client
+
+    asyncio.run(clients.aclose())
+    assert clients.http_async_client.is_closed
+
+
+def test_init_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_HTTP_TIMEOUT", "12")
+    clients = init_llm_clients_from_env()
+    assert clients.timeout == 12.0
+    asyncio.run(clients.aclose())
+
+
+def test_bound_params_override_adapter_fields():
+    retriever = MagicMock()
+    retriever.search.return_value = [
+        Document(page_content="요약\n質問: 본문", metadata={"document_id": "D1"})
+    ]
+    adapter = RetrieverAdapter(retriever=retriever)
+
+    with bind_retrieval_params(top_k=3, domain="food", area="서울", include_parent_summary=False):
+        docs = adapter.invoke("맛집")
+
+    kwargs = retriever.search.call_args.kwargs
+    assert (kwargs["top_k"], kwargs["domain"], kwargs["area"]) == (3, "food", "서울")
+    assert docs[0].page_content == "質問: 본문"
+
+    adapter.invoke("맛집")
+    assert retriever.search.call_args.kwargs["top_k"] == 5
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import backend.main as main_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://llm-clients-test")
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "false")
+
+    fake_retriever = MagicMock()
+    monkeypatch.setattr(main_module, "Retriever", lambda **_: fake_retriever)
+    monkeypatch.setattr(main_module, "ItineraryPlanner", lambda retriever, **_: MagicMock())
+    handler = MagicMock()
+    handler.initialize = AsyncMock()
+    handler.close = AsyncMock()
+    monkeypatch.setattr(main_module, "UnifiedChatHandler", lambda **_: handler)
+
+    fake_chain = MagicMock()
+    fake_chain.ainvoke = AsyncMock(return_value={"result": "답변", "source_documents": []})
+    create_chain = MagicMock(return_value=fake_chain)
+    monkeypatch.setattr(main_module, "create_rag_chain", create_chain)
+
+    with TestClient(main_module.app) as test_client:
+        yield test_client, create_chain
+
+
+def test_rag_chain_built_once_per_model(client):
+    test_client, create_chain = client
+
+    for question in ("서울 맛집 추천", "부산 바다 추천"):
+        response = test_client.post("/rag/query", json={"question": question, "top_k": 3})
+        assert response.status_code == 200
+
+    create_chain.assert_called_once()
+    kwargs = create_chain.call_args.kwargs
+    app_clients = test_client.app.state.llm_clients
+    assert kwargs["llm"] is app_clients.chat(
+        kwargs["llm_model"], temperature=kwargs["temperature"], request_timeout=RAG_REQUEST_TIMEOUT
+    )
+    # 공유 클라이언트를 써도 RAG 체인은 기존 create_llm과 같은 15초 타임아웃 유지
+    llm = getattr(kwargs["llm"], "primary", kwargs["llm"])
+    assert llm.request_timeout == RAG_REQUEST_TIMEOUT == 15
@@ -0,0 +1,168 @@
+"""
+LLM 토큰/비용 집계 테스트
+usage 추출, 단가표 비용 계산, 요청 누적, LangChain 콜백(스트리밍 TTFT), /chat metadata 첨부 검증
+"""
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_openai import ChatOpenAI
+
+from backend.llm_base import LLMClient
+from backend.llm_usage import (
+    LLMUsage,
+    LLMUsageCallback,
+    collect_llm_usage,
+    load_pricing,
+    price_for,
+    record_usage,
+    usage_from_openai,
+)
+from backend.utils.metrics import bind_request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "loadtest"))
+
+from fake_openai import FakeOpenAIConfig, create_app  # noqa: E402
+
+
+def _completion(model="gpt-4o-2024-08-06", prompt=1000, completion=200, cached=400):
+    return SimpleNamespace(
+        model=model,
+        usage=SimpleNamespace(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        ),
+    )
+
+
+def test_usage_from_openai_and_cost():
+    usage = usage_from_openai(_completion(), model="gpt-4o", duration=1.5)
+
+    assert (usage.model, usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens) == (
+        "gpt-4o-2024-08-06", 1000, 200, 400,
+    )
+    # gpt-4o 단가: (600 × 2.5 + 400 × 1.25 + 200 × 10) / 1M
+    assert usage.cost_usd == pytest.approx(0.004)
+    assert usage_from_openai(SimpleNamespace(usage=None), model="gpt-4o") is None
+    assert usage_from_openai(MagicMock(), model="gpt-4o") is None
+
+
+def test_price_lookup_prefers_longest_prefix(monkeypatch):
+    assert price_for("gpt-4o-mini-2024-07-18") == price_for("gpt-4o-mini")
+    assert price_for("unknown-model") is None
+
+    monkeypatch.setenv("LLM_PRICING_JSON", '{"local-llm": [0, 0, 0]}')
+    load_pricing.cache_clear()
+    try:
+        assert price_for("local-llm") == (0.0, 0.0, 0.0)
+        assert LLMUsage(model="unknown-model", prompt_tokens=10).cost_usd == 0.0
+    finally:
+        load_pricing.cache_clear()
+
+
+def test_record_usage_accumulates_per_request_and_model():
+    with bind_request("/test"), collect_llm_usage() as summary:
+        record_usage(LLMUsage(model="gpt-4o", prompt_tokens=100, completion_tokens=10, duration=0.5))
+        record_usage(LLMUsage(model="gpt-4o-mini", prompt_tokens=50, completion_tokens=5, duration=0.25))
+    record_usage(LLMUsage(model="gpt-4o", prompt_tokens=999))
+
+    assert summary["calls"] == 2
+    assert summary["prompt_tokens"] == 150
+    assert summary["llm_ms"] == 750.0
+    assert summary["by_model"]["gpt-4o-mini"]["completion_tokens"] == 5
+
+
+def test_callback_records_llm_result_usage():
+    summary = {}
+    callback = LLMUsageCallback("gpt-4o", endpoint="/test", summary=summary)
+    run_id = uuid4()
+    callback.on_chat_model_start({}, [[]], run_id=run_id)
+    callback.on_llm_new_token("a", run_id=run_id)
+    callback.on_llm_end(
+        LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="a"))]],
+            llm_output={"token_usage": {"prompt_tokens": 30, "completion_tokens": 3}, "model_name": "gpt-4o"},
+        ),
+        run_id=run_id,
+    )
+
+    assert summary["prompt_tokens"] == 30
+    assert summary["completion_tokens"] == 3
+    assert "ttft_ms" in summary and "llm_ms" in summary
+
+
+def test_acomplete_records_usage(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    client = LLMClient(model_name="gpt-4o")
+    client.async_client = MagicMock()
+    client.async_client.chat.completions.create = AsyncMock(return_value=_completion(cached=0))
+
+    async def run():
+        with collect_llm_usage() as summary:
+            await client.acomplete(messages=[{"role": "user", "content": "hi"}])
+        return summary
+
+    summary = asyncio.run(run())
+    assert summary["calls"] == 1
+    assert summary["completion_tokens"] == 200
+
+
+def test_streaming_chat_model_reports_usage_and_ttft():
+    stub = create_app(FakeOpenAIConfig(ttft_ms=5, ttft_sigma=0.0, tokens_per_sec=5000, seed=1))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)) as http:
+            llm = ChatOpenAI(
+                model="gpt-4o",
+                api_key="sk-fake",
+                base_url="http://fake/v1",
+                streaming=True,
+                stream_usage=True,
+                http_async_client=http,
+            )
+            summary = {}
+            callback = LLMUsageCallback("gpt-4o", endpoint="/rag/query/stream", summary=summary)
+            chunks = [chunk async for chunk in llm.astream("ソウル", config={"callbacks": [callback]})]
+        return chunks, summary
+
+    chunks, summary = asyncio.run(run())
+    assert chunks
+    assert summary["completion_tokens"] > 0
+    assert summary["ttft_ms"] <= summary["llm_ms"]
+
+
+def test_chat_response_includes_llm_usage(monkeypatch):
+    import backend.main as main_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://usage-test")
+    monkeypatch.setattr(main_module, "init_cache_from_env", lambda: None)
+    monkeypatch.setattr(main_module, "Retriever", lambda **_: MagicMock())
+    monkeypatch.setattr(main_module, "ItineraryPlanner", lambda retriever, **_: MagicMock())
+
+    async def handle_chat(_request):
+        record_usage(LLMUsage(model="gpt-4o", prompt_tokens=120, completion_tokens=20))
+        return {"message": "こんにちは"}
+
+    handler = MagicMock()
+    handler.initialize = AsyncMock()
+    handler.close = AsyncMock()
+    handler.handle_chat = handle_chat
+    monkeypatch.setattr(main_module, "UnifiedChatHandler", lambda **_: handler)
+
+    with TestClient(main_module.app) as client:
+        response = client.post("/chat", json={"text": "こんにちは"})
+
+    assert response.status_code == 200
+    usage = response.json()["metadata"]["llm_usage"]
+    assert usage["prompt_tokens"] == 120
+    assert usage["by_model"]["gpt-4o"]["calls"] == 1
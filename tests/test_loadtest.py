@@ -0,0 +1,140 @@
+"""
+오프라인 부하 테스트 도구 테스트
+fake_openai 스텁 응답(tool call, Structured Outputs, 일정 JSON, stream), 합성 데이터, 집계/회귀 비교 검증
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "loadtest"))
+
+from fake_openai import FakeOpenAIConfig, create_app  # noqa: E402
+from run_load import EndpointStats, PayloadPool, compare, parse_mix, percentile  # noqa: E402
+from seed_pgvector import EMBEDDING_DIM, generate_documents  # noqa: E402
+
+from backend.function_tools import ALL_TOOLS
+from backend.schemas import ItineraryPlan, ItineraryStructuredResponse
+
+
+@pytest.fixture
+def client():
+    config = FakeOpenAIConfig(ttft_ms=1, ttft_sigma=0.0, tokens_per_sec=1e6, tokens_per_sec_jitter=0, seed=7)
+    return TestClient(create_app(config))
+
+
+def _completion(client, **body):
+    body.setdefault("model", "gpt-4o")
+    response = client.post("/v1/chat/completions", json=body)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_plain_completion_reports_usage(client):
+    data = _completion(client, messages=[{"role": "user", "content": "ソウルのカフェ"}])
+
+    assert data["choices"][0]["message"]["content"]
+    assert data["choices"][0]["finish_reason"] == "stop"
+    assert data["usage"]["total_tokens"] == data["usage"]["prompt_tokens"] + data["usage"]["completion_tokens"]
+
+
+def test_tools_return_search_places_call():
+    app = create_app(FakeOpenAIConfig(ttft_ms=1, tokens_per_sec=1e6, tool_call_rate=1.0))
+    data = _completion(
+        TestClient(app),
+        messages=[{"role": "user", "content": "明洞 カフェ"}],
+        tools=ALL_TOOLS,
+    )
+
+    call = data["choices"][0]["message"]["tool_calls"][0]
+    assert data["choices"][0]["finish_reason"] == "tool_calls"
+    assert call["function"]["name"] == "search_places"
+    assert json.loads(call["function"]["arguments"])["query"] == "明洞 カフェ"
+
+
+def test_structured_output_matches_schema(client):
+    schema = ItineraryStructuredResponse.model_json_schema()
+    data = _completion(
+        client,
+        messages=[{"role": "user", "content": "釜山 2日"}],
+        response_format={"type": "json_schema", "json_schema": {"name": "plan", "schema": schema, "strict": True}},
+    )
+
+    parsed = ItineraryStructuredResponse.model_validate_json(data["choices"][0]["message"]["content"])
+    assert parsed.itinerary.days
+
+
+def test_itinerary_prompt_uses_candidates(client):
+    prompt = (
+        '"itineraries"\n'
+        "- id:BENCH_FOOD_000001 name:ソウル冷麺00001 domain:food summary:...\n"
+        "- id:BENCH_NAT_000002 name:ソウル公園00002 domain:nat summary:...\n"
+        "dayの数は2日と同じにし"
+    )
+    data = _completion(client, messages=[{"role": "user", "content": prompt}])
+
+    payload = json.loads(data["choices"][0]["message"]["content"])
+    plan = ItineraryPlan(**payload["itineraries"][0])
+    assert [day.day for day in plan.days] == [1, 2]
+    assert plan.days[0].segments[0].document_id == "BENCH_FOOD_000001"
+
+
+def test_stream_emits_sse_chunks_and_done(client):
+    with client.stream(
+        "POST",
+        "/v1/chat/completions",
+        json={"model": "gpt-4o", "stream": True, "messages": [{"role": "user", "content": "済州"}]},
+    ) as response:
+        lines = [line for line in response.iter_lines() if line.startswith("data: ")]
+
+    assert lines[-1] == "data: [DONE]"
+    chunks = [json.loads(line[6:]) for line in lines[:-1]]
+    text = "".join(c["choices"][0]["delta"].get("content") or "" for c in chunks)
+    assert text
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+def test_generated_documents_are_deterministic():
+    first = list(generate_documents(3, 2, seed=1))
+    second = list(generate_documents(3, 2, seed=1))
+
+    assert first == second
+    parent, children = first[0]
+    assert parent["document_id"].startswith("BENCH_")
+    assert [child["qa_id"] for child in children] == [f"{parent['document_id']}#0", f"{parent['document_id']}#1"]
+    assert len(json.loads(children[0]["embedding"])) == EMBEDDING_DIM
+
+
+def test_percentile_and_summary():
+    stats = EndpointStats(latencies_ms=[float(v) for v in range(1, 101)], errors=0)
+    summary = stats.summary(10.0)
+
+    assert percentile([], 50) is None
+    assert summary["latency_ms"]["p50"] == pytest.approx(50.5)
+    assert summary["latency_ms"]["p99"] == pytest.approx(99.01)
+    assert summary["throughput_rps"] == 10.0
+
+
+def test_payload_pool_respects_mix():
+    pool = PayloadPool(parse_mix("rag_query=1,chat=0"), pool_size=5, seed=3)
+
+    names = {pool.next()[0] for _ in range(50)}
+    assert names == {"rag_query"}
+    with pytest.raises(ValueError):
+        parse_mix("unknown=1")
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    def result(p95, rps):
+        return {"endpoints": {"rag_query": {
+            "error_rate": 0.0,
+            "throughput_rps": rps,
+            "latency_ms": {"p95": p95, "p99": p95},
+        }}}
+
+    assert compare(result(105, 10), result(100, 10), max_regression=0.1) == []
+    regressions = compare(result(130, 8), result(100, 10), max_regression=0.1)
+    assert any("p95" in line for line in regressions)
+    assert any("throughput" in line for line in regressions)
@@ -138,7 +138,7 @@ async def test_search_with_expansion_async_should_handle_failures_gracefully():
     When: search_with_expansion_async를 호출하면
     Then: 나머지 2개 결과는 정상 반환되어야 한다
     """
-    from backend.retriever import Retriever
+    from backend.retriever import Retriever, collect_expansion_metrics
     
     mock_embeddings = Mock()
     mock_embeddings.embed_query = Mock(return_value=[0.1] * 384)
@@ -168,7 +168,8 @@ async def test_search_with_expansion_async_should_handle_failures_gracefully():
                 )
             ]
         
-        with patch.object(retriever, 'search_async', side_effect=mock_search_async):
+        with patch.object(retriever, 'search_async', side_effect=mock_search_async), \
+                collect_expansion_metrics() as metrics:
             results = await retriever.search_with_expansion_async(
                 query="서울 맛집",
                 top_k=5
@@ -178,8 +179,38 @@ async def test_search_with_expansion_async_should_handle_failures_gracefully():
             assert len(results) >= 2, "실패한 변형을 제외한 결과가 반환되어야 합니다"
             
             # metrics에 실패 카운트가 기록되어야 함
-            assert retriever.last_expansion_metrics is not None
-            assert retriever.last_expansion_metrics.get("failure_count", 0) > 0
+            assert metrics
+            assert metrics.get("failure_count", 0) > 0
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_their_own_expansion_metrics():
+    """
+    공유 Retriever로 동시에 검색해도 요청마다 자기 지표만 받아야 한다.
+    """
+    from backend.retriever import Retriever, collect_expansion_metrics
+
+    with patch('backend.retriever.ConnectionPool') as mock_pool:
+        mock_pool.return_value = Mock()
+        retriever = Retriever(db_url="postgresql://test", embeddings_client=Mock())
+
+    async def mock_search_async(query, top_k=5, domain=None, area=None):
+        # 서울 요청이 늦게 끝나도록 해서 부산 요청 완료 후에도 지표가 섞이지 않는지 확인
+        await asyncio.sleep(0.05 if "서울" in query else 0.01)
+        return [Document(page_content=query, metadata={"document_id": query, "similarity": 0.9})]
+
+    async def request(query):
+        with collect_expansion_metrics() as metrics:
+            await retriever.search_with_expansion_async(query=query, top_k=3)
+        return metrics
+
+    with patch.object(retriever, 'search_async', side_effect=mock_search_async):
+        seoul, busan = await asyncio.gather(request("서울 맛집"), request("부산 해변"))
+
+    assert seoul["variants"][0] == "서울 맛집"
+    assert busan["variants"][0] == "부산 해변"
+    assert not hasattr(retriever, "last_expansion_metrics")
 
 
 @pytest.mark.asyncio
@@ -243,3 +274,30 @@ async def test_search_async_should_exist():
         docs = await result
         assert len(docs) > 0, "검색 결과가 반환되어야 합니다"
         assert docs[0].metadata["similarity"] == 0.95
+
+
+@pytest.mark.asyncio
+async def test_retriever_adapter_ainvoke_uses_parallel_expansion():
+    """
+    RetrieverAdapter.ainvoke(chain.ainvoke 경로)는 병렬 확장 검색을 사용하고
+    동기 search_with_expansion을 호출하지 않아야 한다.
+    """
+    from backend.rag_chain import RetrieverAdapter
+
+    retriever = Mock()
+    retriever.search_with_expansion_async = AsyncMock(return_value=[
+        Document(page_content="親ドキュメント要約:\n요약\n\n質問:\nQ", metadata={"document_id": "doc_1"})
+    ])
+
+    adapter = RetrieverAdapter(
+        retriever=retriever,
+        top_k=3,
+        domain="food",
+        expansion=True,
+        include_parent_summary=False,
+    )
+    docs = await adapter.ainvoke("서울 맛집")
+
+    retriever.search_with_expansion_async.assert_awaited_once()
+    retriever.search_with_expansion.assert_not_called()
+    assert docs[0].page_content.startswith("質問:")
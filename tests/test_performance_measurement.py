@@ -96,10 +96,10 @@ async def test_parallel_expansion_metrics_should_show_performance_gain():
     병렬 처리 메트릭이 성능 향상을 보여줘야 한다.
     
     Given: Query Expansion을 병렬로 실행할 때
-    When: last_expansion_metrics를 확인하면
+    When: collect_expansion_metrics()로 수집한 지표를 확인하면
     Then: duration_ms가 순차 실행보다 짧아야 한다
     """
-    from backend.retriever import Retriever
+    from backend.retriever import Retriever, collect_expansion_metrics
     
     mock_embeddings = Mock()
     mock_embeddings.embed_query = Mock(return_value=[0.1] * 384)
@@ -121,15 +121,15 @@ async def test_parallel_expansion_metrics_should_show_performance_gain():
                 )
             ]
         
-        with patch.object(retriever, 'search_async', side_effect=mock_search_async):
+        with patch.object(retriever, 'search_async', side_effect=mock_search_async), \
+                collect_expansion_metrics() as metrics:
             results = await retriever.search_with_expansion_async(
                 query="서울 맛집",
                 top_k=5
             )
         
-        # 메트릭 검증
-        metrics = retriever.last_expansion_metrics
-        assert metrics is not None, "메트릭이 기록되어야 합니다"
+        # 메트릭 검증 (요청 컨텍스트에 수집된 지표)
+        assert metrics, "메트릭이 기록되어야 합니다"
         
         # 3개 변형 × 50ms = 150ms (순차)
         # 병렬로는 ~50-70ms 정도 예상
@@ -0,0 +1,149 @@
+"""
+Connection Pool 설정/관측 테스트
+환경 변수 기반 풀 크기, configure 콜백, 풀 통계 게이지, 공유 풀 레지스트리 검증
+"""
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from backend.db.pool import (
+    PoolRegistry,
+    PoolTimeout,
+    export_pool_stats,
+    make_configure_callback,
+    pool_settings_from_env,
+    session_settings_from_env,
+    workload_limits_from_env,
+)
+
+
+def test_pool_settings_use_defaults_without_env(monkeypatch):
+    for suffix in ("MIN_SIZE", "MAX_SIZE", "TIMEOUT", "MAX_WAITING", "MAX_IDLE", "MAX_LIFETIME"):
+        monkeypatch.delenv(f"DB_POOL_{suffix}", raising=False)
+
+    settings = pool_settings_from_env("DB_POOL", min_size=2, max_size=10, timeout=30.0)
+
+    assert settings == {
+        "min_size": 2,
+        "max_size": 10,
+        "timeout": 30.0,
+        "max_waiting": 0,
+        "max_idle": 600.0,
+        "max_lifetime": 3600.0,
+    }
+
+
+def test_pool_settings_read_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MIN_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "16")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_MAX_IDLE", "120")
+
+    settings = pool_settings_from_env("DB_POOL", min_size=2, max_size=10, timeout=30.0)
+
+    assert settings["min_size"] == 4
+    assert settings["max_size"] == 16
+    assert settings["timeout"] == 2.5
+    assert settings["max_idle"] == 120.0
+
+
+def test_pool_settings_reject_max_below_min(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MIN_SIZE", "8")
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "4")
+
+    with pytest.raises(ValueError):
+        pool_settings_from_env("DB_POOL", min_size=2, max_size=10, timeout=30.0)
+
+
+def test_configure_callback_applies_session_settings_once(monkeypatch):
+    """configure 콜백은 pgvector 등록 후 SET을 실행하고 commit해야 한다."""
+    monkeypatch.setenv("PGVECTOR_IVFFLAT_PROBES", "10")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    monkeypatch.delenv("PGVECTOR_HNSW_EF_SEARCH", raising=False)
+
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+
+    with patch("pgvector.psycopg.register_vector") as register_vector:
+        configure = make_configure_callback(session_settings_from_env())
+        configure(conn)
+
+    register_vector.assert_called_once_with(conn)
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert executed == ["SET ivfflat.probes = 10", "SET statement_timeout = 5000"]
+    conn.commit.assert_called_once()
+
+
+def test_export_pool_stats_sets_gauges():
+    pool = Mock()
+    pool.get_stats.return_value = {
+        "pool_size": 5,
+        "pool_available": 2,
+        "requests_waiting": 3,
+        "requests_wait_ms": 120,
+    }
+
+    stats = export_pool_stats(pool, "test")
+
+    assert stats["requests_waiting"] == 3
+
+
+def test_retriever_builds_shared_pool_from_env(monkeypatch):
+    from backend.retriever import Retriever
+
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "20")
+    mock_embeddings = Mock()
+
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        retriever = Retriever(db_url="postgresql://pool-env", embeddings_client=mock_embeddings)
+        retriever.close()
+
+    kwargs = mock_pool.call_args.kwargs
+    assert kwargs["max_size"] == 20
+    assert kwargs["min_size"] == 2
+    assert callable(kwargs["configure"])
+
+
+def test_registry_shares_one_pool_per_dsn():
+    """같은 DSN의 Retriever/관리 작업은 하나의 풀을 공유하고 마지막 해제 시 종료한다."""
+    registry = PoolRegistry()
+    factory = Mock()
+
+    search_lease = registry.acquire("postgresql://shared", workload="search", pool_factory=factory)
+    admin_lease = registry.acquire("postgresql://shared", workload="admin", pool_factory=factory)
+
+    assert search_lease.pool is admin_lease.pool
+    assert factory.call_count == 1
+
+    search_lease.release()
+    search_lease.release()  # 중복 해제는 무시
+    search_lease.pool.close.assert_not_called()
+    admin_lease.release()
+    search_lease.pool.close.assert_called_once()
+
+
+def test_registry_enforces_workload_limit(monkeypatch):
+    """워크로드 상한을 넘는 동시 대여는 타임아웃되어야 한다."""
+    monkeypatch.setenv("DB_POOL_ADMIN_LIMIT", "1")
+    registry = PoolRegistry()
+    factory = MagicMock()
+    admin = registry.acquire("postgresql://limited", workload="admin", pool_factory=factory)
+    search = registry.acquire("postgresql://limited", workload="search", pool_factory=factory)
+
+    with admin.connection():
+        with pytest.raises(PoolTimeout):
+            with admin.connection(timeout=0.01):
+                pass
+        # search 워크로드는 별도 상한이므로 대여 가능
+        with search.connection(timeout=0.01):
+            pass
+
+    with admin.connection(timeout=0.01):
+        pass
+
+
+def test_workload_limits_capped_by_pool_size(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SEARCH_LIMIT", "50")
+    monkeypatch.delenv("DB_POOL_ADMIN_LIMIT", raising=False)
+
+    assert workload_limits_from_env(8) == {"search": 8, "admin": 2}
@@ -0,0 +1,163 @@
+"""
+Read Replica 라우팅 테스트
+least-outstanding 선택, 오류 시 primary fallback, 복제 지연 제외, health 보고 검증
+"""
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+
+import threading
+
+import psycopg
+import pytest
+
+from backend.db.replicas import REPLICA_LAG_SQL, ReplicaRouter, replica_urls_from_env
+
+
+class FakeLease:
+    """PoolLease 대체 (connection()만 흉내)"""
+
+    def __init__(self, name, lag=0.0, fail=False):
+        self.name = name
+        self.lag = lag
+        self.fail = fail
+        self.calls = 0
+        self.released = False
+
+    @contextmanager
+    def connection(self, timeout=None):
+        self.calls += 1
+        if self.fail:
+            raise psycopg.OperationalError(f"{self.name} down")
+        conn = MagicMock()
+        conn.name = self.name
+        conn.cursor.return_value.__enter__.return_value.fetchone.return_value = (self.lag,)
+        yield conn
+
+    def release(self):
+        self.released = True
+
+
+def test_replica_urls_from_env(monkeypatch):
+    monkeypatch.setenv("READ_REPLICA_URLS", "postgresql://r1, ,postgresql://r2")
+    assert replica_urls_from_env() == ["postgresql://r1", "postgresql://r2"]
+
+    monkeypatch.delenv("READ_REPLICA_URLS")
+    assert replica_urls_from_env() == []
+
+
+def test_without_replicas_uses_primary():
+    primary = FakeLease("primary")
+    router = ReplicaRouter(primary)
+
+    assert router.run(lambda conn: conn.name) == "primary"
+    assert router.check_health() == {}
+
+
+def test_picks_replica_with_least_outstanding_requests():
+    """진행 중 요청이 적은 replica가 선택되어야 한다."""
+    r1, r2 = FakeLease("r1"), FakeLease("r2")
+    router = ReplicaRouter(FakeLease("primary"), {"replica_1": r1, "replica_2": r2})
+    router.replicas[0].outstanding = 3
+
+    assert router.run(lambda conn: conn.name) == "r2"
+    assert router.replicas[0].outstanding == 3
+    assert router.replicas[1].outstanding == 0
+
+
+def test_failed_replica_is_ejected_and_primary_serves_request():
+    """replica 실패 시 primary로 재시도하고 해당 replica는 제외된다."""
+    primary = FakeLease("primary")
+    broken = FakeLease("r1", fail=True)
+    router = ReplicaRouter(primary, {"replica_1": broken}, eject_seconds=60)
+
+    assert router.run(lambda conn: conn.name) == "primary"
+    assert router.run(lambda conn: conn.name) == "primary"
+    assert broken.calls == 1  # 제외 후에는 시도하지 않음
+    assert router.replicas[0].outstanding == 0
+    assert router.primary.outstanding == 0
+
+
+def test_primary_failure_propagates():
+    router = ReplicaRouter(FakeLease("primary", fail=True))
+
+    with pytest.raises(psycopg.OperationalError):
+        router.run(lambda conn: conn.name)
+
+
+def test_caller_errors_do_not_eject_replica():
+    """SQL 오류 등 호출자 원인 오류는 replica를 제외하지 않고 그대로 전파한다."""
+    replica = FakeLease("r1")
+    router = ReplicaRouter(FakeLease("primary"), {"replica_1": replica})
+
+    def bad_query(conn):
+        raise psycopg.errors.SyntaxError("syntax error")
+
+    with pytest.raises(psycopg.errors.SyntaxError):
+        router.run(bad_query)
+    assert router.replicas[0].healthy(0) and router.replicas[0].status == "ok"
+    assert router.replicas[0].outstanding == 0
+    assert router.run(lambda conn: conn.name) == "r1"
+
+
+def test_lag_sql_reports_zero_when_replay_is_caught_up():
+    """primary에 쓰기가 없어도 재생이 따라잡았으면 지연 0이어야 한다."""
+    assert "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0" in REPLICA_LAG_SQL
+
+
+def test_background_health_checks_eject_lagging_replica():
+    lagging = FakeLease("r1", lag=42.0)
+    router = ReplicaRouter(FakeLease("primary"), {"replica_1": lagging}, max_lag_seconds=10)
+    checked = threading.Event()
+    original = router.check_health
+
+    def check_health():
+        result = original()
+        checked.set()
+        return result
+
+    router.check_health = check_health
+    router.start_health_checks(interval_seconds=0.01)
+    try:
+        assert checked.wait(timeout=2)
+        assert router.run(lambda conn: conn.name) == "primary"
+    finally:
+        router.release()
+    assert router._health_thread is None
+
+
+def test_health_check_ejects_lagging_replica_and_restores_it():
+    """복제 지연이 max_lag_seconds를 넘으면 제외되고, 해소되면 복귀한다."""
+    lagging = FakeLease("r1", lag=42.0)
+    router = ReplicaRouter(
+        FakeLease("primary"),
+        {"replica_1": lagging, "replica_2": FakeLease("r2", fail=True)},
+        max_lag_seconds=10,
+    )
+
+    assert router.check_health() == {"replica_1": "lagging", "replica_2": "error"}
+    assert router.run(lambda conn: conn.name) == "primary"
+
+    lagging.lag = 0.5
+    assert router.check_health()["replica_1"] == "ok"
+    assert router.run(lambda conn: conn.name) == "r1"
+
+
+def test_retriever_routes_search_through_replicas(monkeypatch):
+    """Retriever는 replica URL마다 풀을 만들고 검색을 라우터로 실행해야 한다."""
+    from backend.retriever import Retriever
+
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        mock_pool.side_effect = lambda *args, **kwargs: MagicMock()
+        retriever = Retriever(
+            db_url="postgresql://replica-primary",
+            embeddings_client=Mock(),
+            replica_urls=["postgresql://replica-1"],
+        )
+        assert mock_pool.call_count == 2
+        assert [t.name for t in retriever.router.replicas] == ["replica_1"]
+
+        with patch.object(retriever.router, "run", return_value=[("row",)]) as run:
+            assert retriever._execute_search("SELECT 1", []) == [("row",)]
+        run.assert_called_once()
+
+        retriever.close()
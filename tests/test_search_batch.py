@@ -0,0 +1,235 @@
+"""
+Retriever 일괄 검색 테스트
+일괄 임베딩(embed_documents, memo 히트 보존), pipeline 실행, 캐시 히트 분리, 결과 순서,
+필터 결과 부족 시 pipeline 결과 재사용 검증
+"""
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from langchain.schema import Document
+
+from backend.retriever import Retriever
+from backend.semantic_cache import SemanticCache
+
+
+VECTORS = {
+    "ソウル カフェ": [1.0, 0.0, 0.0],
+    "釜山 ホテル": [0.0, 1.0, 0.0],
+    "済州 自然": [0.0, 0.0, 1.0],
+    "서울 food": [1.0, 0.0, 0.0],
+    "서울 shop": [0.0, 1.0, 0.0],
+    "서울 his": [0.0, 0.0, 1.0],
+}
+
+
+def _make_retriever(semantic_cache=None):
+    embeddings = Mock()
+    embeddings.embed_documents = Mock(side_effect=lambda texts: [VECTORS[t] for t in texts])
+    embeddings.embed_query = Mock(side_effect=lambda text: VECTORS[text])
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        mock_pool.return_value = MagicMock()
+        retriever = Retriever(
+            db_url="postgresql://batch-test",
+            embeddings_client=embeddings,
+            semantic_cache=semantic_cache,
+        )
+    return retriever, embeddings
+
+
+def _docs_for(statement):
+    _, params = statement
+    return [Document(page_content="c", metadata={"document_id": params[0]})]
+
+
+def test_search_batch_embeds_once_and_keeps_order():
+    retriever, embeddings = _make_retriever()
+    batch = [
+        {"query": "ソウル カフェ", "top_k": 2, "domain": "food", "area": "서울"},
+        {"query": "釜山 ホテル", "top_k": 1},
+        {"query": "ソウル カフェ", "top_k": 2, "domain": "food", "area": "서울"},
+    ]
+
+    with patch.object(retriever, "_execute_search_batch", side_effect=lambda stmts, shape: stmts) as execute, \
+            patch.object(retriever, "_rows_to_documents", side_effect=_docs_for):
+        results = retriever.search_batch(batch)
+
+    # 중복 텍스트는 한 번만 임베딩
+    embeddings.embed_documents.assert_called_once_with(["ソウル カフェ", "釜山 ホテル"])
+    embeddings.embed_query.assert_not_called()
+    execute.assert_called_once()
+    assert len(execute.call_args.args[0]) == 3
+    assert [docs[0].metadata["document_id"] for docs in results] == [
+        str(VECTORS["ソウル カフェ"]),
+        str(VECTORS["釜山 ホテル"]),
+        str(VECTORS["ソウル カフェ"]),
+    ]
+    retriever.close()
+
+
+def test_embed_batch_keeps_memo_hits_when_new_texts_overflow_memo(monkeypatch):
+    monkeypatch.setattr("backend.retriever.EMBEDDING_MEMO_SIZE", 2)
+    retriever, embeddings = _make_retriever()
+    embeddings.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    retriever._embed_batch(["hit"])
+
+    # 새 텍스트 3개가 memo(2)를 넘겨 "hit"이 밀려나도 결과에는 포함되어야 함
+    vectors = retriever._embed_batch(["hit", "new-1", "new-22", "new-333"])
+
+    assert vectors == [[3.0], [5.0], [6.0], [7.0]]
+    assert embeddings.embed_documents.call_args.args[0] == ["new-1", "new-22", "new-333"]
+    retriever.close()
+
+
+def test_short_filtered_batch_result_reuses_pipelined_rows():
+    retriever, _ = _make_retriever()
+    short_row = _row(0, "F1", "food")[1:]
+    calls = []
+
+    def execute(sql, params, shape="none", settings=None):
+        calls.append((sql, settings))
+        return [short_row, short_row]
+
+    with patch.object(retriever, "_execute_search_batch", return_value=[[short_row]]), \
+            patch.object(retriever, "_execute_search", side_effect=execute), \
+            patch.object(retriever, "_search_rows") as single:
+        results = retriever.search_batch([{"query": "ソウル カフェ", "top_k": 2, "domain": "food"}])
+
+    single.assert_not_called()
+    # 첫 인덱스 검색/EXPLAIN 없이 바로 probes를 늘린 재시도
+    assert len(calls) == 1
+    assert not calls[0][0].startswith("EXPLAIN")
+    assert "ivfflat.probes" in calls[0][1]
+    assert len(results[0]) == 2
+    retriever.close()
+
+
+def test_search_batch_skips_sql_for_cached_queries():
+    cache = SemanticCache(threshold=0.95)
+    retriever, _ = _make_retriever(semantic_cache=cache)
+    cached_docs = [Document(page_content="cached", metadata={"document_id": "CACHED"})]
+    cache.put(VECTORS["ソウル カフェ"], SemanticCache.make_key("search", top_k=2, domain=None, area=None), cached_docs)
+
+    with patch.object(retriever, "_execute_search_batch", side_effect=lambda stmts, shape: stmts) as execute, \
+            patch.object(retriever, "_rows_to_documents", side_effect=_docs_for):
+        results = retriever.search_batch([
+            {"query": "ソウル カフェ", "top_k": 2},
+            {"query": "済州 自然", "top_k": 2},
+        ])
+
+    assert len(execute.call_args.args[0]) == 1
+    assert results[0][0].metadata["document_id"] == "CACHED"
+    assert results[1][0].metadata["document_id"] == str(VECTORS["済州 自然"])
+    retriever.close()
+
+
+def test_execute_search_batch_uses_pipeline_on_one_connection():
+    retriever, _ = _make_retriever()
+    conn = MagicMock()
+    cursors = [MagicMock(), MagicMock()]
+    cursors[0].fetchall.return_value = [("a",)]
+    cursors[1].fetchall.return_value = [("b",)]
+    conn.cursor.side_effect = cursors
+
+    with patch.object(retriever.router, "run", side_effect=lambda fn: fn(conn)):
+        rows = retriever._execute_search_batch([("SQL1", [1]), ("SQL2", [2])])
+
+    conn.pipeline.assert_called_once()
+    cursors[0].execute.assert_called_once_with("SQL1", [1])
+    cursors[1].execute.assert_called_once_with("SQL2", [2])
+    assert rows == [[("a",)], [("b",)]]
+    retriever.close()
+
+
+def test_search_batch_validates_every_query():
+    retriever, _ = _make_retriever()
+
+    with pytest.raises(ValueError):
+        retriever.search_batch([{"query": "ソウル カフェ"}, {"query": "a"}])
+    with pytest.raises(ValueError):
+        retriever.search_batch([{"query": "ソウル カフェ", "top_k": 11}])
+    retriever.close()
+
+
+def _row(slot, document_id, domain):
+    # slot + SELECT 컬럼 순서 (chunk_text ... similarity)
+    return (slot, "chunk", "q", "a", domain, "t", document_id, "서울", "", document_id, "", 0.1, 0.9)
+
+
+def test_search_domains_runs_one_statement_with_per_slot_quota():
+    retriever, embeddings = _make_retriever()
+    rows = [_row(0, "F1", "food"), _row(0, "F2", "food"), _row(1, "S1", "shop"), _row(1, "S2", "shop")]
+
+    with patch.object(retriever, "_execute_search", return_value=rows) as execute, \
+            patch.object(retriever, "_search_rows") as single:
+        results = retriever.search_domains({"food": "서울 food", "shop": "서울 shop"}, top_k=2, area="서울")
+
+    embeddings.embed_documents.assert_called_once_with(["서울 food", "서울 shop"])
+    execute.assert_called_once()
+    sql, params = execute.call_args.args
+    assert "CROSS JOIN LATERAL" in sql
+    assert params[0] == [0, 1] and params[1] == ["food", "shop"] and params[-1] == 2
+    single.assert_not_called()
+    assert [d.metadata["document_id"] for d in results["food"]] == ["F1", "F2"]
+    assert [d.metadata["document_id"] for d in results["shop"]] == ["S1", "S2"]
+    retriever.close()
+
+
+def test_search_domains_retries_only_short_slots():
+    retriever, _ = _make_retriever()
+    rows = [_row(0, "F1", "food"), _row(0, "F2", "food"), _row(1, "H1", "his")]
+
+    with patch.object(retriever, "_execute_search", return_value=rows), \
+            patch.object(retriever, "_search_rows", return_value=[_row(0, "H2", "his")[1:]]) as single:
+        results = retriever.search_domains({"food": "서울 food", "his": "서울 his"}, top_k=2, area="서울")
+
+    single.assert_called_once()
+    assert single.call_args.args[2] == "his"
+    assert [d.metadata["document_id"] for d in results["his"]] == ["H2"]
+    retriever.close()
+
+
+def test_search_domains_expansion_metrics_count_real_slot_outcomes():
+    from backend.retriever import collect_expansion_metrics
+
+    retriever, _ = _make_retriever()
+    retriever.embeddings.embed_documents.side_effect = lambda texts: [[1.0, 0.0, 0.0] for _ in texts]
+    rows = [_row(0, "F1", "food"), _row(0, "F2", "food")]
+
+    with patch("backend.retriever.generate_variations", side_effect=lambda q: [q]), \
+            patch.object(retriever, "_execute_search", return_value=rows), \
+            patch.object(retriever, "_search_rows", side_effect=RuntimeError("db down")), \
+            collect_expansion_metrics() as metrics:
+        results = retriever.search_domains(
+            {"food": "서울 food", "his": "서울 his"}, top_k=2, area="서울", expansion=True,
+        )
+
+    # his 슬롯은 빈 결과 + 재시도 실패 → failure, food는 success
+    assert metrics["success_count"] == 1
+    assert metrics["failure_count"] == 1
+    assert results["his"] == []
+    assert [d.metadata["document_id"] for d in results["food"]] == ["F1", "F2"]
+    retriever.close()
+
+
+def test_itinerary_planner_gathers_all_domains_in_one_call():
+    from backend.itinerary import ItineraryPlanner
+    from backend.schemas import DomainEnum, ItineraryRecommendationRequest
+
+    retriever = MagicMock()
+    retriever.search_domains.return_value = {
+        "food": [Document(page_content="f", metadata={"document_id": "F1"})],
+        "shop": [Document(page_content="s", metadata={"document_id": "S1"}),
+                 Document(page_content="f", metadata={"document_id": "F1"})],
+    }
+    planner = ItineraryPlanner(retriever)
+    request = ItineraryRecommendationRequest(
+        region="서울", domains=[DomainEnum.FOOD, DomainEnum.SHOP], duration_days=2, expansion=True,
+    )
+
+    docs = planner._gather_candidates(request)
+
+    retriever.search_domains.assert_called_once_with(
+        {"food": "서울 food", "shop": "서울 shop"}, top_k=6, area="서울", expansion=True,
+    )
+    retriever.search.assert_not_called()
+    assert [d.metadata["document_id"] for d in docs] == ["F1", "S1"]
@@ -0,0 +1,149 @@
+"""
+Semantic Cache 테스트
+근사 중복 쿼리 재사용, 필터 분리, TTL/LRU 제거, 히트율 통계 검증
+"""
+import time
+from unittest.mock import Mock, patch
+
+from langchain.schema import Document
+
+from backend.semantic_cache import SemanticCache, init_semantic_cache_from_env
+
+
+def _key(**filters):
+    return SemanticCache.make_key("search", **filters)
+
+
+def test_near_duplicate_vector_hits_cache():
+    """cosine similarity가 threshold 이상이면 캐시된 값을 반환해야 한다."""
+    cache = SemanticCache(threshold=0.95)
+    key = _key(top_k=5, domain="food", area="서울")
+
+    cache.put([1.0, 0.0, 0.0], key, ["cafe"])
+
+    assert cache.get([0.99, 0.05, 0.0], key) == ["cafe"]
+    assert cache.get([0.0, 1.0, 0.0], key) is None
+
+
+def test_different_filters_do_not_share_entries():
+    """domain/area 필터가 다르면 같은 벡터라도 캐시를 공유하지 않는다."""
+    cache = SemanticCache(threshold=0.9)
+    cache.put([1.0, 0.0], _key(top_k=5, domain="food", area="서울"), "seoul")
+
+    assert cache.get([1.0, 0.0], _key(top_k=5, domain="food", area="부산")) is None
+    assert cache.get([1.0, 0.0], _key(top_k=5, domain="shop", area="서울")) is None
+    assert cache.get([1.0, 0.0], _key(top_k=5, domain="food", area="서울")) == "seoul"
+
+
+def test_expired_entries_are_evicted():
+    """TTL이 지난 엔트리는 조회되지 않아야 한다."""
+    cache = SemanticCache(threshold=0.9, ttl_seconds=0.05)
+    key = _key(top_k=3)
+    cache.put([1.0, 0.0], key, "value")
+
+    time.sleep(0.1)
+
+    assert cache.get([1.0, 0.0], key) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    """max_entries 초과 시 가장 오래 사용되지 않은 엔트리가 제거된다."""
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    key = _key(top_k=3)
+    cache.put([1.0, 0.0, 0.0], key, "a")
+    cache.put([0.0, 1.0, 0.0], key, "b")
+
+    # "a"를 최근 사용으로 갱신
+    assert cache.get([1.0, 0.0, 0.0], key) == "a"
+    cache.put([0.0, 0.0, 1.0], key, "c")
+
+    assert len(cache) == 2
+    assert cache.get([0.0, 1.0, 0.0], key) is None
+    assert cache.get([1.0, 0.0, 0.0], key) == "a"
+    assert cache.get([0.0, 0.0, 1.0], key) == "c"
+
+
+def test_put_same_vector_replaces_entry():
+    """동일 벡터로 다시 저장하면 엔트리를 추가하지 않고 교체한다."""
+    cache = SemanticCache(threshold=0.9)
+    key = _key(top_k=3)
+    cache.put([1.0, 0.0], key, "old")
+    cache.put([1.0, 0.0], key, "new")
+
+    assert len(cache) == 1
+    assert cache.get([1.0, 0.0], key) == "new"
+
+
+def test_stats_report_hit_rate_per_namespace():
+    """namespace별 hits/misses/hit_rate를 보고해야 한다."""
+    cache = SemanticCache(threshold=0.9)
+    key = _key(top_k=3)
+    cache.put([1.0, 0.0], key, "value")
+    cache.get([1.0, 0.0], key)
+    cache.get([0.0, 1.0], key)
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["search"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_invalidate_documents_drops_search_and_answer_entries():
+    """재임베딩된 문서를 참조하는 search/answer 엔트리만 삭제되어야 한다."""
+    cache = SemanticCache(threshold=0.95)
+    answer_key = SemanticCache.make_key("answer", top_k=5, domain=None, area=None)
+    cache.put([1.0, 0.0], _key(top_k=5), [Document(page_content="a", metadata={"document_id": "A"})])
+    cache.put([0.0, 1.0], _key(top_k=5), [Document(page_content="b", metadata={"document_id": "B"})])
+    cache.put([1.0, 0.0], answer_key, {"answer": "古い回答", "sources": ["A"], "metadata": {}})
+
+    assert cache.invalidate_documents(["A"]) == 2
+    assert cache.get([0.99, 0.05], _key(top_k=5)) is None
+    assert cache.get([0.99, 0.05], answer_key) is None
+    assert cache.get([0.0, 1.0], _key(top_k=5))[0].metadata["document_id"] == "B"
+
+
+def test_init_semantic_cache_from_env_can_disable(monkeypatch):
+    # 임계값 검증 전이므로 기본은 비활성화
+    monkeypatch.delenv("SEMANTIC_CACHE_ENABLED", raising=False)
+    assert init_semantic_cache_from_env() is None
+
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "false")
+    assert init_semantic_cache_from_env() is None
+
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "true")
+    monkeypatch.setenv("SEMANTIC_CACHE_THRESHOLD", "0.9")
+    cache = init_semantic_cache_from_env()
+    assert cache is not None
+    assert cache.threshold == 0.9
+
+
+def test_retriever_search_reuses_cached_documents():
+    """
+    Retriever.search가 근사 중복 쿼리에 대해 DB 검색을 건너뛰어야 한다.
+    """
+    from backend.retriever import Retriever
+
+    vectors = {
+        "ソウルのおすすめカフェ": [1.0, 0.0, 0.0],
+        "ソウル カフェ おすすめ": [0.98, 0.02, 0.0],
+    }
+    mock_embeddings = Mock()
+    mock_embeddings.embed_query = Mock(side_effect=lambda text: vectors[text])
+
+    with patch("backend.retriever.ConnectionPool") as mock_pool:
+        mock_pool.return_value = Mock()
+        retriever = Retriever(
+            db_url="postgresql://test",
+            embeddings_client=mock_embeddings,
+            semantic_cache=SemanticCache(threshold=0.95),
+        )
+
+        docs = [Document(page_content="cafe", metadata={"document_id": "J_FOOD_1"})]
+        with patch.object(retriever, "_search_rows", return_value=[]) as mock_execute, \
+                patch.object(retriever, "_rows_to_documents", return_value=docs):
+            first = retriever.search("ソウルのおすすめカフェ", top_k=3, area="서울")
+            second = retriever.search("ソウル カフェ おすすめ", top_k=3, area="서울")
+
+        assert mock_execute.call_count == 1
+        assert [d.metadata["document_id"] for d in first] == ["J_FOOD_1"]
+        assert [d.metadata["document_id"] for d in second] == ["J_FOOD_1"]
@@ -0,0 +1,154 @@
+"""
+Single-flight 요청 병합 테스트
+동시 동일 요청 병합, 예외/취소 전파, 요청 fingerprint 정규화, /rag/query 병합 검증
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.single_flight import SingleFlight, request_fingerprint
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    calls = {"count": 0}
+
+    async def compute():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return {"answer": "共有"}
+
+    async def scenario():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(*(flight.run("same", compute) for _ in range(10)))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+
+    assert calls["count"] == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(value is results[0][0] for value, _ in results)
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_and_sequential_calls_compute_separately():
+    calls = []
+
+    async def scenario():
+        flight = SingleFlight("test")
+
+        def factory(name):
+            async def compute():
+                calls.append(name)
+                await asyncio.sleep(0.01)
+                return name
+            return compute
+
+        await asyncio.gather(flight.run("a", factory("a")), flight.run("b", factory("b")))
+        # 완료 후에는 캐시하지 않으므로 다시 계산
+        await flight.run("a", factory("a"))
+
+    asyncio.run(scenario())
+    assert sorted(calls) == ["a", "a", "b"]
+
+
+def test_exception_is_propagated_to_all_waiters():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        flight = SingleFlight("test")
+        return await asyncio.gather(*(flight.run("k", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_leader_does_not_cancel_shared_computation():
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        flight = SingleFlight("test")
+        leader = asyncio.ensure_future(flight.run("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        value, shared = await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return value, shared
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def test_computation_cancelled_when_all_waiters_leave():
+    state = {"cancelled": False}
+
+    async def compute():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    async def scenario():
+        flight = SingleFlight("test")
+        waiter = asyncio.ensure_future(flight.run("k", compute))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        return flight
+
+    flight = asyncio.run(scenario())
+    assert state["cancelled"]
+    assert flight.in_flight() == 0
+
+
+def test_fingerprint_normalizes_text_but_not_parameters():
+    base = request_fingerprint("/rag/query", {"question": "ソウル  の 観光", "top_k": 5})
+
+    assert request_fingerprint("/rag/query", {"question": " ｿｳﾙ の 観光 ", "top_k": 5}) == base
+    assert request_fingerprint("/rag/query", {"question": "ソウル の 観光", "top_k": 3}) != base
+    assert request_fingerprint("/chat", {"question": "ソウル の 観光", "top_k": 5}) != base
+
+
+def test_rag_query_burst_runs_chain_once(monkeypatch):
+    import backend.main as main_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://single-flight-test")
+    monkeypatch.setattr(main_module, "init_cache_from_env", lambda: None)
+    monkeypatch.setattr(main_module, "Retriever", lambda **_: MagicMock())
+    monkeypatch.setattr(main_module, "ItineraryPlanner", lambda retriever, **_: MagicMock())
+    handler = MagicMock()
+    handler.initialize = AsyncMock()
+    handler.close = AsyncMock()
+    monkeypatch.setattr(main_module, "UnifiedChatHandler", lambda **_: handler)
+
+    async def slow_chain(_inputs, config=None):
+        await asyncio.sleep(0.3)
+        return {"result": "答え", "source_documents": []}
+
+    chain = MagicMock()
+    chain.ainvoke = AsyncMock(side_effect=slow_chain)
+    monkeypatch.setattr(main_module, "create_rag_chain", lambda **_: chain)
+
+    with TestClient(main_module.app) as client:
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            responses = list(pool.map(
+                lambda _: client.post("/rag/query", json={"question": "祭りのおすすめ", "top_k": 3}),
+                range(5),
+            ))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert chain.ainvoke.await_count == 1
+    coalesced = [r.json()["metadata"].get("coalesced", False) for r in responses]
+    assert coalesced.count(True) == 4